@@ -8,8 +8,10 @@ from django.utils import timezone
 from datetime import timedelta
 from django.db.models import Count
 from django.db.models.functions import TruncDate
+from infrastructure.database.replicas import use_replica
 
 
+@use_replica
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_admin_stats(request):
@@ -59,6 +61,7 @@ def get_admin_stats(request):
         )
 
 
+@use_replica
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_analytics_stats(request):
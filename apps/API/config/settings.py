@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.gis', 
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'domain.entities',
@@ -52,6 +53,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'interfaces.middleware.token_auth.TokenAuthenticationMiddleware',
+    'interfaces.middleware.replica_routing.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -87,6 +89,31 @@ DATABASES = {
     }
 }
 
+# Réplicas de lectura (infrastructure.database.replicas): POSTGRES_REPLICA_HOSTS
+# separados por coma ("host" o "host:puerto"), mismas credenciales que la primaria
+REPLICA_ALIASES = []
+for i, replica_host in enumerate(filter(None, os.environ.get('POSTGRES_REPLICA_HOSTS', '').split(',')), start=1):
+    host, _, port = replica_host.strip().partition(':')
+    DATABASES[f'replica_{i}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        # Los tests usan la base de la primaria
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_ALIASES.append(f'replica_{i}')
+
+DATABASE_ROUTERS = ['infrastructure.database.replicas.ReplicaRouter']
+
+DATABASE_REPLICAS = {
+    'ALIASES': REPLICA_ALIASES,
+    # Retraso tolerado (s); una réplica más atrasada deja de usarse
+    'MAX_LAG': float(os.environ.get('DATABASE_REPLICA_MAX_LAG', 5)),
+    'LAG_CHECK_INTERVAL': float(os.environ.get('DATABASE_REPLICA_LAG_CHECK_INTERVAL', 10)),
+    # Con varios workers debe ser un backend compartido (p. ej. Redis)
+    'CACHE_ALIAS': os.environ.get('DATABASE_REPLICA_CACHE_ALIAS', 'default'),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -124,6 +151,71 @@ REST_FRAMEWORK = {
     'UNAUTHENTICATED_USER': None,  # No usar AnonymousUser por defecto
 }
 
+# Caché de resolución de tokens de sesión (interfaces/authentication/token_cache.py)
+SESION_TOKEN_CACHE = {
+    'ENABLED': os.environ.get('SESION_TOKEN_CACHE_ENABLED', 'True').lower() == 'true',
+    'MAX_ENTRIES': int(os.environ.get('SESION_TOKEN_CACHE_MAX_ENTRIES', 10000)),
+    'TTL': int(os.environ.get('SESION_TOKEN_CACHE_TTL', 300)),
+    # Alias de CACHES compartido entre procesos (p. ej. Redis); None = solo memoria local
+    'SHARED_ALIAS': os.environ.get('SESION_TOKEN_CACHE_ALIAS') or None,
+    # Vida en la memoria de cada worker (con o sin SHARED_ALIAS): un logout,
+    # cambio de contraseña o desactivación en un worker tarda hasta LOCAL_TTL
+    # segundos en aplicarse en los demás
+    'LOCAL_TTL': int(os.environ.get('SESION_TOKEN_CACHE_LOCAL_TTL', 5)),
+}
+
+# Caché de respuestas del GeoJSON del mapa (reports.services.geojson_cache).
+# Con varios workers, ALIAS debe apuntar a un backend compartido (p. ej. Redis).
+REPORTS_GEOJSON_CACHE = {
+    'ENABLED': os.environ.get('REPORTS_GEOJSON_CACHE_ENABLED', 'True').lower() == 'true',
+    'ALIAS': os.environ.get('REPORTS_GEOJSON_CACHE_ALIAS', 'default'),
+    'TTL': int(os.environ.get('REPORTS_GEOJSON_CACHE_TTL', 120)),
+}
+
+# Envío masivo de notificaciones: filas por bloque de bulk_create en el worker
+# (python manage.py process_notification_jobs)
+NOTIFICATION_FANOUT_CHUNK_SIZE = int(os.environ.get('NOTIFICATION_FANOUT_CHUNK_SIZE', 1000))
+
+# Entrega de notificaciones push (worker send_push_notifications)
+PUSH_NOTIFICATIONS = {
+    'ENABLED': os.environ.get('PUSH_NOTIFICATIONS_ENABLED', 'True').lower() == 'true',
+    'URL': os.environ.get('PUSH_SERVICE_URL', 'https://exp.host/--/api/v2/push/send'),
+    'ACCESS_TOKEN': os.environ.get('PUSH_ACCESS_TOKEN') or None,
+    'MAX_WORKERS': int(os.environ.get('PUSH_MAX_WORKERS', 4)),
+    'BATCH_SIZE': int(os.environ.get('PUSH_BATCH_SIZE', 100)),
+    'MAX_RETRIES': int(os.environ.get('PUSH_MAX_RETRIES', 3)),
+    'BACKOFF': float(os.environ.get('PUSH_BACKOFF', 0.5)),
+    'TIMEOUT': float(os.environ.get('PUSH_TIMEOUT', 10)),
+}
+
+# Miniaturas y variantes WebP de imágenes de reportes
+# (worker process_report_derivatives, requiere Pillow)
+REPORT_IMAGE_DERIVATIVES = {
+    'ENABLED': os.environ.get('REPORT_IMAGE_DERIVATIVES_ENABLED', 'True').lower() == 'true',
+    'BATCH_SIZE': int(os.environ.get('REPORT_IMAGE_DERIVATIVES_BATCH_SIZE', 20)),
+    'JPEG_QUALITY': int(os.environ.get('REPORT_IMAGE_JPEG_QUALITY', 82)),
+    'WEBP_QUALITY': int(os.environ.get('REPORT_IMAGE_WEBP_QUALITY', 80)),
+}
+
+# Subidas reanudables por fragmentos (reports.services.upload_service)
+REPORT_UPLOADS = {
+    # None = MEDIA_ROOT/uploads_tmp. Con varios servidores, un volumen compartido
+    'TEMP_DIR': os.environ.get('REPORT_UPLOADS_TEMP_DIR') or None,
+    'MAX_CHUNK_SIZE': int(os.environ.get('REPORT_UPLOADS_MAX_CHUNK_SIZE', 8 * 1024 * 1024)),
+    'EXPIRATION': int(os.environ.get('REPORT_UPLOADS_EXPIRATION', 24 * 60 * 60)),
+}
+
+# Recolección de archivos huérfanos e inactivos de MEDIA_ROOT
+# (python manage.py collect_orphan_media)
+MEDIA_GC = {
+    'GRACE_PERIOD': int(os.environ.get('MEDIA_GC_GRACE_PERIOD', 24 * 60 * 60)),
+    'BATCH_SIZE': int(os.environ.get('MEDIA_GC_BATCH_SIZE', 500)),
+    'ROOTS': ['reports', 'blobs'],
+    # None = MEDIA_ROOT/.quarantine
+    'QUARANTINE_DIR': os.environ.get('MEDIA_GC_QUARANTINE_DIR') or None,
+    'QUARANTINE_RETENTION': int(os.environ.get('MEDIA_GC_QUARANTINE_RETENTION', 30 * 24 * 60 * 60)),
+}
+
 # EMAIL Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
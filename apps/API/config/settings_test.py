@@ -6,9 +6,17 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # Segunda base local para probar el router de réplicas; solo la usan los
+    # tests que la declaran y la activan con DATABASE_REPLICAS
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
 }
 
+DATABASE_REPLICAS = {'ALIASES': []}
+
 # Usar URLs de prueba que excluyen vistas dependientes de GIS
 ROOT_URLCONF = 'config.urls_test'
 
@@ -18,6 +26,14 @@ INSTALLED_APPS = [
     if app not in ['django.contrib.gis', 'reports', 'proyectos', 'notifications']
 ]
 
+# Los tests reutilizan valores de token entre casos; la caché se activa solo
+# en los tests que la prueban explícitamente
+SESION_TOKEN_CACHE = {'ENABLED': False}
+
+# Igual para la caché del GeoJSON: las invalidaciones ocurren al confirmar la
+# transacción, lo que no sucede dentro de un TestCase
+REPORTS_GEOJSON_CACHE = {'ENABLED': False}
+
 # Configuración de logging para pruebas
 LOGGING = {
     'version': 1,
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 class EntitiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'domain.entities'
-    verbose_name = 'Entidades del Dominio'
\ No newline at end of file
+    verbose_name = 'Entidades del Dominio'
+    
+    def ready(self):
+        # Registra las señales que invalidan la caché de tokens de sesión
+        from interfaces.authentication import token_cache  # noqa: F401
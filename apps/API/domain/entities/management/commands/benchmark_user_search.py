@@ -0,0 +1,172 @@
+"""
+Mide la búsqueda de usuarios del panel admin sobre una tabla sintética.
+
+Crea una copia vacía de `usuario` con sus índices (por defecto
+`usuario_bench`, UNLOGGED), la llena con usuarios generados y compara:
+
+- legacy: icontains sobre nickname/email/RUT sin límite (búsqueda anterior)
+- difuso: similitud por trigramas con límite
+- prefijo: autocompletado por inicio de nickname/email/RUT con límite
+
+    python manage.py benchmark_user_search --users 1000000 --repeat 5
+
+Solo PostgreSQL. La tabla de usuarios real no se modifica.
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+
+from domain.entities.usuario import Usuario
+from domain.services.user_search_service import user_search_service
+
+NOMBRES = [
+    'Juan', 'María', 'José', 'Francisca', 'Matías', 'Catalina', 'Benjamín',
+    'Valentina', 'Vicente', 'Antonella', 'Tomás', 'Josefa', 'Agustín', 'Isidora',
+]
+APELLIDOS = [
+    'González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva',
+    'Martínez', 'Sepúlveda', 'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández',
+]
+
+# Consultas típicas: errores de tipeo, fragmentos de email, RUT y prefijos cortos
+CONSULTAS = ['gonzales', 'rodriges', 'catalina.soto', 'sepulveda', '12345', 'benja', 'mar', 'vi']
+
+
+class Command(BaseCommand):
+    help = 'Compara la búsqueda de usuarios (legacy, difusa y por prefijo) sobre una tabla sintética'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=1_000_000,
+            help='Usuarios sintéticos a generar (por defecto 1.000.000)'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Repeticiones por consulta (por defecto 5)'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=20,
+            help='Límite de resultados de las búsquedas nuevas (por defecto 20)'
+        )
+        parser.add_argument(
+            '--table', default='usuario_bench',
+            help='Nombre de la tabla sintética (por defecto usuario_bench)'
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='No eliminar la tabla al terminar (se reutiliza en la próxima ejecución)'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('El benchmark requiere PostgreSQL con pg_trgm')
+        if options['users'] <= 0 or options['repeat'] <= 0 or options['limit'] <= 0:
+            raise CommandError('--users, --repeat y --limit deben ser mayores que 0')
+
+        tabla = options['table']
+        try:
+            self._preparar_tabla(tabla, options['users'])
+
+            self.stdout.write(f"{'consulta':<16}{'modo':<10}{'filas':>8}{'p50 ms':>10}{'p95 ms':>10}")
+            for consulta in CONSULTAS:
+                for modo, queryset in self._consultas(consulta, options['limit']):
+                    filas, tiempos = self._medir(queryset, tabla, options['repeat'])
+                    self.stdout.write(
+                        f'{consulta:<16}{modo:<10}{filas:>8}'
+                        f'{statistics.median(tiempos):>10.1f}{self._p95(tiempos):>10.1f}'
+                    )
+        finally:
+            if not options['keep']:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP TABLE IF EXISTS "{tabla}"')
+
+        self.stdout.write(self.style.SUCCESS('Benchmark completado'))
+
+    def _preparar_tabla(self, tabla, usuarios):
+        """Crea y llena la tabla sintética si aún no tiene la cantidad pedida"""
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [tabla])
+            if cursor.fetchone()[0] is not None:
+                cursor.execute(f'SELECT count(*) FROM "{tabla}"')
+                if cursor.fetchone()[0] == usuarios:
+                    self.stdout.write(f'Reutilizando {tabla} ({usuarios} usuarios)')
+                    return
+                cursor.execute(f'DROP TABLE "{tabla}"')
+
+            self.stdout.write(f'Generando {usuarios} usuarios en {tabla}...')
+            inicio = time.monotonic()
+            # INCLUDING INDEXES copia los índices de trigramas y de prefijo de usuario
+            cursor.execute(
+                f'CREATE UNLOGGED TABLE "{tabla}" (LIKE usuario INCLUDING DEFAULTS INCLUDING INDEXES)'
+            )
+            cursor.execute(
+                f'''
+                INSERT INTO "{tabla}" (
+                    usua_id, usua_rut, usua_rut_normalizado, usua_nombre, usua_apellido,
+                    usua_nickname, usua_email, usua_pass, usua_creado, usua_telefono,
+                    usua_estado, rous_id
+                )
+                SELECT
+                    g,
+                    (10000000 + g)::text || '-' || (g % 10)::text,
+                    (10000000 + g)::text || (g % 10)::text,
+                    n.nombre,
+                    a.apellido,
+                    lower(n.nombre) || '_' || lower(a.apellido) || g::text,
+                    lower(n.nombre) || '.' || lower(a.apellido) || g::text || '@example.com',
+                    'x',
+                    now() - make_interval(secs => g),
+                    56900000000 + g,
+                    1,
+                    3
+                FROM generate_series(1, %s) AS g
+                CROSS JOIN LATERAL (
+                    SELECT (%s::text[])[1 + (g * 7) %% %s] AS nombre
+                ) n
+                CROSS JOIN LATERAL (
+                    SELECT (%s::text[])[1 + (g * 13) %% %s] AS apellido
+                ) a
+                ''',
+                [usuarios, NOMBRES, len(NOMBRES), APELLIDOS, len(APELLIDOS)]
+            )
+            cursor.execute(f'ANALYZE "{tabla}"')
+            self.stdout.write(f'Tabla lista en {time.monotonic() - inicio:.1f}s')
+
+    def _consultas(self, consulta, limit):
+        legacy = Usuario.objects.filter(
+            Q(usua_nickname__icontains=consulta) |
+            Q(usua_email__icontains=consulta) |
+            Q(usua_rut__icontains=consulta)
+        ).order_by('-usua_creado')
+        yield 'legacy', legacy
+
+        if len(consulta) >= 3:
+            difuso = user_search_service.queryset_difuso(Usuario.objects.all(), consulta)
+            yield 'difuso', difuso.order_by('-score', '-usua_id')[:limit]
+
+        prefijo = Usuario.objects.filter(user_search_service.filtro_prefijo(consulta))
+        yield 'prefijo', prefijo.order_by('usua_nickname', 'usua_id')[:limit]
+
+    def _medir(self, queryset, tabla, repeticiones):
+        """Ejecuta el SQL del queryset contra la tabla sintética; retorna (filas, tiempos en ms)"""
+        sql, params = queryset.query.sql_with_params()
+        sql = sql.replace(f'"{Usuario._meta.db_table}"', f'"{tabla}"')
+
+        tiempos = []
+        filas = 0
+        with connection.cursor() as cursor:
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                cursor.execute(sql, params)
+                filas = len(cursor.fetchall())
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+        return filas, tiempos
+
+    @staticmethod
+    def _p95(tiempos):
+        ordenados = sorted(tiempos)
+        return ordenados[min(len(ordenados) - 1, int(round(0.95 * (len(ordenados) - 1))))]
@@ -0,0 +1,101 @@
+"""
+Elimina en lotes los tokens de sesión y códigos de recuperación que ya no sirven.
+
+Pensado para ejecutarse periódicamente (cron, systemd timer, etc.):
+
+    python manage.py purge_expired_sessions --batch-size 1000 --sleep 0.5
+
+Cada lote se borra en su propia transacción y por clave primaria, de modo que
+los bloqueos son cortos y el comando puede correr junto al tráfico normal.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from domain.entities.recuperar_usuario import RecuperarUsuario
+from domain.entities.sesion_token import SesionToken
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Elimina en lotes los tokens de sesión expirados/inactivos y los códigos de recuperación vencidos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Filas a eliminar por lote (por defecto 1000)'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=0.5,
+            help='Segundos de espera entre lotes (por defecto 0.5)'
+        )
+        parser.add_argument(
+            '--max-batches', type=int, default=0,
+            help='Máximo de lotes por tabla; 0 = sin límite'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo cuenta las filas que se eliminarían'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size <= 0:
+            raise CommandError('--batch-size debe ser mayor que 0')
+        if options['sleep'] < 0:
+            raise CommandError('--sleep no puede ser negativo')
+
+        inicio = time.monotonic()
+        metricas = {
+            'sesion_token': self._purge(SesionToken, options),
+            'recuperar_usuario': self._purge(RecuperarUsuario, options),
+        }
+        duracion = time.monotonic() - inicio
+
+        accion = 'a eliminar' if options['dry_run'] else 'eliminadas'
+        for tabla, datos in metricas.items():
+            self.stdout.write(
+                f"{tabla}: {datos['filas']} filas {accion} en {datos['lotes']} lotes"
+            )
+        self.stdout.write(self.style.SUCCESS(f'Limpieza completada en {duracion:.2f}s'))
+
+        logger.info(
+            'Limpieza de sesiones: tokens=%s códigos=%s duración=%.2fs dry_run=%s',
+            metricas['sesion_token']['filas'],
+            metricas['recuperar_usuario']['filas'],
+            duracion,
+            options['dry_run']
+        )
+
+    def _purge(self, model, options):
+        """Elimina las filas de `model.expirados()` en lotes por clave primaria"""
+        if options['dry_run']:
+            return {'filas': model.expirados().count(), 'lotes': 0}
+
+        filas = 0
+        lotes = 0
+        while True:
+            pks = list(
+                model.expirados().order_by('pk').values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not pks:
+                break
+
+            # La eliminación pasa por el ORM para disparar las señales
+            # (p. ej. invalidación de la caché de tokens)
+            eliminadas, _ = model.objects.filter(pk__in=pks).delete()
+            filas += eliminadas
+            lotes += 1
+            logger.debug('%s: lote %s, %s filas eliminadas', model._meta.db_table, lotes, eliminadas)
+
+            if len(pks) < options['batch_size']:
+                break
+            if options['max_batches'] and lotes >= options['max_batches']:
+                break
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        return {'filas': filas, 'lotes': lotes}
@@ -0,0 +1,17 @@
+# Generated manually for the expired session token sweeper
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0002_alter_usuario_usua_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sesiontoken',
+            index=models.Index(fields=['token_expira_en'], name='sesion_token_expira_idx'),
+        ),
+    ]
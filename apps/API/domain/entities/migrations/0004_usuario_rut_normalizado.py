@@ -0,0 +1,54 @@
+# Generated manually for the normalized RUT lookup column
+
+import logging
+import re
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def _normalizar(rut):
+    # Copia de domain.entities.usuario.normalizar_rut (las migraciones no importan el modelo)
+    return re.sub(r'[^0-9k]', '', (rut or '').lower()).lstrip('0')
+
+
+def poblar_rut_normalizado(apps, schema_editor):
+    Usuario = apps.get_model('entities', 'Usuario')
+    vistos = set()
+    pendientes = []
+    omitidos = []
+    for usuario in Usuario.objects.only('usua_id', 'usua_rut').order_by('usua_id').iterator(chunk_size=2000):
+        normalizado = _normalizar(usuario.usua_rut) or None
+        if normalizado is None or normalizado in vistos:
+            # RUT vacío o duplicado en otro formato: queda sin normalizar para revisión
+            omitidos.append(usuario.usua_id)
+            continue
+        vistos.add(normalizado)
+        usuario.usua_rut_normalizado = normalizado
+        pendientes.append(usuario)
+        if len(pendientes) >= 1000:
+            Usuario.objects.bulk_update(pendientes, ['usua_rut_normalizado'])
+            pendientes = []
+    if pendientes:
+        Usuario.objects.bulk_update(pendientes, ['usua_rut_normalizado'])
+    if omitidos:
+        logger.warning(
+            f"{len(omitidos)} usuarios con RUT vacío o duplicado quedaron sin normalizar: {omitidos}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0003_sesiontoken_expira_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='usua_rut_normalizado',
+            field=models.CharField(editable=False, max_length=12, null=True, unique=True),
+        ),
+        migrations.RunPython(poblar_rut_normalizado, migrations.RunPython.noop),
+    ]
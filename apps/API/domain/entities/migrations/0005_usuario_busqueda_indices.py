@@ -0,0 +1,47 @@
+# Generated manually for the admin user search (trigram and prefix indexes)
+
+from django.db import migrations
+
+# Índices solo de PostgreSQL; en otros motores (SQLite en tests) no se crean
+CREAR_INDICES = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    # Búsqueda difusa: operador %> y word_similarity sobre cada columna
+    '''
+    CREATE INDEX IF NOT EXISTS usuario_busqueda_trgm_idx ON usuario USING gin (
+        usua_nickname gin_trgm_ops,
+        usua_nombre gin_trgm_ops,
+        usua_apellido gin_trgm_ops,
+        usua_email gin_trgm_ops,
+        usua_rut_normalizado gin_trgm_ops
+    )
+    ''',
+    # Autocompletado: istartswith genera UPPER(col::text) LIKE UPPER('abc%')
+    'CREATE INDEX IF NOT EXISTS usuario_nickname_prefijo_idx ON usuario (UPPER(usua_nickname::text) text_pattern_ops)',
+    'CREATE INDEX IF NOT EXISTS usuario_email_prefijo_idx ON usuario (UPPER(usua_email::text) text_pattern_ops)',
+]
+
+ELIMINAR_INDICES = [
+    'DROP INDEX IF EXISTS usuario_email_prefijo_idx',
+    'DROP INDEX IF EXISTS usuario_nickname_prefijo_idx',
+    'DROP INDEX IF EXISTS usuario_busqueda_trgm_idx',
+]
+
+
+def _ejecutar(sentencias):
+    def operacion(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for sql in sentencias:
+            schema_editor.execute(sql)
+    return operacion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0004_usuario_rut_normalizado'),
+    ]
+
+    operations = [
+        migrations.RunPython(_ejecutar(CREAR_INDICES), _ejecutar(ELIMINAR_INDICES)),
+    ]
@@ -0,0 +1,17 @@
+# Generated manually for the keyset-paginated admin user list
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0005_usuario_busqueda_indices'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(fields=['usua_creado', 'usua_id'], name='usuario_creado_idx'),
+        ),
+    ]
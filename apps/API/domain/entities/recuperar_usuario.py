@@ -82,6 +82,13 @@ class RecuperarUsuario(models.Model):
         except cls.DoesNotExist:
             return None
     
+    @classmethod
+    def expirados(cls):
+        """Códigos que ya no pueden usarse: expirados o ya utilizados"""
+        return cls.objects.filter(
+            models.Q(reus_expira_en__lt=timezone.now()) | models.Q(reus_usado=True)
+        )
+    
     @classmethod
     def limpiar_codigos_expirados(cls):
         """Elimina todos los códigos expirados"""
@@ -89,4 +96,4 @@ class RecuperarUsuario(models.Model):
         expired_codes = cls.objects.filter(reus_expira_en__lt=now)
         count = expired_codes.count()
         expired_codes.delete()
-        return count
\ No newline at end of file
+        return count
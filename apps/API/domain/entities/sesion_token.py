@@ -16,6 +16,9 @@ class SesionToken(models.Model):
         db_table = 'sesion_token'
         verbose_name = 'Token de Sesión'
         verbose_name_plural = 'Tokens de Sesión'
+        indexes = [
+            models.Index(fields=['token_expira_en'], name='sesion_token_expira_idx'),
+        ]
     
     def __str__(self):
         return f"Token {self.token_id} - Usuario: {self.usua_id.usua_nickname}"
@@ -69,4 +72,11 @@ class SesionToken(models.Model):
                 return token.usua_id
             return None
         except cls.DoesNotExist:
-            return None
\ No newline at end of file
+            return None
+    
+    @classmethod
+    def expirados(cls):
+        """Tokens que ya no pueden usarse: expirados o desactivados"""
+        return cls.objects.filter(
+            models.Q(token_expira_en__lt=timezone.now()) | models.Q(token_activo=False)
+        )
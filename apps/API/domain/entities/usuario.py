@@ -1,14 +1,24 @@
 from django.db import models
 from .rol_usuario import RolUsuario
 import random
+import re
 
 def generate_user_id():
     """Genera un ID único para el usuario"""
     return random.randint(100000, 999999)
 
+def normalizar_rut(rut):
+    """
+    Forma canónica del RUT: dígitos y dígito verificador en minúscula, sin
+    puntos, guion, espacios ni ceros a la izquierda ("12.345.678-K" -> "12345678k")
+    """
+    return re.sub(r'[^0-9k]', '', (rut or '').lower()).lstrip('0')
+
 class Usuario(models.Model):
     usua_id = models.AutoField(primary_key=True, unique=True, editable=False, default=generate_user_id)
     usua_rut = models.CharField(max_length=12, unique=True)
+    # Se calcula en save(); índice único para buscar por RUT en cualquier formato
+    usua_rut_normalizado = models.CharField(max_length=12, unique=True, null=True, editable=False)
     usua_nombre = models.CharField(max_length=50, blank=True, null=True)
     usua_apellido = models.CharField(max_length=50, blank=True, null=True)
     usua_nickname = models.CharField(max_length=50, unique=True)
@@ -24,6 +34,10 @@ class Usuario(models.Model):
         db_table = 'usuario'
         verbose_name = 'Usuario'
         verbose_name_plural = 'Usuarios'
+        indexes = [
+            # Listado del panel admin: paginación por (usua_creado, usua_id)
+            models.Index(fields=['usua_creado', 'usua_id'], name='usuario_creado_idx'),
+        ]
     
     def __str__(self):
         return self.usua_nickname
@@ -38,10 +52,34 @@ class Usuario(models.Model):
         from django.contrib.auth.hashers import make_password
         self.usua_pass = make_password(raw_password)
     
+    @classmethod
+    def por_rut(cls, rut):
+        """QuerySet de usuarios con ese RUT, sin importar el formato recibido"""
+        normalizado = normalizar_rut(rut)
+        if not normalizado:
+            # Sin dígitos no es un RUT: no debe coincidir con los RUT sin normalizar (NULL)
+            return cls.objects.none()
+        return cls.objects.filter(usua_rut_normalizado=normalizado)
+    
     def save(self, *args, **kwargs):
         # Verificar si es una creación (no actualización)
         is_new = self._state.adding
         
+        # Mantener el RUT normalizado junto al RUT ingresado
+        normalizado = normalizar_rut(self.usua_rut) or None
+        if (
+            not is_new
+            and self.usua_rut_normalizado is None
+            and normalizado is not None
+            and Usuario.objects.filter(usua_rut_normalizado=normalizado).exclude(pk=self.pk).exists()
+        ):
+            # RUT duplicado que la migración 0004 dejó sin normalizar para revisión
+            normalizado = None
+        self.usua_rut_normalizado = normalizado
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'usua_rut' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'usua_rut_normalizado'}
+        
         # Generar ID aleatorio si no existe
         if not self.usua_id:
             self.usua_id = random.randint(100000, 999999)
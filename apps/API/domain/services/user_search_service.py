@@ -0,0 +1,131 @@
+"""
+Búsqueda de usuarios para el panel de administración.
+
+Dos modos, ambos con límite y paginación por clave (keyset):
+
+- prefijo: para autocompletar mientras se escribe. Coincide con el inicio del
+  nickname, email o RUT y usa índices B-tree de patrón (LIKE 'abc%').
+- difuso: similitud por trigramas (pg_trgm) sobre nickname, nombre, apellido,
+  email y RUT normalizado, ordenado por relevancia. Tolera errores de tipeo
+  ("gonzales" encuentra "González") y usa el índice GIN de trigramas.
+
+Las consultas de menos de MIN_TRIGRAMA caracteres usan siempre el modo prefijo,
+porque no forman trigramas útiles. Fuera de PostgreSQL el modo difuso se
+reduce a icontains.
+"""
+
+import re
+from typing import Any, List, Optional, Tuple
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import FloatField, Q, QuerySet
+from django.db.models.functions import Cast, Greatest
+
+from domain.entities.usuario import Usuario, normalizar_rut
+from infrastructure.database.pagination import keyset_paginate
+
+MODO_PREFIJO = 'prefijo'
+MODO_DIFUSO = 'difuso'
+
+MIN_TRIGRAMA = 3
+
+# Columnas de texto comparadas en la búsqueda difusa (índice usuario_busqueda_trgm_idx)
+CAMPOS_DIFUSOS = ('usua_nickname', 'usua_nombre', 'usua_apellido', 'usua_email')
+
+
+class UserSearchService:
+    """Servicio de búsqueda de usuarios"""
+
+    def resolver_modo(self, consulta: str, prefijo: bool = False) -> str:
+        if prefijo or len(consulta) < MIN_TRIGRAMA:
+            return MODO_PREFIJO
+        return MODO_DIFUSO
+
+    def buscar(
+        self,
+        consulta: str,
+        limit: int,
+        after: Optional[Tuple[Any, Any]] = None,
+        prefijo: bool = False
+    ) -> Tuple[List[Usuario], bool, str]:
+        """
+        Retorna (usuarios, hay_más, modo). `after` es la posición decodificada
+        del cursor; ValueError si no corresponde al modo de la búsqueda.
+        """
+        modo = self.resolver_modo(consulta, prefijo)
+        queryset = Usuario.objects.select_related('rous_id')
+
+        if modo == MODO_PREFIJO:
+            self._validar_posicion(after, str)
+            items, hay_mas = keyset_paginate(
+                queryset.filter(self.filtro_prefijo(consulta)),
+                'usua_nickname',
+                limit,
+                after=after,
+                descending=False,
+                pk_field='usua_id'
+            )
+            return items, hay_mas, modo
+
+        if connection.vendor != 'postgresql':
+            self._validar_posicion(after, str)
+            filtro = Q()
+            for campo in CAMPOS_DIFUSOS + ('usua_rut',):
+                filtro |= Q(**{f'{campo}__icontains': consulta})
+            items, hay_mas = keyset_paginate(
+                queryset.filter(filtro), 'usua_nickname', limit,
+                after=after, descending=False, pk_field='usua_id'
+            )
+            return items, hay_mas, modo
+
+        self._validar_posicion(after, (int, float))
+        items, hay_mas = keyset_paginate(
+            self.queryset_difuso(queryset, consulta),
+            'score',
+            limit,
+            after=after,
+            descending=True,
+            pk_field='usua_id'
+        )
+        return items, hay_mas, modo
+
+    def queryset_difuso(self, queryset: QuerySet, consulta: str) -> QuerySet:
+        """Filtra por similitud de trigramas y anota `score` (0 a 1)"""
+        rut = normalizar_rut(consulta) if re.search(r'\d', consulta) else ''
+
+        filtro = Q()
+        similitudes = []
+        for campo in CAMPOS_DIFUSOS:
+            # campo %> consulta: word_similarity(consulta, campo) sobre el umbral
+            filtro |= Q(**{f'{campo}__trigram_word_similar': consulta})
+            similitudes.append(TrigramWordSimilarity(consulta, campo))
+        if rut:
+            filtro |= Q(usua_rut_normalizado__startswith=rut)
+            filtro |= Q(usua_rut_normalizado__trigram_word_similar=rut)
+            similitudes.append(TrigramWordSimilarity(rut, 'usua_rut_normalizado'))
+
+        # word_similarity retorna real; como double el valor viaja exacto en el cursor
+        return queryset.filter(filtro).annotate(
+            score=Cast(Greatest(*similitudes), FloatField())
+        )
+
+    def filtro_prefijo(self, consulta: str) -> Q:
+        """Coincidencia por inicio de nickname, email o RUT normalizado"""
+        filtro = Q(usua_nickname__istartswith=consulta) | Q(usua_email__istartswith=consulta)
+        rut = normalizar_rut(consulta)
+        if rut and re.search(r'\d', consulta):
+            filtro |= Q(usua_rut_normalizado__startswith=rut)
+        return filtro
+
+    @staticmethod
+    def _validar_posicion(after: Optional[Tuple[Any, Any]], tipo) -> None:
+        if after is None:
+            return
+        valor, pk = after
+        if isinstance(valor, bool) or not isinstance(valor, tipo) or not isinstance(pk, int):
+            raise ValueError('Cursor inválido para esta búsqueda')
+
+
+# Instancia singleton del servicio
+user_search_service = UserSearchService()
@@ -0,0 +1,112 @@
+"""
+Paginación por clave (keyset) para listados ordenados por (campo, pk).
+
+En lugar de OFFSET, cada página continúa desde la última posición vista, por
+lo que el costo no crece con la profundidad y las filas nuevas no desplazan
+las páginas siguientes. La posición viaja al cliente como un cursor opaco en
+base64, igual que en la paginación de reportes.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+
+# Bajo este número el COUNT exacto es barato y se prefiere a la estimación
+EXACT_COUNT_THRESHOLD = 10000
+
+
+def encode_cursor(valor: Any, pk: Any) -> str:
+    """Codifica la posición (valor del campo de orden, pk) como cursor opaco"""
+    if isinstance(valor, (datetime, date)):
+        valor = valor.isoformat()
+    datos = json.dumps({'v': valor, 'id': pk})
+    return base64.urlsafe_b64encode(datos.encode('utf-8')).decode('utf-8')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, Any]]:
+    """Decodifica un cursor; retorna None si falta o es inválido"""
+    if not cursor:
+        return None
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(cursor.encode('utf-8')).decode('utf-8'))
+        return datos['v'], datos['id']
+    except (ValueError, KeyError, TypeError, binascii.Error, json.JSONDecodeError):
+        return None
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    order_field: str,
+    limit: int,
+    after: Optional[Tuple[Any, Any]] = None,
+    descending: bool = True,
+    pk_field: str = 'id'
+) -> Tuple[List[Any], bool]:
+    """
+    Retorna (elementos, hay_más) a partir de la posición `after` (exclusiva).
+
+    El orden es (order_field, pk_field), ambos descendentes o ascendentes,
+    para que el índice compuesto correspondiente resuelva el filtro y el orden.
+    """
+    queryset = _keyset_queryset(queryset, order_field, after, descending, pk_field)
+    elementos = list(queryset[:limit + 1])
+    hay_mas = len(elementos) > limit
+    return elementos[:limit], hay_mas
+
+
+async def akeyset_paginate(
+    queryset: QuerySet,
+    order_field: str,
+    limit: int,
+    after: Optional[Tuple[Any, Any]] = None,
+    descending: bool = True,
+    pk_field: str = 'id'
+) -> Tuple[List[Any], bool]:
+    """keyset_paginate con el ORM async, para las vistas ASGI"""
+    queryset = _keyset_queryset(queryset, order_field, after, descending, pk_field)
+    elementos = [elemento async for elemento in queryset[:limit + 1]]
+    hay_mas = len(elementos) > limit
+    return elementos[:limit], hay_mas
+
+
+def _keyset_queryset(queryset, order_field, after, descending, pk_field) -> QuerySet:
+    prefijo = '-' if descending else ''
+    queryset = queryset.order_by(f'{prefijo}{order_field}', f'{prefijo}{pk_field}')
+
+    if after is not None:
+        valor, pk = after
+        lookup = 'lt' if descending else 'gt'
+        # El primer término acota el rango del índice; el OR resuelve los empates
+        queryset = queryset.filter(
+            Q(**{f'{order_field}__{lookup}e': valor}),
+            Q(**{f'{order_field}__{lookup}': valor}) | Q(**{order_field: valor, f'{pk_field}__{lookup}': pk})
+        )
+    return queryset
+
+
+def estimate_count(queryset: QuerySet, threshold: int = EXACT_COUNT_THRESHOLD) -> Tuple[int, bool]:
+    """
+    Retorna (total, es_estimado). En PostgreSQL usa las filas estimadas por el
+    planificador (EXPLAIN, sin recorrer la tabla) y solo cuenta exactamente
+    cuando la estimación es menor que `threshold`. En otros motores, COUNT.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count(), False
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimado = int(plan[0]['Plan']['Plan Rows'])
+
+    if estimado < threshold:
+        return queryset.count(), False
+    return estimado, True
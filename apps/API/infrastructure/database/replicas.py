@@ -0,0 +1,217 @@
+"""
+Réplicas de lectura de la base de datos.
+
+Las lecturas del mapa, listados, detalle, estadísticas y auditoría dominan la
+carga y compiten con las escrituras (votos, comentarios, subidas). Con
+réplicas configuradas, ReplicaRouter envía a una réplica solo las lecturas de
+las vistas marcadas con @use_replica en peticiones GET/HEAD; todo lo demás
+(escrituras, autenticación, tareas y comandos) va a `default`.
+
+Lectura de lo propio (read-your-writes):
+- Dentro de una petición, después de la primera escritura todas las lecturas
+  van a la primaria.
+- Después de una petición que escribió, el usuario queda fijado a la primaria
+  por MAX_LAG + LAG_CHECK_INTERVAL segundos (marca en la caché de Django; con
+  varios workers CACHE_ALIAS debe ser compartido, p. ej. Redis).
+
+Las réplicas con un retraso mayor que MAX_LAG se dejan de usar hasta la
+siguiente medición. Sin réplicas disponibles se lee de la primaria.
+
+Configuración en settings.DATABASE_REPLICAS:
+    ALIASES             Alias de settings.DATABASES que son réplicas (por defecto ninguno)
+    MAX_LAG             Retraso tolerado en segundos (por defecto 5)
+    LAG_CHECK_INTERVAL  Cada cuántos segundos se mide el retraso (por defecto 10; 0 = no medir)
+    CACHE_ALIAS         Alias de settings.CACHES para fijar usuarios a la primaria
+
+El estado de cada petición lo maneja ReplicaRoutingMiddleware.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'db_primaria:'
+
+DEFAULT_CONFIG = {
+    'ALIASES': [],
+    'MAX_LAG': 5,
+    'LAG_CHECK_INTERVAL': 10,
+    'CACHE_ALIAS': 'default',
+}
+
+# Segundos de retraso de una réplica PostgreSQL (0 si está al día o no es réplica)
+LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def get_config() -> dict:
+    return {**DEFAULT_CONFIG, **getattr(settings, 'DATABASE_REPLICAS', {})}
+
+
+def use_replica(view):
+    """Marca una vista (función o clase) cuyas lecturas GET pueden ir a una réplica"""
+    view.use_replica = True
+    return view
+
+
+class RoutingState:
+    """Estado de enrutamiento de una petición"""
+
+    def __init__(self, replica_allowed: bool):
+        self.replica_allowed = replica_allowed
+        self.wrote = False
+        self._replica = None
+        self._chosen = False
+
+    @property
+    def replica(self) -> Optional[str]:
+        """Réplica de la petición (la misma para todas sus lecturas) o None"""
+        if not self.replica_allowed or self.wrote:
+            return None
+        if not self._chosen:
+            disponibles = replica_monitor.available()
+            self._replica = random.choice(disponibles) if disponibles else None
+            self._chosen = True
+        return self._replica
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar('db_routing_state', default=None)
+
+
+def begin_request(replica_allowed: bool) -> RoutingState:
+    # Objeto mutable: las escrituras que marca el router desde los hilos de
+    # sync_to_async (vistas async) se ven en el contexto de la petición
+    state = RoutingState(replica_allowed)
+    _state.set(state)
+    return state
+
+
+def end_request():
+    _state.set(None)
+
+
+def current_state() -> Optional[RoutingState]:
+    return _state.get()
+
+
+class ReplicaLagMonitor:
+    """Mide el retraso de las réplicas y recuerda el resultado LAG_CHECK_INTERVAL segundos"""
+
+    def __init__(self):
+        self._lags: Dict[str, Tuple[float, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def available(self) -> List[str]:
+        """Réplicas configuradas con un retraso dentro de MAX_LAG"""
+        config = get_config()
+        return [
+            alias for alias in config['ALIASES']
+            if self._within_lag(alias, config)
+        ]
+
+    def _within_lag(self, alias: str, config: dict) -> bool:
+        intervalo = config['LAG_CHECK_INTERVAL']
+        if not intervalo:
+            return True
+
+        ahora = time.monotonic()
+        with self._lock:
+            medido = self._lags.get(alias)
+        if medido is None or ahora - medido[0] >= intervalo:
+            medido = (ahora, self.measure(alias))
+            with self._lock:
+                self._lags[alias] = medido
+
+        lag = medido[1]
+        return lag is not None and lag <= config['MAX_LAG']
+
+    def measure(self, alias: str) -> Optional[float]:
+        """Retraso en segundos, o None si la réplica no responde"""
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            return 0.0
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError as e:
+            logger.warning(f"Réplica {alias} no disponible: {e}")
+            return None
+        if lag > get_config()['MAX_LAG']:
+            logger.warning(f"Réplica {alias} con {lag:.1f}s de retraso; se lee de la primaria")
+        return lag
+
+    def reset(self):
+        with self._lock:
+            self._lags.clear()
+
+
+replica_monitor = ReplicaLagMonitor()
+
+
+def _pin_key(usuario_id) -> str:
+    return f'{CACHE_KEY_PREFIX}{usuario_id}'
+
+
+def pin_to_primary(usuario_id):
+    """Fija al usuario a la primaria mientras las réplicas puedan no tener su escritura"""
+    config = get_config()
+    if not config['ALIASES']:
+        return
+    duracion = config['MAX_LAG'] + config['LAG_CHECK_INTERVAL']
+    caches[config['CACHE_ALIAS']].set(_pin_key(usuario_id), 1, timeout=max(1, int(duracion + 0.5)))
+
+
+def is_pinned(usuario_id) -> bool:
+    config = get_config()
+    if not config['ALIASES']:
+        return False
+    return caches[config['CACHE_ALIAS']].get(_pin_key(usuario_id)) is not None
+
+
+class ReplicaRouter:
+    """
+    Router de settings.DATABASE_ROUTERS: escrituras y migraciones en `default`,
+    lecturas de las vistas @use_replica en una réplica al día.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_state()
+        if state is None:
+            return None
+        # Relaciones y prefetch de un objeto: la misma base de la que se leyó
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = current_state()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Las réplicas tienen los mismos datos que la primaria
+        bases = {DEFAULT_DB_ALIAS, *get_config()['ALIASES']}
+        if obj1._state.db in bases and obj2._state.db in bases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_config()['ALIASES']:
+            return False
+        return None
@@ -0,0 +1,76 @@
+"""
+Búsqueda de texto completo sobre columnas tsvector (PostgreSQL).
+
+Los modelos con búsqueda guardan un `search_vector` que mantiene un trigger de
+la base de datos con la configuración `es_unaccent` (diccionario español sin
+tildes) y se indexa con GIN. La consulta trata cada palabra como prefijo, de
+modo que "alumb pub" encuentra "Alumbrado público".
+
+En motores sin tsvector (p. ej. SQLite en tests) se usa icontains sobre los
+campos de texto indicados.
+"""
+
+import re
+from typing import Iterable, Optional
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, FloatField, Q, QuerySet
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'es_unaccent'
+
+# Palabras (letras, dígitos, guion bajo) en cualquier alfabeto
+_PALABRA = re.compile(r'\w+', re.UNICODE)
+
+# Evita consultas enormes desde el cuadro de búsqueda
+MAX_TERMINOS = 8
+
+
+def is_supported() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def build_search_query(texto: str) -> Optional[SearchQuery]:
+    """
+    Convierte el texto del usuario en un tsquery con coincidencia por prefijo
+    ("bache calle" -> 'bache:* & calle:*'). Retorna None si no hay palabras.
+    """
+    terminos = _PALABRA.findall(texto or '')[:MAX_TERMINOS]
+    if not terminos:
+        return None
+    # Solo palabras \w: el tsquery crudo no puede recibir operadores del usuario
+    crudo = ' & '.join(f'{termino}:*' for termino in terminos)
+    return SearchQuery(crudo, search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_filter(texto: str, fallback_fields: Iterable[str], field: str = 'search_vector') -> Q:
+    """Filtro de búsqueda combinable con otros Q"""
+    if is_supported():
+        consulta = build_search_query(texto)
+        if consulta is None:
+            return Q()
+        return Q(**{field: consulta})
+
+    filtro = Q()
+    for campo in fallback_fields:
+        filtro |= Q(**{f'{campo}__icontains': texto})
+    return filtro
+
+
+def annotate_rank(queryset: QuerySet, texto: str, field: str = 'search_vector') -> QuerySet:
+    """Anota `rank` (SearchRank) para ordenar por relevancia; sin efecto fuera de PostgreSQL"""
+    if not is_supported():
+        return queryset
+    consulta = build_search_query(texto)
+    if consulta is None:
+        return queryset
+    # ts_rank retorna real; como double precision el valor viaja exacto en los
+    # cursores (rank, id) y la comparación de la página siguiente no repite filas
+    return queryset.annotate(rank=Cast(SearchRank(F(field), consulta), FloatField()))
+
+
+def search(queryset: QuerySet, texto: str, fallback_fields: Iterable[str], field: str = 'search_vector') -> QuerySet:
+    """Filtra por búsqueda y anota `rank` cuando está disponible"""
+    queryset = queryset.filter(search_filter(texto, fallback_fields, field))
+    return annotate_rank(queryset, texto, field)
@@ -39,9 +39,7 @@ class RequestPasswordResetSerializer(serializers.Serializer):
             if '@' in identifier:
                 usuario = Usuario.objects.get(usua_email=identifier, usua_estado=1)
             else:
-                # Limpiar RUT (remover puntos y guión para búsqueda)
-                rut_limpio = re.sub(r'[.-]', '', identifier)
-                usuario = Usuario.objects.get(usua_rut=identifier, usua_estado=1)
+                usuario = Usuario.por_rut(identifier).get(usua_estado=1)
             
             data['usuario'] = usuario
             return data
@@ -96,7 +94,7 @@ class VerifyResetCodeSerializer(serializers.Serializer):
             if '@' in identifier:
                 usuario = Usuario.objects.get(usua_email=identifier, usua_estado=1)
             else:
-                usuario = Usuario.objects.get(usua_rut=identifier, usua_estado=1)
+                usuario = Usuario.por_rut(identifier).get(usua_estado=1)
             
             # Verificar el código
             reset_record = RecuperarUsuario.verificar_codigo(usuario, code)
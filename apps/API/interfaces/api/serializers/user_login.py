@@ -11,7 +11,7 @@ class UserLoginSerializer(serializers.Serializer):
         password = data.get('password')
         
         try:
-            usuario = Usuario.objects.get(usua_rut=rut, usua_estado=1)
+            usuario = Usuario.por_rut(rut).get(usua_estado=1)
         except Usuario.DoesNotExist:
             raise serializers.ValidationError("Usuario no encontrado o deshabilitado.")
         
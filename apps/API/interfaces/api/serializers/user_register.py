@@ -16,6 +16,12 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         model = Usuario
         fields = ['rut', 'username', 'email', 'phone', 'password', 'confirmPassword']
 
+    def validate_rut(self, value):
+        # El mismo RUT puede venir con o sin puntos y guion
+        if Usuario.por_rut(value).exists():
+            raise serializers.ValidationError("Ya existe un usuario con este RUT.")
+        return value
+
     def validate(self, data):
         if data['usua_pass'] != data['confirmPassword']:
             raise serializers.ValidationError("Las contraseñas no coinciden.")
@@ -1,14 +1,32 @@
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from django.core.paginator import Paginator
 from interfaces.api.serializers import AdminUserSerializer
 from domain.entities.usuario import Usuario
+from domain.services.user_search_service import user_search_service
+from infrastructure.database.pagination import decode_cursor, encode_cursor, estimate_count, keyset_paginate
+from infrastructure.database.replicas import use_replica
+import csv
+import json
 import logging
-from django.db import models
 
 logger = logging.getLogger(__name__)
 
+LIST_DEFAULT_LIMIT = 20
+LIST_MAX_LIMIT = 100
+
+# Exportación en streaming (mismas columnas que AdminUserSerializer)
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = (
+    'usua_id', 'usua_rut', 'usua_nickname', 'usua_email',
+    'usua_telefono', 'rous_id', 'usua_estado', 'usua_creado'
+)
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+SEARCH_MAX_QUERY_LENGTH = 100
+
 def check_admin_permission(request):
     """Verifica si el usuario es admin."""
     usuario = getattr(request, 'auth_user', None)
@@ -16,12 +34,18 @@ def check_admin_permission(request):
         return False
     return True
 
+@use_replica
 @csrf_exempt
 @require_http_methods(["GET"])
 def admin_list_users(request):
     """
     Endpoint para admins: Lista usuarios con filtros y paginación.
-    GET params: estado (0/1), page, limit.
+    GET params:
+    - estado: 0/1
+    - limit: cantidad por página (por defecto 20, máximo 100)
+    - cursor: pagination.nextCursor de la respuesta anterior (más antiguos)
+    - format: ndjson o csv para exportar todos los usuarios en streaming
+    Orden: usua_creado descendente. El total es estimado en tablas grandes.
     """
     if not check_admin_permission(request):
         return JsonResponse({
@@ -31,18 +55,110 @@ def admin_list_users(request):
 
     # Filtros
     estado = request.GET.get('estado')
-    queryset = Usuario.objects.select_related('rous_id').order_by('-usua_creado')
+    queryset = Usuario.objects.all()
 
     if estado is not None:
-        queryset = queryset.filter(usua_estado=int(estado))
+        try:
+            queryset = queryset.filter(usua_estado=int(estado))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'Parámetro estado inválido.'
+            }, status=400)
+
+    formato = request.GET.get('format')
+    if formato:
+        if formato not in EXPORT_FORMATS:
+            return JsonResponse({
+                'success': False,
+                'message': 'Formato de exportación inválido. Use ndjson o csv.'
+            }, status=400)
+        return _exportar_usuarios(queryset, formato)
+
+    try:
+        limit = int(request.GET.get('limit', LIST_DEFAULT_LIMIT))
+    except ValueError:
+        limit = LIST_DEFAULT_LIMIT
+    limit = max(1, min(limit, LIST_MAX_LIMIT))
+
+    cursor = request.GET.get('cursor')
+    posicion = decode_cursor(cursor) if cursor else None
+    if cursor and posicion is None:
+        return JsonResponse({
+            'success': False,
+            'message': 'Cursor inválido.'
+        }, status=400)
+
+    usuarios, has_more = keyset_paginate(
+        queryset.select_related('rous_id'),
+        'usua_creado',
+        limit,
+        after=posicion,
+        pk_field='usua_id'
+    )
+    total, total_estimado = estimate_count(queryset)
 
-    serializer = AdminUserSerializer(queryset, many=True)
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(usuarios[-1].usua_creado, usuarios[-1].usua_id)
+
+    serializer = AdminUserSerializer(usuarios, many=True)
 
     return JsonResponse({
         'success': True,
-        'data': serializer.data
+        'data': serializer.data,
+        'pagination': {
+            'nextCursor': next_cursor,
+            'hasMore': has_more,
+            'count': len(usuarios),
+            'total': total,
+            'totalIsEstimate': total_estimado
+        }
     })
 
+
+class _Eco:
+    """Buffer mínimo para csv.writer: retorna la línea en lugar de guardarla"""
+
+    def write(self, valor):
+        return valor
+
+
+def _exportar_usuarios(queryset, formato):
+    """
+    Respuesta en streaming con todos los usuarios del queryset. Se recorre con
+    iterator(chunk_size) sobre values_list, sin instanciar modelos ni acumular
+    filas, de modo que la memoria es constante.
+    """
+    filas = queryset.order_by('-usua_creado', '-usua_id').values_list(
+        *EXPORT_FIELDS
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    def valores(fila):
+        return [valor.isoformat() if hasattr(valor, 'isoformat') else valor for valor in fila]
+
+    if formato == 'csv':
+        escritor = csv.writer(_Eco())
+
+        def lineas():
+            yield escritor.writerow(EXPORT_FIELDS)
+            for fila in filas:
+                yield escritor.writerow(valores(fila))
+
+        response = StreamingHttpResponse(lineas(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="usuarios.csv"'
+    else:
+        def lineas():
+            for fila in filas:
+                yield json.dumps(dict(zip(EXPORT_FIELDS, valores(fila))), ensure_ascii=False) + '\n'
+
+        response = StreamingHttpResponse(lineas(), content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="usuarios.ndjson"'
+
+    logger.info('Exportación de usuarios en formato %s', formato)
+    return response
+
+
 @csrf_exempt
 @require_http_methods(["PUT"])
 def admin_update_user_status(request, user_id):
@@ -126,12 +242,18 @@ def admin_update_user_status(request, user_id):
             }
         }, status=500)
 
+@use_replica
 @csrf_exempt
 @require_http_methods(["GET"])
 def admin_search_users(request):
     """
-    Endpoint para admins: Buscar usuarios por q (nickname, email o RUT).
-    GET params: q (query string).
+    Endpoint para admins: Buscar usuarios por q (nickname, nombre, email o RUT).
+    GET params:
+    - q: texto a buscar (requerido)
+    - prefix: true para autocompletar por inicio de nickname/email/RUT
+    - limit: cantidad por página (por defecto 20, máximo 50)
+    - cursor: pagination.nextCursor de la respuesta anterior
+    Sin prefix, los resultados se ordenan por similitud (pg_trgm).
     """
     if not check_admin_permission(request):
         return JsonResponse({
@@ -152,15 +274,47 @@ def admin_search_users(request):
             }
         }, status=400)
 
-    queryset = Usuario.objects.select_related('rous_id').filter(
-        models.Q(usua_nickname__icontains=query) |
-        models.Q(usua_email__icontains=query) |
-        models.Q(usua_rut__icontains=query)
-    ).order_by('-usua_creado')
+    try:
+        limit = int(request.GET.get('limit', SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        limit = SEARCH_DEFAULT_LIMIT
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    prefijo = request.GET.get('prefix', 'false').lower() == 'true'
 
-    serializer = AdminUserSerializer(queryset, many=True)
+    posicion = None
+    cursor = request.GET.get('cursor')
+    if cursor:
+        posicion = decode_cursor(cursor)
+    try:
+        if cursor and posicion is None:
+            raise ValueError('Cursor inválido')
+        usuarios, has_more, modo = user_search_service.buscar(
+            query[:SEARCH_MAX_QUERY_LENGTH], limit, after=posicion, prefijo=prefijo
+        )
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'error': {
+                'code': 'VALIDATION_ERROR',
+                'message': 'Cursor inválido.'
+            }
+        }, status=400)
+
+    next_cursor = None
+    if has_more:
+        ultimo = usuarios[-1]
+        clave = ultimo.score if hasattr(ultimo, 'score') else ultimo.usua_nickname
+        next_cursor = encode_cursor(clave, ultimo.usua_id)
+
+    serializer = AdminUserSerializer(usuarios, many=True)
 
     return JsonResponse({
         'success': True,
-        'data': serializer.data
-    })
\ No newline at end of file
+        'data': serializer.data,
+        'pagination': {
+            'mode': modo,
+            'nextCursor': next_cursor,
+            'hasMore': has_more,
+            'count': len(usuarios)
+        }
+    })
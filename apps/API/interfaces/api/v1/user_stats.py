@@ -1,14 +1,18 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
 from reports.models import ReportModel, VotoReporte
 from reports.models.seguimiento_reporte import SeguimientoReporte
 from domain.entities.usuario import Usuario
+from infrastructure.database.replicas import use_replica
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@use_replica
 @api_view(['GET'])
 def user_stats_view(request):
     """
@@ -31,9 +35,13 @@ def user_stats_view(request):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Contar reportes creados por el usuario (solo visibles)
-        reportes_creados = ReportModel.objects.filter(
-            usuario=usuario, visible=True).count()
+        # Reportes creados y votos RECIBIDOS (contadores de sus reportes visibles)
+        reportes = ReportModel.objects.filter(usuario=usuario, visible=True).aggregate(
+            creados=Count('id'),
+            votos=Coalesce(Sum('total_votos'), 0)
+        )
+        reportes_creados = reportes['creados']
+        votos_recibidos = reportes['votos']
 
         # Contar reportes seguidos por el usuario (solo visibles)
         reportes_seguidos = SeguimientoReporte.objects.filter(
@@ -41,10 +49,6 @@ def user_stats_view(request):
             reporte__visible=True
         ).count()
 
-        # Contar votos RECIBIDOS en los reportes del usuario
-        votos_recibidos = VotoReporte.objects.filter(
-            reporte__usuario=usuario, reporte__visible=True).count()
-
         # Contar votos REALIZADOS/DADOS por el usuario
         votos_realizados = VotoReporte.objects.filter(usuario=usuario).count()
 
@@ -63,6 +67,7 @@ def user_stats_view(request):
         )
 
 
+@use_replica
 @api_view(['GET'])
 def public_user_stats_view(request, user_id):
     """
@@ -99,9 +104,13 @@ def public_user_stats_view(request, user_id):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Contar reportes creados por el usuario (solo visibles)
-        reportes_creados = ReportModel.objects.filter(
-            usuario=usuario, visible=True).count()
+        # Reportes creados y votos RECIBIDOS (contadores de sus reportes visibles)
+        reportes = ReportModel.objects.filter(usuario=usuario, visible=True).aggregate(
+            creados=Count('id'),
+            votos=Coalesce(Sum('total_votos'), 0)
+        )
+        reportes_creados = reportes['creados']
+        votos_recibidos = reportes['votos']
 
         # Contar reportes seguidos por el usuario (solo visibles)
         reportes_seguidos = SeguimientoReporte.objects.filter(
@@ -109,10 +118,6 @@ def public_user_stats_view(request, user_id):
             reporte__visible=True
         ).count()
 
-        # Contar votos RECIBIDOS en los reportes del usuario
-        votos_recibidos = VotoReporte.objects.filter(
-            reporte__usuario=usuario, reporte__visible=True).count()
-
         # Contar votos REALIZADOS/DADOS por el usuario
         votos_realizados = VotoReporte.objects.filter(usuario=usuario).count()
 
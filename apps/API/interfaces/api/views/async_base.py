@@ -0,0 +1,50 @@
+"""
+Base de las vistas de lectura nativas async.
+
+DRF ejecuta cada APIView de forma síncrona, así que bajo ASGI (uvicorn) una
+consulta lenta del mapa o de un listado ocupa un hilo durante toda la
+espera. Las vistas que heredan de AsyncAPIView son vistas async de Django:
+usan el ORM async (async for, acount, afirst...) y devuelven JsonResponse.
+
+La autenticación la resuelve TokenAuthenticationMiddleware (request.auth_user),
+igual que SesionTokenAuthentication en las vistas DRF.
+
+Bajo WSGI siguen funcionando (Django las ejecuta con async_to_sync), pero la
+ganancia de concurrencia solo aparece sirviendo config.asgi:application:
+
+    uvicorn config.asgi:application --workers 4
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.views import View
+
+
+def json_response(data, status: int = 200) -> JsonResponse:
+    """JsonResponse con la misma salida que el JSONRenderer de DRF (UTF-8 sin escapar)"""
+    return JsonResponse(
+        data,
+        status=status,
+        encoder=DjangoJSONEncoder,
+        safe=False,
+        json_dumps_params={'ensure_ascii': False}
+    )
+
+
+class AsyncAPIView(View):
+    """Vista async de solo lectura que requiere un token de sesión válido"""
+
+    http_method_names = ['get', 'head', 'options']
+
+    def dispatch(self, request, *args, **kwargs):
+        if getattr(request, 'auth_user', None) is None:
+            return self._no_autenticado()
+        return super().dispatch(request, *args, **kwargs)
+
+    async def _no_autenticado(self):
+        response = json_response({
+            'success': False,
+            'error': 'Token de autenticación inválido o expirado'
+        }, status=401)
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
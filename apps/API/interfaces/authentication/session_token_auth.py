@@ -1,6 +1,6 @@
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from domain.entities.sesion_token import SesionToken
+from interfaces.authentication.token_cache import token_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,25 +24,21 @@ class SesionTokenAuthentication(BaseAuthentication):
         
         token_value = auth_header[7:]  # Remover 'Bearer '
         
+        # Resolver el token (caché en memoria/compartida o base de datos)
         try:
-            # Buscar token en la base de datos usando tu modelo existente
-            sesion_token = SesionToken.objects.select_related('usua_id').get(
-                token_valor=token_value,
-                token_activo=True
-            )
-            
-            # Verificar si el token es válido
-            if sesion_token.is_valid():
-                return (sesion_token.usua_id, sesion_token)
-            else:
-                # Token expirado - eliminarlo
-                sesion_token.delete()
-                raise AuthenticationFailed('Token expirado')
-        
-        except SesionToken.DoesNotExist:
-            raise AuthenticationFailed('Token inválido')
-        except Exception as e:
+            sesion_token = token_cache.resolve(token_value)
+        except Exception:
             raise AuthenticationFailed('Error de autenticación')
+        
+        if sesion_token is None:
+            raise AuthenticationFailed('Token inválido')
+        
+        # Verificar si el token es válido
+        if sesion_token.is_valid():
+            return (sesion_token.usua_id, sesion_token)
+        
+        # Token expirado: se elimina en segundo plano (purge_expired_sessions)
+        raise AuthenticationFailed('Token expirado')
     
     def authenticate_header(self, request):
         return 'Bearer'
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""
+Caché de resolución de tokens de sesión.
+
+Evita consultar `sesion_token` (y el usuario/rol asociado) en cada request
+autenticado. Se compone de:
+
+- Un LRU en memoria del proceso con TTL acotado por `token_expira_en`.
+- Opcionalmente, un backend de caché compartido de Django (p. ej. Redis) para
+  que las invalidaciones se propaguen entre procesos/workers.
+
+Las entradas se invalidan mediante señales al guardar o eliminar un
+SesionToken (logout, refresh, desactivación) o un Usuario (cambio de
+contraseña, cambio de usua_estado, etc.).
+
+Configuración en settings.SESION_TOKEN_CACHE:
+    ENABLED       Activa la caché (por defecto True)
+    MAX_ENTRIES   Tamaño máximo del LRU local (por defecto 10000)
+    TTL           Vida máxima de una entrada en segundos (por defecto 300)
+    SHARED_ALIAS  Alias de settings.CACHES a usar como caché compartida (opcional)
+    LOCAL_TTL     Vida máxima en el LRU local (por defecto 5). Las señales solo
+                  limpian el LRU del proceso que atendió el logout o el cambio
+                  de contraseña; los demás workers siguen aceptando el token
+                  hasta LOCAL_TTL segundos
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'sesion_token:'
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 10000,
+    'TTL': 300,
+    'SHARED_ALIAS': None,
+    'LOCAL_TTL': 5,
+}
+
+
+class LRUCache:
+    """LRU thread-safe con expiración por entrada"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expira, value = item
+            if expira <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TokenCache:
+    """Resuelve tokens de sesión usando el LRU local y la caché compartida"""
+
+    def __init__(self):
+        self._local = None
+
+    @property
+    def config(self) -> dict:
+        return {**DEFAULT_CONFIG, **getattr(settings, 'SESION_TOKEN_CACHE', {})}
+
+    @property
+    def local(self) -> LRUCache:
+        if self._local is None:
+            self._local = LRUCache(self.config['MAX_ENTRIES'])
+        return self._local
+
+    @property
+    def shared(self):
+        alias = self.config['SHARED_ALIAS']
+        return caches[alias] if alias else None
+
+    def resolve(self, token_value: str) -> Optional[SesionToken]:
+        """
+        Obtiene el SesionToken activo (con usuario y rol cargados) para el valor dado.
+
+        Retorna None si el token no existe o está inactivo. Un token expirado se
+        retorna sin cachear para que el llamador decida cómo tratarlo.
+        """
+        config = self.config
+        if not config['ENABLED']:
+            return self._load(token_value)
+
+        key = CACHE_KEY_PREFIX + token_value
+
+        sesion_token = self.local.get(key)
+        if sesion_token is not None:
+            return copy.deepcopy(sesion_token)
+
+        shared = self.shared
+        if shared is not None:
+            sesion_token = shared.get(key)
+            if sesion_token is not None:
+                self.local.set(key, sesion_token, self._local_ttl(sesion_token))
+                return copy.deepcopy(sesion_token)
+
+        sesion_token = self._load(token_value)
+        if sesion_token is None or not sesion_token.is_valid():
+            return sesion_token
+
+        ttl = self._ttl(sesion_token)
+        if ttl > 0:
+            if shared is not None:
+                shared.set(key, sesion_token, ttl)
+            self.local.set(key, sesion_token, self._local_ttl(sesion_token))
+            sesion_token = copy.deepcopy(sesion_token)
+
+        return sesion_token
+
+    def invalidate(self, token_value: str) -> None:
+        """Elimina un token de la caché local y compartida"""
+        key = CACHE_KEY_PREFIX + token_value
+        self.local.delete(key)
+        shared = self.shared
+        if shared is not None:
+            shared.delete(key)
+
+    def invalidate_user(self, usuario_id: int) -> None:
+        """Elimina de la caché todos los tokens de un usuario"""
+        tokens = SesionToken.objects.filter(usua_id=usuario_id).values_list('token_valor', flat=True)
+        keys = [CACHE_KEY_PREFIX + token for token in tokens]
+        for key in keys:
+            self.local.delete(key)
+        shared = self.shared
+        if shared is not None and keys:
+            shared.delete_many(keys)
+
+    def clear(self) -> None:
+        """Vacía el LRU local (la caché compartida expira por TTL)"""
+        self._local = None
+
+    def _load(self, token_value: str) -> Optional[SesionToken]:
+        try:
+            return SesionToken.objects.select_related('usua_id', 'usua_id__rous_id').get(
+                token_valor=token_value,
+                token_activo=True
+            )
+        except SesionToken.DoesNotExist:
+            return None
+
+    def _ttl(self, sesion_token: SesionToken) -> float:
+        """TTL de la entrada: nunca más allá de la expiración del token"""
+        expira_en = sesion_token.token_expira_en
+        if timezone.is_naive(expira_en):
+            expira_en = timezone.make_aware(expira_en)
+        restante = (expira_en - timezone.now()).total_seconds()
+        return min(float(self.config['TTL']), restante)
+
+    def _local_ttl(self, sesion_token: SesionToken) -> float:
+        # Con o sin caché compartida: otro worker no ve la invalidación del LRU
+        ttl = min(self._ttl(sesion_token), float(self.config['LOCAL_TTL']))
+        return max(ttl, 0)
+
+
+# Instancia global de la caché
+token_cache = TokenCache()
+
+
+@receiver(post_save, sender=SesionToken, dispatch_uid='token_cache_sesion_token_saved')
+@receiver(post_delete, sender=SesionToken, dispatch_uid='token_cache_sesion_token_deleted')
+def _invalidate_sesion_token(sender, instance, **kwargs):
+    """Logout, refresh o desactivación de un token"""
+    token_cache.invalidate(instance.token_valor)
+
+
+@receiver(post_save, sender=Usuario, dispatch_uid='token_cache_usuario_saved')
+def _invalidate_usuario(sender, instance, created, **kwargs):
+    """Cambio de contraseña, de usua_estado u otros datos del usuario"""
+    if not created:
+        token_cache.invalidate_user(instance.pk)
+
+
+@receiver(setting_changed, dispatch_uid='token_cache_setting_changed')
+def _reset_on_setting_changed(setting, **kwargs):
+    if setting == 'SESION_TOKEN_CACHE':
+        token_cache.clear()
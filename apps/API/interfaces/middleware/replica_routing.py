@@ -0,0 +1,49 @@
+"""
+Middleware que habilita las réplicas de lectura por petición.
+
+Debe ir después de TokenAuthenticationMiddleware: la autenticación siempre se
+resuelve contra la primaria y el usuario (request.auth_user) decide si sigue
+fijado a ella por una escritura reciente. Ver infrastructure.database.replicas.
+"""
+
+from django.utils.deprecation import MiddlewareMixin
+
+from infrastructure.database import replicas
+import logging
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Las lecturas de vistas @use_replica en métodos seguros van a una réplica,
+    salvo que el usuario haya escrito hace poco. Si la petición escribe, el
+    usuario queda fijado a la primaria.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        usuario = getattr(request, 'auth_user', None)
+        replica_allowed = (
+            request.method in SAFE_METHODS
+            and self._usa_replica(view_func)
+            and not (usuario is not None and replicas.is_pinned(usuario.usua_id))
+        )
+        replicas.begin_request(replica_allowed)
+        return None
+
+    def process_response(self, request, response):
+        state = replicas.current_state()
+        usuario = getattr(request, 'auth_user', None)
+        if state is not None and state.wrote and usuario is not None:
+            replicas.pin_to_primary(usuario.usua_id)
+            logger.debug(f"Usuario {usuario.usua_id} fijado a la primaria tras escribir")
+        replicas.end_request()
+        return response
+
+    def _usa_replica(self, view_func) -> bool:
+        # Vistas función marcadas directamente; vistas clase por su atributo
+        if getattr(view_func, 'use_replica', False):
+            return True
+        return getattr(getattr(view_func, 'view_class', None), 'use_replica', False)
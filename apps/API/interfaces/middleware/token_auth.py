@@ -5,7 +5,7 @@ Verifica tokens en headers Authorization y agrega información del usuario a req
 
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
-from domain.entities.sesion_token import SesionToken
+from interfaces.authentication.token_cache import token_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,29 +48,23 @@ class TokenAuthenticationMiddleware(MiddlewareMixin):
         if auth_header.startswith('Bearer '):
             token_value = auth_header[7:]  # Remover 'Bearer '
             
-            try:
-                # Buscar token en la base de datos
-                sesion_token = SesionToken.objects.select_related('usua_id').get(
-                    token_valor=token_value,
-                    token_activo=True
-                )
-                
-                # Verificar si el token es válido
-                if sesion_token.is_valid():
-                    # Verificar si el usuario está habilitado (soft delete)
-                    if sesion_token.usua_id.usua_estado == 0:
-                        logger.debug(f"Usuario deshabilitado intentó autenticarse: {sesion_token.usua_id.usua_nickname}")
-                    else:
-                        request.auth_user = sesion_token.usua_id
-                        request.auth_token = sesion_token
-                        logger.debug(f"Usuario autenticado: {sesion_token.usua_id.usua_nickname}")
-                else:
-                    # Token expirado - eliminarlo
-                    sesion_token.delete()
-                    logger.debug(f"Token expirado eliminado: {token_value[:10]}...")
+            # Resolver el token (caché en memoria/compartida o base de datos)
+            sesion_token = token_cache.resolve(token_value)
             
-            except SesionToken.DoesNotExist:
+            if sesion_token is None:
                 logger.debug(f"Token no válido: {token_value[:10]}...")
+            # Verificar si el token es válido
+            elif sesion_token.is_valid():
+                # Verificar si el usuario está habilitado (soft delete)
+                if sesion_token.usua_id.usua_estado == 0:
+                    logger.debug(f"Usuario deshabilitado intentó autenticarse: {sesion_token.usua_id.usua_nickname}")
+                else:
+                    request.auth_user = sesion_token.usua_id
+                    request.auth_token = sesion_token
+                    logger.debug(f"Usuario autenticado: {sesion_token.usua_id.usua_nickname}")
+            else:
+                # Token expirado: se elimina en segundo plano (purge_expired_sessions)
+                logger.debug(f"Token expirado: {token_value[:10]}...")
         
         # Continuar con el request normalmente
         # DRF manejará la autenticación y permisos
@@ -0,0 +1,73 @@
+"""
+GET condicional (ETag / Last-Modified) para endpoints que los clientes
+móviles consultan repetidamente.
+
+Cada vista calcula primero una "versión" barata del recurso (un agregado o
+una consulta de solo columnas, sin serializar) y llama a `conditional_get`.
+Si el cliente envía If-None-Match / If-Modified-Since y la versión coincide,
+se responde 304 sin construir el cuerpo.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+# Las respuestas dependen del usuario autenticado: solo cachés privadas y
+# siempre revalidando con el servidor
+CACHE_CONTROL = {'private': True, 'no_cache': True}
+
+
+def build_etag(*partes: Any) -> str:
+    """ETag débil a partir de los valores que determinan el contenido"""
+    huella = hashlib.md5(repr(partes).encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'W/"{huella}"'
+
+
+def conditional_get(
+    request,
+    etag: str,
+    last_modified: Optional[datetime],
+    construir: Callable[[], Any]
+):
+    """
+    Retorna 304 si el cliente ya tiene esta versión; si no, la respuesta de
+    `construir()`. En ambos casos agrega ETag y Last-Modified (solo a 200/304).
+
+    `last_modified` solo debe indicarse si cubre todo lo que cubre el ETag: un
+    cliente que envía solo If-Modified-Since recibiría 304 con datos viejos
+    ante cambios que no mueven la fecha (contadores, bajas, campos diarios).
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    respuesta = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if respuesta is None:
+        respuesta = construir()
+    return _agregar_validadores(respuesta, etag, timestamp)
+
+
+async def aconditional_get(
+    request,
+    etag: str,
+    last_modified: Optional[datetime],
+    construir: Callable[[], Awaitable[Any]]
+):
+    """conditional_get para vistas async: `construir` es una corrutina"""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    respuesta = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if respuesta is None:
+        respuesta = await construir()
+    return _agregar_validadores(respuesta, etag, timestamp)
+
+
+def _agregar_validadores(respuesta, etag: str, timestamp: Optional[int]):
+    if respuesta.status_code in (200, 304):
+        respuesta['ETag'] = etag
+        if timestamp is not None:
+            respuesta['Last-Modified'] = http_date(timestamp)
+        patch_cache_control(respuesta, **CACHE_CONTROL)
+        patch_vary_headers(respuesta, ('Authorization',))
+    return respuesta
@@ -1,13 +1,13 @@
 from django.contrib import admin
-from notifications.models import Notification
+from notifications.models import Notification, NotificationJob
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ['id', 'titulo', 'usuario', 'tipo', 'leida', 'fecha_creacion']
-    list_filter = ['tipo', 'leida', 'fecha_creacion']
+    list_display = ['id', 'titulo', 'usuario', 'tipo', 'leida', 'push_estado', 'fecha_creacion']
+    list_filter = ['tipo', 'leida', 'push_estado', 'fecha_creacion']
     search_fields = ['titulo', 'mensaje', 'usuario__usua_nickname']
-    readonly_fields = ['fecha_creacion', 'fecha_lectura']
+    readonly_fields = ['fecha_creacion', 'fecha_lectura', 'push_estado', 'push_fecha']
     date_hierarchy = 'fecha_creacion'
     
     fieldsets = (
@@ -15,10 +15,20 @@ class NotificationAdmin(admin.ModelAdmin):
             'fields': ('usuario', 'titulo', 'mensaje', 'tipo')
         }),
         ('Estado', {
-            'fields': ('leida', 'fecha_creacion', 'fecha_lectura')
+            'fields': ('leida', 'fecha_creacion', 'fecha_lectura', 'push_estado', 'push_fecha')
         }),
         ('Relaciones', {
             'fields': ('denuncia',),
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(NotificationJob)
+class NotificationJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo', 'estado', 'procesados', 'total', 'creado_por', 'fecha_creacion', 'fecha_fin']
+    list_filter = ['tipo', 'estado']
+    readonly_fields = [
+        'tipo', 'payload', 'creado_por', 'total', 'procesados', 'ultimo_usuario_id',
+        'intentos', 'error', 'fecha_creacion', 'fecha_actualizacion', 'fecha_inicio', 'fecha_fin'
+    ]
@@ -0,0 +1,63 @@
+"""
+Worker de la cola de notificaciones masivas (NotificationJob).
+
+    python manage.py process_notification_jobs            # corre indefinidamente
+    python manage.py process_notification_jobs --once     # vacía la cola y termina
+
+Con PostgreSQL se pueden levantar varios workers en paralelo: cada trabajo se
+reclama con SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from notifications.services.fanout_service import fanout_service
+
+logger = logging.getLogger('notifications')
+
+
+class Command(BaseCommand):
+    help = 'Procesa los trabajos de envío masivo de notificaciones encolados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Procesa los trabajos pendientes y termina'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Segundos de espera cuando la cola está vacía (por defecto 2)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=None,
+            help='Notificaciones por bloque de bulk_create (por defecto NOTIFICATION_FANOUT_CHUNK_SIZE)'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size is not None and chunk_size <= 0:
+            raise CommandError('--chunk-size debe ser mayor que 0')
+
+        if options['once']:
+            procesados = fanout_service.run_pending(chunk_size=chunk_size)
+            self.stdout.write(self.style.SUCCESS(f'{procesados} trabajos procesados'))
+            return
+
+        self.stdout.write('Worker de notificaciones iniciado')
+        try:
+            while True:
+                close_old_connections()
+                job = fanout_service.claim_next_job()
+                if job is None:
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                job = fanout_service.process_job(job, chunk_size)
+                self.stdout.write(
+                    f'Job #{job.id} {job.estado}: {job.procesados}/{job.total} notificaciones'
+                )
+        except KeyboardInterrupt:
+            self.stdout.write('Worker de notificaciones detenido')
@@ -0,0 +1,71 @@
+"""
+Worker de entrega de notificaciones push.
+
+    python manage.py send_push_notifications            # corre indefinidamente
+    python manage.py send_push_notifications --once     # envía lo pendiente y termina
+
+Con PostgreSQL se pueden levantar varios workers en paralelo: cada bloque de
+notificaciones se reclama con SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from notifications.services.push_service import push_service
+
+logger = logging.getLogger('notifications')
+
+
+class Command(BaseCommand):
+    help = 'Envía las notificaciones pendientes a los dispositivos registrados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Envía las notificaciones pendientes y termina'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Segundos de espera cuando no hay notificaciones pendientes (por defecto 2)'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Notificaciones reclamadas por ciclo (por defecto 500)'
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        if limit is not None and limit <= 0:
+            raise CommandError('--limit debe ser mayor que 0')
+
+        if options['once']:
+            total = {}
+            while True:
+                stats = push_service.run_pending(limit)
+                for clave, valor in stats.items():
+                    total[clave] = total.get(clave, 0) + valor
+                if not stats['notificaciones']:
+                    break
+            self.stdout.write(self._format(total))
+            return
+
+        self.stdout.write('Worker de push iniciado')
+        try:
+            while True:
+                close_old_connections()
+                stats = push_service.run_pending(limit)
+                if not stats['notificaciones']:
+                    time.sleep(options['poll_interval'])
+                    continue
+                self.stdout.write(self._format(stats))
+        except KeyboardInterrupt:
+            self.stdout.write('Worker de push detenido')
+
+    def _format(self, stats):
+        return (
+            f"{stats['enviadas']} enviadas, {stats['sin_destino']} sin dispositivos, "
+            f"{stats['fallidas']} fallidas, {stats['tokens_desactivados']} tokens desactivados"
+        )
@@ -0,0 +1,41 @@
+# Generated manually for the notification fan-out job queue
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0002_alter_usuario_usua_id'),
+        ('notifications', '0003_pushtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('broadcast', 'Envío a todos los usuarios'), ('comentario', 'Nuevo comentario en reporte')], max_length=20, verbose_name='Tipo')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('completado', 'Completado'), ('fallido', 'Fallido')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('payload', models.JSONField(default=dict, verbose_name='Datos del envío')),
+                ('total', models.IntegerField(default=0, verbose_name='Destinatarios')),
+                ('procesados', models.IntegerField(default=0, verbose_name='Notificaciones creadas')),
+                ('ultimo_usuario_id', models.IntegerField(blank=True, help_text='Cursor para retomar el envío desde el último bloque confirmado', null=True, verbose_name='Último usuario procesado')),
+                ('intentos', models.IntegerField(default=0, verbose_name='Intentos')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Error')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de inicio')),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de término')),
+                ('creado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notification_jobs', to='entities.usuario', verbose_name='Creado por')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de notificaciones',
+                'verbose_name_plural': 'Trabajos de notificaciones',
+                'db_table': 'notificacion_jobs',
+                'ordering': ['fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'fecha_creacion'], name='notif_jobs_estado_fecha_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated manually for the push delivery worker
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notificationjob'),
+    ]
+
+    operations = [
+        # Las notificaciones existentes quedan como 'omitida' para que el worker
+        # no envíe push de notificaciones antiguas; las nuevas nacen 'pendiente'.
+        migrations.AddField(
+            model_name='notification',
+            name='push_estado',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('enviando', 'Enviando'), ('enviada', 'Enviada'), ('sin_destino', 'Sin dispositivos'), ('fallida', 'Fallida'), ('omitida', 'Omitida')], default='omitida', max_length=12, verbose_name='Estado push'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='push_estado',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('enviando', 'Enviando'), ('enviada', 'Enviada'), ('sin_destino', 'Sin dispositivos'), ('fallida', 'Fallida'), ('omitida', 'Omitida')], default='pendiente', max_length=12, verbose_name='Estado push'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='push_fecha',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Último cambio de estado push'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('push_estado__in', ['pendiente', 'enviando'])), fields=['id'], name='notif_push_pendiente_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated manually for the per-user notification counters
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0002_alter_usuario_usua_id'),
+        ('notifications', '0005_notification_push_estado'),
+    ]
+
+    operations = [
+        # Sin backfill: el contador de cada usuario se calcula la primera vez
+        # que se consulta (NotificationCounter.obtener)
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('usuario', models.OneToOneField(db_column='usuario_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='contador_notificaciones', serialize=False, to='entities.usuario', verbose_name='Usuario')),
+                ('total', models.IntegerField(default=0, verbose_name='Total')),
+                ('no_leidas', models.IntegerField(default=0, verbose_name='No leídas')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+            ],
+            options={
+                'verbose_name': 'Contador de notificaciones',
+                'verbose_name_plural': 'Contadores de notificaciones',
+                'db_table': 'notificacion_contadores',
+            },
+        ),
+    ]
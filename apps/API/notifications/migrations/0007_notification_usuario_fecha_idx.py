@@ -0,0 +1,17 @@
+# Generated manually for keyset pagination of the notification list
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_notificationcounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['usuario', '-fecha_creacion', '-id'], name='notif_usuario_fecha_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from notifications.models.notification import Notification
 from notifications.models.push_token import PushToken
+from notifications.models.notification_job import NotificationJob
+from notifications.models.notification_counter import NotificationCounter
 
-__all__ = ['Notification', 'PushToken']
+__all__ = ['Notification', 'PushToken', 'NotificationJob', 'NotificationCounter']
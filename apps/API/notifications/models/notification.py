@@ -11,6 +11,22 @@ class Notification(models.Model):
         ('warning', 'Advertencia'),
         ('error', 'Error'),
     ]
+
+    # Estado de la entrega push (worker send_push_notifications)
+    PUSH_PENDIENTE = 'pendiente'
+    PUSH_ENVIANDO = 'enviando'
+    PUSH_ENVIADA = 'enviada'
+    PUSH_SIN_DESTINO = 'sin_destino'
+    PUSH_FALLIDA = 'fallida'
+    PUSH_OMITIDA = 'omitida'
+    PUSH_ESTADO_CHOICES = [
+        (PUSH_PENDIENTE, 'Pendiente'),
+        (PUSH_ENVIANDO, 'Enviando'),
+        (PUSH_ENVIADA, 'Enviada'),
+        (PUSH_SIN_DESTINO, 'Sin dispositivos'),
+        (PUSH_FALLIDA, 'Fallida'),
+        (PUSH_OMITIDA, 'Omitida'),
+    ]
     
     usuario = models.ForeignKey(
         Usuario,
@@ -47,6 +63,13 @@ class Notification(models.Model):
     )
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')
     fecha_lectura = models.DateTimeField(null=True, blank=True, verbose_name='Fecha de lectura')
+    push_estado = models.CharField(
+        max_length=12,
+        choices=PUSH_ESTADO_CHOICES,
+        default=PUSH_PENDIENTE,
+        verbose_name='Estado push'
+    )
+    push_fecha = models.DateTimeField(null=True, blank=True, verbose_name='Último cambio de estado push')
     
     class Meta:
         db_table = 'notificaciones'
@@ -56,15 +79,34 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['usuario', 'leida']),
             models.Index(fields=['-fecha_creacion']),
+            # Paginación por (fecha_creacion, id) del listado de cada usuario
+            models.Index(fields=['usuario', '-fecha_creacion', '-id'], name='notif_usuario_fecha_idx'),
+            # Solo las notificaciones que el worker de push aún debe revisar
+            models.Index(
+                fields=['id'],
+                name='notif_push_pendiente_idx',
+                condition=models.Q(push_estado__in=['pendiente', 'enviando'])
+            ),
         ]
     
     def __str__(self):
         return f"{self.titulo} - {self.usuario.usua_nickname}"
     
     def marcar_como_leida(self):
-        """Marca la notificación como leída"""
+        """Marca la notificación como leída y descuenta el contador de no leídas"""
         if not self.leida:
+            from django.db import transaction
             from django.utils import timezone
+            from notifications.models.notification_counter import NotificationCounter
+
+            fecha_lectura = timezone.now()
+            with transaction.atomic():
+                # El filtro leida=False evita descontar dos veces si se marca en paralelo
+                marcadas = Notification.objects.filter(pk=self.pk, leida=False).update(
+                    leida=True,
+                    fecha_lectura=fecha_lectura
+                )
+                if marcadas:
+                    NotificationCounter.registrar(self.usuario_id, no_leidas=-1)
             self.leida = True
-            self.fecha_lectura = timezone.now()
-            self.save(update_fields=['leida', 'fecha_lectura'])
+            self.fecha_lectura = fecha_lectura
@@ -0,0 +1,120 @@
+from typing import Iterable
+
+from asgiref.sync import sync_to_async
+from django.db import models
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from domain.entities.usuario import Usuario
+from notifications.models.notification import Notification
+
+
+class NotificationCounter(models.Model):
+    """
+    Contadores de notificaciones por usuario (total y no leídas).
+
+    Evita contar la tabla de notificaciones en cada consulta de los clientes
+    móviles. Se actualiza con F() en la misma transacción que crea o marca las
+    notificaciones; si un usuario aún no tiene fila, se calcula una vez desde
+    la tabla de notificaciones al consultarla (ver obtener).
+    """
+
+    usuario = models.OneToOneField(
+        Usuario,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='contador_notificaciones',
+        verbose_name='Usuario',
+        db_column='usuario_id'
+    )
+    total = models.IntegerField(default=0, verbose_name='Total')
+    no_leidas = models.IntegerField(default=0, verbose_name='No leídas')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
+
+    class Meta:
+        db_table = 'notificacion_contadores'
+        verbose_name = 'Contador de notificaciones'
+        verbose_name_plural = 'Contadores de notificaciones'
+
+    def __str__(self):
+        return f"{self.usuario_id}: {self.no_leidas}/{self.total}"
+
+    @classmethod
+    def obtener(cls, usuario_id: int) -> 'NotificationCounter':
+        """Retorna el contador del usuario, calculándolo si aún no existe"""
+        contador = cls.objects.filter(usuario_id=usuario_id).first()
+        if contador is None:
+            contador, _ = cls.objects.get_or_create(
+                usuario_id=usuario_id,
+                defaults=cls._contar(usuario_id)
+            )
+        return contador
+
+    @classmethod
+    async def aobtener(cls, usuario_id: int) -> 'NotificationCounter':
+        """obtener() con el ORM async; el cálculo inicial (una vez por usuario) va por sync_to_async"""
+        contador = await cls.objects.filter(usuario_id=usuario_id).afirst()
+        if contador is None:
+            contador = await sync_to_async(cls.obtener)(usuario_id)
+        return contador
+
+    @classmethod
+    def registrar(cls, usuario_id: int, total: int = 0, no_leidas: int = 0) -> None:
+        """
+        Aplica una variación a los contadores del usuario.
+        Debe llamarse dentro de la transacción que modificó las notificaciones.
+        """
+        if not total and not no_leidas:
+            return
+        actualizadas = cls.objects.filter(usuario_id=usuario_id).update(
+            total=F('total') + total,
+            no_leidas=F('no_leidas') + no_leidas
+        )
+        if actualizadas:
+            return
+
+        # Sin fila: el conteo ya incluye los cambios de esta transacción. Si otra
+        # transacción la creó primero, se aplica la variación sobre la suya.
+        _, creado = cls.objects.get_or_create(usuario_id=usuario_id, defaults=cls._contar(usuario_id))
+        if not creado:
+            cls.objects.filter(usuario_id=usuario_id).update(
+                total=F('total') + total,
+                no_leidas=F('no_leidas') + no_leidas
+            )
+
+    @classmethod
+    def registrar_nuevas(cls, usuario_ids: Iterable[int]) -> None:
+        """
+        Suma una notificación no leída a cada usuario (envíos masivos).
+        Los usuarios sin fila se calcularán al consultar su contador.
+        """
+        cls.objects.filter(usuario_id__in=list(usuario_ids)).update(
+            total=F('total') + 1,
+            no_leidas=F('no_leidas') + 1
+        )
+
+    @classmethod
+    def recalcular(cls, usuario_id: int) -> 'NotificationCounter':
+        """Recalcula el contador desde la tabla de notificaciones"""
+        contador, _ = cls.objects.update_or_create(
+            usuario_id=usuario_id,
+            defaults=cls._contar(usuario_id)
+        )
+        return contador
+
+    @staticmethod
+    def _contar(usuario_id: int) -> dict:
+        return Notification.objects.filter(usuario_id=usuario_id).aggregate(
+            total=Count('id'),
+            no_leidas=Count('id', filter=Q(leida=False))
+        )
+
+
+@receiver(post_delete, sender=Notification)
+def descontar_notificacion_eliminada(sender, instance, **kwargs):
+    """Mantiene los contadores al eliminar notificaciones (p. ej. desde el admin)"""
+    NotificationCounter.objects.filter(usuario_id=instance.usuario_id).update(
+        total=F('total') - 1,
+        no_leidas=F('no_leidas') - (0 if instance.leida else 1)
+    )
@@ -0,0 +1,97 @@
+from django.db import models
+from domain.entities.usuario import Usuario
+
+
+class NotificationJob(models.Model):
+    """
+    Trabajo de envío masivo de notificaciones (cola respaldada en la base de datos).
+
+    Lo crea la API y lo procesa un worker (comando process_notification_jobs)
+    en bloques con bulk_create, guardando el avance para poder consultarlo y
+    retomarlo si el worker se detiene.
+    """
+
+    TIPO_BROADCAST = 'broadcast'
+    TIPO_COMENTARIO = 'comentario'
+    TIPO_CHOICES = [
+        (TIPO_BROADCAST, 'Envío a todos los usuarios'),
+        (TIPO_COMENTARIO, 'Nuevo comentario en reporte'),
+    ]
+
+    ESTADO_PENDIENTE = 'pendiente'
+    ESTADO_PROCESANDO = 'procesando'
+    ESTADO_COMPLETADO = 'completado'
+    ESTADO_FALLIDO = 'fallido'
+    ESTADO_CHOICES = [
+        (ESTADO_PENDIENTE, 'Pendiente'),
+        (ESTADO_PROCESANDO, 'Procesando'),
+        (ESTADO_COMPLETADO, 'Completado'),
+        (ESTADO_FALLIDO, 'Fallido'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES, verbose_name='Tipo')
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADO_CHOICES,
+        default=ESTADO_PENDIENTE,
+        verbose_name='Estado'
+    )
+    payload = models.JSONField(default=dict, verbose_name='Datos del envío')
+    creado_por = models.ForeignKey(
+        Usuario,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='notification_jobs',
+        verbose_name='Creado por'
+    )
+    total = models.IntegerField(default=0, verbose_name='Destinatarios')
+    procesados = models.IntegerField(default=0, verbose_name='Notificaciones creadas')
+    ultimo_usuario_id = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Último usuario procesado',
+        help_text='Cursor para retomar el envío desde el último bloque confirmado'
+    )
+    intentos = models.IntegerField(default=0, verbose_name='Intentos')
+    error = models.TextField(blank=True, default='', verbose_name='Error')
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
+    fecha_inicio = models.DateTimeField(null=True, blank=True, verbose_name='Fecha de inicio')
+    fecha_fin = models.DateTimeField(null=True, blank=True, verbose_name='Fecha de término')
+
+    class Meta:
+        db_table = 'notificacion_jobs'
+        verbose_name = 'Trabajo de notificaciones'
+        verbose_name_plural = 'Trabajos de notificaciones'
+        ordering = ['fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'fecha_creacion'], name='notif_jobs_estado_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.pk} ({self.tipo}) - {self.estado}"
+
+    @property
+    def progreso(self) -> float:
+        """Porcentaje de avance del envío"""
+        if self.estado == self.ESTADO_COMPLETADO:
+            return 100.0
+        if not self.total:
+            return 0.0
+        return round(min(self.procesados / self.total, 1) * 100, 2)
+
+    def to_dict(self) -> dict:
+        """Representación para el endpoint de consulta de avance"""
+        return {
+            'id': self.pk,
+            'tipo': self.tipo,
+            'estado': self.estado,
+            'total': self.total,
+            'procesados': self.procesados,
+            'progreso': self.progreso,
+            'error': self.error or None,
+            'fecha_creacion': self.fecha_creacion.isoformat() if self.fecha_creacion else None,
+            'fecha_inicio': self.fecha_inicio.isoformat() if self.fecha_inicio else None,
+            'fecha_fin': self.fecha_fin.isoformat() if self.fecha_fin else None,
+        }
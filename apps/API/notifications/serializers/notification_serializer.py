@@ -1,5 +1,6 @@
+from django.db import transaction
 from rest_framework import serializers
-from notifications.models import Notification
+from notifications.models import Notification, NotificationCounter
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -166,12 +167,14 @@ class NotificationCreateSerializer(serializers.Serializer):
         if validated_data.get('denuncia_id'):
             denuncia = ReportModel.objects.get(id=validated_data['denuncia_id'])
         
-        notificacion = Notification.objects.create(
-            usuario=usuario,
-            titulo=validated_data['titulo'],
-            mensaje=validated_data['mensaje'],
-            tipo=validated_data['tipo'],
-            denuncia=denuncia
-        )
+        with transaction.atomic():
+            notificacion = Notification.objects.create(
+                usuario=usuario,
+                titulo=validated_data['titulo'],
+                mensaje=validated_data['mensaje'],
+                tipo=validated_data['tipo'],
+                denuncia=denuncia
+            )
+            NotificationCounter.registrar(usuario.usua_id, total=1, no_leidas=1)
         
         return notificacion
\ No newline at end of file
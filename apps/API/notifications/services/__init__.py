@@ -2,5 +2,14 @@ from notifications.services.notification_service import (
     NotificationService,
     notification_service
 )
+from notifications.services.fanout_service import (
+    FanoutService,
+    fanout_service
+)
+from notifications.services.push_service import (
+    PushService,
+    push_service
+)
 
-__all__ = ['NotificationService', 'notification_service']
+__all__ = ['NotificationService', 'notification_service', 'FanoutService', 'fanout_service',
+           'PushService', 'push_service']
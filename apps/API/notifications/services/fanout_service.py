@@ -0,0 +1,246 @@
+import logging
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from domain.entities.usuario import Usuario
+from notifications.models import Notification, NotificationCounter, NotificationJob
+
+logger = logging.getLogger('notifications')
+
+
+class FanoutService:
+    """
+    Envío masivo de notificaciones mediante una cola en la base de datos.
+
+    La API solo encola un NotificationJob; el worker (process_notification_jobs)
+    reclama los trabajos pendientes y crea las notificaciones en bloques con
+    bulk_create. Cada bloque se confirma junto con el avance del trabajo, por lo
+    que un worker interrumpido retoma desde el último bloque sin duplicar.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    # Un trabajo "procesando" sin avances por este tiempo se considera abandonado
+    STALE_AFTER = timedelta(minutes=10)
+
+    @property
+    def chunk_size(self) -> int:
+        return getattr(settings, 'NOTIFICATION_FANOUT_CHUNK_SIZE', self.DEFAULT_CHUNK_SIZE)
+
+    # ==================== ENCOLADO ====================
+
+    def enqueue_broadcast(
+        self,
+        titulo: str,
+        mensaje: str,
+        tipo: str = 'info',
+        denuncia=None,
+        creado_por: Optional[Usuario] = None
+    ) -> NotificationJob:
+        """Encola una notificación para todos los usuarios habilitados"""
+        job = NotificationJob.objects.create(
+            tipo=NotificationJob.TIPO_BROADCAST,
+            payload={
+                'titulo': titulo,
+                'mensaje': mensaje,
+                'tipo': tipo,
+                'denuncia_id': denuncia.id if denuncia else None,
+            },
+            creado_por=creado_por,
+            total=Usuario.objects.filter(usua_estado=1).count()
+        )
+        logger.info(f"Job de notificaciones #{job.id} encolado (broadcast, {job.total} destinatarios)")
+        return job
+
+    def enqueue_comment(self, reporte, comentario, autor_comentario: Usuario) -> NotificationJob:
+        """Encola las notificaciones a seguidores y autor por un nuevo comentario"""
+        job = NotificationJob.objects.create(
+            tipo=NotificationJob.TIPO_COMENTARIO,
+            payload={
+                'reporte_id': reporte.id,
+                'reporte_titulo': reporte.titulo,
+                'reporte_autor_id': reporte.usuario_id,
+                'comentario_id': comentario.id,
+                'autor_id': autor_comentario.usua_id,
+                'autor_nickname': autor_comentario.usua_nickname,
+            },
+            creado_por=autor_comentario
+        )
+        logger.info(f"Job de notificaciones #{job.id} encolado (comentario en reporte #{reporte.id})")
+        return job
+
+    # ==================== PROCESAMIENTO ====================
+
+    def claim_next_job(self) -> Optional[NotificationJob]:
+        """
+        Reclama el siguiente trabajo pendiente (o abandonado) de forma exclusiva.
+        Con PostgreSQL varios workers pueden correr en paralelo (SKIP LOCKED).
+        """
+        limite_abandono = timezone.now() - self.STALE_AFTER
+        with transaction.atomic():
+            job = NotificationJob.objects.select_for_update(skip_locked=True).filter(
+                Q(estado=NotificationJob.ESTADO_PENDIENTE) |
+                Q(estado=NotificationJob.ESTADO_PROCESANDO, fecha_actualizacion__lt=limite_abandono)
+            ).order_by('fecha_creacion').first()
+
+            if job is None:
+                return None
+
+            job.estado = NotificationJob.ESTADO_PROCESANDO
+            job.intentos += 1
+            if job.fecha_inicio is None:
+                job.fecha_inicio = timezone.now()
+            job.save(update_fields=['estado', 'intentos', 'fecha_inicio', 'fecha_actualizacion'])
+            return job
+
+    def process_job(self, job: NotificationJob, chunk_size: Optional[int] = None) -> NotificationJob:
+        """Crea las notificaciones del trabajo en bloques y registra el avance"""
+        chunk_size = chunk_size or self.chunk_size
+        try:
+            if job.tipo == NotificationJob.TIPO_BROADCAST:
+                self._process_broadcast(job, chunk_size)
+            elif job.tipo == NotificationJob.TIPO_COMENTARIO:
+                self._process_comment(job, chunk_size)
+            else:
+                raise ValueError(f"Tipo de job desconocido: {job.tipo}")
+
+            job.refresh_from_db()
+            job.estado = NotificationJob.ESTADO_COMPLETADO
+            job.fecha_fin = timezone.now()
+            job.save(update_fields=['estado', 'fecha_fin', 'fecha_actualizacion'])
+            logger.info(f"Job de notificaciones #{job.id} completado: {job.procesados} notificaciones")
+
+        except Exception as e:
+            logger.error(f"Error al procesar job de notificaciones #{job.id}: {str(e)}")
+            job.refresh_from_db()
+            job.estado = NotificationJob.ESTADO_FALLIDO
+            job.error = str(e)
+            job.fecha_fin = timezone.now()
+            job.save(update_fields=['estado', 'error', 'fecha_fin', 'fecha_actualizacion'])
+
+        return job
+
+    def run_pending(self, max_jobs: Optional[int] = None, chunk_size: Optional[int] = None) -> int:
+        """Procesa trabajos hasta vaciar la cola (o hasta max_jobs). Retorna cuántos procesó"""
+        procesados = 0
+        while max_jobs is None or procesados < max_jobs:
+            job = self.claim_next_job()
+            if job is None:
+                break
+            self.process_job(job, chunk_size)
+            procesados += 1
+        return procesados
+
+    def _process_broadcast(self, job: NotificationJob, chunk_size: int) -> None:
+        payload = job.payload
+        denuncia_id = self._existing_report_id(payload.get('denuncia_id'))
+        cursor = job.ultimo_usuario_id
+
+        while True:
+            usuarios = Usuario.objects.filter(usua_estado=1)
+            if cursor is not None:
+                usuarios = usuarios.filter(usua_id__gt=cursor)
+            ids = list(usuarios.order_by('usua_id').values_list('usua_id', flat=True)[:chunk_size])
+            if not ids:
+                break
+
+            self._save_chunk(job, [
+                Notification(
+                    usuario_id=usuario_id,
+                    titulo=payload['titulo'],
+                    mensaje=payload['mensaje'],
+                    tipo=payload.get('tipo', 'info'),
+                    denuncia_id=denuncia_id
+                )
+                for usuario_id in ids
+            ], ids[-1])
+            cursor = ids[-1]
+
+    def _process_comment(self, job: NotificationJob, chunk_size: int) -> None:
+        destinatarios = self._comment_recipients(job.payload)
+        if job.total != len(destinatarios):
+            NotificationJob.objects.filter(pk=job.pk).update(total=len(destinatarios))
+
+        if job.ultimo_usuario_id is not None:
+            destinatarios = [d for d in destinatarios if d[0] > job.ultimo_usuario_id]
+
+        reporte_id = self._existing_report_id(job.payload['reporte_id'])
+        comentario_id = self._existing_comment_id(job.payload['comentario_id'])
+
+        for inicio in range(0, len(destinatarios), chunk_size):
+            bloque = destinatarios[inicio:inicio + chunk_size]
+            self._save_chunk(job, [
+                Notification(
+                    usuario_id=usuario_id,
+                    titulo=titulo,
+                    mensaje=mensaje,
+                    tipo='info',
+                    denuncia_id=reporte_id,
+                    comentario_id=comentario_id
+                )
+                for usuario_id, titulo, mensaje in bloque
+            ], bloque[-1][0])
+
+    def _comment_recipients(self, payload: dict) -> List[Tuple[int, str, str]]:
+        """
+        Seguidores del reporte (excepto el autor del comentario) y el autor del
+        reporte si no comentó él mismo ni lo sigue. Ordenados por usuario_id.
+        """
+        from reports.models.seguimiento_reporte import SeguimientoReporte
+
+        autor_id = payload['autor_id']
+        nickname = payload['autor_nickname']
+        titulo_reporte = payload['reporte_titulo']
+
+        seguidores = set(
+            SeguimientoReporte.objects.filter(
+                reporte_id=payload['reporte_id']
+            ).exclude(usuario_id=autor_id).values_list('usuario_id', flat=True)
+        )
+        destinatarios = [
+            (usuario_id, "Nuevo comentario en reporte que sigues",
+             f"{nickname} comentó en '{titulo_reporte}'")
+            for usuario_id in seguidores
+        ]
+
+        reporte_autor_id = payload['reporte_autor_id']
+        if reporte_autor_id != autor_id and reporte_autor_id not in seguidores:
+            destinatarios.append(
+                (reporte_autor_id, "Nuevo comentario en tu reporte",
+                 f"{nickname} comentó en tu reporte '{titulo_reporte}'")
+            )
+
+        return sorted(destinatarios)
+
+    def _save_chunk(self, job: NotificationJob, notificaciones: List[Notification], ultimo_usuario_id: int) -> None:
+        """Inserta un bloque, los contadores de sus destinatarios y su avance en la misma transacción"""
+        with transaction.atomic():
+            Notification.objects.bulk_create(notificaciones)
+            NotificationCounter.registrar_nuevas(n.usuario_id for n in notificaciones)
+            NotificationJob.objects.filter(pk=job.pk).update(
+                procesados=F('procesados') + len(notificaciones),
+                ultimo_usuario_id=ultimo_usuario_id,
+                fecha_actualizacion=timezone.now()
+            )
+
+    def _existing_report_id(self, reporte_id: Optional[int]) -> Optional[int]:
+        """El reporte pudo eliminarse entre el encolado y el procesamiento"""
+        if reporte_id is None:
+            return None
+        from reports.models import ReportModel
+        return reporte_id if ReportModel.objects.filter(pk=reporte_id).exists() else None
+
+    def _existing_comment_id(self, comentario_id: Optional[int]) -> Optional[int]:
+        if comentario_id is None:
+            return None
+        from reports.models.comentario_reporte import ComentarioReporte
+        return comentario_id if ComentarioReporte.objects.filter(pk=comentario_id).exists() else None
+
+
+# Instancia del servicio
+fanout_service = FanoutService()
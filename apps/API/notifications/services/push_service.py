@@ -0,0 +1,341 @@
+import http.client
+import json
+import logging
+import queue
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications.models import Notification, PushToken
+
+logger = logging.getLogger('notifications')
+
+
+DEFAULT_PUSH_SETTINGS = {
+    'ENABLED': True,
+    'URL': 'https://exp.host/--/api/v2/push/send',
+    'ACCESS_TOKEN': None,
+    'MAX_WORKERS': 4,
+    # Expo acepta como máximo 100 mensajes por solicitud
+    'BATCH_SIZE': 100,
+    'MAX_RETRIES': 3,
+    'BACKOFF': 0.5,
+    'TIMEOUT': 10,
+}
+
+# Errores del proveedor que indican que el token ya no es válido
+INVALID_TOKEN_ERRORS = {'DeviceNotRegistered'}
+
+# Respuestas HTTP que vale la pena reintentar
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class PushDeliveryError(Exception):
+    """El proveedor rechazó el lote completo o se agotaron los reintentos"""
+
+
+class PushClient:
+    """
+    Cliente HTTP para la API de push de Expo.
+
+    Mantiene un pool de conexiones keep-alive (una por hilo concurrente como
+    máximo) y reintenta con backoff exponencial los errores de red, 429 y 5xx.
+    No toca la base de datos, por lo que puede usarse desde varios hilos.
+    """
+
+    def __init__(self, url: str, max_connections: int, timeout: float = 10,
+                 max_retries: int = 3, backoff: float = 0.5, access_token: Optional[str] = None):
+        partes = urlsplit(url)
+        self.scheme = partes.scheme
+        self.host = partes.hostname
+        self.port = partes.port
+        self.path = partes.path or '/'
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.access_token = access_token
+        self._pool = queue.LifoQueue(maxsize=max_connections)
+
+    def send(self, mensajes: List[dict]) -> List[dict]:
+        """Envía un lote y retorna un ticket por mensaje (en el mismo orden)"""
+        cuerpo = json.dumps(mensajes).encode('utf-8')
+        intento = 0
+        while True:
+            try:
+                status, headers, datos = self._post(cuerpo)
+            except (OSError, http.client.HTTPException) as e:
+                if intento >= self.max_retries:
+                    raise PushDeliveryError(f"Error de conexión con el servicio push: {e}")
+                self._sleep(intento)
+                intento += 1
+                continue
+
+            if status in RETRYABLE_STATUS and intento < self.max_retries:
+                self._sleep(intento, headers.get('Retry-After'))
+                intento += 1
+                continue
+
+            if status != 200:
+                raise PushDeliveryError(f"El servicio push respondió {status}: {datos[:200]!r}")
+
+            tickets = json.loads(datos or b'{}').get('data')
+            if not isinstance(tickets, list) or len(tickets) != len(mensajes):
+                raise PushDeliveryError('Respuesta del servicio push con formato inesperado')
+            return tickets
+
+    def close(self) -> None:
+        """Cierra las conexiones del pool"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _post(self, cuerpo: bytes):
+        conexion = self._acquire()
+        try:
+            headers = {
+                'Content-Type': 'application/json',
+                'Accept': 'application/json',
+            }
+            if self.access_token:
+                headers['Authorization'] = f'Bearer {self.access_token}'
+            conexion.request('POST', self.path, body=cuerpo, headers=headers)
+            respuesta = conexion.getresponse()
+            datos = respuesta.read()
+        except Exception:
+            # La conexión quedó en un estado desconocido: no se devuelve al pool
+            conexion.close()
+            raise
+        self._release(conexion)
+        return respuesta.status, respuesta.headers, datos
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            clase = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            return clase(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conexion: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conexion)
+        except queue.Full:
+            conexion.close()
+
+    def _sleep(self, intento: int, retry_after: Optional[str] = None) -> None:
+        espera = self.backoff * (2 ** intento) + random.uniform(0, self.backoff)
+        if retry_after:
+            try:
+                espera = max(espera, float(retry_after))
+            except ValueError:
+                pass
+        time.sleep(min(espera, 30))
+
+
+class PushService:
+    """
+    Entrega de notificaciones push a los dispositivos registrados (PushToken).
+
+    Las notificaciones se crean con push_estado='pendiente' y las entrega el
+    worker send_push_notifications, por lo que la solicitud que las crea no
+    espera al proveedor. Cada ciclo reclama un bloque de notificaciones, arma un
+    mensaje por dispositivo activo, los agrupa por plataforma en lotes y los
+    envía en paralelo con un número acotado de conexiones. Los tokens que el
+    proveedor rechaza (DeviceNotRegistered) se desactivan.
+    """
+
+    DEFAULT_LIMIT = 500
+
+    # Un bloque "enviando" sin cambios por este tiempo se considera abandonado
+    STALE_AFTER = timedelta(minutes=5)
+
+    # Notificaciones más antiguas ya no se envían como push
+    MAX_AGE = timedelta(hours=24)
+
+    @property
+    def config(self) -> dict:
+        return {**DEFAULT_PUSH_SETTINGS, **getattr(settings, 'PUSH_NOTIFICATIONS', {})}
+
+    def build_client(self) -> PushClient:
+        config = self.config
+        return PushClient(
+            url=config['URL'],
+            max_connections=config['MAX_WORKERS'],
+            timeout=config['TIMEOUT'],
+            max_retries=config['MAX_RETRIES'],
+            backoff=config['BACKOFF'],
+            access_token=config['ACCESS_TOKEN']
+        )
+
+    # ==================== RECLAMO ====================
+
+    def claim_pending(self, limit: Optional[int] = None) -> List[Notification]:
+        """
+        Reclama de forma exclusiva un bloque de notificaciones por enviar.
+        Con PostgreSQL varios workers pueden correr en paralelo (SKIP LOCKED).
+        """
+        ahora = timezone.now()
+        limit = limit or self.DEFAULT_LIMIT
+
+        Notification.objects.filter(
+            push_estado=Notification.PUSH_PENDIENTE,
+            fecha_creacion__lt=ahora - self.MAX_AGE
+        ).update(push_estado=Notification.PUSH_OMITIDA, push_fecha=ahora)
+
+        with transaction.atomic():
+            ids = list(
+                Notification.objects.select_for_update(skip_locked=True).filter(
+                    Q(push_estado=Notification.PUSH_PENDIENTE) |
+                    Q(push_estado=Notification.PUSH_ENVIANDO, push_fecha__lt=ahora - self.STALE_AFTER)
+                ).order_by('id').values_list('id', flat=True)[:limit]
+            )
+            if not ids:
+                return []
+            Notification.objects.filter(id__in=ids).update(
+                push_estado=Notification.PUSH_ENVIANDO, push_fecha=ahora
+            )
+
+        return list(Notification.objects.filter(id__in=ids).order_by('id'))
+
+    # ==================== ENVÍO ====================
+
+    def deliver(self, notificaciones: List[Notification], client: Optional[PushClient] = None) -> Dict[str, int]:
+        """Envía las notificaciones ya reclamadas y registra el resultado"""
+        stats = {'notificaciones': len(notificaciones), 'mensajes': 0, 'lotes': 0,
+                 'enviadas': 0, 'sin_destino': 0, 'fallidas': 0, 'tokens_desactivados': 0}
+        if not notificaciones:
+            return stats
+
+        config = self.config
+        lotes = self._build_batches(notificaciones, config['BATCH_SIZE'])
+        stats['lotes'] = len(lotes)
+        stats['mensajes'] = sum(len(lote) for lote in lotes)
+
+        con_destino = {notif_id for lote in lotes for notif_id, _, _ in lote}
+        entregadas = set()
+        tokens_invalidos = set()
+
+        if lotes:
+            propio = client is None
+            client = client or self.build_client()
+            try:
+                with ThreadPoolExecutor(max_workers=config['MAX_WORKERS']) as executor:
+                    resultados = executor.map(lambda lote: self._send_batch(client, lote), lotes)
+                    for ok, invalidos in resultados:
+                        entregadas.update(ok)
+                        tokens_invalidos.update(invalidos)
+            finally:
+                if propio:
+                    client.close()
+
+        if tokens_invalidos:
+            stats['tokens_desactivados'] = PushToken.objects.filter(
+                push_token__in=tokens_invalidos, is_active=True
+            ).update(is_active=False)
+            logger.info(f"{stats['tokens_desactivados']} tokens push desactivados por el proveedor")
+
+        ids = {n.id for n in notificaciones}
+        ahora = timezone.now()
+        sin_destino = ids - con_destino
+        fallidas = con_destino - entregadas
+        for estado, grupo in (
+            (Notification.PUSH_ENVIADA, entregadas),
+            (Notification.PUSH_SIN_DESTINO, sin_destino),
+            (Notification.PUSH_FALLIDA, fallidas),
+        ):
+            if grupo:
+                Notification.objects.filter(id__in=grupo).update(push_estado=estado, push_fecha=ahora)
+
+        stats['enviadas'] = len(entregadas)
+        stats['sin_destino'] = len(sin_destino)
+        stats['fallidas'] = len(fallidas)
+        return stats
+
+    def run_pending(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """Reclama y envía un bloque de notificaciones pendientes"""
+        if not self.config['ENABLED']:
+            return self.deliver([])
+        notificaciones = self.claim_pending(limit)
+        stats = self.deliver(notificaciones)
+        if notificaciones:
+            logger.info(
+                f"Push: {stats['enviadas']} enviadas, {stats['sin_destino']} sin dispositivos, "
+                f"{stats['fallidas']} fallidas ({stats['mensajes']} mensajes en {stats['lotes']} lotes)"
+            )
+        return stats
+
+    def _build_batches(self, notificaciones: List[Notification], batch_size: int) -> List[list]:
+        """Un mensaje por dispositivo activo, agrupados por plataforma en lotes"""
+        tokens_por_usuario = defaultdict(list)
+        for token in PushToken.objects.filter(
+            usuario_id__in={n.usuario_id for n in notificaciones},
+            is_active=True
+        ).values('usuario_id', 'push_token', 'platform'):
+            tokens_por_usuario[token['usuario_id']].append(token)
+
+        por_plataforma = defaultdict(list)
+        for notificacion in notificaciones:
+            for token in tokens_por_usuario.get(notificacion.usuario_id, []):
+                por_plataforma[token['platform']].append((
+                    notificacion.id,
+                    token['push_token'],
+                    self._build_message(notificacion, token)
+                ))
+
+        return [
+            mensajes[inicio:inicio + batch_size]
+            for mensajes in por_plataforma.values()
+            for inicio in range(0, len(mensajes), batch_size)
+        ]
+
+    def _build_message(self, notificacion: Notification, token: dict) -> dict:
+        mensaje = {
+            'to': token['push_token'],
+            'title': notificacion.titulo,
+            'body': notificacion.mensaje,
+            'sound': 'default',
+            'data': {
+                'notificationId': notificacion.id,
+                'reportId': notificacion.denuncia_id,
+                'tipo': notificacion.tipo,
+            },
+        }
+        if token['platform'] == 'android':
+            mensaje['channelId'] = 'default'
+            mensaje['priority'] = 'high'
+        return mensaje
+
+    def _send_batch(self, client: PushClient, lote: list):
+        """Envía un lote (en un hilo del pool). Retorna (notificaciones ok, tokens inválidos)"""
+        try:
+            tickets = client.send([mensaje for _, _, mensaje in lote])
+        except PushDeliveryError as e:
+            logger.error(f"Error al enviar lote push de {len(lote)} mensajes: {str(e)}")
+            return set(), set()
+
+        ok = set()
+        invalidos = set()
+        for (notif_id, push_token, _), ticket in zip(lote, tickets):
+            if ticket.get('status') == 'ok':
+                ok.add(notif_id)
+                continue
+            error = (ticket.get('details') or {}).get('error')
+            if error in INVALID_TOKEN_ERRORS:
+                invalidos.add(push_token)
+            else:
+                logger.warning(f"Push rechazado para notificación #{notif_id}: {ticket.get('message')}")
+        return ok, invalidos
+
+
+# Instancia del servicio
+push_service = PushService()
@@ -4,7 +4,8 @@ from notifications.views import (
     MarkNotificationReadView,
     MarkAllNotificationsReadView,
     NotificationAdminListView,
-    NotificationCreateAdminView
+    NotificationCreateAdminView,
+    NotificationJobDetailView
 )
 from notifications.views.push_token_views import register_push_token
 
@@ -23,4 +24,7 @@ urlpatterns = [
     # Endpoints administrativos
     path('admin/', NotificationAdminListView.as_view(), name='notifications-admin-list'),
     path('admin/create/', NotificationCreateAdminView.as_view(), name='notifications-admin-create'),
+    
+    # Avance de envíos masivos encolados
+    path('jobs/<int:job_id>/', NotificationJobDetailView.as_view(), name='notifications-job-detail'),
 ]
@@ -3,7 +3,8 @@ from notifications.views.notification_views import (
     MarkNotificationReadView,
     MarkAllNotificationsReadView,
     NotificationAdminListView,
-    NotificationCreateAdminView
+    NotificationCreateAdminView,
+    NotificationJobDetailView
 )
 
 __all__ = [
@@ -11,5 +12,6 @@ __all__ = [
     'MarkNotificationReadView',
     'MarkAllNotificationsReadView',
     'NotificationAdminListView',
-    'NotificationCreateAdminView'
+    'NotificationCreateAdminView',
+    'NotificationJobDetailView'
 ]
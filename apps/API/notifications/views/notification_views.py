@@ -2,8 +2,11 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from notifications.models import Notification
+from django.utils.dateparse import parse_datetime
+from django.db import transaction
+from django.db.models import Count, Q
+from notifications.models import Notification, NotificationCounter, NotificationJob
+from notifications.services.fanout_service import fanout_service
 from notifications.serializers import (
     NotificationSerializer,
     NotificationReadSerializer,
@@ -12,56 +15,117 @@ from notifications.serializers import (
 )
 from reports.services.notification_service import notification_service
 from reports.models import ReportModel
+from infrastructure.database.pagination import akeyset_paginate, decode_cursor, encode_cursor
+from interfaces.api.views.async_base import AsyncAPIView, json_response
+import asyncio
 import logging
 
 logger = logging.getLogger('notifications')
 
 
-class NotificationListView(APIView):
+class NotificationListView(AsyncAPIView):
     """
-    Vista para listar las notificaciones del usuario actual
-    GET /api/notifications/ - Lista todas las notificaciones del usuario
+    Vista para listar las notificaciones del usuario actual (async, ver AsyncAPIView)
+    GET /api/notifications/ - Lista paginada de notificaciones del usuario
+    
+    Parámetros query opcionales:
+    - unread: (true/false) Filtrar solo no leídas
+    - limit: Cantidad por página (por defecto 20, máximo 100)
+    - cursor: Cursor de la página siguiente (pagination.nextCursor), más antiguas
+    - since: Sincronización incremental; pagination.syncCursor de una respuesta
+      anterior o una fecha ISO 8601 (inclusiva). Retorna solo las notificaciones
+      más nuevas, de la más antigua a la más reciente.
     """
     
-    def get(self, request):
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+    
+    async def get(self, request):
         try:
-            # Verificar autenticación usando el middleware personalizado
-            if not hasattr(request, 'auth_user') or request.auth_user is None:
-                return Response({
-                    'success': False,
-                    'error': 'Autenticación requerida'
-                }, status=status.HTTP_401_UNAUTHORIZED)
-            
             usuario = request.auth_user
             
             # Obtener parámetros de query
-            solo_no_leidas = request.query_params.get('unread', 'false').lower() == 'true'
+            solo_no_leidas = request.GET.get('unread', 'false').lower() == 'true'
+            try:
+                limit = int(request.GET.get('limit', self.DEFAULT_LIMIT))
+            except ValueError:
+                limit = self.DEFAULT_LIMIT
+            limit = max(1, min(limit, self.MAX_LIMIT))
+            
+            cursor = request.GET.get('cursor')
+            since = request.GET.get('since')
+            
+            # Posición de inicio (exclusiva) según el modo
+            posicion = None
+            if since:
+                try:
+                    fecha = parse_datetime(since)
+                except ValueError:
+                    fecha = None
+                posicion = (fecha, 0) if fecha else decode_cursor(since)
+                if posicion is None:
+                    return json_response({
+                        'success': False,
+                        'error': 'Parámetro since inválido'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+            elif cursor:
+                posicion = decode_cursor(cursor)
+                if posicion is None:
+                    return json_response({
+                        'success': False,
+                        'error': 'Cursor inválido'
+                    }, status=status.HTTP_400_BAD_REQUEST)
             
             # Filtrar notificaciones del usuario
-            notificaciones = Notification.objects.filter(usuario=usuario)
+            notificaciones = Notification.objects.filter(usuario=usuario).select_related('denuncia', 'comentario')
             
             if solo_no_leidas:
                 notificaciones = notificaciones.filter(leida=False)
             
-            # Serializar
-            serializer = NotificationSerializer(notificaciones, many=True)
-            
-            # Contar no leídas
-            count_no_leidas = Notification.objects.filter(
-                usuario=usuario,
-                leida=False
-            ).count()
+            # La página, por (fecha_creacion, id), y los conteos del contador por
+            # usuario (sin COUNT sobre la tabla) son independientes: se piden a la vez.
+            # Con since se avanza hacia las más nuevas
+            (items, has_more), contador = await asyncio.gather(
+                akeyset_paginate(
+                    notificaciones,
+                    'fecha_creacion',
+                    limit,
+                    after=posicion,
+                    descending=not since
+                ),
+                NotificationCounter.aobtener(usuario.usua_id)
+            )
             
-            return Response({
+            # Serializar (denuncia y comentario ya vienen cargados)
+            serializer = NotificationSerializer(items, many=True)
+            
+            # syncCursor: posición de la notificación más reciente entregada, para el próximo since
+            next_cursor = None
+            sync_cursor = None
+            if since:
+                sync_cursor = encode_cursor(items[-1].fecha_creacion, items[-1].id) if items else since
+            else:
+                if has_more:
+                    next_cursor = encode_cursor(items[-1].fecha_creacion, items[-1].id)
+                if items and not cursor:
+                    sync_cursor = encode_cursor(items[0].fecha_creacion, items[0].id)
+            
+            return json_response({
                 'success': True,
                 'data': serializer.data,
-                'unread_count': count_no_leidas,
-                'total': notificaciones.count()
+                'unread_count': contador.no_leidas,
+                'total': contador.no_leidas if solo_no_leidas else contador.total,
+                'pagination': {
+                    'nextCursor': next_cursor,
+                    'syncCursor': sync_cursor,
+                    'hasMore': has_more,
+                    'count': len(items)
+                }
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
             logger.error(f"Error al listar notificaciones: {str(e)}")
-            return Response({
+            return json_response({
                 'success': False,
                 'error': 'Error al obtener notificaciones'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -135,13 +199,15 @@ class MarkAllNotificationsReadView(APIView):
             from django.utils import timezone
             
             # Actualizar todas las notificaciones no leídas del usuario
-            count = Notification.objects.filter(
-                usuario=usuario,
-                leida=False
-            ).update(
-                leida=True,
-                fecha_lectura=timezone.now()
-            )
+            with transaction.atomic():
+                count = Notification.objects.filter(
+                    usuario=usuario,
+                    leida=False
+                ).update(
+                    leida=True,
+                    fecha_lectura=timezone.now()
+                )
+                NotificationCounter.registrar(usuario.usua_id, no_leidas=-count)
             
             return Response({
                 'success': True,
@@ -218,15 +284,18 @@ class NotificationAdminListView(APIView):
             # Serializar con el serializer admin (incluye info de usuario)
             serializer = NotificationAdminSerializer(notificaciones, many=True)
             
-            # Estadísticas
-            total = notificaciones.count()
-            no_leidas = notificaciones.filter(leida=False).count()
-            por_tipo = {
-                'info': notificaciones.filter(tipo='info').count(),
-                'success': notificaciones.filter(tipo='success').count(),
-                'warning': notificaciones.filter(tipo='warning').count(),
-                'error': notificaciones.filter(tipo='error').count(),
-            }
+            # Estadísticas en una sola consulta con agregados condicionales
+            estadisticas = notificaciones.order_by().aggregate(
+                total=Count('id'),
+                no_leidas=Count('id', filter=Q(leida=False)),
+                info=Count('id', filter=Q(tipo='info')),
+                success=Count('id', filter=Q(tipo='success')),
+                warning=Count('id', filter=Q(tipo='warning')),
+                error=Count('id', filter=Q(tipo='error')),
+            )
+            total = estadisticas['total']
+            no_leidas = estadisticas['no_leidas']
+            por_tipo = {tipo: estadisticas[tipo] for tipo in ('info', 'success', 'warning', 'error')}
             
             return Response({
                 'success': True,
@@ -303,33 +372,28 @@ class NotificationCreateAdminView(APIView):
                 except ReportModel.DoesNotExist:
                     logger.warning(f"Reporte {reporte_id} no encontrado")
             
-            # Si send_to_all es True, crear notificaciones para todos los usuarios
+            # Si send_to_all es True, encolar el envío masivo y responder de inmediato
             if send_to_all:
-                from domain.entities.usuario import Usuario
-                usuarios = Usuario.objects.filter(usua_estado=1)
-                notificaciones_creadas = []
-                
-                for usuario in usuarios:
-                    notificacion = notification_service.create_notification(
-                        usuario=usuario,
-                        titulo=titulo,
-                        mensaje=mensaje,
-                        tipo=tipo,
-                        denuncia=reporte
-                    )
-                    if notificacion:
-                        notificaciones_creadas.append(notificacion)
+                job = fanout_service.enqueue_broadcast(
+                    titulo=titulo,
+                    mensaje=mensaje,
+                    tipo=tipo,
+                    denuncia=reporte,
+                    creado_por=usuario_admin
+                )
                 
                 logger.info(
-                    f"Notificaciones masivas creadas por admin {usuario_admin.usua_nickname}: "
-                    f"{len(notificaciones_creadas)} notificaciones enviadas"
+                    f"Notificaciones masivas encoladas por admin {usuario_admin.usua_nickname}: "
+                    f"job #{job.id} con {job.total} destinatarios"
                 )
                 
                 return Response({
                     'success': True,
-                    'message': f'{len(notificaciones_creadas)} notificaciones creadas exitosamente',
-                    'count': len(notificaciones_creadas)
-                }, status=status.HTTP_201_CREATED)
+                    'message': f'Envío de {job.total} notificaciones encolado',
+                    'count': job.total,
+                    'job_id': job.id,
+                    'job': job.to_dict()
+                }, status=status.HTTP_202_ACCEPTED)
             
             # Crear notificación individual usando el servicio con RUT/ID
             notificacion = notification_service.create_notification(
@@ -364,3 +428,41 @@ class NotificationCreateAdminView(APIView):
                 'error': 'Error al crear la notificación'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+class NotificationJobDetailView(APIView):
+    """
+    Vista para consultar el avance de un envío masivo de notificaciones
+    GET /api/notifications/jobs/<id>/ - Estado y progreso del job
+    """
+    
+    def get(self, request, job_id):
+        try:
+            # Verificar autenticación
+            if not hasattr(request, 'auth_user') or request.auth_user is None:
+                return Response({
+                    'success': False,
+                    'error': 'Autenticación requerida'
+                }, status=status.HTTP_401_UNAUTHORIZED)
+            
+            usuario = request.auth_user
+            
+            job = NotificationJob.objects.filter(id=job_id).first()
+            
+            # Solo el creador del job o un administrador pueden consultarlo
+            if job is None or (job.creado_por_id != usuario.usua_id and usuario.rous_id_id != 1):
+                return Response({
+                    'success': False,
+                    'error': 'Job no encontrado'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            return Response({
+                'success': True,
+                'job': job.to_dict()
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error al consultar job de notificaciones: {str(e)}")
+            return Response({
+                'success': False,
+                'error': 'Error al consultar el envío de notificaciones'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
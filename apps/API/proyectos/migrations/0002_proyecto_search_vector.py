@@ -0,0 +1,53 @@
+# Generated manually for full-text search on projects
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+VECTOR_PROYECTO = """
+    setweight(to_tsvector('es_unaccent', coalesce({p}proy_titulo, '')), 'A') ||
+    setweight(to_tsvector('es_unaccent', coalesce({p}proy_descripcion, '')), 'B') ||
+    setweight(to_tsvector('es_unaccent', coalesce({p}proy_lugar, '')), 'C')
+"""
+
+CREAR_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION proyecto_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {VECTOR_PROYECTO.format(p='NEW.')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER proyecto_search_vector_update
+    BEFORE INSERT OR UPDATE OF proy_titulo, proy_descripcion, proy_lugar ON "Proyecto"
+    FOR EACH ROW EXECUTE FUNCTION proyecto_search_vector_trigger();
+
+UPDATE "Proyecto" SET search_vector = {VECTOR_PROYECTO.format(p='')};
+"""
+
+ELIMINAR_TRIGGER = """
+DROP TRIGGER IF EXISTS proyecto_search_vector_update ON "Proyecto";
+DROP FUNCTION IF EXISTS proyecto_search_vector_trigger();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0001_initial'),
+        # Crea la extensión unaccent y la configuración es_unaccent
+        ('reports', '0006_report_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proyectomodel',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='proyectomodel',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='proyecto_search_gin'),
+        ),
+        migrations.RunSQL(CREAR_TRIGGER, ELIMINAR_TRIGGER),
+    ]
@@ -0,0 +1,27 @@
+# Generated manually for content-addressed deduplicated media storage
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0002_proyecto_search_vector'),
+        ('reports', '0010_media_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proyectoarchivosmodel',
+            name='blob',
+            field=models.ForeignKey(
+                blank=True,
+                db_column='blob_id',
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='archivos_proyecto',
+                to='reports.mediablob'
+            ),
+        ),
+    ]
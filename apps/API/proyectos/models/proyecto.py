@@ -1,5 +1,7 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from reports.models import ReportModel
 
 
@@ -53,11 +55,18 @@ class ProyectoModel(models.Model):
         null=True
     )
     
+    # Búsqueda de texto (título > descripción > lugar); lo mantiene un trigger
+    # de la base de datos (migración 0002), no se asigna desde Python
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         db_table = 'Proyecto'
         ordering = ['-proy_creado']
         verbose_name = 'Proyecto'
         verbose_name_plural = 'Proyectos'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='proyecto_search_gin'),
+        ]
     
     def __str__(self):
         return f"{self.proy_titulo}"
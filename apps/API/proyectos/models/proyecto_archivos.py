@@ -33,6 +33,15 @@ class ProyectoArchivosModel(models.Model):
         db_column='proar_nombre_archivo'
     )
     proar_ruta = models.CharField(max_length=500, db_column='proar_ruta')
+    # Blob deduplicado cuando proar_ruta apunta a un archivo del blob store
+    blob = models.ForeignKey(
+        'reports.MediaBlob',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        db_column='blob_id',
+        related_name='archivos_proyecto'
+    )
     proar_visible = models.IntegerField(default=1, db_column='proar_visible')
     proar_creado = models.DateTimeField(auto_now_add=True, db_column='proar_creado')
     proar_actualizado = models.DateTimeField(auto_now=True, db_column='proar_actualizado')
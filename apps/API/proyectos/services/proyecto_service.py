@@ -1,12 +1,17 @@
 from typing import List, Optional, Dict, Any
 from django.db import transaction
-from django.db.models import Count, Q, Avg, Sum
+from django.db.models import Count, Avg, Max, Sum
 from django.core.exceptions import ValidationError as DjangoValidationError
 from datetime import datetime, timedelta
 from collections import defaultdict
 
 from proyectos.models import ProyectoModel, ProyectoArchivosModel
 from reports.models import ReportModel
+from reports.services.blob_store import blob_store
+from infrastructure.database import search as full_text
+
+# Campos de texto de la búsqueda de proyectos (respaldo icontains fuera de PostgreSQL)
+PROYECTO_SEARCH_FIELDS = ('proy_titulo', 'proy_descripcion', 'proy_lugar')
 
 
 class ProyectoNotFoundException(Exception):
@@ -91,6 +96,8 @@ class ProyectoService:
                 proy_id=proyecto,
                 **archivo_data
             )
+            # Si la ruta es un archivo ya subido al blob store, lo referencia
+            archivo.blob = blob_store.por_ruta(archivo.proar_ruta)
             try:
                 archivo.full_clean()
                 archivo.save()
@@ -147,7 +154,42 @@ class ProyectoService:
         Returns:
             Lista de proyectos que coincidan con los filtros
         """
-        queryset = ProyectoModel.objects.select_related('denu_id').prefetch_related('archivos').filter(proy_visible=1)
+        queryset = ProyectoModel.objects.select_related('denu_id').prefetch_related('archivos')
+        return list(self._filtrar_proyectos(queryset, estado, prioridad, categoria, search))
+    
+    def get_proyectos_version(
+        self,
+        estado: Optional[int] = None,
+        prioridad: Optional[int] = None,
+        categoria: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Versión del listado de get_all_proyectos para el ETag: un
+        agregado sobre los mismos filtros, sin cargar ni serializar proyectos.
+        """
+        queryset = self._filtrar_proyectos(ProyectoModel.objects.all(), estado, prioridad, categoria, search)
+        return queryset.order_by().aggregate(
+            total=Count('proy_id'),
+            suma_ids=Sum('proy_id'),
+            ultimo=Max('proy_actualizado')
+        )
+    
+    def get_proyecto_version(self, proyecto_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Versión del detalle de un proyecto (proyecto, denuncia y archivos) para
+        el ETag, o None si no existe.
+        """
+        return ProyectoModel.objects.filter(proy_id=proyecto_id).annotate(
+            archivos_total=Count('archivos'),
+            archivos_actualizado=Max('archivos__proar_actualizado')
+        ).values(
+            'proy_actualizado', 'denu_id__fecha_actualizacion', 'archivos_total', 'archivos_actualizado'
+        ).first()
+    
+    def _filtrar_proyectos(self, queryset, estado, prioridad, categoria, search):
+        """Filtros y orden del listado de proyectos visibles"""
+        queryset = queryset.filter(proy_visible=1)
         
         # Aplicar filtros
         if estado is not None:
@@ -160,13 +202,12 @@ class ProyectoService:
             queryset = queryset.filter(proy_tipo_denuncia__icontains=categoria)
         
         if search:
-            queryset = queryset.filter(
-                Q(proy_titulo__icontains=search) |
-                Q(proy_descripcion__icontains=search) |
-                Q(proy_lugar__icontains=search)
-            )
+            # Texto completo con prefijos, ordenado por relevancia en PostgreSQL
+            queryset = full_text.search(queryset, search, PROYECTO_SEARCH_FIELDS)
+            if 'rank' in queryset.query.annotations:
+                queryset = queryset.order_by('-rank', '-proy_creado')
         
-        return list(queryset)
+        return queryset
     
     @transaction.atomic
     def update_proyecto(self, proyecto_id: int, **kwargs) -> ProyectoModel:
@@ -420,6 +461,7 @@ class ProyectoService:
             proy_id=proyecto,
             **archivo_data
         )
+        archivo.blob = blob_store.por_ruta(archivo.proar_ruta)
         
         try:
             archivo.full_clean()
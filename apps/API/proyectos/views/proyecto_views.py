@@ -1,9 +1,11 @@
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from interfaces.authentication.permissions import IsAuthenticatedWithSesionToken
 from interfaces.authentication.session_token_auth import SesionTokenAuthentication
+from interfaces.responses.conditional import build_etag, conditional_get
 
 from proyectos.services import proyecto_service, ProyectoNotFoundException, ProyectoValidationException
 from proyectos.serializers import (
@@ -118,24 +120,41 @@ class ProyectoListView(APIView):
             estado = int(estado) if estado else None
             prioridad = int(prioridad) if prioridad else None
             
-            proyectos = proyecto_service.get_all_proyectos(
+            # Versión del listado (agregado) para responder 304 sin serializar
+            version = proyecto_service.get_proyectos_version(
                 estado=estado,
                 prioridad=prioridad,
                 categoria=categoria,
                 search=search
             )
             
-            serializer = ProyectoListSerializer(proyectos, many=True)
-            return Response({
-                'results': serializer.data,
-                'count': len(serializer.data),
-                'filters_applied': {
-                    'estado': estado,
-                    'prioridad': prioridad,
-                    'categoria': categoria,
-                    'search': search
-                }
-            })
+            def construir():
+                proyectos = proyecto_service.get_all_proyectos(
+                    estado=estado,
+                    prioridad=prioridad,
+                    categoria=categoria,
+                    search=search
+                )
+                
+                serializer = ProyectoListSerializer(proyectos, many=True)
+                return Response({
+                    'results': serializer.data,
+                    'count': len(serializer.data),
+                    'filters_applied': {
+                        'estado': estado,
+                        'prioridad': prioridad,
+                        'categoria': categoria,
+                        'search': search
+                    }
+                })
+            
+            return conditional_get(
+                request,
+                build_etag('proyectos', sorted(version.items())),
+                # Sin Last-Modified: una baja cambia el total pero no la fecha máxima
+                None,
+                construir
+            )
             
         except ValueError:
             return Response(
@@ -159,15 +178,26 @@ class ProyectoDetailView(APIView):
     
     def get(self, request, proyecto_id):
         try:
-            proyecto = proyecto_service.get_proyecto_by_id(proyecto_id)
-            if not proyecto:
+            version = proyecto_service.get_proyecto_version(proyecto_id)
+            if not version:
                 return Response(
                     {'error': 'Proyecto no encontrado'},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            serializer = ProyectoDetailSerializer(proyecto)
-            return Response(serializer.data)
+            def construir():
+                proyecto = proyecto_service.get_proyecto_by_id(proyecto_id)
+                serializer = ProyectoDetailSerializer(proyecto)
+                return Response(serializer.data)
+            
+            # dias_desde_creacion cambia cada día aunque el proyecto no cambie,
+            # por eso va en el ETag y no hay Last-Modified
+            return conditional_get(
+                request,
+                build_etag('proyecto', proyecto_id, sorted(version.items()), timezone.localdate()),
+                None,
+                construir
+            )
             
         except Exception as e:
             return Response(
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ReportConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reports'
+
+    def ready(self):
+        # Registra los receptores que mantienen los contadores de los reportes
+        from reports import signals  # noqa: F401
+        # Invalida la caché del GeoJSON del mapa al cambiar los reportes
+        from reports.services import geojson_cache  # noqa: F401
@@ -18,3 +18,12 @@ class ReportValidationException(ReportException):
 class ReportPermissionException(ReportException):
     def __init__(self, message: str = "No tienes permisos"):
         super().__init__(message)
+
+
+class ReportUploadException(ReportException):
+    """Error de una subida reanudable; status_code es el HTTP a responder"""
+    def __init__(self, message: str, status_code: int = 400, offset: Optional[int] = None):
+        self.message = message
+        self.status_code = status_code
+        self.offset = offset
+        super().__init__(message)
@@ -0,0 +1,79 @@
+"""
+Genera los derivados (miniaturas y WebP) de imágenes ya subidas.
+
+    python manage.py backfill_report_derivatives                  # pendientes y con error
+    python manage.py backfill_report_derivatives --force          # regenera todas
+    python manage.py backfill_report_derivatives --reporte 123 --dry-run
+
+Marca las imágenes elegidas como pendientes y las procesa en bloques, igual
+que el worker process_report_derivatives (pueden correr a la vez). Usar
+--force tras cambiar los tamaños o formatos de VARIANTES.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.models.report_archivos import ReportArchivo
+from reports.services.derivative_service import derivative_service
+
+logger = logging.getLogger('reports')
+
+
+class Command(BaseCommand):
+    help = 'Genera las miniaturas y variantes WebP de las imágenes existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Regenera también las imágenes que ya tienen derivados'
+        )
+        parser.add_argument(
+            '--reporte', type=int, default=None,
+            help='Solo las imágenes de este reporte'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Imágenes procesadas por bloque (por defecto 100)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo informa cuántas imágenes se procesarían'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size debe ser mayor que 0')
+
+        queryset = ReportArchivo.objects.filter(tipo_archivo='imagen')
+        if options['reporte'] is not None:
+            queryset = queryset.filter(reporte_id=options['reporte'])
+        if not options['force']:
+            queryset = queryset.filter(derivados_estado__in=[
+                ReportArchivo.DERIVADOS_PENDIENTE, ReportArchivo.DERIVADOS_ERROR
+            ])
+
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} imágenes por procesar')
+            return
+
+        inicio = time.monotonic()
+        encoladas = derivative_service.requeue(queryset)
+        self.stdout.write(f'{encoladas} imágenes marcadas como pendientes')
+
+        total = {'archivos': 0, 'generados': 0, 'fallidos': 0}
+        while True:
+            stats = derivative_service.process(derivative_service.claim_pending(options['batch_size']))
+            if not stats['archivos']:
+                break
+            for clave, valor in stats.items():
+                total[clave] += valor
+            self.stdout.write(f"  {total['generados']} generadas, {total['fallidos']} fallidas")
+
+        mensaje = (
+            f"Backfill de derivados: {total['generados']} generadas, {total['fallidos']} fallidas "
+            f"en {time.monotonic() - inicio:.1f}s"
+        )
+        logger.info(mensaje)
+        self.stdout.write(self.style.SUCCESS(mensaje))
@@ -0,0 +1,80 @@
+"""
+Elimina de MEDIA_ROOT los archivos que ya no usa ninguna fila, los archivos de
+reportes desactivados y los blobs sin referencias, pasado el período de gracia.
+
+Pensado para ejecutarse periódicamente (cron, systemd timer, etc.), también
+mientras la API recibe subidas:
+
+    python manage.py collect_orphan_media --dry-run -v 2   # lista lo que eliminaría
+    python manage.py collect_orphan_media --quarantine     # mueve a MEDIA_GC["QUARANTINE_DIR"]
+    python manage.py collect_orphan_media --grace-hours 72
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.services.media_gc_service import media_gc
+
+logger = logging.getLogger('reports')
+
+
+class Command(BaseCommand):
+    help = 'Elimina o pone en cuarentena los archivos huérfanos e inactivos de MEDIA_ROOT'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo informa lo que se eliminaría'
+        )
+        parser.add_argument(
+            '--quarantine', action='store_true',
+            help='Mueve los archivos a la cuarentena en vez de eliminarlos'
+        )
+        parser.add_argument(
+            '--grace-hours', type=float, default=None,
+            help='Antigüedad mínima en horas (por defecto MEDIA_GC["GRACE_PERIOD"])'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Rutas por consulta (por defecto MEDIA_GC["BATCH_SIZE"])'
+        )
+
+    def handle(self, *args, **options):
+        grace_hours = options['grace_hours']
+        if grace_hours is not None and grace_hours < 0:
+            raise CommandError('--grace-hours no puede ser negativo')
+        if options['batch_size'] is not None and options['batch_size'] <= 0:
+            raise CommandError('--batch-size debe ser mayor que 0')
+
+        reportar = None
+        if options['verbosity'] >= 2:
+            def reportar(accion, ruta, tamaño):
+                self.stdout.write(f'  [{accion}] {ruta} ({tamaño} bytes)')
+
+        inicio = time.monotonic()
+        stats = media_gc.run(
+            dry_run=options['dry_run'],
+            quarantine=options['quarantine'],
+            grace_period=None if grace_hours is None else int(grace_hours * 3600),
+            batch_size=options['batch_size'],
+            reportar=reportar
+        )
+
+        if options['dry_run']:
+            destino = 'a eliminar'
+        else:
+            destino = 'en cuarentena' if options['quarantine'] else 'eliminados'
+        self.stdout.write(
+            f"{stats['revisados']} archivos revisados: {stats['huerfanos']} huérfanos, "
+            f"{stats['inactivos']} inactivos y {stats['blobs']} blobs {destino} "
+            f"({stats['bytes'] / (1024 * 1024):.1f} MB)"
+        )
+        if stats['directorios'] or stats['cuarentena_purgados']:
+            self.stdout.write(
+                f"{stats['directorios']} carpetas vacías eliminadas, "
+                f"{stats['cuarentena_purgados']} archivos purgados de la cuarentena"
+            )
+        self.stdout.write(self.style.SUCCESS(f'Recolección completada en {time.monotonic() - inicio:.2f}s'))
+        logger.info('Recolección de archivos huérfanos: %s, dry_run=%s', stats, options['dry_run'])
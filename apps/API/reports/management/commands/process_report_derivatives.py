@@ -0,0 +1,68 @@
+"""
+Worker que genera las miniaturas y variantes WebP de las imágenes de reportes.
+
+    python manage.py process_report_derivatives            # corre indefinidamente
+    python manage.py process_report_derivatives --once     # procesa lo pendiente y termina
+
+Con PostgreSQL se pueden levantar varios workers en paralelo: cada bloque de
+archivos se reclama con SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from reports.services.derivative_service import derivative_service
+
+logger = logging.getLogger('reports')
+
+
+class Command(BaseCommand):
+    help = 'Genera las miniaturas y variantes WebP pendientes de las imágenes de reportes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Procesa las imágenes pendientes y termina'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Segundos de espera cuando no hay imágenes pendientes (por defecto 2)'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Imágenes reclamadas por ciclo (por defecto REPORT_IMAGE_DERIVATIVES["BATCH_SIZE"])'
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        if limit is not None and limit <= 0:
+            raise CommandError('--limit debe ser mayor que 0')
+
+        if options['once']:
+            total = {}
+            while True:
+                stats = derivative_service.run_pending(limit)
+                for clave, valor in stats.items():
+                    total[clave] = total.get(clave, 0) + valor
+                if not stats['archivos']:
+                    break
+            self.stdout.write(self._format(total))
+            return
+
+        self.stdout.write('Worker de derivados iniciado')
+        try:
+            while True:
+                close_old_connections()
+                stats = derivative_service.run_pending(limit)
+                if not stats['archivos']:
+                    time.sleep(options['poll_interval'])
+                    continue
+                self.stdout.write(self._format(stats))
+        except KeyboardInterrupt:
+            self.stdout.write('Worker de derivados detenido')
+
+    def _format(self, stats):
+        return f"{stats['generados']} imágenes procesadas, {stats['fallidos']} fallidas"
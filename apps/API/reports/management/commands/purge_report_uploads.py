@@ -0,0 +1,36 @@
+"""
+Elimina las subidas reanudables expiradas o canceladas y sus archivos parciales.
+
+Pensado para ejecutarse periódicamente (cron, systemd timer, etc.):
+
+    python manage.py purge_report_uploads
+    python manage.py purge_report_uploads --dry-run
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from reports.services.upload_service import upload_service
+
+logger = logging.getLogger('reports')
+
+
+class Command(BaseCommand):
+    help = 'Elimina las subidas reanudables expiradas o canceladas y sus archivos parciales'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo cuenta las subidas que se eliminarían'
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.monotonic()
+        filas = upload_service.purge_expired(dry_run=options['dry_run'])
+
+        accion = 'a eliminar' if options['dry_run'] else 'eliminadas'
+        self.stdout.write(f'{filas} subidas {accion}')
+        self.stdout.write(self.style.SUCCESS(f'Limpieza completada en {time.monotonic() - inicio:.2f}s'))
+        logger.info('Limpieza de subidas reanudables: %s filas, dry_run=%s', filas, options['dry_run'])
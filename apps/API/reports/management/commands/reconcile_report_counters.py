@@ -0,0 +1,54 @@
+"""
+Repara los contadores desnormalizados de los reportes (votos, seguidores y
+comentarios) comparándolos con el conteo real.
+
+    python manage.py reconcile_report_counters --batch-size 1000
+    python manage.py reconcile_report_counters --dry-run
+
+Los contadores se mantienen en cada escritura (reports.signals); este comando
+corrige el desfase que puedan dejar cargas masivas o cambios hechos fuera del ORM.
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.services.report_service import ReportService
+
+logger = logging.getLogger('reports')
+
+
+class Command(BaseCommand):
+    help = 'Compara y repara los contadores de votos, seguidores y comentarios de los reportes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Reportes revisados por lote (por defecto 1000)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo informa los reportes con contadores desfasados'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size debe ser mayor que 0')
+
+        inicio = time.monotonic()
+        resultado = ReportService.reconcile_counters(
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run']
+        )
+        duracion = time.monotonic() - inicio
+
+        accion = 'con diferencias' if options['dry_run'] else 'corregidos'
+        self.stdout.write(
+            f"{resultado['revisados']} reportes revisados, {resultado['corregidos']} {accion}"
+        )
+        self.stdout.write(self.style.SUCCESS(f'Conciliación completada en {duracion:.2f}s'))
+        logger.info(
+            'Conciliación de contadores: revisados=%s corregidos=%s dry_run=%s',
+            resultado['revisados'], resultado['corregidos'], options['dry_run']
+        )
@@ -0,0 +1,33 @@
+# Generated manually for index-backed bbox filtering on reportes.ubicacion
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_comentarioreporte_comment_visible'),
+    ]
+
+    operations = [
+        # Reemplaza el índice espacial implícito de Django por uno con nombre explícito
+        migrations.AlterField(
+            model_name='reportmodel',
+            name='ubicacion',
+            field=django.contrib.gis.db.models.fields.PointField(geography=True, help_text='Coordenadas geográficas del reporte', spatial_index=False, srid=4326, verbose_name='Ubicación geográfica'),
+        ),
+        migrations.AddIndex(
+            model_name='reportmodel',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['ubicacion'], name='reportes_ubicacion_gist'),
+        ),
+        migrations.AddIndex(
+            model_name='reportmodel',
+            index=django.contrib.postgres.indexes.GistIndex(condition=models.Q(('visible', True)), fields=['ubicacion'], name='reportes_ubic_visible_gist'),
+        ),
+        migrations.AddIndex(
+            model_name='reportmodel',
+            index=models.Index(condition=models.Q(('visible', True)), fields=['-fecha_creacion', '-id'], name='reportes_visible_fecha_idx'),
+        ),
+    ]
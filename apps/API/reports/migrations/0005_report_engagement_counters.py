@@ -0,0 +1,49 @@
+# Generated manually for the denormalized report engagement counters
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def poblar_contadores(apps, schema_editor):
+    """Inicializa los contadores con el conteo real de cada reporte"""
+    ReportModel = apps.get_model('reports', 'ReportModel')
+
+    def contar(nombre_modelo):
+        modelo = apps.get_model('reports', nombre_modelo)
+        conteo = modelo.objects.filter(
+            reporte=OuterRef('pk')
+        ).order_by().values('reporte').annotate(total=Count('id')).values('total')
+        return Coalesce(Subquery(conteo, output_field=IntegerField()), 0)
+
+    ReportModel.objects.update(
+        total_votos=contar('VotoReporte'),
+        total_seguidores=contar('SeguimientoReporte'),
+        total_comentarios=contar('ComentarioReporte')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_report_spatial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportmodel',
+            name='total_votos',
+            field=models.IntegerField(default=0, verbose_name='Total de votos'),
+        ),
+        migrations.AddField(
+            model_name='reportmodel',
+            name='total_seguidores',
+            field=models.IntegerField(default=0, verbose_name='Total de seguidores'),
+        ),
+        migrations.AddField(
+            model_name='reportmodel',
+            name='total_comentarios',
+            field=models.IntegerField(default=0, verbose_name='Total de comentarios'),
+        ),
+        migrations.RunPython(poblar_contadores, migrations.RunPython.noop),
+    ]
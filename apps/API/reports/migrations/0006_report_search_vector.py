@@ -0,0 +1,68 @@
+# Generated manually for full-text search on reports
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import UnaccentExtension
+from django.db import migrations
+
+CREAR_CONFIGURACION = """
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+        ALTER TEXT SEARCH CONFIGURATION es_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    END IF;
+END
+$$;
+"""
+
+ELIMINAR_CONFIGURACION = "DROP TEXT SEARCH CONFIGURATION IF EXISTS es_unaccent;"
+
+VECTOR_REPORTE = """
+    setweight(to_tsvector('es_unaccent', coalesce({p}titulo, '')), 'A') ||
+    setweight(to_tsvector('es_unaccent', coalesce({p}descripcion, '')), 'B') ||
+    setweight(to_tsvector('es_unaccent', coalesce({p}direccion, '')), 'C')
+"""
+
+CREAR_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION reportes_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {VECTOR_REPORTE.format(p='NEW.')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER reportes_search_vector_update
+    BEFORE INSERT OR UPDATE OF titulo, descripcion, direccion ON reportes
+    FOR EACH ROW EXECUTE FUNCTION reportes_search_vector_trigger();
+
+UPDATE reportes SET search_vector = {VECTOR_REPORTE.format(p='')};
+"""
+
+ELIMINAR_TRIGGER = """
+DROP TRIGGER IF EXISTS reportes_search_vector_update ON reportes;
+DROP FUNCTION IF EXISTS reportes_search_vector_trigger();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0005_report_engagement_counters'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        migrations.RunSQL(CREAR_CONFIGURACION, ELIMINAR_CONFIGURACION),
+        migrations.AddField(
+            model_name='reportmodel',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='reportmodel',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='reportes_search_gin'),
+        ),
+        migrations.RunSQL(CREAR_TRIGGER, ELIMINAR_TRIGGER),
+    ]
@@ -0,0 +1,17 @@
+# Generated manually for incremental report exports filtered by fecha_actualizacion
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0006_report_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reportmodel',
+            index=models.Index(condition=models.Q(('visible', True)), fields=['fecha_actualizacion', 'id'], name='reportes_visible_actualiz_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated manually for the thumbnail / WebP derivative pipeline of report images
+
+from django.db import migrations, models
+
+
+def marcar_videos(apps, schema_editor):
+    """Los videos no tienen derivados; las imágenes existentes quedan pendientes"""
+    ReportArchivo = apps.get_model('reports', 'ReportArchivo')
+    ReportArchivo.objects.exclude(tipo_archivo='imagen').update(derivados_estado='no_aplica')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0007_report_export_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportarchivo',
+            name='derivados',
+            field=models.JSONField(blank=True, default=dict, help_text='Rutas de las miniaturas y variantes WebP generadas', verbose_name='Derivados'),
+        ),
+        migrations.AddField(
+            model_name='reportarchivo',
+            name='derivados_estado',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('listo', 'Listo'), ('error', 'Error'), ('no_aplica', 'No aplica')], default='pendiente', max_length=12, verbose_name='Estado de derivados'),
+        ),
+        migrations.AddField(
+            model_name='reportarchivo',
+            name='derivados_fecha',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Último cambio de estado de derivados'),
+        ),
+        migrations.RunPython(marcar_videos, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reportarchivo',
+            index=models.Index(condition=models.Q(('derivados_estado__in', ['pendiente', 'procesando'])), fields=['id'], name='archivo_derivados_pend_idx'),
+        ),
+    ]
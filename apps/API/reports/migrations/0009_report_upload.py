@@ -0,0 +1,43 @@
+# Generated manually for resumable chunked uploads of report files
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entities', '0002_alter_usuario_usua_id'),
+        ('reports', '0008_reportarchivo_derivados'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('nombre_original', models.CharField(max_length=255, verbose_name='Nombre original')),
+                ('tipo_archivo', models.CharField(max_length=20, verbose_name='Tipo de archivo')),
+                ('extension', models.CharField(max_length=10, verbose_name='Extensión')),
+                ('tamaño_bytes', models.PositiveBigIntegerField(verbose_name='Tamaño declarado en bytes')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Bytes recibidos')),
+                ('checksum_declarado', models.CharField(blank=True, max_length=64, verbose_name='SHA-256 declarado por el cliente')),
+                ('sha256', models.CharField(blank=True, max_length=64, verbose_name='SHA-256 del archivo ensamblado')),
+                ('estado', models.CharField(choices=[('activa', 'Activa'), ('completada', 'Completada'), ('cancelada', 'Cancelada')], default='activa', max_length=12, verbose_name='Estado')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('expira_en', models.DateTimeField(verbose_name='Expira en')),
+                ('archivo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reports.reportarchivo', verbose_name='Archivo creado al finalizar')),
+                ('reporte', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subidas', to='reports.reportmodel', verbose_name='Reporte')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subidas_reportes', to='entities.usuario', to_field='usua_id', verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Subida reanudable',
+                'verbose_name_plural': 'Subidas reanudables',
+                'db_table': 'report_subidas',
+                'indexes': [models.Index(fields=['estado', 'expira_en'], name='report_subidas_expira_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated manually for content-addressed deduplicated media storage
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0009_report_upload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('ruta', models.CharField(max_length=200, unique=True, verbose_name='Ruta en el storage')),
+                ('tamaño_bytes', models.PositiveBigIntegerField(verbose_name='Tamaño en bytes')),
+                ('mime_type', models.CharField(blank=True, max_length=100, verbose_name='Tipo MIME')),
+                ('referencias', models.PositiveIntegerField(default=0, verbose_name='Referencias')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('sin_referencias_desde', models.DateTimeField(blank=True, null=True, verbose_name='Sin referencias desde')),
+            ],
+            options={
+                'verbose_name': 'Blob de archivo',
+                'verbose_name_plural': 'Blobs de archivos',
+                'db_table': 'media_blobs',
+                'indexes': [
+                    models.Index(
+                        condition=models.Q(referencias=0),
+                        fields=['sin_referencias_desde'],
+                        name='media_blobs_sin_ref_idx'
+                    ),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name='reportarchivo',
+            name='blob',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='archivos_reporte',
+                to='reports.mediablob',
+                verbose_name='Blob'
+            ),
+        ),
+    ]
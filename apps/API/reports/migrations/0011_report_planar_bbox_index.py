@@ -0,0 +1,21 @@
+# Generated manually for planar (geometry) bbox filtering on reportes.ubicacion
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_media_blob'),
+    ]
+
+    operations = [
+        # Índice de expresión para ubicacion::geometry(Point,4326) (ver ubicacion_planar)
+        migrations.AddIndex(
+            model_name='reportmodel',
+            index=django.contrib.postgres.indexes.GistIndex(django.db.models.functions.comparison.Cast('ubicacion', django.contrib.gis.db.models.fields.PointField(srid=4326)), name='reportes_ubic_geom_gist'),
+        ),
+    ]
@@ -2,7 +2,9 @@ from .report import ReportModel
 from .ciudad import Ciudad
 from .tipo_denuncia import TipoDenuncia
 from .denuncia_estado import DenunciaEstado
+from .media_blob import MediaBlob
 from .report_archivos import ReportArchivo
+from .report_upload import ReportUpload
 from .seguimiento_reporte import SeguimientoReporte
 from .voto_reporte import VotoReporte
 from .comentario_reporte import ComentarioReporte
@@ -18,7 +20,9 @@ __all__ = [
     'Ciudad',
     'TipoDenuncia', 
     'DenunciaEstado',
+    'MediaBlob',
     'ReportArchivo',
+    'ReportUpload',
     'SeguimientoReporte',
     'VotoReporte',
     'ReportHistory',
@@ -0,0 +1,39 @@
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    Contenido de un archivo subido, guardado una sola vez por SHA-256
+    (reports.services.blob_store). ReportArchivo y ProyectoArchivosModel lo
+    referencian; `referencias` cuenta las filas que lo usan y se mantiene en
+    reports.signals.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name='SHA-256')
+    ruta = models.CharField(max_length=200, unique=True, verbose_name='Ruta en el storage')
+    tamaño_bytes = models.PositiveBigIntegerField(verbose_name='Tamaño en bytes')
+    mime_type = models.CharField(max_length=100, blank=True, verbose_name='Tipo MIME')
+    referencias = models.PositiveIntegerField(default=0, verbose_name='Referencias')
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')
+    # Cuándo quedó sin referencias; el recolector lo elimina pasado un período de gracia
+    sin_referencias_desde = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Sin referencias desde'
+    )
+
+    class Meta:
+        db_table = 'media_blobs'
+        verbose_name = 'Blob de archivo'
+        verbose_name_plural = 'Blobs de archivos'
+        indexes = [
+            models.Index(
+                fields=['sin_referencias_desde'],
+                name='media_blobs_sin_ref_idx',
+                condition=models.Q(referencias=0)
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.referencias} referencias)"
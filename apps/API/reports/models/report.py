@@ -1,9 +1,28 @@
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import Cast
 from domain.entities.usuario import Usuario
 
 
+# Solo se modifican con F() (reports.signals, VotoReporte) o con
+# reconcile_report_counters; un save() completo no debe sobrescribirlos
+CAMPOS_CONTADORES = ('total_votos', 'total_seguidores', 'total_comentarios')
+
+
+def ubicacion_planar():
+    """
+    `ubicacion` como geometry en grados (lon/lat planos). Los filtros por caja
+    del mapa (bbox y teselas) comparan con esta expresión y no con la columna
+    geography, cuyas cajas siguen arcos de círculo máximo y cruzan el
+    antimeridiano en envolventes de ±180°. Usa el índice reportes_ubic_geom_gist;
+    en SQL crudo se escribe `ubicacion::geometry(Point,4326)`.
+    """
+    return Cast('ubicacion', models.PointField(srid=4326))
+
+
 class ReportModel(models.Model):
     """Modelo de Django para persistir reportes"""
     
@@ -14,13 +33,24 @@ class ReportModel(models.Model):
     ubicacion = models.PointField(
         geography=True,
         verbose_name="Ubicación geográfica",
-        help_text="Coordenadas geográficas del reporte"
+        help_text="Coordenadas geográficas del reporte",
+        spatial_index=False  # El índice GiST se declara explícitamente en Meta.indexes
     )
     visible = models.BooleanField(default=True)
     urgencia = models.IntegerField(choices=[(1, 'Baja'), (2, 'Media'), (3, 'Alta')])
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(auto_now=True, null=True, blank=True)
     
+    # Contadores desnormalizados; se mantienen con F() desde reports.signals
+    # y se reparan con el comando reconcile_report_counters
+    total_votos = models.IntegerField(default=0, verbose_name='Total de votos')
+    total_seguidores = models.IntegerField(default=0, verbose_name='Total de seguidores')
+    total_comentarios = models.IntegerField(default=0, verbose_name='Total de comentarios')
+    
+    # Búsqueda de texto (título > descripción > dirección); lo mantiene un
+    # trigger de la base de datos (migración 0006), no se asigna desde Python
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     # Foreign Keys
     usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE, related_name='reportes', to_field='usua_id')
     denuncia_estado = models.ForeignKey('DenunciaEstado', on_delete=models.PROTECT)
@@ -37,11 +67,46 @@ class ReportModel(models.Model):
             models.Index(fields=['fecha_creacion']),
             models.Index(fields=['urgencia']),
             models.Index(fields=['denuncia_estado']),
+            # Índices espaciales para bbox/proximidad/teselas del mapa
+            GistIndex(fields=['ubicacion'], name='reportes_ubicacion_gist'),
+            GistIndex(
+                fields=['ubicacion'],
+                name='reportes_ubic_visible_gist',
+                condition=models.Q(visible=True)
+            ),
+            # Filtros por caja en coordenadas planas (bbox y teselas)
+            GistIndex(ubicacion_planar(), name='reportes_ubic_geom_gist'),
+            # Listados del mapa: solo visibles, más recientes primero
+            models.Index(
+                fields=['-fecha_creacion', '-id'],
+                name='reportes_visible_fecha_idx',
+                condition=models.Q(visible=True)
+            ),
+            # Exportación incremental (since): visibles por fecha de actualización
+            models.Index(
+                fields=['fecha_actualizacion', 'id'],
+                name='reportes_visible_actualiz_idx',
+                condition=models.Q(visible=True)
+            ),
+            # Búsqueda de texto completo
+            GinIndex(fields=['search_vector'], name='reportes_search_gin'),
         ]
     
     def __str__(self):
         return f"{self.titulo} - {self.usuario}"
     
+    def save(self, *args, **kwargs):
+        # En actualizaciones sin update_fields se escriben todas las columnas
+        # menos los contadores: el valor leído al inicio de la petición
+        # pisaría los incrementos concurrentes
+        if (not self._state.adding and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in CAMPOS_CONTADORES
+            ]
+        super().save(*args, **kwargs)
+    
     # ========== MÉTODOS DE CONSULTA (Read-only) ==========
     
     def is_urgent(self) -> bool:
@@ -64,6 +64,20 @@ class ReportArchivoManager(models.Manager):
 class ReportArchivo(models.Model):
     """Modelo para archivos multimedia de reportes (solo imágenes y videos)"""
     
+    # Estado de las miniaturas y variantes WebP (worker process_report_derivatives)
+    DERIVADOS_PENDIENTE = 'pendiente'
+    DERIVADOS_PROCESANDO = 'procesando'
+    DERIVADOS_LISTO = 'listo'
+    DERIVADOS_ERROR = 'error'
+    DERIVADOS_NO_APLICA = 'no_aplica'
+    DERIVADOS_ESTADO_CHOICES = [
+        (DERIVADOS_PENDIENTE, 'Pendiente'),
+        (DERIVADOS_PROCESANDO, 'Procesando'),
+        (DERIVADOS_LISTO, 'Listo'),
+        (DERIVADOS_ERROR, 'Error'),
+        (DERIVADOS_NO_APLICA, 'No aplica'),
+    ]
+    
     # Campo principal
     id = models.AutoField(primary_key=True)
     
@@ -84,6 +98,16 @@ class ReportArchivo(models.Model):
         help_text='Archivo subido (imagen o video únicamente)'
     )
     
+    # Contenido deduplicado: `archivo` apunta a blob.ruta (ver reports.services.blob_store)
+    blob = models.ForeignKey(
+        'reports.MediaBlob',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='archivos_reporte',
+        verbose_name='Blob'
+    )
+    
     # Metadatos del archivo
     nombre_original = models.CharField(
         max_length=255,
@@ -140,6 +164,27 @@ class ReportArchivo(models.Model):
         help_text='Indica si el archivo está activo'
     )
     
+    # Derivados de imágenes: {variante: ruta en el storage}, junto al original
+    derivados = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Derivados',
+        help_text='Rutas de las miniaturas y variantes WebP generadas'
+    )
+    
+    derivados_estado = models.CharField(
+        max_length=12,
+        choices=DERIVADOS_ESTADO_CHOICES,
+        default=DERIVADOS_PENDIENTE,
+        verbose_name='Estado de derivados'
+    )
+    
+    derivados_fecha = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Último cambio de estado de derivados'
+    )
+    
     # Timestamps
     fecha_subida = models.DateTimeField(
         auto_now_add=True,
@@ -163,6 +208,12 @@ class ReportArchivo(models.Model):
             models.Index(fields=['tipo_archivo']),
             models.Index(fields=['es_principal']),
             models.Index(fields=['fecha_subida']),
+            # Solo los archivos que el worker de derivados aún debe revisar
+            models.Index(
+                fields=['id'],
+                name='archivo_derivados_pend_idx',
+                condition=models.Q(derivados_estado__in=['pendiente', 'procesando'])
+            ),
         ]
         constraints = [
             # Solo un archivo principal por reporte
@@ -224,7 +275,13 @@ class ReportArchivo(models.Model):
     
     def save(self, *args, **kwargs):
         """Override save para poblar metadatos automáticamente"""
-        if self.archivo and self.archivo.file:
+        if self.blob_id:
+            # El contenido ya está en el blob store: los metadatos salen del blob sin abrir el archivo
+            if not self.tamaño_bytes:
+                self.tamaño_bytes = self.blob.tamaño_bytes
+            if not self.mime_type:
+                self.mime_type = self._get_mime_type()
+        elif self.archivo and self.archivo.file:
             # Poblar nombre original si no existe
             if not self.nombre_original:
                 self.nombre_original = self.archivo.name
@@ -246,6 +303,10 @@ class ReportArchivo(models.Model):
             if not self.mime_type:
                 self.mime_type = self._get_mime_type()
         
+        # Solo las imágenes tienen miniaturas y variantes WebP
+        if self._state.adding and self.tipo_archivo != 'imagen':
+            self.derivados_estado = self.DERIVADOS_NO_APLICA
+        
         # Validar antes de guardar
         self.clean()
         
@@ -293,6 +354,26 @@ class ReportArchivo(models.Model):
             return self.archivo.url
         return None
     
+    @property
+    def derivados_urls(self):
+        """URLs de los derivados generados ({} mientras no se hayan generado)"""
+        if not self.derivados:
+            return {}
+        storage = self.archivo.storage
+        return {variante: storage.url(ruta) for variante, ruta in self.derivados.items()}
+    
+    def eliminar_derivados(self):
+        """
+        Elimina del storage los derivados generados. Los de un blob se
+        comparten con otros archivos y los elimina el recolector.
+        """
+        if self.blob_id:
+            return
+        storage = self.archivo.storage
+        for ruta in (self.derivados or {}).values():
+            if storage.exists(ruta):
+                storage.delete(ruta)
+    
     @property
     def tamaño_formateado(self):
         """Retorna el tamaño formateado en KB/MB"""
@@ -0,0 +1,80 @@
+import uuid
+
+from django.db import models
+
+from domain.entities.usuario import Usuario
+
+
+class ReportUpload(models.Model):
+    """
+    Sesión de subida reanudable de un archivo de reporte (ver
+    reports.services.upload_service). Los bytes recibidos se guardan en un
+    archivo temporal hasta que la sesión se finaliza y pasa a ser un ReportArchivo.
+    """
+
+    ESTADO_ACTIVA = 'activa'
+    ESTADO_COMPLETADA = 'completada'
+    ESTADO_CANCELADA = 'cancelada'
+    ESTADO_CHOICES = [
+        (ESTADO_ACTIVA, 'Activa'),
+        (ESTADO_COMPLETADA, 'Completada'),
+        (ESTADO_CANCELADA, 'Cancelada'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    reporte = models.ForeignKey(
+        'reports.ReportModel',
+        on_delete=models.CASCADE,
+        related_name='subidas',
+        verbose_name='Reporte'
+    )
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name='subidas_reportes',
+        to_field='usua_id',
+        verbose_name='Usuario'
+    )
+    nombre_original = models.CharField(max_length=255, verbose_name='Nombre original')
+    tipo_archivo = models.CharField(max_length=20, verbose_name='Tipo de archivo')
+    extension = models.CharField(max_length=10, verbose_name='Extensión')
+    tamaño_bytes = models.PositiveBigIntegerField(verbose_name='Tamaño declarado en bytes')
+    offset = models.PositiveBigIntegerField(default=0, verbose_name='Bytes recibidos')
+    checksum_declarado = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name='SHA-256 declarado por el cliente'
+    )
+    sha256 = models.CharField(max_length=64, blank=True, verbose_name='SHA-256 del archivo ensamblado')
+    estado = models.CharField(
+        max_length=12,
+        choices=ESTADO_CHOICES,
+        default=ESTADO_ACTIVA,
+        verbose_name='Estado'
+    )
+    archivo = models.ForeignKey(
+        'reports.ReportArchivo',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Archivo creado al finalizar'
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
+    expira_en = models.DateTimeField(verbose_name='Expira en')
+
+    class Meta:
+        db_table = 'report_subidas'
+        verbose_name = 'Subida reanudable'
+        verbose_name_plural = 'Subidas reanudables'
+        indexes = [
+            models.Index(fields=['estado', 'expira_en'], name='report_subidas_expira_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre_original} ({self.offset}/{self.tamaño_bytes}) - Reporte #{self.reporte_id}"
+
+    @property
+    def completa(self) -> bool:
+        return self.offset >= self.tamaño_bytes
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.utils import timezone
 from domain.entities.usuario import Usuario
 from reports.models.report import ReportModel
 
@@ -44,4 +45,92 @@ class VotoReporte(models.Model):
     @staticmethod
     def contar_votos_reporte(reporte):
         """Cuenta el total de votos de un reporte"""
-        return VotoReporte.objects.filter(reporte=reporte).count()
\ No newline at end of file
+        return VotoReporte.objects.filter(reporte=reporte).count()
+
+    @staticmethod
+    def alternar_voto(usuario_id, reporte_id):
+        """
+        Registra o quita el voto del usuario (toggle) y retorna el nuevo total.
+
+        En PostgreSQL se resuelve en una sola sentencia: DELETE ... RETURNING y,
+        si no había voto, INSERT ... ON CONFLICT DO NOTHING RETURNING, junto con
+        la actualización del contador del reporte. Retorna None si el reporte no
+        existe; si no, un dict con accion ('added'/'removed'), voto_id,
+        fecha_voto y total.
+        """
+        if connection.vendor == 'postgresql':
+            return VotoReporte._alternar_voto_sql(usuario_id, reporte_id)
+        return VotoReporte._alternar_voto_orm(usuario_id, reporte_id)
+
+    @staticmethod
+    def _alternar_voto_sql(usuario_id, reporte_id):
+        votos = VotoReporte._meta.db_table
+        reportes = ReportModel._meta.db_table
+        sql = f"""
+            WITH reporte AS (
+                SELECT id FROM {reportes} WHERE id = %(reporte)s
+            ),
+            borrado AS (
+                DELETE FROM {votos}
+                WHERE usuario_id = %(usuario)s AND reporte_id = %(reporte)s
+                RETURNING id
+            ),
+            insertado AS (
+                INSERT INTO {votos} (usuario_id, reporte_id, fecha_voto)
+                SELECT %(usuario)s, id, %(ahora)s FROM reporte
+                WHERE NOT EXISTS (SELECT 1 FROM borrado)
+                ON CONFLICT (usuario_id, reporte_id) DO NOTHING
+                RETURNING id, fecha_voto
+            ),
+            contador AS (
+                UPDATE {reportes}
+                SET total_votos = total_votos
+                    + (SELECT count(*) FROM insertado)
+                    - (SELECT count(*) FROM borrado)
+                WHERE id = %(reporte)s
+                RETURNING total_votos
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM reporte),
+                EXISTS (SELECT 1 FROM borrado),
+                (SELECT id FROM insertado),
+                (SELECT fecha_voto FROM insertado),
+                (SELECT total_votos FROM contador)
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {'usuario': usuario_id, 'reporte': reporte_id, 'ahora': timezone.now()})
+            existe, eliminado, voto_id, fecha_voto, total = cursor.fetchone()
+
+        if not existe:
+            return None
+        # Sin borrado ni inserción: otro request simultáneo del mismo usuario
+        # acaba de registrar el voto (doble toque); el voto queda registrado.
+        return {
+            'accion': 'removed' if eliminado else 'added',
+            'voto_id': voto_id,
+            'fecha_voto': fecha_voto,
+            'total': total
+        }
+
+    @staticmethod
+    def _alternar_voto_orm(usuario_id, reporte_id):
+        """Alternativa para otros motores: serializa los toggles bloqueando el reporte"""
+        with transaction.atomic():
+            reporte = ReportModel.objects.select_for_update().filter(pk=reporte_id).first()
+            if reporte is None:
+                return None
+
+            eliminados, _ = VotoReporte.objects.filter(usuario_id=usuario_id, reporte_id=reporte_id).delete()
+            voto = None
+            if not eliminados:
+                voto = VotoReporte.objects.create(usuario_id=usuario_id, reporte_id=reporte_id)
+
+            # Los receptores de reports.signals ya ajustaron el contador
+            total = ReportModel.objects.values_list('total_votos', flat=True).get(pk=reporte_id)
+
+        return {
+            'accion': 'removed' if eliminados else 'added',
+            'voto_id': voto.id if voto else None,
+            'fecha_voto': voto.fecha_voto if voto else None,
+            'total': total
+        }
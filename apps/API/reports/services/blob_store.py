@@ -0,0 +1,121 @@
+"""
+Almacenamiento de archivos direccionado por contenido.
+
+Cada contenido distinto se guarda una sola vez, en una ruta derivada de su
+SHA-256:
+
+    blobs/ab/cd/abcd1234...ef.jpg
+
+y las filas que lo usan (ReportArchivo, ProyectoArchivosModel) lo referencian
+con un MediaBlob. Como la ruta depende solo del contenido:
+
+- Subir de nuevo la misma foto (otro reporte, o un reintento del cliente) no
+  escribe nada en disco: el hash se calcula recorriendo los fragmentos de la
+  subida y, si el blob ya existe, solo se agrega una referencia.
+- Las URLs son inmutables, así que una CDN o el navegador pueden cachearlas
+  indefinidamente.
+
+El conteo de referencias se mantiene en reports.signals al crear o eliminar
+las filas. Un blob que queda sin referencias no se borra de inmediato (otra
+subida podría estar reutilizándolo): lo elimina el recolector de archivos
+huérfanos pasado un período de gracia.
+
+Si dos subidas del mismo contenido nuevo coinciden, ambas pueden escribir; la
+segunda copia queda fuera de MediaBlob y también la elimina el recolector.
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+from typing import Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+
+from reports.models.media_blob import MediaBlob
+
+logger = logging.getLogger('reports')
+
+PREFIJO = 'blobs'
+
+
+class BlobStore:
+    """Guarda y resuelve blobs deduplicados por SHA-256"""
+
+    storage = default_storage
+
+    @staticmethod
+    def ruta_para(sha256: str, extension: str) -> str:
+        extension = extension.lower().lstrip('.')
+        nombre = f'{sha256}.{extension}' if extension else sha256
+        return f'{PREFIJO}/{sha256[:2]}/{sha256[2:4]}/{nombre}'
+
+    @staticmethod
+    def calcular_sha256(contenido: File) -> str:
+        """SHA-256 recorriendo el archivo por fragmentos (no lo carga completo)"""
+        hash_contenido = hashlib.sha256()
+        for fragmento in contenido.chunks():
+            hash_contenido.update(fragmento)
+        contenido.seek(0)
+        return hash_contenido.hexdigest()
+
+    def store(
+        self,
+        contenido: File,
+        extension: str,
+        mime_type: str = '',
+        sha256: Optional[str] = None
+    ) -> MediaBlob:
+        """
+        Retorna el blob del contenido, escribiéndolo solo si aún no existe.
+        `sha256` evita recalcular el hash cuando ya se conoce (subidas reanudables).
+        Las referencias las agrega quien crea la fila que lo usa.
+        """
+        sha256 = sha256 or self.calcular_sha256(contenido)
+        # Según la extensión ya validada, no el content_type que declara el cliente
+        mime_type = mime_type or mimetypes.guess_type(f'archivo.{extension}')[0] or ''
+
+        existente = MediaBlob.objects.filter(sha256=sha256).first()
+        # Quitar la marca de "sin referencias" impide que el recolector lo elimine
+        # mientras se crea la fila que lo usa; si ya lo eliminó, se escribe de nuevo
+        if existente is not None and MediaBlob.objects.filter(pk=existente.pk).update(sin_referencias_desde=None):
+            logger.debug(f'Blob {sha256[:12]} reutilizado, sin escritura')
+            return existente
+
+        ruta = self.ruta_para(sha256, extension)
+        if not self.storage.exists(ruta):
+            # Con un archivo temporal (subidas grandes) el storage lo mueve en vez de copiarlo
+            ruta = self.storage.save(ruta, contenido)
+
+        try:
+            with transaction.atomic():
+                return MediaBlob.objects.create(
+                    sha256=sha256,
+                    ruta=ruta,
+                    tamaño_bytes=contenido.size,
+                    mime_type=mime_type
+                )
+        except IntegrityError:
+            # Otra subida del mismo contenido creó el blob primero
+            return MediaBlob.objects.get(sha256=sha256)
+
+    def por_ruta(self, ruta: str) -> Optional[MediaBlob]:
+        """
+        Blob al que apunta una ruta o URL (p. ej. proar_ruta de un proyecto),
+        o None si no es del blob store.
+        """
+        ruta = (ruta or '').strip()
+        if settings.MEDIA_URL and ruta.startswith(settings.MEDIA_URL):
+            ruta = ruta[len(settings.MEDIA_URL):]
+        ruta = ruta.lstrip('/')
+        if not ruta.startswith(f'{PREFIJO}/'):
+            return None
+        sha256 = os.path.splitext(os.path.basename(ruta))[0]
+        return MediaBlob.objects.filter(sha256=sha256).first()
+
+
+# Instancia global del servicio
+blob_store = BlobStore()
@@ -0,0 +1,141 @@
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+from django.db import connection
+from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+
+class ClusterService:
+    """
+    Agrupa reportes en clusters usando una grilla dependiente del zoom.
+
+    Cada reporte se asigna a la celda de la grilla que lo contiene, por lo que
+    el costo es lineal en la cantidad de reportes. La celda es
+    (floor(x / tamaño), floor(y / tamaño)): con PostGIS se calcula en la base
+    de datos y en otros motores (SQLite en tests) en Python, con el mismo
+    resultado.
+    """
+
+    # Tamaño de una tesela en píxeles (Web Mercator)
+    TILE_SIZE = 256
+
+    # Radio del cluster en píxeles de pantalla
+    DEFAULT_RADIUS_PX = 60
+
+    MIN_ZOOM = 0
+    MAX_ZOOM = 22
+
+    @staticmethod
+    def cell_size_for_zoom(zoom: int, radius_px: int = DEFAULT_RADIUS_PX) -> float:
+        """Calcula el tamaño de la celda (en grados) para un nivel de zoom"""
+        zoom = max(ClusterService.MIN_ZOOM, min(int(zoom), ClusterService.MAX_ZOOM))
+        grados_por_pixel = 360.0 / (ClusterService.TILE_SIZE * (2 ** zoom))
+        return grados_por_pixel * radius_px
+
+    @staticmethod
+    def cluster(queryset: QuerySet, cell_size: float) -> List[Dict[str, Any]]:
+        """
+        Agrupa los reportes del queryset en celdas de `cell_size` grados.
+
+        Retorna una lista de diccionarios con: count, urgencia_max, latitud,
+        longitud (centroide), report_ids y, para clusters de un solo reporte,
+        id y titulo.
+        """
+        if connection.vendor == 'postgresql':
+            return ClusterService._cluster_postgis(queryset, cell_size)
+        return ClusterService._cluster_python(queryset, cell_size)
+
+    @staticmethod
+    def _cluster_postgis(queryset: QuerySet, cell_size: float) -> List[Dict[str, Any]]:
+        """Agrupa en la base de datos sobre los reportes filtrados"""
+        inner_sql, inner_params = queryset.order_by().values('pk').query.sql_with_params()
+        tabla = queryset.model._meta.db_table
+
+        sql = f"""
+            SELECT
+                COUNT(*) AS total,
+                MAX(r.urgencia) AS urgencia_max,
+                AVG(ST_Y(r.ubicacion::geometry)) AS latitud,
+                AVG(ST_X(r.ubicacion::geometry)) AS longitud,
+                ARRAY_AGG(r.id ORDER BY r.id) AS report_ids,
+                (ARRAY_AGG(r.titulo ORDER BY r.id))[1] AS titulo
+            FROM "{tabla}" r
+            WHERE r.id IN ({inner_sql})
+            GROUP BY
+                FLOOR(ST_X(r.ubicacion::geometry) / %s),
+                FLOOR(ST_Y(r.ubicacion::geometry) / %s)
+        """
+
+        # FLOOR y no ST_SnapToGrid (que redondea al punto más cercano de la
+        # grilla): así coincide con _cluster_python en los bordes de celda
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (*inner_params, cell_size, cell_size))
+            rows = cursor.fetchall()
+
+        clusters = []
+        for total, urgencia_max, latitud, longitud, report_ids, titulo in rows:
+            clusters.append(ClusterService._build_cluster(
+                total, urgencia_max, float(latitud), float(longitud), list(report_ids), titulo
+            ))
+        return clusters
+
+    @staticmethod
+    def _cluster_python(queryset: QuerySet, cell_size: float) -> List[Dict[str, Any]]:
+        """Agrupa en memoria con una tabla hash de celdas (una sola pasada)"""
+        celdas: Dict[tuple, Dict[str, Any]] = {}
+
+        rows = queryset.order_by('id').values_list('id', 'titulo', 'urgencia', 'ubicacion')
+        for report_id, titulo, urgencia, ubicacion in rows.iterator(chunk_size=2000):
+            if ubicacion is None:
+                continue
+            clave = (math.floor(ubicacion.x / cell_size), math.floor(ubicacion.y / cell_size))
+            celda = celdas.get(clave)
+            if celda is None:
+                celda = celdas[clave] = {
+                    'total': 0,
+                    'urgencia_max': urgencia,
+                    'suma_lat': 0.0,
+                    'suma_lng': 0.0,
+                    'report_ids': [],
+                    'titulo': titulo
+                }
+            celda['total'] += 1
+            celda['urgencia_max'] = max(celda['urgencia_max'], urgencia)
+            celda['suma_lat'] += ubicacion.y
+            celda['suma_lng'] += ubicacion.x
+            celda['report_ids'].append(report_id)
+
+        return [
+            ClusterService._build_cluster(
+                celda['total'],
+                celda['urgencia_max'],
+                celda['suma_lat'] / celda['total'],
+                celda['suma_lng'] / celda['total'],
+                celda['report_ids'],
+                celda['titulo']
+            )
+            for celda in celdas.values()
+        ]
+
+    @staticmethod
+    def _build_cluster(total: int, urgencia_max: int, latitud: float, longitud: float,
+                       report_ids: List[int], titulo: Optional[str]) -> Dict[str, Any]:
+        """Normaliza el resultado de ambos motores a la misma estructura"""
+        cluster = {
+            'count': total,
+            'urgencia_max': urgencia_max,
+            'latitud': latitud,
+            'longitud': longitud,
+            'report_ids': report_ids
+        }
+        if total == 1:
+            cluster['id'] = report_ids[0]
+            cluster['titulo'] = titulo
+        return cluster
+
+
+# Instancia global del servicio
+cluster_service = ClusterService()
@@ -0,0 +1,204 @@
+"""
+Miniaturas y variantes WebP de las imágenes de reportes.
+
+Las imágenes originales pueden pesar hasta 5MB (ReportService.MAX_FILE_SIZES)
+y el listado y el mapa solo necesitan una miniatura. Cada ReportArchivo de
+tipo imagen se crea con derivados_estado='pendiente' y el worker
+process_report_derivatives genera, fuera de la solicitud:
+
+    miniatura        256x256 recortada, JPEG
+    miniatura_webp   256x256 recortada, WebP
+    webp             hasta 1280px por lado, WebP
+
+Los derivados se guardan junto al original con nombres deterministas
+(reports/20-10-2025/123/<uuid>_miniatura.jpg, o blobs/ab/cd/<sha256>_miniatura.jpg
+para el contenido deduplicado), así que reprocesar un archivo reemplaza los
+mismos derivados en vez de acumular copias. Los archivos se reclaman con
+SELECT ... FOR UPDATE SKIP LOCKED para poder levantar varios workers; uno
+interrumpido a medias se reclama de nuevo pasado STALE_AFTER.
+
+Configuración en settings.REPORT_IMAGE_DERIVATIVES:
+    ENABLED        Activa el worker (por defecto True)
+    BATCH_SIZE     Archivos reclamados por ciclo (por defecto 20)
+    JPEG_QUALITY   Calidad JPEG (por defecto 82)
+    WEBP_QUALITY   Calidad WebP (por defecto 80)
+
+Requiere Pillow.
+"""
+
+import io
+import logging
+import os
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from reports.models.report_archivos import ReportArchivo
+from .geojson_cache import geojson_cache
+
+logger = logging.getLogger('reports')
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'BATCH_SIZE': 20,
+    'JPEG_QUALITY': 82,
+    'WEBP_QUALITY': 80,
+}
+
+# variante -> (tamaño máximo, recortar al tamaño exacto, formato)
+VARIANTES = {
+    'miniatura': ((256, 256), True, 'JPEG'),
+    'miniatura_webp': ((256, 256), True, 'WEBP'),
+    'webp': ((1280, 1280), False, 'WEBP'),
+}
+
+EXTENSIONES = {'JPEG': 'jpg', 'WEBP': 'webp'}
+
+
+class DerivativeService:
+    """Generación de miniaturas y variantes WebP de ReportArchivo"""
+
+    # Un archivo "procesando" sin cambios por este tiempo se considera abandonado
+    STALE_AFTER = timedelta(minutes=10)
+
+    @property
+    def config(self) -> dict:
+        return {**DEFAULT_CONFIG, **getattr(settings, 'REPORT_IMAGE_DERIVATIVES', {})}
+
+    # ==================== RECLAMO ====================
+
+    def claim_pending(self, limit: Optional[int] = None) -> List[ReportArchivo]:
+        """
+        Reclama de forma exclusiva un bloque de imágenes sin derivados.
+        Con PostgreSQL varios workers pueden correr en paralelo (SKIP LOCKED).
+        """
+        ahora = timezone.now()
+        limit = limit or self.config['BATCH_SIZE']
+
+        with transaction.atomic():
+            ids = list(
+                ReportArchivo.objects.select_for_update(skip_locked=True).filter(
+                    Q(derivados_estado=ReportArchivo.DERIVADOS_PENDIENTE) |
+                    Q(
+                        derivados_estado=ReportArchivo.DERIVADOS_PROCESANDO,
+                        derivados_fecha__lt=ahora - self.STALE_AFTER
+                    ),
+                    tipo_archivo='imagen'
+                ).order_by('id').values_list('id', flat=True)[:limit]
+            )
+            if not ids:
+                return []
+            ReportArchivo.objects.filter(id__in=ids).update(
+                derivados_estado=ReportArchivo.DERIVADOS_PROCESANDO, derivados_fecha=ahora
+            )
+
+        return list(ReportArchivo.objects.filter(id__in=ids).order_by('id'))
+
+    def requeue(self, queryset: QuerySet) -> int:
+        """Marca como pendientes las imágenes del queryset (p. ej. para regenerarlas)"""
+        return queryset.filter(tipo_archivo='imagen').exclude(
+            derivados_estado=ReportArchivo.DERIVADOS_PROCESANDO
+        ).update(derivados_estado=ReportArchivo.DERIVADOS_PENDIENTE, derivados_fecha=timezone.now())
+
+    # ==================== GENERACIÓN ====================
+
+    def generate(self, archivo: ReportArchivo) -> Dict[str, str]:
+        """
+        Genera y guarda los derivados de una imagen; retorna {variante: ruta}.
+        Si un derivado ya existe se reemplaza (misma ruta). Los archivos que
+        comparten blob comparten derivados: si otro ya los tiene, se reutilizan.
+        """
+        if archivo.blob_id:
+            compartidos = ReportArchivo.objects.filter(
+                blob_id=archivo.blob_id,
+                derivados_estado=ReportArchivo.DERIVADOS_LISTO
+            ).exclude(id=archivo.id).exclude(derivados={}).values_list('derivados', flat=True).first()
+            if compartidos:
+                return compartidos
+
+        from PIL import Image, ImageOps
+
+        config = self.config
+        calidad = {'JPEG': config['JPEG_QUALITY'], 'WEBP': config['WEBP_QUALITY']}
+        storage = archivo.archivo.storage
+        base, _ = os.path.splitext(archivo.archivo.name)
+
+        with archivo.archivo.open('rb') as original:
+            imagen = Image.open(original)
+            # En JPEG decodifica directamente a una escala reducida
+            imagen.draft('RGB', max(tamano for tamano, _, _ in VARIANTES.values()))
+            imagen = ImageOps.exif_transpose(imagen)
+            imagen.load()
+
+        if imagen.mode not in ('RGB', 'RGBA'):
+            con_alfa = imagen.mode in ('LA', 'PA') or 'transparency' in imagen.info
+            imagen = imagen.convert('RGBA' if con_alfa else 'RGB')
+
+        rutas = {}
+        for variante, (tamano, recortar, formato) in VARIANTES.items():
+            if recortar:
+                derivado = ImageOps.fit(imagen, tamano, Image.Resampling.LANCZOS)
+            else:
+                derivado = imagen.copy()
+                derivado.thumbnail(tamano, Image.Resampling.LANCZOS)
+            if formato == 'JPEG' and derivado.mode != 'RGB':
+                derivado = derivado.convert('RGB')
+
+            contenido = io.BytesIO()
+            derivado.save(contenido, formato, quality=calidad[formato], optimize=True)
+
+            ruta = f'{base}_{variante}.{EXTENSIONES[formato]}'
+            if storage.exists(ruta):
+                storage.delete(ruta)
+            rutas[variante] = storage.save(ruta, ContentFile(contenido.getvalue()))
+
+        return rutas
+
+    def process(self, archivos: List[ReportArchivo]) -> Dict[str, int]:
+        """Genera los derivados de archivos ya reclamados y registra el resultado"""
+        stats = {'archivos': len(archivos), 'generados': 0, 'fallidos': 0}
+
+        for archivo in archivos:
+            try:
+                rutas = self.generate(archivo)
+            except Exception as e:
+                logger.warning(f"No se pudieron generar derivados del archivo {archivo.id}: {e}")
+                ReportArchivo.objects.filter(id=archivo.id).update(
+                    derivados_estado=ReportArchivo.DERIVADOS_ERROR, derivados_fecha=timezone.now()
+                )
+                stats['fallidos'] += 1
+                continue
+
+            ahora = timezone.now()
+            # fecha_actualizada cambia el ETag de los reportes que muestran el archivo
+            ReportArchivo.objects.filter(id=archivo.id).update(
+                derivados=rutas,
+                derivados_estado=ReportArchivo.DERIVADOS_LISTO,
+                derivados_fecha=ahora,
+                fecha_actualizada=ahora
+            )
+            stats['generados'] += 1
+
+        if stats['generados']:
+            # update() no emite post_save: el GeoJSON cacheado no tiene las miniaturas
+            geojson_cache.bump_version()
+        return stats
+
+    def run_pending(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """Reclama y procesa un bloque de imágenes pendientes"""
+        if not self.config['ENABLED']:
+            return self.process([])
+        archivos = self.claim_pending(limit)
+        stats = self.process(archivos)
+        if archivos:
+            logger.info(f"Derivados: {stats['generados']} generados, {stats['fallidos']} fallidos")
+        return stats
+
+
+# Instancia global del servicio
+derivative_service = DerivativeService()
@@ -0,0 +1,150 @@
+"""
+Exportación masiva de reportes en GeoJSON o GeoJSON por líneas (NDJSON).
+
+Pensada para analistas y SIG externos que necesitan todos los reportes, no
+la página del mapa:
+
+- Lee con `.values()` (sin instancias del modelo) y `.iterator()`, que en
+  PostgreSQL usa un cursor del lado del servidor: las filas llegan por lotes
+  de EXPORT_CHUNK_SIZE y la memoria no crece con la cantidad de reportes.
+- La geometría sale ya serializada de la base (ST_AsGeoJSON) y cada feature
+  se escribe como texto apenas se lee, así que la respuesta puede entregarse
+  con StreamingHttpResponse.
+- Acepta los mismos filtros del mapa (ReportService.apply_map_filters) más
+  `since`: solo los reportes creados o editados desde ese instante, para
+  descargas incrementales. Los reportes ocultos o eliminados no aparecen en
+  una descarga incremental. Los contadores (total_votos, total_seguidores,
+  total_comentarios) cambian con F() sin tocar fecha_actualizacion, por lo
+  que no son incrementales: un reporte solo votado o comentado desde `since`
+  no se vuelve a exportar; sus contadores se actualizan con una descarga
+  completa.
+
+    GET /api/reports/export/?format=ndjson&since=2025-01-01T00:00:00Z
+    python manage.py export_reports --format ndjson --since 2025-01-01 -o reportes.ndjson
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from reports.models import ReportModel
+from .report_service import ReportService
+
+FORMATO_GEOJSON = 'geojson'
+FORMATO_NDJSON = 'ndjson'
+FORMATOS = (FORMATO_GEOJSON, FORMATO_NDJSON)
+
+CONTENT_TYPES = {
+    FORMATO_GEOJSON: 'application/geo+json',
+    FORMATO_NDJSON: 'application/x-ndjson',
+}
+
+# Filas por viaje al cursor del servidor
+EXPORT_CHUNK_SIZE = 2000
+
+# Decimales de las coordenadas (7 ≈ 1 cm)
+PRECISION_COORDENADAS = 7
+
+# Columnas exportadas: nombre de la propiedad -> campo de values()
+CAMPOS_EXPORTADOS = {
+    'id': 'id',
+    'titulo': 'titulo',
+    'descripcion': 'descripcion',
+    'direccion': 'direccion',
+    'urgencia': 'urgencia',
+    'estado': 'denuncia_estado_id',
+    'estado_nombre': 'denuncia_estado__nombre',
+    'tipo_denuncia': 'tipo_denuncia_id',
+    'tipo_denuncia_nombre': 'tipo_denuncia__nombre',
+    'ciudad': 'ciudad_id',
+    'ciudad_nombre': 'ciudad__nombre',
+    'total_votos': 'total_votos',
+    'total_seguidores': 'total_seguidores',
+    'total_comentarios': 'total_comentarios',
+    'fecha_creacion': 'fecha_creacion',
+    'fecha_actualizacion': 'fecha_actualizacion',
+}
+
+
+class ReportExportService:
+    """Servicio de exportación masiva de reportes"""
+
+    @staticmethod
+    def parse_since(valor: Optional[str]) -> Optional[datetime]:
+        """
+        Instante ISO 8601 ("2025-01-01", "2025-01-01T10:00:00Z"); sin zona
+        horaria se interpreta en la zona del servidor. ValueError si no es válido.
+        """
+        if not valor:
+            return None
+        # fromisoformat no acepta el sufijo Z antes de Python 3.11
+        since = datetime.fromisoformat(valor.strip().replace('Z', '+00:00'))
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    @staticmethod
+    def get_queryset(
+        params,
+        usuario_id: Optional[int] = None,
+        since: Optional[datetime] = None
+    ) -> QuerySet:
+        """
+        Reportes a exportar como diccionarios, ordenados por fecha de
+        actualización e id (el orden en que conviene aplicarlos al importar).
+        """
+        queryset = ReportService.apply_map_filters(ReportModel.objects.all(), params, usuario_id)
+        if since is not None:
+            # auto_now también se fija al crear, así que cubre altas y ediciones
+            queryset = queryset.filter(fecha_actualizacion__gte=since)
+
+        return queryset.annotate(
+            geometria=AsGeoJSON('ubicacion', precision=PRECISION_COORDENADAS)
+        ).values(
+            'geometria', *CAMPOS_EXPORTADOS.values()
+        ).order_by('fecha_actualizacion', 'id')
+
+    @staticmethod
+    def iter_features(queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+        """Cada reporte como Feature GeoJSON serializado, sin salto de línea"""
+        for fila in queryset.iterator(chunk_size=chunk_size):
+            propiedades = {nombre: fila[campo] for nombre, campo in CAMPOS_EXPORTADOS.items()}
+            yield (
+                '{"type":"Feature","geometry":' + (fila['geometria'] or 'null') +
+                ',"properties":' + json.dumps(propiedades, cls=DjangoJSONEncoder, ensure_ascii=False) +
+                '}'
+            )
+
+    def stream(
+        self,
+        queryset: QuerySet,
+        formato: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> Iterator[str]:
+        """
+        Fragmentos de texto de la exportación. En GeoJSON es un único
+        FeatureCollection (con `metadata` al final); en NDJSON, un Feature por línea.
+        """
+        features = self.iter_features(queryset, chunk_size)
+
+        if formato == FORMATO_NDJSON:
+            for feature in features:
+                yield feature + '\n'
+            return
+
+        yield '{"type":"FeatureCollection","features":['
+        separador = ''
+        for feature in features:
+            yield separador + feature
+            separador = ','
+        yield '],"metadata":' + json.dumps(metadata or {}, cls=DjangoJSONEncoder, ensure_ascii=False) + '}\n'
+
+
+# Instancia global del servicio
+report_export_service = ReportExportService()
@@ -0,0 +1,189 @@
+"""
+Caché de respuestas de ReportGeoJSONView por conjunto de filtros.
+
+La mayoría de los usuarios abre el mapa con los mismos filtros (ciudad y
+valores por defecto), así que el GeoJSON se guarda una vez por combinación
+normalizada de filtros y se reutiliza entre usuarios:
+
+- La clave no incluye al usuario. Las propiedades que dependen de él
+  (`es_mi_reporte`) se guardan aparte (autor de cada feature) y se aplican
+  sobre la copia entregada en cada acierto.
+- Invalidación por versión: cualquier alta, edición, cambio de estado o
+  eliminación de un reporte (o de sus archivos) incrementa la versión al
+  confirmar la transacción; las claves anteriores dejan de usarse y expiran
+  por TTL.
+- Las peticiones con `my_reports=true` no se cachean (el resultado es del usuario).
+
+Configuración en settings.REPORTS_GEOJSON_CACHE:
+    ENABLED   Activa la caché (por defecto True)
+    ALIAS     Alias de settings.CACHES (por defecto 'default'). Con varios
+              procesos debe ser un backend compartido (p. ej. Redis) para que
+              la versión y las métricas sean comunes.
+    TTL       Vida de una respuesta en segundos (por defecto 120)
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reports.models import Ciudad, DenunciaEstado, ReportArchivo, ReportModel, TipoDenuncia
+
+logger = logging.getLogger('reports')
+
+CACHE_KEY_PREFIX = 'reports:geojson:'
+VERSION_KEY = CACHE_KEY_PREFIX + 'version'
+HITS_KEY = CACHE_KEY_PREFIX + 'hits'
+MISSES_KEY = CACHE_KEY_PREFIX + 'misses'
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TTL': 120,
+}
+
+# Filtros que aplica ReportService.apply_map_filters, según cómo se interpretan
+PARAMS_ENTEROS = ('urgencia', 'estado', 'tipo', 'ciudad')
+PARAMS_DECIMALES = ('center_lat', 'center_lng', 'radius')
+PARAMS_TEXTO = ('fecha_desde', 'fecha_hasta', 'bbox')
+
+
+class GeoJSONCache:
+    """Guarda y recupera el GeoJSON del mapa por filtros normalizados"""
+
+    @property
+    def config(self) -> dict:
+        return {**DEFAULT_CONFIG, **getattr(settings, 'REPORTS_GEOJSON_CACHE', {})}
+
+    @property
+    def backend(self):
+        return caches[self.config['ALIAS']]
+
+    def is_cacheable(self, params) -> bool:
+        return self.config['ENABLED'] and params.get('my_reports', '').lower() != 'true'
+
+    def normalize_params(self, params, limit: int) -> Dict[str, Any]:
+        """
+        Filtros en forma canónica: los valores que apply_map_filters ignoraría
+        se descartan y los equivalentes ("02" y "2", "Bache " y "bache")
+        producen la misma clave.
+        """
+        normalizados = {'limit': limit}
+        for param in PARAMS_ENTEROS:
+            try:
+                normalizados[param] = int(params.get(param))
+            except (TypeError, ValueError):
+                pass
+        for param in PARAMS_DECIMALES:
+            try:
+                normalizados[param] = float(params.get(param))
+            except (TypeError, ValueError):
+                pass
+        for param in PARAMS_TEXTO:
+            valor = (params.get(param) or '').strip()
+            if valor:
+                normalizados[param] = valor
+        search = ' '.join((params.get('search') or '').lower().split())
+        if search:
+            normalizados['search'] = search
+        return normalizados
+
+    def key(self, filtros: Dict[str, Any]) -> str:
+        """
+        Clave de los filtros en la versión vigente. Se calcula una vez por
+        petición y se usa para get y set: si la versión cambia mientras se
+        construye la respuesta, esta queda guardada bajo la versión anterior.
+        """
+        version = self.backend.get(VERSION_KEY, 0)
+        huella = hashlib.sha1(
+            json.dumps(filtros, sort_keys=True).encode('utf-8'), usedforsecurity=False
+        ).hexdigest()
+        return f'{CACHE_KEY_PREFIX}v{version}:{huella}'
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Entrada cacheada ({'features', 'autores'}) o None; registra acierto/fallo"""
+        entrada = self.backend.get(key)
+        self._count(HITS_KEY if entrada is not None else MISSES_KEY)
+        return entrada
+
+    def set(self, key: str, features: List[dict], autores: List[int]) -> None:
+        self.backend.set(key, {'features': features, 'autores': autores}, self.config['TTL'])
+
+    @staticmethod
+    def overlay(entrada: Dict[str, Any], usuario_id: int) -> List[dict]:
+        """Features de la entrada con las propiedades propias del usuario"""
+        return [
+            {**feature, 'properties': {**feature['properties'], 'es_mi_reporte': autor == usuario_id}}
+            for feature, autor in zip(entrada['features'], entrada['autores'])
+        ]
+
+    def bump_version(self) -> None:
+        """Invalida todas las respuestas cacheadas"""
+        backend = self.backend
+        try:
+            backend.incr(VERSION_KEY)
+        except ValueError:
+            # Sin versión previa (primer uso o desalojada por el backend)
+            if not backend.add(VERSION_KEY, 1, None):
+                backend.incr(VERSION_KEY)
+        logger.debug('Caché GeoJSON invalidada')
+
+    def stats(self) -> Dict[str, Any]:
+        """Aciertos, fallos y tasa de aciertos acumulados"""
+        valores = self.backend.get_many([HITS_KEY, MISSES_KEY, VERSION_KEY])
+        hits = valores.get(HITS_KEY, 0)
+        misses = valores.get(MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            'enabled': self.config['ENABLED'],
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else None,
+            'version': valores.get(VERSION_KEY, 0),
+            'ttl': self.config['TTL'],
+        }
+
+    def reset_stats(self) -> None:
+        self.backend.delete_many([HITS_KEY, MISSES_KEY])
+
+    def _count(self, key: str) -> None:
+        backend = self.backend
+        try:
+            backend.incr(key)
+        except ValueError:
+            if not backend.add(key, 1, None):
+                backend.incr(key)
+
+
+# Instancia global de la caché
+geojson_cache = GeoJSONCache()
+
+
+def _invalidar():
+    # Tras el commit: una lectura concurrente no debe volver a cachear datos previos
+    transaction.on_commit(geojson_cache.bump_version)
+
+
+@receiver(post_save, sender=ReportModel, dispatch_uid='geojson_cache_report_saved')
+@receiver(post_delete, sender=ReportModel, dispatch_uid='geojson_cache_report_deleted')
+@receiver(post_save, sender=ReportArchivo, dispatch_uid='geojson_cache_archivo_saved')
+@receiver(post_delete, sender=ReportArchivo, dispatch_uid='geojson_cache_archivo_deleted')
+def _invalidar_por_reporte(sender, raw=False, **kwargs):
+    """Alta, edición, cambio de estado o eliminación de reportes y sus archivos"""
+    if not raw:
+        _invalidar()
+
+
+@receiver(post_save, sender=DenunciaEstado, dispatch_uid='geojson_cache_estado_saved')
+@receiver(post_save, sender=TipoDenuncia, dispatch_uid='geojson_cache_tipo_saved')
+@receiver(post_save, sender=Ciudad, dispatch_uid='geojson_cache_ciudad_saved')
+def _invalidar_por_catalogo(sender, raw=False, **kwargs):
+    """Los nombres de estado, tipo y ciudad se copian en las propiedades"""
+    if not raw:
+        _invalidar()
@@ -0,0 +1,384 @@
+"""
+Recolector de archivos huérfanos en MEDIA_ROOT.
+
+Varias operaciones dejan archivos en disco sin ninguna fila que los use:
+create_report_with_files que falla a medias y elimina el reporte, los
+reportes eliminados (sus carpetas reports/<fecha>/<id>/ quedan vacías), las
+subidas reanudables cuyo registro ya no existe y los blobs que quedaron sin
+referencias. Los archivos desactivados (activo=False) tampoco se eliminan
+nunca. El recolector:
+
+1. Elimina los ReportArchivo inactivos hace más del período de gracia y sus
+   archivos (los de un blob solo liberan su referencia).
+2. Elimina los MediaBlob sin referencias hace más del período de gracia,
+   con su archivo, bloqueando la fila para no competir con una subida que
+   lo esté reutilizando (ver blob_store.store).
+3. Recorre ROOTS y el directorio de subidas temporales con os.scandir, por
+   bloques de BATCH_SIZE archivos, y consulta en bloque qué rutas siguen
+   referenciadas (ReportArchivo.archivo y derivados, MediaBlob.ruta,
+   ProyectoArchivosModel.proar_ruta, ReportUpload). Lo no referenciado y más
+   antiguo que el período de gracia se elimina o se mueve a cuarentena.
+4. Elimina las carpetas vacías y, en cuarentena, lo que ya cumplió la retención.
+
+El período de gracia es lo que permite correrlo junto a las subidas: un
+archivo recién escrito cuya fila aún no se confirma es más nuevo que el
+límite y no se toca.
+
+Configuración en settings.MEDIA_GC:
+    GRACE_PERIOD           Segundos antes de considerar un archivo huérfano o inactivo (por defecto 24h)
+    BATCH_SIZE             Rutas por consulta (por defecto 500)
+    ROOTS                  Carpetas de MEDIA_ROOT a recorrer (por defecto reports y blobs)
+    QUARANTINE_DIR         Destino de la cuarentena (por defecto MEDIA_ROOT/.quarantine)
+    QUARANTINE_RETENTION   Segundos que un archivo queda en cuarentena (por defecto 30 días)
+"""
+
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.deletion import ProtectedError
+from django.utils import timezone
+
+from reports.models import MediaBlob, ReportArchivo, ReportUpload
+from .derivative_service import VARIANTES
+from .upload_service import upload_service
+
+logger = logging.getLogger('reports')
+
+DEFAULT_CONFIG = {
+    'GRACE_PERIOD': 24 * 60 * 60,
+    'BATCH_SIZE': 500,
+    'ROOTS': ['reports', 'blobs'],
+    'QUARANTINE_DIR': None,
+    'QUARANTINE_RETENTION': 30 * 24 * 60 * 60,
+}
+
+# Sufijos de los derivados, del más largo al más corto (miniatura_webp antes que webp)
+SUFIJOS_DERIVADOS = sorted(VARIANTES, key=len, reverse=True)
+
+# (acción, ruta relativa, bytes) para listar lo que se elimina con --verbosity 2
+Reportar = Callable[[str, str, int], None]
+
+
+class MediaGarbageCollector:
+    """Detecta y elimina (o pone en cuarentena) archivos sin referencias"""
+
+    @property
+    def config(self) -> dict:
+        config = {**DEFAULT_CONFIG, **getattr(settings, 'MEDIA_GC', {})}
+        if not config['QUARANTINE_DIR']:
+            config['QUARANTINE_DIR'] = os.path.join(settings.MEDIA_ROOT, '.quarantine')
+        return config
+
+    def run(
+        self,
+        dry_run: bool = False,
+        quarantine: bool = False,
+        grace_period: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        reportar: Optional[Reportar] = None
+    ) -> Dict[str, int]:
+        """Ejecuta una pasada completa; con dry_run solo cuenta lo que haría"""
+        config = self.config
+        grace_period = config['GRACE_PERIOD'] if grace_period is None else grace_period
+        self._dry_run = dry_run
+        self._quarantine = quarantine
+        self._batch_size = batch_size or config['BATCH_SIZE']
+        self._reportar = reportar or (lambda accion, ruta, tamaño: None)
+        self._limite = timezone.now() - timedelta(seconds=grace_period)
+        self._limite_mtime = time.time() - grace_period
+
+        stats = {
+            'revisados': 0,
+            'huerfanos': 0,
+            'inactivos': 0,
+            'blobs': 0,
+            'bytes': 0,
+            'directorios': 0,
+            'cuarentena_purgados': 0,
+        }
+        self._purgar_inactivos(stats)
+        self._expirar_blobs(stats)
+
+        for raiz in config['ROOTS']:
+            directorio = os.path.join(settings.MEDIA_ROOT, raiz)
+            self._recolectar(directorio, self._referenciadas_media, stats)
+            stats['directorios'] += self._eliminar_directorios_vacios(directorio)
+        self._recolectar(upload_service.config['TEMP_DIR'], self._referenciadas_subidas, stats)
+
+        if not dry_run:
+            stats['cuarentena_purgados'] = self._purgar_cuarentena(config)
+
+        return stats
+
+    # ==================== FILAS ====================
+
+    def _purgar_inactivos(self, stats: Dict[str, int]) -> None:
+        """Elimina los archivos desactivados hace más del período de gracia"""
+        vencidos = ReportArchivo.objects.filter(
+            activo=False, fecha_actualizada__lt=self._limite
+        ).order_by('id').values_list('id', flat=True)
+
+        for ids in self._en_bloques(vencidos.iterator(chunk_size=self._batch_size)):
+            if self._dry_run:
+                for archivo in ReportArchivo.objects.filter(id__in=ids):
+                    stats['inactivos'] += 1
+                    stats['bytes'] += 0 if archivo.blob_id else archivo.tamaño_bytes
+                    self._reportar('inactivo', archivo.archivo.name, archivo.tamaño_bytes)
+                continue
+
+            with transaction.atomic():
+                # Otro recolector concurrente se salta las filas ya bloqueadas
+                archivos = list(
+                    ReportArchivo.objects.select_for_update(skip_locked=True).filter(
+                        id__in=ids, activo=False, fecha_actualizada__lt=self._limite
+                    )
+                )
+                for archivo in archivos:
+                    archivo.delete()
+
+            # Los archivos se desechan después de confirmar; si falla, quedan
+            # huérfanos y los toma la siguiente pasada
+            for archivo in archivos:
+                stats['inactivos'] += 1
+                self._reportar('inactivo', archivo.archivo.name, archivo.tamaño_bytes)
+                if archivo.blob_id:
+                    continue
+                for ruta in [archivo.archivo.name, *(archivo.derivados or {}).values()]:
+                    stats['bytes'] += self._desechar(ruta)
+
+    def _expirar_blobs(self, stats: Dict[str, int]) -> None:
+        """Elimina los blobs sin referencias hace más del período de gracia"""
+        vencidos = MediaBlob.objects.filter(
+            referencias=0, sin_referencias_desde__lt=self._limite
+        ).order_by('id').values_list('id', flat=True)
+
+        for blob_id in list(vencidos):
+            with transaction.atomic():
+                # Si una subida lo está reutilizando, la fila está bloqueada o ya
+                # no cumple el filtro (blob_store.store limpia sin_referencias_desde)
+                blob = MediaBlob.objects.select_for_update(skip_locked=True).filter(
+                    id=blob_id, referencias=0, sin_referencias_desde__lt=self._limite
+                ).first()
+                if blob is None:
+                    continue
+
+                stats['blobs'] += 1
+                self._reportar('blob', blob.ruta, blob.tamaño_bytes)
+                if self._dry_run:
+                    stats['bytes'] += blob.tamaño_bytes
+                    continue
+
+                try:
+                    # PROTECT: si aún hay filas que lo usan el conteo estaba desfasado
+                    blob.delete()
+                except ProtectedError:
+                    logger.warning(f"Blob {blob.id} sin referencias contadas pero en uso; se conserva")
+                    stats['blobs'] -= 1
+                    continue
+                # Con la fila aún bloqueada, para que nadie lo reutilice a medias
+                stats['bytes'] += self._desechar(blob.ruta)
+
+    # ==================== RECORRIDO ====================
+
+    def _recolectar(
+        self,
+        directorio: str,
+        referenciadas: Callable[[List[str]], Set[str]],
+        stats: Dict[str, int]
+    ) -> None:
+        """Recorre un directorio por bloques y desecha lo no referenciado y antiguo"""
+        for bloque in self._en_bloques(self._recorrer(directorio)):
+            stats['revisados'] += len(bloque)
+            antiguos = [
+                (ruta, info) for ruta, info in bloque
+                if info.st_mtime < self._limite_mtime
+            ]
+            if not antiguos:
+                continue
+
+            en_uso = referenciadas([ruta for ruta, _ in antiguos])
+            for ruta, info in antiguos:
+                if ruta in en_uso:
+                    continue
+                stats['huerfanos'] += 1
+                self._reportar('huerfano', ruta, info.st_size)
+                stats['bytes'] += info.st_size if self._dry_run else self._desechar(ruta)
+
+    def _recorrer(self, directorio: str) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        Archivos bajo `directorio` como (ruta relativa a MEDIA_ROOT, stat), sin
+        cargar el árbol completo en memoria.
+        """
+        pendientes = [directorio]
+        while pendientes:
+            actual = pendientes.pop()
+            try:
+                with os.scandir(actual) as entradas:
+                    for entrada in entradas:
+                        try:
+                            if entrada.is_dir(follow_symlinks=False):
+                                pendientes.append(entrada.path)
+                            elif entrada.is_file(follow_symlinks=False):
+                                yield self._relativa(entrada.path), entrada.stat(follow_symlinks=False)
+                        except FileNotFoundError:
+                            # Eliminado mientras se recorría
+                            continue
+            except FileNotFoundError:
+                continue
+
+    def _referenciadas_media(self, rutas: List[str]) -> Set[str]:
+        """Rutas del bloque que usa alguna fila (original, derivado, blob o proyecto)"""
+        en_uso = set(ReportArchivo.objects.filter(archivo__in=rutas).values_list('archivo', flat=True))
+        en_uso.update(MediaBlob.objects.filter(ruta__in=rutas).values_list('ruta', flat=True))
+
+        por_variante = defaultdict(list)
+        for ruta in rutas:
+            variante = self._variante(ruta)
+            if variante:
+                por_variante[variante].append(ruta)
+        for variante, candidatas in por_variante.items():
+            campo = f'derivados__{variante}'
+            en_uso.update(
+                ReportArchivo.objects.filter(**{f'{campo}__in': candidatas}).values_list(campo, flat=True)
+            )
+
+        if apps.is_installed('proyectos'):
+            # proar_ruta puede guardar la ruta relativa o la URL de MEDIA_URL
+            ProyectoArchivosModel = apps.get_model('proyectos', 'ProyectoArchivosModel')
+            candidatas = rutas + [f'{settings.MEDIA_URL}{ruta}' for ruta in rutas]
+            for ruta in ProyectoArchivosModel.objects.filter(
+                proar_ruta__in=candidatas
+            ).values_list('proar_ruta', flat=True):
+                en_uso.add(ruta[len(settings.MEDIA_URL):] if ruta.startswith(settings.MEDIA_URL) else ruta)
+
+        return en_uso
+
+    def _referenciadas_subidas(self, rutas: List[str]) -> Set[str]:
+        """Archivos parciales cuya subida reanudable aún existe"""
+        por_id = {}
+        for ruta in rutas:
+            nombre, extension = os.path.splitext(os.path.basename(ruta))
+            try:
+                if extension == '.part':
+                    por_id[uuid.UUID(hex=nombre)] = ruta
+            except ValueError:
+                continue
+        existentes = ReportUpload.objects.filter(id__in=list(por_id)).values_list('id', flat=True)
+        return {por_id[upload_id] for upload_id in existentes}
+
+    # ==================== LIMPIEZA ====================
+
+    def _desechar(self, ruta: str) -> int:
+        """Elimina o mueve a cuarentena una ruta relativa; retorna los bytes liberados"""
+        origen = self._absoluta(ruta)
+        try:
+            tamaño = os.stat(origen).st_size
+            if self._quarantine:
+                destino = os.path.join(self.config['QUARANTINE_DIR'], self._ruta_cuarentena(ruta))
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                shutil.move(origen, destino)
+                # La retención se cuenta desde que entra a cuarentena
+                os.utime(destino)
+            else:
+                os.remove(origen)
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"No se pudo desechar {ruta}: {e}")
+            return 0
+        return tamaño
+
+    def _eliminar_directorios_vacios(self, directorio: str, es_raiz: bool = True) -> int:
+        """Elimina las carpetas vacías (y antiguas) bajo `directorio`, de abajo hacia arriba"""
+        eliminados = 0
+        vacio = True
+        try:
+            with os.scandir(directorio) as entradas:
+                subdirectorios = []
+                for entrada in entradas:
+                    if entrada.is_dir(follow_symlinks=False):
+                        subdirectorios.append(entrada.path)
+                    else:
+                        vacio = False
+        except FileNotFoundError:
+            return 0
+
+        for subdirectorio in subdirectorios:
+            eliminados += self._eliminar_directorios_vacios(subdirectorio, es_raiz=False)
+            if os.path.isdir(subdirectorio):
+                vacio = False
+
+        if es_raiz or not vacio or self._dry_run:
+            return eliminados
+        try:
+            # Una carpeta recién creada puede estar por recibir una subida
+            if os.stat(directorio).st_mtime < self._limite_mtime:
+                os.rmdir(directorio)
+                eliminados += 1
+        except OSError:
+            # Recibió un archivo entre medio o ya no existe
+            pass
+        return eliminados
+
+    def _purgar_cuarentena(self, config: dict) -> int:
+        """Elimina lo que lleva en cuarentena más que QUARANTINE_RETENTION"""
+        limite = time.time() - config['QUARANTINE_RETENTION']
+        purgados = 0
+        for ruta, info in self._recorrer(config['QUARANTINE_DIR']):
+            if info.st_mtime < limite:
+                try:
+                    os.remove(self._absoluta(ruta))
+                    purgados += 1
+                except OSError:
+                    continue
+        return purgados
+
+    # ==================== AUXILIARES ====================
+
+    def _en_bloques(self, iterable: Iterable) -> Iterator[list]:
+        iterador = iter(iterable)
+        while True:
+            bloque = list(islice(iterador, self._batch_size))
+            if not bloque:
+                return
+            yield bloque
+
+    @staticmethod
+    def _variante(ruta: str) -> Optional[str]:
+        """Variante de derivado según el sufijo del nombre (foto_miniatura.jpg -> miniatura)"""
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        for variante in SUFIJOS_DERIVADOS:
+            if nombre.endswith(f'_{variante}'):
+                return variante
+        return None
+
+    @staticmethod
+    def _ruta_cuarentena(ruta: str) -> str:
+        """Ruta dentro de la cuarentena; lo que está fuera de MEDIA_ROOT va a externos/"""
+        ruta = os.path.normpath(ruta)
+        if ruta.startswith(os.pardir):
+            return os.path.join('externos', os.path.basename(ruta))
+        return ruta
+
+    @staticmethod
+    def _relativa(ruta: str) -> str:
+        """Ruta como la guarda el storage: relativa a MEDIA_ROOT y con '/'"""
+        return os.path.relpath(ruta, settings.MEDIA_ROOT).replace(os.sep, '/')
+
+    @staticmethod
+    def _absoluta(ruta: str) -> str:
+        return os.path.join(settings.MEDIA_ROOT, *ruta.split('/'))
+
+
+# Instancia global del servicio
+media_gc = MediaGarbageCollector()
@@ -1,6 +1,8 @@
 import logging
 from typing import Dict, Optional, Union
+from django.db import transaction
 from reports.models import ReportModel, Notification
+from notifications.models import NotificationCounter
 from domain.entities.usuario import Usuario
 
 logger = logging.getLogger('reports')
@@ -32,17 +34,8 @@ class NotificationService:
                     if usuario:
                         return usuario
                 
-                # Buscar por RUT - limpiar completamente (quitar puntos, guiones y espacios)
-                rut_limpio = identifier.replace('.', '').replace('-', '').replace(' ', '').lower()
-                
-                # Buscar todos los usuarios y comparar RUTs limpios
-                for usuario in Usuario.objects.all():
-                    rut_bd_limpio = usuario.usua_rut.replace('.', '').replace('-', '').replace(' ', '').lower()
-                    if rut_bd_limpio == rut_limpio:
-                        return usuario
-                
-                # Si no se encontró con comparación exacta, intentar con contains
-                return Usuario.objects.filter(usua_rut__icontains=rut_limpio).first()
+                # Buscar por RUT en cualquier formato (columna normalizada con índice único)
+                return Usuario.por_rut(identifier).first()
             
             return None
         except Exception as e:
@@ -78,13 +71,15 @@ class NotificationService:
                     logger.warning(f"No se encontró usuario para crear notificación: {titulo}")
                     return None
             
-            notificacion = Notification.objects.create(
-                usuario=usuario,
-                titulo=titulo,
-                mensaje=mensaje,
-                tipo=tipo,
-                denuncia=denuncia
-            )
+            with transaction.atomic():
+                notificacion = Notification.objects.create(
+                    usuario=usuario,
+                    titulo=titulo,
+                    mensaje=mensaje,
+                    tipo=tipo,
+                    denuncia=denuncia
+                )
+                NotificationCounter.registrar(usuario.usua_id, total=1, no_leidas=1)
             logger.info(f"Notificación creada: {titulo} para usuario {usuario.usua_nickname}")
             return notificacion
         except Exception as e:
@@ -1,28 +1,53 @@
 from typing import List, Optional, Dict, Any
 from django.db import transaction
-from django.db.models import Count, Max, QuerySet, Q
+from django.db.models import Count, F, Max, QuerySet, Q, Exists, OuterRef, Subquery, Prefetch, IntegerField
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError as DjangoValidationError, ValidationError
 from datetime import datetime, timedelta
 import base64
 import json
+import logging
 import mimetypes
 import os
 
 from reports.models import ReportModel, DenunciaEstado, TipoDenuncia, Ciudad, VotoReporte
+from reports.models.report import ubicacion_planar
 from reports.models.report_archivos import ReportArchivo
 from reports.models.seguimiento_reporte import SeguimientoReporte
 from reports.models.comentario_reporte import ComentarioReporte
 from reports.exceptions import ReportNotFoundException, ReportValidationException
 from .validation_service import validation_service
 from .notification_service import notification_service
+from .blob_store import blob_store
 from domain.entities.usuario import Usuario
 from django.utils import timezone
-from django.contrib.gis.geos import Point
+from django.contrib.gis.geos import GEOSException, Point, Polygon
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.db.models.lookups import BBOverlapsLookup
+from infrastructure.database import search as full_text
+from reports.utils.constants import SEARCH_FIELDS
+
+logger = logging.getLogger('reports')
+
+
+def _contar_por_reporte(model) -> Coalesce:
+    """Subconsulta correlacionada que cuenta las filas de `model` asociadas al reporte"""
+    conteo = model.objects.filter(
+        reporte=OuterRef('pk')
+    ).order_by().values('reporte').annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(conteo, output_field=IntegerField()), 0)
 
 
 class ReportService:
     """Servicio con toda la lógica de negocio de reportes"""
 
+    # Columnas que cambian el contenido serializado de un reporte. Los contadores
+    # se actualizan con F() sin tocar fecha_actualizacion, por eso se incluyen.
+    VERSION_FIELDS = (
+        'id', 'fecha_creacion', 'fecha_actualizacion', 'total_votos', 'total_seguidores',
+        'total_comentarios', 'archivos_total', 'archivos_actualizado'
+    )
+
     # Configuración para validación de archivos (solo imágenes y videos)
     ALLOWED_EXTENSIONS = {
         'imagen': ['jpg', 'jpeg', 'png', 'webp', 'gif', 'bmp'],
@@ -141,51 +166,99 @@ class ReportService:
             'videos_totales': total_videos
         }
 
+    @staticmethod
+    def prefetch_archivos_activos() -> Prefetch:
+        """
+        Precarga de los archivos activos (mismo orden que get_archivos_activos)
+        en `archivos_activos_cache`
+        """
+        archivos_activos = ReportArchivo.objects.filter(
+            activo=True
+        ).order_by('orden', 'fecha_subida')
+        return Prefetch('archivos', queryset=archivos_activos, to_attr='archivos_activos_cache')
+
+    @staticmethod
+    def _with_serialization_data(queryset: QuerySet, usuario_id: Optional[int] = None) -> QuerySet:
+        """
+        Prepara un queryset de reportes para serializarlo en lote.
+
+        Anota los flags del usuario (voto y seguimiento) y precarga los archivos
+        activos, de modo que _serialize_report no ejecute consultas adicionales
+        por reporte. Los conteos vienen de los contadores del propio reporte.
+        """
+        queryset = queryset.select_related(
+            'usuario', 'denuncia_estado', 'tipo_denuncia', 'ciudad'
+        ).prefetch_related(ReportService.prefetch_archivos_activos())
+
+        if usuario_id:
+            queryset = queryset.annotate(
+                usuario_ha_votado=Exists(VotoReporte.objects.filter(
+                    reporte=OuterRef('pk'), usuario_id=usuario_id
+                )),
+                usuario_sigue=Exists(SeguimientoReporte.objects.filter(
+                    reporte=OuterRef('pk'), usuario_id=usuario_id
+                ))
+            )
+
+        return queryset
+
     @staticmethod
     def _serialize_report(report: ReportModel, usuario_id: Optional[int] = None) -> Dict[str, Any]:
-        """Serializa un reporte con solo los campos especificados para archivos"""
+        """
+        Serializa un reporte con solo los campos especificados para archivos.
+
+        Si el reporte viene de _with_serialization_data usa los datos anotados y
+        precargados; en caso contrario los consulta individualmente.
+        """
         coordinates = report.get_coordinates()
 
         # Obtener archivos usando la nueva relación
-        archivos_data = []
-        archivos = report.get_archivos_activos()
+        archivos = getattr(report, 'archivos_activos_cache', None)
+        if archivos is None:
+            archivos = report.get_archivos_activos()
+            # Obtener estadísticas de archivos
+            stats = report.contar_archivos()
+        else:
+            stats = {
+                'total': len(archivos),
+                'imagenes': sum(1 for archivo in archivos if archivo.tipo_archivo == 'imagen'),
+                'videos': sum(1 for archivo in archivos if archivo.tipo_archivo == 'video')
+            }
 
+        archivos_data = []
         for archivo in archivos:
             archivos_data.append({
                 'id': archivo.id,
                 'nombre': archivo.nombre_original,
                 'url': archivo.url,
+                'derivados': archivo.derivados_urls,
                 'tipo': archivo.tipo_archivo,
                 'mime_type': archivo.mime_type,
                 'es_principal': archivo.es_principal,
                 'orden': archivo.orden
             })
 
-        # Obtener estadísticas de archivos
-        stats = report.contar_archivos()
-
-        # Obtener información de votos
-        votos_count = VotoReporte.objects.filter(reporte=report).count()
         usuario_ha_votado = False
-        if usuario_id:
-            usuario_ha_votado = VotoReporte.objects.filter(
-                reporte=report,
-                usuario_id=usuario_id
-            ).exists()
-
-        # Verificar si el usuario está siguiendo este reporte
         is_following = False
         if usuario_id:
-            try:
-                usuario = Usuario.objects.get(usua_id=usuario_id)
-                is_following = SeguimientoReporte.esta_siguiendo_reporte(
-                    usuario, report)
-            except Usuario.DoesNotExist:
-                pass
-
-        # Obtener contador de comentarios
-        comentarios_count = ComentarioReporte.objects.filter(
-            reporte=report).count()
+            if hasattr(report, 'usuario_ha_votado'):
+                usuario_ha_votado = report.usuario_ha_votado
+            else:
+                usuario_ha_votado = VotoReporte.objects.filter(
+                    reporte=report,
+                    usuario_id=usuario_id
+                ).exists()
+
+            # Verificar si el usuario está siguiendo este reporte
+            if hasattr(report, 'usuario_sigue'):
+                is_following = report.usuario_sigue
+            else:
+                try:
+                    usuario = Usuario.objects.get(usua_id=usuario_id)
+                    is_following = SeguimientoReporte.esta_siguiendo_reporte(
+                        usuario, report)
+                except Usuario.DoesNotExist:
+                    pass
 
         return {
             'id': report.id,
@@ -231,14 +304,14 @@ class ReportService:
                 'puede_agregar_videos': stats.get('videos', 0) < ReportService.MAX_VIDEOS_PER_REPORT
             },
             'votos': {
-                'count': votos_count,
+                'count': report.total_votos,
                 'usuario_ha_votado': usuario_ha_votado
             },
             'seguimiento': {
                 'is_following': is_following,
-                'seguidores_count': SeguimientoReporte.objects.filter(reporte=report).count()
+                'seguidores_count': report.total_seguidores
             },
-            'comentarios_count': comentarios_count
+            'comentarios_count': report.total_comentarios
         }
 
     @staticmethod
@@ -304,10 +377,12 @@ class ReportService:
                 if es_principal:
                     primer_imagen_agregada = True
 
-                # Crear ReportArchivo
+                # Crear ReportArchivo (un contenido repetido reutiliza su blob)
+                blob = blob_store.store(archivo, validation['extension'])
                 report_archivo = ReportArchivo(
                     reporte=report,
-                    archivo=archivo,
+                    archivo=blob.ruta,
+                    blob=blob,
                     nombre_original=archivo.name,
                     tipo_archivo=validation['tipo_archivo'],
                     extension=validation['extension'],
@@ -322,24 +397,21 @@ class ReportService:
         return report
 
     @staticmethod
-    def get_reports_with_cursor_pagination(
-        cursor: Optional[str] = None,
-        limit: int = 10,
-        filters: Optional[Dict] = None,
-        usuario_id: Optional[int] = None
-    ) -> Dict[str, Any]:
-        """Obtiene reportes con paginación usando la nueva estructura"""
-        # Construir queryset base
-        queryset = ReportModel.objects.select_related(
-            'usuario', 'denuncia_estado', 'tipo_denuncia', 'ciudad'
-        ).prefetch_related('archivos')
-
+    def _cursor_queryset(queryset: QuerySet, cursor: Optional[str], filters: Optional[Dict]):
+        """
+        Aplica filtros, orden y posición del cursor del listado de reportes.
+        Retorna (queryset, ordenado_por_relevancia).
+        """
         # Aplicar filtros si existen
         if filters:
             queryset = ReportService._apply_filters(queryset, filters)
 
-        # Aplicar ordenamiento
-        queryset = queryset.order_by('-id')
+        # Aplicar ordenamiento: por relevancia si hubo búsqueda de texto, si no por id
+        ranked = 'rank' in queryset.query.annotations
+        if ranked:
+            queryset = queryset.order_by('-rank', '-id')
+        else:
+            queryset = queryset.order_by('-id')
 
         # Decodificar cursor si existe
         cursor_data = None
@@ -351,16 +423,136 @@ class ReportService:
                 cursor_data = None
 
         # Aplicar filtro de cursor
-        if cursor_data and 'id' in cursor_data:
+        if cursor_data and 'id' in cursor_data and ranked and 'rank' in cursor_data:
+            # Keyset sobre (rank, id) para los resultados de búsqueda
+            rank = cursor_data['rank']
+            if cursor_data.get('direction') == 'next':
+                queryset = queryset.filter(
+                    Q(rank__lt=rank) | Q(rank=rank, id__lt=cursor_data['id']))
+            elif cursor_data.get('direction') == 'prev':
+                queryset = queryset.filter(
+                    Q(rank__gt=rank) | Q(rank=rank, id__gt=cursor_data['id'])).order_by('rank', 'id')
+        elif cursor_data and 'id' in cursor_data:
             if cursor_data.get('direction') == 'next':
                 queryset = queryset.filter(id__lt=cursor_data['id'])
             elif cursor_data.get('direction') == 'prev':
                 queryset = queryset.filter(
                     id__gt=cursor_data['id']).order_by('id')
 
+        return queryset, ranked
+
+    @staticmethod
+    def get_reports_version(
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        usuario_id: Optional[int] = None
+    ):
+        """
+        Versión de la página que retornaría get_reports_with_cursor_pagination,
+        para el ETag: una consulta de solo columnas sobre las mismas filas, sin
+        relaciones ni serialización.
+        """
+        return list(ReportService._version_queryset(cursor, limit, filters, usuario_id))
+
+    @staticmethod
+    async def aget_reports_version(
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        usuario_id: Optional[int] = None
+    ):
+        """get_reports_version con el ORM async (vistas ASGI)"""
+        return [fila async for fila in ReportService._version_queryset(cursor, limit, filters, usuario_id)]
+
+    @staticmethod
+    def _version_queryset(cursor, limit, filters, usuario_id) -> QuerySet:
+        queryset = ReportModel.objects.all()
+        if usuario_id:
+            queryset = queryset.annotate(
+                usuario_ha_votado=Exists(VotoReporte.objects.filter(
+                    reporte=OuterRef('pk'), usuario_id=usuario_id
+                )),
+                usuario_sigue=Exists(SeguimientoReporte.objects.filter(
+                    reporte=OuterRef('pk'), usuario_id=usuario_id
+                ))
+            )
+        queryset, ranked = ReportService._cursor_queryset(
+            ReportService.with_version_fields(queryset), cursor, filters
+        )
+        campos = list(ReportService.VERSION_FIELDS)
+        if usuario_id:
+            campos += ['usuario_ha_votado', 'usuario_sigue']
+        if ranked:
+            campos.append('rank')
+
+        return queryset.values_list(*campos)[:limit + 1]
+
+    @staticmethod
+    def with_version_fields(queryset: QuerySet) -> QuerySet:
+        """Anota la cantidad y última modificación de los archivos activos de cada reporte"""
+        archivos = ReportArchivo.objects.filter(
+            reporte=OuterRef('pk'), activo=True
+        ).order_by().values('reporte')
+        return queryset.annotate(
+            archivos_total=Coalesce(Subquery(
+                archivos.annotate(total=Count('id')).values('total'), output_field=IntegerField()
+            ), 0),
+            archivos_actualizado=Subquery(
+                archivos.annotate(ultimo=Max('fecha_actualizada')).values('ultimo')
+            )
+        )
+
+    @staticmethod
+    def get_report_version(report_id: int):
+        """
+        Fila de versión de un reporte (VERSION_FIELDS + visible, usuario_id) para
+        ETag del detalle, o None si no existe.
+        """
+        return ReportService.with_version_fields(
+            ReportModel.objects.filter(id=report_id)
+        ).values_list(*ReportService.VERSION_FIELDS, 'visible', 'usuario_id').first()
+
+    @staticmethod
+    def get_reports_with_cursor_pagination(
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        usuario_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Obtiene reportes con paginación usando la nueva estructura"""
+        queryset, ranked = ReportService._page_queryset(cursor, filters, usuario_id)
+
         # Obtener un registro extra para verificar si hay más datos
         reports = list(queryset[:limit + 1])
+        return ReportService._build_page(reports, limit, ranked, usuario_id)
+
+    @staticmethod
+    async def aget_reports_with_cursor_pagination(
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        usuario_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        get_reports_with_cursor_pagination con el ORM async (vistas ASGI). La
+        serialización no consulta la base: todo viene anotado y precargado.
+        """
+        queryset, ranked = ReportService._page_queryset(cursor, filters, usuario_id)
+        reports = [report async for report in queryset[:limit + 1]]
+        return ReportService._build_page(reports, limit, ranked, usuario_id)
+
+    @staticmethod
+    def _page_queryset(cursor, filters, usuario_id):
+        # Construir queryset base con contadores y archivos precargados
+        return ReportService._cursor_queryset(
+            ReportService._with_serialization_data(ReportModel.objects.all(), usuario_id),
+            cursor,
+            filters
+        )
 
+    @staticmethod
+    def _build_page(reports, limit, ranked, usuario_id) -> Dict[str, Any]:
         # Verificar si hay más datos
         has_more = len(reports) > limit
         if has_more:
@@ -376,6 +568,8 @@ class ReportService:
                     'id': reports[-1].id,
                     'direction': 'next'
                 }
+                if ranked:
+                    next_cursor_data['rank'] = reports[-1].rank
                 next_cursor = base64.b64encode(
                     json.dumps(next_cursor_data).encode('utf-8')
                 ).decode('utf-8')
@@ -384,6 +578,8 @@ class ReportService:
                 'id': reports[0].id,
                 'direction': 'prev'
             }
+            if ranked:
+                prev_cursor_data['rank'] = reports[0].rank
             prev_cursor = base64.b64encode(
                 json.dumps(prev_cursor_data).encode('utf-8')
             ).decode('utf-8')
@@ -405,6 +601,51 @@ class ReportService:
             }
         }
 
+    @staticmethod
+    def reconcile_counters(batch_size: int = 1000, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Compara los contadores desnormalizados con el conteo real y corrige
+        los reportes con diferencias. Recorre la tabla en lotes por id.
+        """
+        revisados = 0
+        corregidos = 0
+        ultimo_id = 0
+
+        while True:
+            ids = list(
+                ReportModel.objects.filter(id__gt=ultimo_id)
+                .order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            ultimo_id = ids[-1]
+            revisados += len(ids)
+
+            con_diferencias = ReportModel.objects.filter(id__in=ids).annotate(
+                real_votos=_contar_por_reporte(VotoReporte),
+                real_seguidores=_contar_por_reporte(SeguimientoReporte),
+                real_comentarios=_contar_por_reporte(ComentarioReporte)
+            ).filter(
+                ~Q(total_votos=F('real_votos')) |
+                ~Q(total_seguidores=F('real_seguidores')) |
+                ~Q(total_comentarios=F('real_comentarios'))
+            ).values_list('id', 'real_votos', 'real_seguidores', 'real_comentarios')
+
+            for report_id, votos, seguidores, comentarios in con_diferencias:
+                corregidos += 1
+                logger.warning(
+                    f"Contadores desfasados en reporte #{report_id}: "
+                    f"votos={votos} seguidores={seguidores} comentarios={comentarios}"
+                )
+                if not dry_run:
+                    ReportModel.objects.filter(id=report_id).update(
+                        total_votos=votos,
+                        total_seguidores=seguidores,
+                        total_comentarios=comentarios
+                    )
+
+        return {'revisados': revisados, 'corregidos': corregidos}
+
     @staticmethod
     def _apply_filters(queryset: QuerySet, filters: Dict) -> QuerySet:
         """Aplica filtros al queryset"""
@@ -427,15 +668,103 @@ class ReportService:
             queryset = queryset.filter(usuario_id=filters['usuario_id'])
 
         if 'search' in filters:
-            search_term = filters['search']
-            queryset = queryset.filter(
-                Q(titulo__icontains=search_term) |
-                Q(descripcion__icontains=search_term) |
-                Q(direccion__icontains=search_term)
-            )
+            # Texto completo con prefijos; anota `rank` en PostgreSQL
+            queryset = full_text.search(queryset, filters['search'], SEARCH_FIELDS)
 
         return queryset
 
+    @staticmethod
+    def build_map_filters(params, usuario_id: Optional[int] = None) -> Q:
+        """
+        Construye los filtros de las vistas de mapa (GeoJSON, clusters) a partir
+        de los parámetros del request. Los valores inválidos se ignoran.
+        """
+        filters = Q(visible=True)  # Solo reportes visibles por defecto
+
+        # Filtro por usuario (opcional - para ver solo mis reportes)
+        if params.get('my_reports', '').lower() == 'true':
+            filters &= Q(usuario_id=usuario_id)
+
+        # Filtros numéricos: urgencia, estado, tipo de denuncia y ciudad
+        campos_numericos = {
+            'urgencia': 'urgencia',
+            'estado': 'denuncia_estado_id',
+            'tipo': 'tipo_denuncia_id',
+            'ciudad': 'ciudad_id'
+        }
+        for param, campo in campos_numericos.items():
+            if params.get(param):
+                try:
+                    filters &= Q(**{campo: int(params.get(param))})
+                except ValueError:
+                    pass
+
+        # Filtro por búsqueda de texto
+        search = params.get('search')
+        if search:
+            filters &= full_text.search_filter(search, SEARCH_FIELDS)
+
+        # Filtro por rango de fechas
+        fecha_desde = params.get('fecha_desde')
+        fecha_hasta = params.get('fecha_hasta')
+        if fecha_desde:
+            try:
+                fecha_desde_obj = datetime.fromisoformat(fecha_desde.replace('Z', '+00:00'))
+                filters &= Q(fecha_creacion__gte=fecha_desde_obj)
+            except ValueError:
+                pass
+        if fecha_hasta:
+            try:
+                fecha_hasta_obj = datetime.fromisoformat(fecha_hasta.replace('Z', '+00:00'))
+                filters &= Q(fecha_creacion__lte=fecha_hasta_obj)
+            except ValueError:
+                pass
+
+        # Filtro por área geográfica (bounding box)
+        bbox = params.get('bbox')  # formato: "minLng,minLat,maxLng,maxLat"
+        if bbox:
+            try:
+                coords = [float(x) for x in bbox.split(',')]
+                if len(coords) == 4:
+                    # Caja plana en grados (no geography: sus bordes serían
+                    # arcos de círculo máximo); usa reportes_ubic_geom_gist
+                    envolvente = Polygon.from_bbox(coords)
+                    envolvente.srid = 4326
+                    filters &= Q(BBOverlapsLookup(ubicacion_planar(), envolvente))
+            except (ValueError, IndexError, GEOSException):
+                pass
+
+        return filters
+
+    @staticmethod
+    def apply_map_filters(queryset: QuerySet, params, usuario_id: Optional[int] = None) -> QuerySet:
+        """
+        Aplica los filtros de mapa y, si se indica centro y radio (en metros),
+        el filtro de proximidad anotando `distance` en cada reporte. Con
+        búsqueda de texto anota además `rank` (relevancia).
+        """
+        queryset = queryset.filter(ReportService.build_map_filters(params, usuario_id))
+
+        if params.get('search'):
+            queryset = full_text.annotate_rank(queryset, params.get('search'))
+
+        center_lat = params.get('center_lat')
+        center_lng = params.get('center_lng')
+        radius = params.get('radius')  # en metros
+
+        if center_lat and center_lng and radius:
+            try:
+                center_point = Point(float(center_lng), float(center_lat))
+                radius_meters = float(radius)
+                queryset = queryset.annotate(
+                    distance=Distance('ubicacion', center_point)
+                ).filter(distance__lte=radius_meters)
+            except (ValueError, TypeError):
+                pass
+
+        return queryset
+
+
 
 # Instancia global del servicio
 report_service = ReportService()
@@ -0,0 +1,131 @@
+from typing import List, Optional, Tuple
+
+from django.db import connection
+from django.db.models import QuerySet
+
+from reports.models import TipoDenuncia
+from reports.utils.constants import (
+    MARKER_COLORS, DEFAULT_MARKER_COLOR, MARKER_SIZES, DEFAULT_MARKER_SIZE,
+    MARKER_SYMBOLS, DEFAULT_MARKER_SYMBOL, NO_TYPE_MARKER_SYMBOL
+)
+
+
+class TileService:
+    """
+    Genera teselas vectoriales (Mapbox Vector Tiles) de reportes con PostGIS.
+
+    Las propiedades de estilo (color, tamaño y símbolo del marcador) se
+    calculan en SQL a partir de las mismas constantes que usa la vista GeoJSON.
+    """
+
+    LAYER_NAME = 'reportes'
+    EXTENT = 4096
+    BUFFER = 64
+    MAX_ZOOM = 22
+
+    CONTENT_TYPE = 'application/vnd.mapbox-vector-tile'
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Las teselas requieren PostGIS (ST_AsMVT)"""
+        return connection.vendor == 'postgresql'
+
+    @staticmethod
+    def is_valid_tile(z: int, x: int, y: int) -> bool:
+        """Valida que las coordenadas correspondan a una tesela existente"""
+        if z < 0 or z > TileService.MAX_ZOOM:
+            return False
+        limite = 2 ** z
+        return 0 <= x < limite and 0 <= y < limite
+
+    @staticmethod
+    def render_tile(queryset: QuerySet, z: int, x: int, y: int,
+                    usuario_id: Optional[int] = None) -> bytes:
+        """Renderiza la tesela z/x/y con los reportes del queryset filtrado"""
+        inner_sql, inner_params = queryset.order_by().values('pk').query.sql_with_params()
+        tabla_reportes = queryset.model._meta.db_table
+        tabla_tipos = TipoDenuncia._meta.db_table
+
+        color_sql, color_params = TileService._case_urgencia(MARKER_COLORS, DEFAULT_MARKER_COLOR)
+        size_sql, size_params = TileService._case_urgencia(MARKER_SIZES, DEFAULT_MARKER_SIZE)
+        symbol_sql, symbol_params = TileService._case_simbolo()
+
+        sql = f"""
+            WITH bounds AS (
+                SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+            ),
+            mvtgeom AS (
+                SELECT
+                    ST_AsMVTGeom(
+                        ST_Transform(r.ubicacion::geometry, 3857),
+                        bounds.geom, %s, %s, true
+                    ) AS geom,
+                    r.id,
+                    r.titulo,
+                    r.urgencia,
+                    r.denuncia_estado_id AS estado,
+                    r.tipo_denuncia_id AS tipo_denuncia,
+                    r.ciudad_id AS ciudad,
+                    (r.usuario_id = %s) AS es_mi_reporte,
+                    {color_sql} AS marker_color,
+                    {size_sql} AS marker_size,
+                    {symbol_sql} AS marker_symbol
+                FROM "{tabla_reportes}" r
+                LEFT JOIN "{tabla_tipos}" t ON t.id = r.tipo_denuncia_id
+                CROSS JOIN bounds
+                -- Caja plana (ver ubicacion_planar): como geography, la envolvente
+                -- de z=0/z=1 cruza el antimeridiano y deja fuera a Chile
+                WHERE r.ubicacion::geometry(Point,4326) && ST_Transform(ST_Expand(
+                    bounds.geom,
+                    (ST_XMax(bounds.geom) - ST_XMin(bounds.geom)) * %s / %s
+                ), 4326)
+                  AND r.id IN ({inner_sql})
+            )
+            SELECT ST_AsMVT(mvtgeom.*, %s, %s, 'geom') FROM mvtgeom
+        """
+        params = [
+            z, x, y,
+            TileService.EXTENT, TileService.BUFFER,
+            usuario_id,
+            *color_params,
+            *size_params,
+            *symbol_params,
+            TileService.BUFFER, TileService.EXTENT,
+            *inner_params,
+            TileService.LAYER_NAME, TileService.EXTENT,
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+
+        return bytes(row[0]) if row and row[0] is not None else b''
+
+    @staticmethod
+    def _case_urgencia(mapa: dict, default: str) -> Tuple[str, List]:
+        """Expresión CASE sobre la urgencia equivalente a un dict.get()"""
+        partes = ['CASE r.urgencia']
+        params = []
+        for urgencia, valor in mapa.items():
+            partes.append('WHEN %s THEN %s')
+            params.extend([urgencia, valor])
+        partes.append('ELSE %s END')
+        params.append(default)
+        return ' '.join(partes), params
+
+    @staticmethod
+    def _case_simbolo() -> Tuple[str, List]:
+        """Expresión CASE equivalente a get_marker_symbol() sobre el tipo de denuncia"""
+        partes = ["CASE WHEN t.nombre IS NULL OR t.nombre = '' THEN %s"]
+        params = [NO_TYPE_MARKER_SYMBOL]
+        for palabras, simbolo in MARKER_SYMBOLS:
+            condiciones = ' OR '.join(['strpos(lower(t.nombre), %s) > 0'] * len(palabras))
+            partes.append(f'WHEN {condiciones} THEN %s')
+            params.extend([*palabras, simbolo])
+        partes.append('ELSE %s END')
+        params.append(DEFAULT_MARKER_SYMBOL)
+        return ' '.join(partes), params
+
+
+# Instancia global del servicio
+tile_service = TileService()
@@ -0,0 +1,425 @@
+"""
+Subidas reanudables de archivos de reportes (protocolo al estilo tus).
+
+Los videos pueden pesar hasta 100MB (ReportService.MAX_FILE_SIZES) y en redes
+móviles una conexión cortada obligaba a repetir la subida completa. Con este
+protocolo el cliente:
+
+1. Crea una sesión declarando nombre y tamaño:
+       POST /api/reports/<id>/uploads/            -> 201, id de la subida
+2. Envía el archivo por fragmentos indicando el offset en que empieza cada uno:
+       PATCH /api/reports/uploads/<uuid>/         Upload-Offset: 0
+   Si la conexión se corta, consulta cuántos bytes llegaron y continúa:
+       HEAD/GET /api/reports/uploads/<uuid>/      -> Upload-Offset: n
+3. Finaliza: el archivo ensamblado pasa al blob store (reports.services.blob_store)
+   y se adjunta al reporte como ReportArchivo, validando los límites por
+   reporte (validate_files_limits).
+       POST /api/reports/uploads/<uuid>/complete/
+
+Cada fragmento se escribe en disco a medida que llega (sin cargarlo entero en
+memoria) y alimenta el SHA-256 del archivo, que se calcula de forma
+incremental. El estado del hash vive en el proceso que recibió el fragmento
+anterior; si el siguiente llega a otro proceso, se reconstruye leyendo la
+parte ya recibida. Un fragmento puede traer `Upload-Checksum: sha256 <base64>`
+y la sesión un SHA-256 del archivo completo; si no coinciden, se descarta.
+
+Configuración en settings.REPORT_UPLOADS:
+    TEMP_DIR         Directorio de los archivos parciales (por defecto MEDIA_ROOT/uploads_tmp).
+                     Con varios servidores debe ser un volumen compartido.
+    MAX_CHUNK_SIZE   Bytes máximos por fragmento (por defecto 8MB)
+    EXPIRATION       Segundos que una sesión puede quedar sin terminar (por defecto 24h)
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import re
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre solicitudes concurrentes
+    fcntl = None
+
+from reports.exceptions import ReportUploadException
+from reports.models import ReportArchivo, ReportModel, ReportUpload
+from .blob_store import blob_store
+from .report_service import ReportService
+
+logger = logging.getLogger('reports')
+
+DEFAULT_CONFIG = {
+    'TEMP_DIR': None,
+    'MAX_CHUNK_SIZE': 8 * 1024 * 1024,
+    'EXPIRATION': 24 * 60 * 60,
+}
+
+# Bytes leídos del request por iteración
+BLOQUE_LECTURA = 64 * 1024
+
+# Hashes en curso conservados por proceso
+MAX_HASHES_EN_MEMORIA = 256
+
+SHA256_HEX = re.compile(r'^[0-9a-f]{64}$')
+
+# Lo mínimo que validate_file y validate_files_limits leen de un archivo
+ArchivoDeclarado = namedtuple('ArchivoDeclarado', ['name', 'size'])
+
+
+class _ArchivoEnsamblado(File):
+    """
+    Archivo temporal ya completo. Con temporary_file_path() el storage de
+    archivos lo mueve a su ubicación final en vez de copiarlo.
+    """
+
+    def __init__(self, ruta: str, nombre: str):
+        super().__init__(open(ruta, 'rb'), name=nombre)
+        self._ruta = ruta
+
+    def temporary_file_path(self) -> str:
+        return self._ruta
+
+
+class ResumableUploadService:
+    """Sesiones de subida reanudable y ensamblado de sus fragmentos"""
+
+    def __init__(self):
+        # id de subida -> (offset, hash) del último fragmento recibido en este proceso
+        self._hashes = OrderedDict()
+
+    @property
+    def config(self) -> dict:
+        config = {**DEFAULT_CONFIG, **getattr(settings, 'REPORT_UPLOADS', {})}
+        if not config['TEMP_DIR']:
+            config['TEMP_DIR'] = os.path.join(settings.MEDIA_ROOT, 'uploads_tmp')
+        return config
+
+    def ruta_temporal(self, subida: ReportUpload) -> str:
+        return os.path.join(self.config['TEMP_DIR'], f'{subida.id.hex}.part')
+
+    # ==================== SESIONES ====================
+
+    def create(
+        self,
+        reporte: ReportModel,
+        usuario_id: int,
+        nombre: str,
+        tamaño: int,
+        checksum: str = ''
+    ) -> ReportUpload:
+        """Abre una sesión para un archivo de `tamaño` bytes"""
+        if tamaño <= 0:
+            raise ReportUploadException('El tamaño del archivo debe ser mayor que 0')
+
+        declarado = ArchivoDeclarado(nombre, tamaño)
+        validacion = ReportService.validate_file(declarado)
+        if not validacion['valid']:
+            raise ReportUploadException(validacion['error'])
+
+        checksum = (checksum or '').lower()
+        if checksum and not SHA256_HEX.match(checksum):
+            raise ReportUploadException('checksum debe ser un SHA-256 en hexadecimal')
+
+        # Se valida también al finalizar; aquí evita subir un archivo que no cabe
+        limites = ReportService.validate_files_limits([declarado], reporte.id)
+        if not limites['valid']:
+            raise ReportUploadException(limites['error'])
+
+        subida = ReportUpload.objects.create(
+            reporte=reporte,
+            usuario_id=usuario_id,
+            nombre_original=os.path.basename(nombre)[:255],
+            tipo_archivo=validacion['tipo_archivo'],
+            extension=validacion['extension'],
+            tamaño_bytes=tamaño,
+            checksum_declarado=checksum,
+            expira_en=timezone.now() + timedelta(seconds=self.config['EXPIRATION'])
+        )
+        os.makedirs(self.config['TEMP_DIR'], exist_ok=True)
+        open(self.ruta_temporal(subida), 'wb').close()
+        return subida
+
+    def get(self, upload_id, usuario_id: int) -> ReportUpload:
+        """Sesión del usuario; 404 si no existe, 410 si expiró o se canceló"""
+        try:
+            subida = ReportUpload.objects.select_related('archivo').get(id=upload_id, usuario_id=usuario_id)
+        except ReportUpload.DoesNotExist:
+            raise ReportUploadException('Subida no encontrada', 404)
+
+        if subida.estado == ReportUpload.ESTADO_CANCELADA:
+            raise ReportUploadException('La subida fue cancelada', 410)
+        if subida.estado == ReportUpload.ESTADO_ACTIVA and subida.expira_en < timezone.now():
+            raise ReportUploadException('La subida expiró', 410)
+        return subida
+
+    def cancel(self, subida: ReportUpload) -> None:
+        if subida.estado != ReportUpload.ESTADO_ACTIVA:
+            raise ReportUploadException('La subida ya fue finalizada', 409)
+        # Condicionado al estado: una finalización concurrente ya usa el parcial
+        canceladas = ReportUpload.objects.filter(
+            id=subida.id, estado=ReportUpload.ESTADO_ACTIVA
+        ).update(estado=ReportUpload.ESTADO_CANCELADA, fecha_actualizacion=timezone.now())
+        if not canceladas:
+            raise ReportUploadException('La subida ya fue finalizada', 409)
+        self._descartar(subida)
+
+    # ==================== FRAGMENTOS ====================
+
+    def append(
+        self,
+        subida: ReportUpload,
+        offset: int,
+        stream,
+        longitud: Optional[int],
+        checksum_fragmento: Optional[str] = None
+    ) -> int:
+        """
+        Escribe un fragmento que empieza en `offset` leyendo `longitud` bytes de
+        `stream`. Retorna el nuevo offset. Si la conexión se corta a mitad de
+        fragmento se conservan los bytes recibidos (salvo que traiga checksum).
+        """
+        if subida.estado != ReportUpload.ESTADO_ACTIVA:
+            raise ReportUploadException('La subida ya fue finalizada', 409, subida.offset)
+        if longitud is None:
+            raise ReportUploadException('Content-Length es obligatorio', 411)
+        if longitud > self.config['MAX_CHUNK_SIZE']:
+            raise ReportUploadException(
+                f"El fragmento excede {self.config['MAX_CHUNK_SIZE']} bytes", 413, subida.offset
+            )
+        if offset + longitud > subida.tamaño_bytes:
+            raise ReportUploadException('El fragmento excede el tamaño declarado', 413, subida.offset)
+        algoritmo_fragmento, digest_fragmento = self._parse_checksum(checksum_fragmento)
+
+        with self._bloquear(subida) as parcial:
+            # El offset guardado es el válido: otra solicitud pudo avanzar antes del bloqueo
+            subida.refresh_from_db(fields=['offset', 'estado'])
+            if subida.estado != ReportUpload.ESTADO_ACTIVA:
+                raise ReportUploadException('La subida ya fue finalizada', 409, subida.offset)
+            if offset != subida.offset:
+                raise ReportUploadException('Upload-Offset no coincide con los bytes recibidos', 409, subida.offset)
+
+            # Copia: el hash en memoria solo avanza cuando el offset se confirma,
+            # así un fragmento interrumpido o rechazado no lo deja desfasado
+            hash_archivo = self._hash(subida, parcial).copy()
+            hash_fragmento = hashlib.new(algoritmo_fragmento) if algoritmo_fragmento else None
+
+            # Descarta restos de una escritura interrumpida después del offset confirmado
+            parcial.seek(offset)
+            parcial.truncate()
+            recibidos = 0
+            while recibidos < longitud:
+                bloque = stream.read(min(BLOQUE_LECTURA, longitud - recibidos))
+                if not bloque:
+                    break
+                parcial.write(bloque)
+                hash_archivo.update(bloque)
+                if hash_fragmento:
+                    hash_fragmento.update(bloque)
+                recibidos += len(bloque)
+
+            if hash_fragmento and (recibidos < longitud or hash_fragmento.digest() != digest_fragmento):
+                parcial.seek(offset)
+                parcial.truncate()
+                raise ReportUploadException('El checksum del fragmento no coincide', 460, offset)
+
+            parcial.flush()
+            os.fsync(parcial.fileno())
+            nuevo_offset = offset + recibidos
+            ReportUpload.objects.filter(id=subida.id, offset=offset).update(
+                offset=nuevo_offset, fecha_actualizacion=timezone.now()
+            )
+            self._recordar_hash(subida.id, nuevo_offset, hash_archivo)
+
+        subida.offset = nuevo_offset
+        return nuevo_offset
+
+    # ==================== FINALIZACIÓN ====================
+
+    def complete(self, subida: ReportUpload) -> ReportArchivo:
+        """
+        Adjunta el archivo ensamblado al reporte. Repetir la llamada sobre una
+        subida ya finalizada retorna el mismo archivo.
+        """
+        if subida.estado == ReportUpload.ESTADO_COMPLETADA and subida.archivo_id:
+            return subida.archivo
+        if not subida.completa:
+            raise ReportUploadException('Faltan bytes por subir', 409, subida.offset)
+
+        try:
+            with self._bloquear(subida) as parcial:
+                sha256 = self._hash(subida, parcial).hexdigest()
+        except ReportUploadException:
+            # Otra finalización pudo terminar (y descartar el parcial) entre tanto
+            finalizada = self._finalizada(subida)
+            if finalizada is not None:
+                return finalizada
+            raise
+        if subida.checksum_declarado and sha256 != subida.checksum_declarado:
+            self.cancel(subida)
+            raise ReportUploadException('El SHA-256 del archivo no coincide con el declarado', 460)
+
+        with transaction.atomic():
+            # Bloquea la subida y revisa de nuevo su estado: un reintento o una
+            # finalización concurrente no debe adjuntar un segundo archivo
+            bloqueada = ReportUpload.objects.select_for_update().get(id=subida.id)
+            if bloqueada.estado == ReportUpload.ESTADO_COMPLETADA and bloqueada.archivo_id:
+                subida.estado = bloqueada.estado
+                subida.sha256 = bloqueada.sha256
+                subida.archivo = ReportArchivo.objects.get(id=bloqueada.archivo_id)
+                return subida.archivo
+            if bloqueada.estado != ReportUpload.ESTADO_ACTIVA:
+                raise ReportUploadException('La subida fue cancelada', 410)
+
+            # Serializa las finalizaciones del mismo reporte para respetar los límites
+            reporte = ReportModel.objects.select_for_update().get(id=subida.reporte_id)
+            limites = ReportService.validate_files_limits(
+                [ArchivoDeclarado(subida.nombre_original, subida.tamaño_bytes)], reporte.id
+            )
+            if not limites['valid']:
+                raise ReportUploadException(limites['error'])
+
+            # Con el SHA-256 ya calculado, un contenido repetido no se vuelve a escribir
+            try:
+                ensamblado = _ArchivoEnsamblado(self.ruta_temporal(subida), subida.nombre_original)
+            except FileNotFoundError:
+                raise ReportUploadException('El archivo parcial ya no existe', 410)
+            try:
+                blob = blob_store.store(ensamblado, subida.extension, sha256=sha256)
+            finally:
+                ensamblado.close()
+
+            archivo = ReportArchivo(
+                reporte=reporte,
+                archivo=blob.ruta,
+                blob=blob,
+                nombre_original=subida.nombre_original,
+                tipo_archivo=subida.tipo_archivo,
+                extension=subida.extension,
+                tamaño_bytes=subida.tamaño_bytes,
+                orden=reporte.get_archivos_activos().count(),
+                es_principal=False
+            )
+            archivo.save()
+
+            ReportUpload.objects.filter(id=subida.id).update(
+                estado=ReportUpload.ESTADO_COMPLETADA,
+                sha256=sha256,
+                archivo=archivo,
+                fecha_actualizacion=timezone.now()
+            )
+
+        # Si el blob ya existía el parcial no se movió al storage y sobra
+        self._descartar(subida)
+        subida.estado = ReportUpload.ESTADO_COMPLETADA
+        subida.sha256 = sha256
+        subida.archivo = archivo
+        logger.info(f"Subida {subida.id} finalizada como archivo {archivo.id} del reporte {reporte.id}")
+        return archivo
+
+    # ==================== LIMPIEZA ====================
+
+    def purge_expired(self, dry_run: bool = False) -> int:
+        """Elimina las sesiones expiradas o canceladas y sus archivos parciales"""
+        ahora = timezone.now()
+        vencidas = ReportUpload.objects.filter(
+            Q(estado=ReportUpload.ESTADO_CANCELADA) |
+            Q(estado=ReportUpload.ESTADO_ACTIVA, expira_en__lt=ahora)
+        )
+        if dry_run:
+            return vencidas.count()
+
+        eliminadas = 0
+        for subida in vencidas.iterator():
+            self._descartar(subida)
+            subida.delete()
+            eliminadas += 1
+        return eliminadas
+
+    # ==================== AUXILIARES ====================
+
+    @contextmanager
+    def _bloquear(self, subida: ReportUpload):
+        """Abre el archivo parcial con bloqueo exclusivo (409 si otra solicitud lo tiene)"""
+        try:
+            parcial = open(self.ruta_temporal(subida), 'r+b')
+        except FileNotFoundError:
+            raise ReportUploadException('El archivo parcial ya no existe', 410)
+        with parcial:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(parcial, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    raise ReportUploadException(
+                        'Otra solicitud está escribiendo en esta subida', 409, subida.offset
+                    )
+            yield parcial
+
+    def _finalizada(self, subida: ReportUpload) -> Optional[ReportArchivo]:
+        """Archivo de la subida si otra solicitud ya la finalizó"""
+        subida.refresh_from_db(fields=['estado', 'sha256', 'archivo'])
+        if subida.estado == ReportUpload.ESTADO_COMPLETADA and subida.archivo_id:
+            return subida.archivo
+        return None
+
+    def _hash(self, subida: ReportUpload, parcial):
+        """SHA-256 de los primeros `subida.offset` bytes"""
+        guardado = self._hashes.get(subida.id)
+        if guardado and guardado[0] == subida.offset:
+            return guardado[1]
+
+        # El fragmento anterior llegó a otro proceso: recalcular desde el disco
+        hash_archivo = hashlib.sha256()
+        parcial.seek(0)
+        self._actualizar_hash(hash_archivo, parcial, subida.offset)
+        self._recordar_hash(subida.id, subida.offset, hash_archivo)
+        return hash_archivo
+
+    @staticmethod
+    def _actualizar_hash(hash_archivo, parcial, cantidad: int) -> None:
+        while cantidad > 0:
+            bloque = parcial.read(min(BLOQUE_LECTURA * 16, cantidad))
+            if not bloque:
+                break
+            hash_archivo.update(bloque)
+            cantidad -= len(bloque)
+
+    def _recordar_hash(self, upload_id, offset: int, hash_archivo) -> None:
+        self._hashes[upload_id] = (offset, hash_archivo)
+        self._hashes.move_to_end(upload_id)
+        while len(self._hashes) > MAX_HASHES_EN_MEMORIA:
+            self._hashes.popitem(last=False)
+
+    @staticmethod
+    def _parse_checksum(valor: Optional[str]):
+        """'sha256 <base64>' (encabezado Upload-Checksum) -> (algoritmo, digest)"""
+        if not valor:
+            return None, None
+        try:
+            algoritmo, codificado = valor.strip().split(' ', 1)
+            algoritmo = algoritmo.lower()
+            if algoritmo not in ('sha1', 'sha256', 'md5'):
+                raise ValueError(algoritmo)
+            return algoritmo, base64.b64decode(codificado.strip(), validate=True)
+        except (ValueError, TypeError):
+            raise ReportUploadException('Upload-Checksum inválido (formato: "sha256 <base64>")')
+
+    def _descartar(self, subida: ReportUpload) -> None:
+        self._hashes.pop(subida.id, None)
+        try:
+            os.remove(self.ruta_temporal(subida))
+        except FileNotFoundError:
+            pass
+
+
+# Instancia global del servicio
+upload_service = ResumableUploadService()
@@ -0,0 +1,81 @@
+"""
+Mantenimiento de los contadores desnormalizados de ReportModel.
+
+Cada alta o baja de voto, seguimiento o comentario ajusta el contador del
+reporte con F(), dentro de la misma transacción que la escritura (las vistas
+envuelven la operación en transaction.atomic). Así el contador no requiere
+bloqueos ni COUNT, y las bajas en cascada (p. ej. al eliminar un usuario)
+también quedan reflejadas.
+
+Del mismo modo se cuentan las referencias a cada MediaBlob desde
+ReportArchivo y ProyectoArchivosModel. Un blob que llega a cero no se
+borra aquí: queda marcado con sin_referencias_desde para el recolector.
+"""
+
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reports.models.comentario_reporte import ComentarioReporte
+from reports.models.media_blob import MediaBlob
+from reports.models.report_archivos import ReportArchivo
+from reports.models.report import ReportModel
+from reports.models.seguimiento_reporte import SeguimientoReporte
+from reports.models.voto_reporte import VotoReporte
+
+CONTADORES = {
+    VotoReporte: 'total_votos',
+    SeguimientoReporte: 'total_seguidores',
+    ComentarioReporte: 'total_comentarios',
+}
+
+
+def ajustar_contador(sender, reporte_id, delta):
+    campo = CONTADORES[sender]
+    ReportModel.objects.filter(pk=reporte_id).update(**{campo: F(campo) + delta})
+
+
+@receiver(post_save, sender=VotoReporte)
+@receiver(post_save, sender=SeguimientoReporte)
+@receiver(post_save, sender=ComentarioReporte)
+def contar_alta(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ajustar_contador(sender, instance.reporte_id, 1)
+
+
+@receiver(post_delete, sender=VotoReporte)
+@receiver(post_delete, sender=SeguimientoReporte)
+@receiver(post_delete, sender=ComentarioReporte)
+def contar_baja(sender, instance, **kwargs):
+    ajustar_contador(sender, instance.reporte_id, -1)
+
+
+# Por nombre para no importar proyectos.models (que a su vez importa reports.models)
+PROYECTO_ARCHIVOS = 'proyectos.ProyectoArchivosModel'
+
+
+@receiver(post_save, sender=ReportArchivo)
+@receiver(post_save, sender=PROYECTO_ARCHIVOS)
+def referenciar_blob(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.blob_id:
+        MediaBlob.objects.filter(pk=instance.blob_id).update(
+            referencias=F('referencias') + 1,
+            sin_referencias_desde=None
+        )
+
+
+@receiver(post_delete, sender=ReportArchivo)
+@receiver(post_delete, sender=PROYECTO_ARCHIVOS)
+def liberar_blob(sender, instance, **kwargs):
+    if not instance.blob_id:
+        return
+    MediaBlob.objects.filter(pk=instance.blob_id).update(
+        referencias=Greatest(F('referencias') - 1, 0)
+    )
+    MediaBlob.objects.filter(
+        pk=instance.blob_id,
+        referencias=0,
+        sin_referencias_desde__isnull=True
+    ).update(sin_referencias_desde=timezone.now())
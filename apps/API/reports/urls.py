@@ -20,7 +20,8 @@ from .views.comentario_views import (
     restaurar_comentario_reporte
 )
 
-from .views.geojson_views import ReportGeoJSONView, ReportGeoJSONClusterView
+from .views.upload_views import ReportUploadCreateView, ReportUploadDetailView, ReportUploadCompleteView
+from .views.geojson_views import ReportGeoJSONView, ReportGeoJSONCacheStatsView, ReportExportView, ReportGeoJSONClusterView, ReportTileView
 
 urlpatterns = [
     # CRUD de reportes con clases APIView
@@ -35,9 +36,17 @@ urlpatterns = [
     path('<int:report_id>/media/upload/', ReportMediaUploadView.as_view(), name='report_media_upload'),
     path('<int:report_id>/media/<int:archivo_id>/delete/', ReportMediaDeleteView.as_view(), name='report_media_delete'),
     
+    # Subidas reanudables por fragmentos (videos grandes)
+    path('<int:report_id>/uploads/', ReportUploadCreateView.as_view(), name='report_upload_create'),
+    path('uploads/<uuid:upload_id>/', ReportUploadDetailView.as_view(), name='report_upload_detail'),
+    path('uploads/<uuid:upload_id>/complete/', ReportUploadCompleteView.as_view(), name='report_upload_complete'),
+    
     # Vistas GeoJSON
     path('geojson/', ReportGeoJSONView.as_view(), name='reports-geojson'),
     path('geojson/clusters/', ReportGeoJSONClusterView.as_view(), name='reports-geojson-clusters'),
+    path('geojson/cache/stats/', ReportGeoJSONCacheStatsView.as_view(), name='reports-geojson-cache-stats'),
+    path('export/', ReportExportView.as_view(), name='reports-export'),
+    path('tiles/<int:z>/<int:x>/<int:y>.mvt', ReportTileView.as_view(), name='reports-tiles'),
  
 
     # Vista con paginación (usando decorador para funciones específicas)
@@ -29,3 +29,36 @@ MIN_LOCATION_LENGTH = 3
 MAX_TITLE_LENGTH = 200
 MAX_DESCRIPTION_LENGTH = 1000
 MAX_LOCATION_LENGTH = 255
+
+# Estilos de marcadores en el mapa (GeoJSON, clusters y teselas vectoriales)
+MARKER_COLORS = {
+    1: '#28a745',  # Verde - Baja
+    2: '#ffc107',  # Amarillo - Media
+    3: '#fd7e14',  # Naranja - Alta
+    4: '#dc3545',  # Rojo - Crítica
+    5: '#6f42c1'   # Púrpura - Emergencia
+}
+DEFAULT_MARKER_COLOR = '#6c757d'  # Gris
+
+MARKER_SIZES = {
+    1: 'small',
+    2: 'medium',
+    3: 'medium',
+    4: 'large',
+    5: 'large'
+}
+DEFAULT_MARKER_SIZE = 'medium'
+
+# Palabras clave del tipo de denuncia -> símbolo (se evalúan en orden)
+MARKER_SYMBOLS = [
+    (('infraestructura', 'vial'), 'road'),
+    (('agua', 'alcantarilla'), 'water'),
+    (('seguridad',), 'police'),
+    (('ambiente', 'basura'), 'waste-basket'),
+    (('iluminación', 'luz'), 'lamp'),
+]
+DEFAULT_MARKER_SYMBOL = 'marker'
+NO_TYPE_MARKER_SYMBOL = 'circle'
+
+# Campos de texto de la búsqueda de reportes (respaldo icontains fuera de PostgreSQL)
+SEARCH_FIELDS = ('titulo', 'descripcion', 'direccion')
@@ -2,7 +2,11 @@
 
 from datetime import datetime, timedelta
 from django.utils import timezone
-from .constants import URGENCY_LEVELS
+from .constants import (
+    URGENCY_LEVELS, MARKER_COLORS, DEFAULT_MARKER_COLOR, MARKER_SIZES,
+    DEFAULT_MARKER_SIZE, MARKER_SYMBOLS, DEFAULT_MARKER_SYMBOL, NO_TYPE_MARKER_SYMBOL,
+    SEARCH_FIELDS
+)
 
 
 def calculate_days_since(date):
@@ -48,14 +52,55 @@ def paginate_queryset(queryset, page_size=None):
 
 
 def build_search_query(query_text):
-    """Construir consulta de búsqueda"""
+    """Construir consulta de búsqueda (texto completo sobre search_vector)"""
     from django.db.models import Q
+    from infrastructure.database.search import search_filter
     
     if not query_text:
         return Q()
     
-    return (
-        Q(titulo__icontains=query_text) |
-        Q(descripcion__icontains=query_text) |
-        Q(ubicacion__icontains=query_text)
-    )
+    return search_filter(query_text, SEARCH_FIELDS)
+
+
+def get_marker_color(urgencia):
+    """Color del marcador en el mapa según la urgencia"""
+    return MARKER_COLORS.get(urgencia, DEFAULT_MARKER_COLOR)
+
+
+def get_marker_size(urgencia):
+    """Tamaño del marcador en el mapa según la urgencia"""
+    return MARKER_SIZES.get(urgencia, DEFAULT_MARKER_SIZE)
+
+
+def get_marker_symbol(tipo_denuncia_nombre):
+    """Símbolo del marcador en el mapa según el nombre del tipo de denuncia"""
+    if not tipo_denuncia_nombre:
+        return NO_TYPE_MARKER_SYMBOL
+
+    tipo_lower = tipo_denuncia_nombre.lower()
+    for palabras, simbolo in MARKER_SYMBOLS:
+        if any(palabra in tipo_lower for palabra in palabras):
+            return simbolo
+    return DEFAULT_MARKER_SYMBOL
+
+
+def get_usuario_id(request):
+    """Obtener el usuario_id autenticado de la petición de forma consistente"""
+    usuario_id = None
+
+    if hasattr(request, 'usua_id') and request.usua_id:
+        usuario_id = request.usua_id
+    elif hasattr(request, 'user_id') and request.user_id:
+        usuario_id = request.user_id
+    elif hasattr(request, 'auth_user') and request.auth_user:
+        if hasattr(request.auth_user, 'usua_id'):
+            usuario_id = request.auth_user.usua_id
+        elif hasattr(request.auth_user, 'id'):
+            usuario_id = request.auth_user.id
+    elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
+        if hasattr(request.user, 'usua_id'):
+            usuario_id = request.user.usua_id
+        elif hasattr(request.user, 'id'):
+            usuario_id = request.user.id
+
+    return usuario_id
@@ -7,10 +7,12 @@ from reports.models import ReportModel
 from reports.serializers.report_history_serializer import ReportHistorySerializer
 from interfaces.authentication.permissions import IsAuthenticatedWithSesionToken
 from interfaces.authentication.session_token_auth import SesionTokenAuthentication
+from infrastructure.database.replicas import use_replica
 
 logger = logging.getLogger(__name__)
 
 
+@use_replica
 class ReportAuditView(APIView):
     """
     Vista para consultar el historial de cambios de un reporte
@@ -5,6 +5,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.utils import timezone as django_timezone
 
@@ -85,12 +86,13 @@ def crear_comentario_reporte(request, report_id):
         if len(comentario_texto) > 1000:
             raise ValidationError("El comentario no puede exceder los 1000 caracteres.")
 
-        # Crear el comentario
-        comentario = ComentarioReporte.objects.create(
-            usuario=usuario,
-            reporte=reporte,
-            comentario=comentario_texto
-        )
+        # Crear el comentario (el contador se ajusta en la misma transacción)
+        with transaction.atomic():
+            comentario = ComentarioReporte.objects.create(
+                usuario=usuario,
+                reporte=reporte,
+                comentario=comentario_texto
+            )
 
         # Notificar a los seguidores del reporte (excepto al autor del comentario)
         try:
@@ -99,7 +101,7 @@ def crear_comentario_reporte(request, report_id):
                 comentario=comentario,
                 autor_comentario=usuario
             )
-            logger.info(f"Notificaciones enviadas por comentario en reporte #{report_id}")
+            logger.info(f"Notificaciones encoladas por comentario en reporte #{report_id}")
         except Exception as e:
             logger.error(f"Error al enviar notificaciones: {str(e)}")
             # No fallar la creación del comentario si falla la notificación
@@ -1,177 +1,157 @@
+import asyncio
 import logging
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.db import DEFAULT_DB_ALIAS
 from django.db.models import Q
-from django.contrib.gis.geos import Point
-from django.contrib.gis.db.models.functions import Distance
+from datetime import datetime
 import json
 
 from ..models import ReportModel
 from ..services.report_service import ReportService
+from ..services.geojson_cache import geojson_cache
+from ..services.export_service import CONTENT_TYPES, FORMATO_GEOJSON, FORMATOS, report_export_service
+from ..services.cluster_service import ClusterService
+from ..services.tile_service import TileService
+from ..utils.helpers import get_marker_color, get_marker_size, get_marker_symbol, get_usuario_id
 from interfaces.authentication.permissions import IsAuthenticatedWithSesionToken
 from interfaces.authentication.session_token_auth import SesionTokenAuthentication
+from interfaces.api.views.async_base import AsyncAPIView, json_response
+from interfaces.responses.conditional import aconditional_get, build_etag
+from infrastructure.database.replicas import use_replica
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
-class ReportGeoJSONView(APIView):
+@use_replica
+class ReportGeoJSONView(AsyncAPIView):
     """
     Vista para servir reportes en formato GeoJSON compatible con MapLibre/Mapbox
+    (async, ver AsyncAPIView)
     """
-    authentication_classes = [SesionTokenAuthentication]
-    permission_classes = [IsAuthenticatedWithSesionToken]
     
-    def get(self, request):
+    async def get(self, request):
         logger.info("=== INICIO CONSULTA GEOJSON ===")
         
         try:
-            usuario_id = self._get_usuario_id(request)
-            
-            if not usuario_id:
-                return Response({
-                    'success': False,
-                    'error': 'Token de autenticación inválido o expirado'
-                }, status=status.HTTP_401_UNAUTHORIZED)
+            usuario_id = request.auth_user.usua_id
             
             # Obtener parámetros de query
             limit = min(int(request.GET.get('limit', 100)), 500)  # Máximo 500 para mapas
             
-            # Filtros de búsqueda
-            filters = Q(visible=True)  # Solo reportes visibles por defecto
-            
-            # Filtro por usuario (opcional - para ver solo mis reportes)
-            if request.GET.get('my_reports', '').lower() == 'true':
-                filters &= Q(usuario_id=usuario_id)
-            
-            # Filtro por urgencia
-            if request.GET.get('urgencia'):
-                try:
-                    urgencia = int(request.GET.get('urgencia'))
-                    filters &= Q(urgencia=urgencia)
-                except ValueError:
-                    pass
-            
-            # Filtro por estado
-            if request.GET.get('estado'):
-                try:
-                    estado = int(request.GET.get('estado'))
-                    filters &= Q(denuncia_estado_id=estado)
-                except ValueError:
-                    pass
-            
-            # Filtro por tipo de denuncia
-            if request.GET.get('tipo'):
-                try:
-                    tipo = int(request.GET.get('tipo'))
-                    filters &= Q(tipo_denuncia_id=tipo)
-                except ValueError:
-                    pass
-            
-            # Filtro por ciudad
-            if request.GET.get('ciudad'):
-                try:
-                    ciudad = int(request.GET.get('ciudad'))
-                    filters &= Q(ciudad_id=ciudad)
-                except ValueError:
-                    pass
-            
-            # Filtro por búsqueda de texto
-            search = request.GET.get('search')
-            if search:
-                filters &= (
-                    Q(titulo__icontains=search) |
-                    Q(descripcion__icontains=search) |
-                    Q(direccion__icontains=search)
-                )
-            
-            # Filtro por rango de fechas
-            fecha_desde = request.GET.get('fecha_desde')
-            fecha_hasta = request.GET.get('fecha_hasta')
-            if fecha_desde:
-                try:
-                    from datetime import datetime
-                    fecha_desde_obj = datetime.fromisoformat(fecha_desde.replace('Z', '+00:00'))
-                    filters &= Q(fecha_creacion__gte=fecha_desde_obj)
-                except ValueError:
-                    pass
-            if fecha_hasta:
-                try:
-                    from datetime import datetime
-                    fecha_hasta_obj = datetime.fromisoformat(fecha_hasta.replace('Z', '+00:00'))
-                    filters &= Q(fecha_creacion__lte=fecha_hasta_obj)
-                except ValueError:
-                    pass
-            
-            # Filtro por área geográfica (bounding box)
-            bbox = request.GET.get('bbox')  # formato: "minLng,minLat,maxLng,maxLat"
-            if bbox:
-                try:
-                    coords = [float(x) for x in bbox.split(',')]
-                    if len(coords) == 4:
-                        min_lng, min_lat, max_lng, max_lat = coords
-                        filters &= Q(
-                            ubicacion__longitude__gte=min_lng,
-                            ubicacion__longitude__lte=max_lng,
-                            ubicacion__latitude__gte=min_lat,
-                            ubicacion__latitude__lte=max_lat
+            # Versión de los reportes del mapa (solo columnas) para responder 304
+            # sin cargar relaciones ni construir el GeoJSON
+            version = self._ordenar(ReportService.apply_map_filters(
+                ReportService.with_version_fields(ReportModel.objects.all()),
+                request.GET,
+                usuario_id
+            ))
+            
+            # Las features se comparten entre usuarios con los mismos filtros;
+            # es_mi_reporte se aplica sobre la copia de cada petición
+            cacheable = geojson_cache.is_cacheable(request.GET)
+            clave = geojson_cache.key(geojson_cache.normalize_params(request.GET, limit)) if cacheable else None
+            
+            async def leer_version():
+                return [fila async for fila in version.values_list(*ReportService.VERSION_FIELDS)[:limit]]
+            
+            async def leer_cache():
+                if not cacheable:
+                    return None
+                return await sync_to_async(geojson_cache.get, thread_sensitive=False)(clave)
+            
+            # La versión (base de datos) y la entrada de caché son independientes
+            filas, entrada = await asyncio.gather(leer_version(), leer_cache())
+            
+            async def construir():
+                nonlocal entrada
+                if entrada is None:
+                    # Lo que se guarda en la caché se lee de la primaria: una
+                    # réplica atrasada daría features anteriores a la versión
+                    # de la clave. Sin caché basta con la réplica.
+                    base = ReportModel.objects.using(DEFAULT_DB_ALIAS) if cacheable else ReportModel.objects.all()
+                    
+                    # Construir queryset base con los filtros de mapa (incluye proximidad)
+                    queryset = self._ordenar(ReportService.apply_map_filters(
+                        base.select_related(
+                            'usuario', 'denuncia_estado', 'tipo_denuncia', 'ciudad'
+                        ).prefetch_related(ReportService.prefetch_archivos_activos()),
+                        request.GET,
+                        usuario_id
+                    ))
+                    
+                    # Aplicar límite
+                    reports = [report async for report in queryset[:limit]]
+                    
+                    # Construir GeoJSON (archivos activos precargados)
+                    geojson_base = await sync_to_async(self._build_geojson)(reports, usuario_id)
+                    entrada = {
+                        'features': geojson_base['features'],
+                        'autores': [report.usuario_id for report in reports]
+                    }
+                    if cacheable:
+                        await sync_to_async(geojson_cache.set, thread_sensitive=False)(
+                            clave, entrada['features'], entrada['autores']
                         )
-                except (ValueError, IndexError):
-                    pass
-            
-            # Filtro por proximidad (centro y radio en metros)
-            center_lat = request.GET.get('center_lat')
-            center_lng = request.GET.get('center_lng')
-            radius = request.GET.get('radius')  # en metros
-            
-            # Construir queryset base
-            queryset = ReportModel.objects.select_related(
-                'usuario', 'denuncia_estado', 'tipo_denuncia', 'ciudad'
-            ).prefetch_related('archivos').filter(filters)
-            
-            # Aplicar filtro de proximidad si se especifica
-            if center_lat and center_lng and radius:
-                try:
-                    center_point = Point(float(center_lng), float(center_lat))
-                    radius_meters = float(radius)
-                    queryset = queryset.annotate(
-                        distance=Distance('ubicacion', center_point)
-                    ).filter(distance__lte=radius_meters).order_by('distance')
-                except (ValueError, TypeError):
-                    queryset = queryset.order_by('-fecha_creacion')
-            else:
-                queryset = queryset.order_by('-fecha_creacion')
-            
-            # Aplicar límite
-            reports = queryset[:limit]
-            
-            # Construir GeoJSON
-            geojson = self._build_geojson(reports, usuario_id)
-            
-            # Información adicional de metadatos
-            metadata = {
-                'total_features': len(geojson['features']),
-                'limit_applied': limit,
-                'filters_applied': self._get_applied_filters(request),
-                'generated_at': self._get_current_timestamp()
-            }
-            
-            # Agregar metadatos al GeoJSON
-            geojson['metadata'] = metadata
-            
-            logger.info(f"GeoJSON generado con {len(geojson['features'])} features")
-            
-            return Response(geojson, status=status.HTTP_200_OK)
+                    estado_cache = 'MISS' if cacheable else 'BYPASS'
+                else:
+                    estado_cache = 'HIT'
+                
+                geojson = {
+                    'type': 'FeatureCollection',
+                    'features': geojson_cache.overlay(entrada, usuario_id)
+                }
+                
+                # Información adicional de metadatos
+                metadata = {
+                    'total_features': len(geojson['features']),
+                    'limit_applied': limit,
+                    'filters_applied': self._get_applied_filters(request),
+                    'generated_at': self._get_current_timestamp()
+                }
+                
+                # Agregar metadatos al GeoJSON
+                geojson['metadata'] = metadata
+                
+                logger.info(f"GeoJSON generado con {len(geojson['features'])} features (caché: {estado_cache})")
+                
+                response = json_response(geojson, status=status.HTTP_200_OK)
+                response['X-Cache'] = estado_cache
+                return response
+            
+            return await aconditional_get(
+                request,
+                build_etag('geojson', usuario_id, limit, filas),
+                # Sin Last-Modified: los contadores cambian sin tocar las fechas
+                None,
+                construir
+            )
             
         except Exception as e:
             logger.error(f"Error al generar GeoJSON: {str(e)}")
             logger.exception("Detalles del error:")
-            return Response({
+            return json_response({
                 'success': False,
                 'error': 'Error interno del servidor',
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    def _ordenar(self, queryset):
+        """
+        Ordena por distancia si se aplicó el filtro de proximidad,
+        o por relevancia si hubo búsqueda de texto
+        """
+        if 'distance' in queryset.query.annotations:
+            return queryset.order_by('distance')
+        if 'rank' in queryset.query.annotations:
+            return queryset.order_by('-rank', '-fecha_creacion')
+        return queryset.order_by('-fecha_creacion')
+    
     def _build_geojson(self, reports, usuario_id):
         """Construye el objeto GeoJSON a partir de los reportes"""
         features = []
@@ -179,19 +159,28 @@ class ReportGeoJSONView(APIView):
         for report in reports:
             # Obtener imagen principal
             imagen_principal = None
-            archivos = report.get_archivos_activos()
+            archivo_principal = None
+            archivos = getattr(report, 'archivos_activos_cache', None)
+            if archivos is None:
+                archivos = list(report.get_archivos_activos())
             for archivo in archivos:
                 if archivo.es_principal and archivo.tipo_archivo == 'imagen':
-                    imagen_principal = archivo.url
+                    archivo_principal = archivo
                     break
             
             # Si no hay imagen principal, tomar la primera imagen disponible
-            if not imagen_principal:
+            if not archivo_principal:
                 for archivo in archivos:
                     if archivo.tipo_archivo == 'imagen':
-                        imagen_principal = archivo.url
+                        archivo_principal = archivo
                         break
             
+            # Miniatura para el marcador/listado (None mientras el worker no la genere)
+            imagen_miniatura = None
+            if archivo_principal:
+                imagen_principal = archivo_principal.url
+                imagen_miniatura = archivo_principal.derivados_urls.get('miniatura_webp')
+            
             # Propiedades del feature
             properties = {
                 'id': report.id,
@@ -209,7 +198,8 @@ class ReportGeoJSONView(APIView):
                 'fecha_creacion': report.fecha_creacion.isoformat() if report.fecha_creacion else None,
                 'fecha_actualizacion': report.fecha_actualizacion.isoformat() if report.fecha_actualizacion else None,
                 'imagen_principal': imagen_principal,
-                'total_archivos': archivos.count(),
+                'imagen_miniatura': imagen_miniatura,
+                'total_archivos': len(archivos),
                 'es_mi_reporte': report.usuario_id == usuario_id,
                 'usuario_nombre': getattr(report.usuario, 'nombre', 'Usuario') if report.usuario else 'Usuario',
                 
@@ -244,45 +234,15 @@ class ReportGeoJSONView(APIView):
     
     def _get_marker_color(self, urgencia):
         """Obtiene el color del marcador basado en la urgencia"""
-        color_map = {
-            1: '#28a745',  # Verde - Baja
-            2: '#ffc107',  # Amarillo - Media
-            3: '#fd7e14',  # Naranja - Alta
-            4: '#dc3545',  # Rojo - Crítica
-            5: '#6f42c1'   # Púrpura - Emergencia
-        }
-        return color_map.get(urgencia, '#6c757d')  # Gris por defecto
+        return get_marker_color(urgencia)
     
     def _get_marker_size(self, urgencia):
         """Obtiene el tamaño del marcador basado en la urgencia"""
-        size_map = {
-            1: 'small',
-            2: 'medium',
-            3: 'medium',
-            4: 'large',
-            5: 'large'
-        }
-        return size_map.get(urgencia, 'medium')
+        return get_marker_size(urgencia)
     
     def _get_marker_symbol(self, tipo_denuncia_nombre):
         """Obtiene el símbolo del marcador basado en el tipo de denuncia"""
-        if not tipo_denuncia_nombre:
-            return 'circle'
-        
-        # Mapeo básico de tipos a símbolos
-        tipo_lower = tipo_denuncia_nombre.lower()
-        if 'infraestructura' in tipo_lower or 'vial' in tipo_lower:
-            return 'road'
-        elif 'agua' in tipo_lower or 'alcantarilla' in tipo_lower:
-            return 'water'
-        elif 'seguridad' in tipo_lower:
-            return 'police'
-        elif 'ambiente' in tipo_lower or 'basura' in tipo_lower:
-            return 'waste-basket'
-        elif 'iluminación' in tipo_lower or 'luz' in tipo_lower:
-            return 'lamp'
-        else:
-            return 'marker'
+        return get_marker_symbol(tipo_denuncia_nombre)
     
     def _get_applied_filters(self, request):
         """Obtiene los filtros aplicados para los metadatos"""
@@ -303,28 +263,92 @@ class ReportGeoJSONView(APIView):
         """Obtiene el timestamp actual en formato ISO"""
         from datetime import datetime
         return datetime.now().isoformat()
+
+class ReportGeoJSONCacheStatsView(APIView):
+    """
+    Métricas de la caché del GeoJSON (aciertos, fallos y tasa de aciertos).
+    Solo administradores.
+    """
+    authentication_classes = [SesionTokenAuthentication]
+    permission_classes = [IsAuthenticatedWithSesionToken]
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
+    def get(self, request):
+        usuario = getattr(request, 'auth_user', None)
+        rol_nombre = usuario.rous_id.rous_nombre.lower().strip() if usuario and usuario.rous_id else ''
+        if 'admin' not in rol_nombre:
+            return Response({
+                'success': False,
+                'error': 'Acceso denegado. Solo administradores.'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        return Response({
+            'success': True,
+            'data': geojson_cache.stats()
+        }, status=status.HTTP_200_OK)
+
+
+class ReportExportView(APIView):
+    """
+    Exportación completa de reportes en GeoJSON (`format=geojson`, por defecto)
+    o NDJSON (`format=ndjson`), transmitida por partes. Acepta los filtros del
+    mapa más `since` (ISO 8601) para descargas incrementales; el header
+    X-Export-Generated-At es el `since` de la siguiente descarga (los
+    contadores no son incrementales, ver export_service).
+    Solo administradores.
+    """
+    authentication_classes = [SesionTokenAuthentication]
+    permission_classes = [IsAuthenticatedWithSesionToken]
+    
+    def perform_content_negotiation(self, request, force=False):
+        # `format` elige el formato de exportación, no un renderer de DRF
+        return super().perform_content_negotiation(request, force=True)
+    
+    def get(self, request):
+        usuario = getattr(request, 'auth_user', None)
+        rol_nombre = usuario.rous_id.rous_nombre.lower().strip() if usuario and usuario.rous_id else ''
+        if 'admin' not in rol_nombre:
+            return Response({
+                'success': False,
+                'error': 'Acceso denegado. Solo administradores.'
+            }, status=status.HTTP_403_FORBIDDEN)
         
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
+        formato = request.GET.get('format', FORMATO_GEOJSON).lower()
+        if formato not in FORMATOS:
+            return Response({
+                'success': False,
+                'error': f"Formato inválido. Opciones: {', '.join(FORMATOS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        return usuario_id
+        try:
+            since = report_export_service.parse_since(request.GET.get('since'))
+        except ValueError:
+            return Response({
+                'success': False,
+                'error': 'since debe ser una fecha ISO 8601 (p. ej. 2025-01-01T00:00:00Z)'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Antes de consultar: lo que cambie durante la descarga entra en la siguiente
+        generado = timezone.now()
+        queryset = report_export_service.get_queryset(request.GET, usuario.usua_id, since)
+        metadata = {
+            'generated_at': generado,
+            'since': since,
+            'filters_applied': {k: v for k, v in request.GET.items() if k not in ('format', 'since')},
+        }
+        logger.info(f"Exportación de reportes ({formato}) solicitada por usuario {usuario.usua_id}")
+        
+        response = StreamingHttpResponse(
+            report_export_service.stream(queryset, formato, metadata),
+            content_type=CONTENT_TYPES[formato]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="reportes_{generado:%Y%m%d_%H%M%S}.{formato}"'
+        )
+        response['X-Export-Generated-At'] = generado.isoformat()
+        return response
 
+
+@use_replica
 class ReportGeoJSONClusterView(APIView):
     """
     Vista para servir reportes agrupados por clusters en formato GeoJSON
@@ -337,7 +361,7 @@ class ReportGeoJSONClusterView(APIView):
         logger.info("=== INICIO CONSULTA GEOJSON CLUSTERS ===")
         
         try:
-            usuario_id = self._get_usuario_id(request)
+            usuario_id = get_usuario_id(request)
             
             if not usuario_id:
                 return Response({
@@ -345,31 +369,46 @@ class ReportGeoJSONClusterView(APIView):
                     'error': 'Token de autenticación inválido o expirado'
                 }, status=status.HTTP_401_UNAUTHORIZED)
             
-            # Parámetros de clustering
+            # Parámetros de clustering: el tamaño de celda depende del zoom,
+            # salvo que se indique explícitamente un radio en grados
             zoom_level = int(request.GET.get('zoom', 10))
-            cluster_radius = float(request.GET.get('cluster_radius', 0.01))  # En grados
-            
-            # Aplicar los mismos filtros que la vista principal
-            filters = Q(visible=True)
-            
-            if request.GET.get('my_reports', '').lower() == 'true':
-                filters &= Q(usuario_id=usuario_id)
+            if request.GET.get('cluster_radius'):
+                cell_size = float(request.GET.get('cluster_radius'))
+            else:
+                cell_size = ClusterService.cell_size_for_zoom(zoom_level)
             
-            # ... (aplicar otros filtros similar a la vista principal)
+            if cell_size <= 0:
+                return Response({
+                    'success': False,
+                    'error': 'cluster_radius debe ser mayor que 0'
+                }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Obtener reportes
-            queryset = ReportModel.objects.select_related(
-                'denuncia_estado', 'tipo_denuncia', 'ciudad'
-            ).filter(filters)
+            # Aplicar los mismos filtros que la vista principal
+            queryset = ReportService.apply_map_filters(
+                ReportModel.objects.all(), request.GET, usuario_id
+            )
             
-            # Agrupar por proximidad geográfica
-            clusters = self._create_clusters(queryset, cluster_radius)
+            # Agrupar por celdas de la grilla
+            clusters = ClusterService.cluster(queryset, cell_size)
             
             # Construir GeoJSON de clusters
             geojson = self._build_cluster_geojson(clusters, usuario_id)
+            geojson['metadata'] = {
+                'zoom': zoom_level,
+                'cell_size': cell_size,
+                'total_clusters': len(clusters),
+                'total_reports': sum(cluster['count'] for cluster in clusters),
+                'generated_at': datetime.now().isoformat()
+            }
             
             return Response(geojson, status=status.HTTP_200_OK)
             
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': 'Parámetros inválidos',
+                'details': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error al generar GeoJSON clusters: {str(e)}")
             return Response({
@@ -378,87 +417,42 @@ class ReportGeoJSONClusterView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _create_clusters(self, queryset, radius):
-        """Agrupa reportes en clusters basado en proximidad"""
-        clusters = []
-        processed_reports = set()
-        
-        for report in queryset:
-            if report.id in processed_reports:
-                continue
-            
-            # Crear nuevo cluster centrado en este reporte
-            cluster_reports = [report]
-            processed_reports.add(report.id)
-            
-            # Buscar reportes cercanos
-            for other_report in queryset:
-                if other_report.id in processed_reports:
-                    continue
-                
-                # Calcular distancia aproximada
-                distance = self._calculate_distance(
-                    report.ubicacion.y, report.ubicacion.x,
-                    other_report.ubicacion.y, other_report.ubicacion.x
-                )
-                
-                if distance <= radius:
-                    cluster_reports.append(other_report)
-                    processed_reports.add(other_report.id)
-            
-            clusters.append(cluster_reports)
-        
-        return clusters
-    
-    def _calculate_distance(self, lat1, lon1, lat2, lon2):
-        """Calcula distancia aproximada entre dos puntos en grados"""
-        import math
-        return math.sqrt((lat2 - lat1)**2 + (lon2 - lon1)**2)
-    
     def _build_cluster_geojson(self, clusters, usuario_id):
         """Construye GeoJSON para clusters"""
         features = []
         
         for cluster in clusters:
-            if len(cluster) == 1:
+            if cluster['count'] == 1:
                 # Cluster de un solo reporte - usar feature normal
-                report = cluster[0]
                 feature = {
                     'type': 'Feature',
                     'geometry': {
                         'type': 'Point',
-                        'coordinates': [float(report.ubicacion.x), float(report.ubicacion.y)]
+                        'coordinates': [cluster['longitud'], cluster['latitud']]
                     },
                     'properties': {
-                        'id': report.id,
-                        'titulo': report.titulo,
+                        'id': cluster['id'],
+                        'titulo': cluster['titulo'],
                         'cluster_size': 1,
                         'is_cluster': False,
-                        'urgencia_max': report.urgencia,
-                        'marker_color': self._get_marker_color(report.urgencia)
+                        'urgencia_max': cluster['urgencia_max'],
+                        'marker_color': self._get_marker_color(cluster['urgencia_max'])
                     }
                 }
             else:
-                # Cluster múltiple
-                # Calcular centro del cluster
-                avg_lat = sum(r.ubicacion.y for r in cluster) / len(cluster)
-                avg_lng = sum(r.ubicacion.x for r in cluster) / len(cluster)
-                
-                # Obtener urgencia máxima
-                max_urgencia = max(r.urgencia for r in cluster)
-                
+                # Cluster múltiple centrado en el promedio de sus reportes
                 feature = {
                     'type': 'Feature',
                     'geometry': {
                         'type': 'Point',
-                        'coordinates': [avg_lng, avg_lat]
+                        'coordinates': [cluster['longitud'], cluster['latitud']]
                     },
                     'properties': {
-                        'cluster_size': len(cluster),
+                        'cluster_size': cluster['count'],
                         'is_cluster': True,
-                        'urgencia_max': max_urgencia,
-                        'marker_color': self._get_marker_color(max_urgencia),
-                        'report_ids': [r.id for r in cluster]
+                        'urgencia_max': cluster['urgencia_max'],
+                        'marker_color': self._get_marker_color(cluster['urgencia_max']),
+                        'report_ids': cluster['report_ids']
                     }
                 }
             
@@ -471,32 +465,74 @@ class ReportGeoJSONClusterView(APIView):
     
     def _get_marker_color(self, urgencia):
         """Obtiene el color del marcador basado en la urgencia"""
-        color_map = {
-            1: '#28a745',  # Verde - Baja
-            2: '#ffc107',  # Amarillo - Media
-            3: '#fd7e14',  # Naranja - Alta
-            4: '#dc3545',  # Rojo - Crítica
-            5: '#6f42c1'   # Púrpura - Emergencia
-        }
-        return color_map.get(urgencia, '#6c757d')
+        return get_marker_color(urgencia)
+    
+
+class MVTRenderer(BaseRenderer):
+    """Permite negociar application/vnd.mapbox-vector-tile (los errores se envían como JSON)"""
+    media_type = TileService.CONTENT_TYPE
+    format = 'mvt'
+    charset = None
+    render_style = 'binary'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, bytearray)):
+            return bytes(data)
+        return json.dumps(data).encode('utf-8')
+
+
+@use_replica
+class ReportTileView(APIView):
+    """
+    Vista para servir reportes como teselas vectoriales (Mapbox Vector Tiles)
+    GET /api/reports/tiles/<z>/<x>/<y>.mvt
+    
+    Acepta los mismos filtros que ReportGeoJSONView y cada feature incluye
+    las propiedades de estilo del marcador (marker_color, marker_size, marker_symbol).
+    """
+    authentication_classes = [SesionTokenAuthentication]
+    permission_classes = [IsAuthenticatedWithSesionToken]
+    renderer_classes = [JSONRenderer, MVTRenderer]
+    
+    def get(self, request, z, x, y):
+        try:
+            usuario_id = get_usuario_id(request)
+            
+            if not usuario_id:
+                return Response({
+                    'success': False,
+                    'error': 'Token de autenticación inválido o expirado'
+                }, status=status.HTTP_401_UNAUTHORIZED)
+            
+            if not TileService.is_valid_tile(z, x, y):
+                return Response({
+                    'success': False,
+                    'error': 'Coordenadas de tesela inválidas'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            if not TileService.is_supported():
+                return Response({
+                    'success': False,
+                    'error': 'Las teselas vectoriales requieren PostGIS'
+                }, status=status.HTTP_501_NOT_IMPLEMENTED)
+            
+            # Aplicar los mismos filtros que la vista GeoJSON
+            queryset = ReportService.apply_map_filters(
+                ReportModel.objects.all(), request.GET, usuario_id
+            )
+            
+            tile = TileService.render_tile(queryset, z, x, y, usuario_id)
+            
+            response = HttpResponse(tile, content_type=TileService.CONTENT_TYPE)
+            # La tesela incluye es_mi_reporte, por lo que solo se cachea en el cliente
+            response['Cache-Control'] = 'private, max-age=60'
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error al generar tesela {z}/{x}/{y}: {str(e)}")
+            return Response({
+                'success': False,
+                'error': 'Error interno del servidor',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
\ No newline at end of file
@@ -5,8 +5,10 @@ from reports.models import ProyectoHistory
 from reports.serializers.proyecto_history_serializer import ProyectoHistorySerializer
 from interfaces.authentication.permissions import IsAuthenticatedWithSesionToken
 from interfaces.authentication.session_token_auth import SesionTokenAuthentication
+from infrastructure.database.replicas import use_replica
 
 
+@use_replica
 class ProyectoAuditView(APIView):
     """
     Vista para consultar el historial de cambios de un proyecto específico.
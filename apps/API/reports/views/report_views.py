@@ -11,10 +11,15 @@ import base64
 import json
 
 from ..services.report_service import ReportService
+from ..services.blob_store import blob_store
 from ..models import ReportModel, ReportArchivo
 from ..exceptions import *
+from ..utils.helpers import get_usuario_id
 from interfaces.authentication.permissions import IsAuthenticatedWithSesionToken
 from interfaces.authentication.session_token_auth import SesionTokenAuthentication
+from interfaces.api.views.async_base import AsyncAPIView, json_response
+from interfaces.responses.conditional import aconditional_get, build_etag, conditional_get
+from infrastructure.database.replicas import use_replica
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from django.core.exceptions import ValidationError
@@ -32,7 +37,7 @@ class ReportCreateView(APIView):
         
         try:
             # Obtener usuario_id usando el método existente
-            usuario_id = self._get_usuario_id(request)
+            usuario_id = get_usuario_id(request)
             
             if not usuario_id:
                 logger.error("No se pudo obtener usuario_id")
@@ -124,10 +129,12 @@ class ReportCreateView(APIView):
                     if es_principal:
                         primer_imagen_agregada = True
                     
-                    # Crear archivo asociado
+                    # Crear archivo asociado (un contenido repetido reutiliza su blob)
+                    blob = blob_store.store(archivo, validation_result['extension'])
                     report_archivo = ReportArchivo(
                         reporte=report,
-                        archivo=archivo,
+                        archivo=blob.ruta,
+                        blob=blob,
                         nombre_original=archivo.name,
                         tipo_archivo=validation_result['tipo_archivo'],
                         extension=validation_result['extension'],
@@ -173,42 +180,18 @@ class ReportCreateView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
-
-class ReportListView(APIView):
-    authentication_classes = [SesionTokenAuthentication]
-    permission_classes = [IsAuthenticatedWithSesionToken]
+@use_replica
+class ReportListView(AsyncAPIView):
+    """
+    Listado de reportes con paginación por cursor (async, ver AsyncAPIView).
+    La versión de la página para el 304 y la página misma usan el ORM async.
+    """
     
-    def get(self, request):
+    async def get(self, request):
         logger.info("=== INICIO LISTADO DE REPORTES CON CURSOR PAGINATION ===")
         
         try:
-            usuario_id = self._get_usuario_id(request)
-            
-            if not usuario_id:
-                return Response({
-                    'success': False,
-                    'error': 'Token de autenticación inválido o expirado'
-                }, status=status.HTTP_401_UNAUTHORIZED)
+            usuario_id = request.auth_user.usua_id
             
             # Obtener parámetros de query
             cursor = request.GET.get('cursor')
@@ -255,58 +238,54 @@ class ReportListView(APIView):
             if request.GET.get('search'):
                 filters['search'] = request.GET.get('search')
             
-            # Obtener reportes con paginación (incluir usuario_id para calcular votos)
-            result = ReportService.get_reports_with_cursor_pagination(
+            # Versión de la página (solo columnas) para responder 304 sin serializar
+            filas = await ReportService.aget_reports_version(
                 cursor=cursor,
                 limit=limit,
                 filters=filters,
                 usuario_id=usuario_id
             )
             
-            return Response(result, status=status.HTTP_200_OK)
+            async def construir():
+                # Obtener reportes con paginación (incluir usuario_id para calcular votos)
+                result = await ReportService.aget_reports_with_cursor_pagination(
+                    cursor=cursor,
+                    limit=limit,
+                    filters=filters,
+                    usuario_id=usuario_id
+                )
+                return json_response(result, status=status.HTTP_200_OK)
+            
+            return await aconditional_get(
+                request,
+                build_etag('reportes', usuario_id, filas),
+                # Sin Last-Modified: los contadores cambian sin tocar las fechas
+                None,
+                construir
+            )
             
         except ValueError as e:
-            return Response({
+            return json_response({
                 'success': False,
                 'error': 'Parámetros inválidos',
                 'details': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error al obtener reportes: {str(e)}")
-            return Response({
+            return json_response({
                 'success': False,
                 'error': 'Error interno del servidor',
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
 
+@use_replica
 class ReportDetailView(APIView):
     authentication_classes = [SesionTokenAuthentication]
     permission_classes = [IsAuthenticatedWithSesionToken]
     
     def get(self, request, report_id):
         try:
-            usuario_id = self._get_usuario_id(request)
+            usuario_id = get_usuario_id(request)
             
             if not usuario_id:
                 return Response({
@@ -314,27 +293,42 @@ class ReportDetailView(APIView):
                     'error': 'Token de autenticación inválido o expirado'
                 }, status=status.HTTP_401_UNAUTHORIZED)
             
-            # Obtener reporte sin filtrar por usuario (permite ver reportes de otros)
-            report = ReportModel.objects.select_related(
-                'usuario', 'denuncia_estado', 'tipo_denuncia', 'ciudad'
-            ).prefetch_related('archivos').get(
-                id=report_id
-            )
+            # Versión del reporte (sin relaciones) para responder 304 sin serializar
+            version = ReportService.get_report_version(report_id)
+            if version is None:
+                raise ReportModel.DoesNotExist
             
             # Verificar visibilidad (solo si el reporte no es visible y no pertenece al usuario)
-            if not report.visible and report.usuario_id != usuario_id:
+            visible, autor_id = version[-2], version[-1]
+            if not visible and autor_id != usuario_id:
                 return Response({
                     'success': False,
                     'error': 'Reporte no encontrado'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            # Serializar y retornar
-            response_data = ReportService._serialize_report(report)
+            def construir():
+                # Obtener reporte sin filtrar por usuario (permite ver reportes de otros)
+                report = ReportService._with_serialization_data(
+                    ReportModel.objects.all()
+                ).get(
+                    id=report_id
+                )
+                
+                # Serializar y retornar
+                response_data = ReportService._serialize_report(report)
+                
+                return Response({
+                    'success': True,
+                    'data': response_data
+                }, status=status.HTTP_200_OK)
             
-            return Response({
-                'success': True,
-                'data': response_data
-            }, status=status.HTTP_200_OK)
+            return conditional_get(
+                request,
+                build_etag('reporte', version),
+                # Sin Last-Modified: los contadores cambian sin tocar las fechas
+                None,
+                construir
+            )
             
         except ReportModel.DoesNotExist:
             return Response({
@@ -348,27 +342,6 @@ class ReportDetailView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
-
 class ReportUpdateView(APIView):
     authentication_classes = [SesionTokenAuthentication]
     permission_classes = [IsAuthenticatedWithSesionToken]
@@ -382,7 +355,7 @@ class ReportUpdateView(APIView):
     
     def _update_report(self, request, report_id, partial=False):
         try:
-            usuario_id = self._get_usuario_id(request)
+            usuario_id = get_usuario_id(request)
             
             if not usuario_id:
                 return Response({
@@ -475,9 +448,11 @@ class ReportUpdateView(APIView):
                             'details': validation_result['error']
                         }, status=status.HTTP_400_BAD_REQUEST)
                     
+                    blob = blob_store.store(file, validation_result['extension'])
                     report_archivo = ReportArchivo(
                         reporte=report,
-                        archivo=file,
+                        archivo=blob.ruta,
+                        blob=blob,
                         nombre_original=file.name,
                         tipo_archivo=validation_result['tipo_archivo'],
                         extension=validation_result['extension'],
@@ -518,34 +493,13 @@ class ReportUpdateView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
-
 class ReportDeleteView(APIView):
     authentication_classes = [SesionTokenAuthentication]
     permission_classes = [IsAuthenticatedWithSesionToken]
     
     def delete(self, request, report_id):
         try:
-            usuario_id = self._get_usuario_id(request)
+            usuario_id = get_usuario_id(request)
             
             if not usuario_id:
                 return Response({
@@ -597,6 +551,10 @@ class ReportDeleteView(APIView):
                     archivos = report.archivos.all()
                     for archivo in archivos:
                         try:
+                            archivo.eliminar_derivados()
+                            # Un blob puede estar compartido; lo elimina el recolector al quedar sin referencias
+                            if archivo.blob_id:
+                                continue
                             if archivo.archivo and hasattr(archivo.archivo, 'path'):
                                 import os
                                 if os.path.isfile(archivo.archivo.path):
@@ -630,27 +588,6 @@ class ReportDeleteView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
-
 # Vistas específicas para manejo de archivos/imágenes
 
 class ReportMediaUploadView(APIView):
@@ -661,7 +598,7 @@ class ReportMediaUploadView(APIView):
     def post(self, request, report_id):
         """Sube archivos/imágenes a un reporte existente"""
         try:
-            usuario_id = self._get_usuario_id(request)
+            usuario_id = get_usuario_id(request)
             
             if not usuario_id:
                 return Response({
@@ -711,9 +648,11 @@ class ReportMediaUploadView(APIView):
                         'details': validation_result['error']
                     }, status=status.HTTP_400_BAD_REQUEST)
                 
+                blob = blob_store.store(file, validation_result['extension'])
                 report_archivo = ReportArchivo(
                     reporte=report,
-                    archivo=file,
+                    archivo=blob.ruta,
+                    blob=blob,
                     nombre_original=file.name,
                     tipo_archivo=validation_result['tipo_archivo'],
                     extension=validation_result['extension'],
@@ -744,27 +683,7 @@ class ReportMediaUploadView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
-
+@use_replica
 class ReportMediaListView(APIView):
     authentication_classes = [SesionTokenAuthentication]
     permission_classes = [IsAuthenticatedWithSesionToken]
@@ -772,7 +691,7 @@ class ReportMediaListView(APIView):
     def get(self, request, report_id):
         """Lista todos los archivos/imágenes de un reporte"""
         try:
-            usuario_id = self._get_usuario_id(request)
+            usuario_id = get_usuario_id(request)
             
             if not usuario_id:
                 return Response({
@@ -801,6 +720,7 @@ class ReportMediaListView(APIView):
                     'tamaño': archivo.tamaño_bytes,
                     'tamaño_formateado': archivo.tamaño_formateado,
                     'url': archivo.url,
+                    'derivados': archivo.derivados_urls,
                     'es_principal': archivo.es_principal,
                     'orden': archivo.orden,
                     'fecha_subida': archivo.fecha_subida.isoformat() if archivo.fecha_subida else None
@@ -819,27 +739,6 @@ class ReportMediaListView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
-
 class ReportMediaDeleteView(APIView):
     authentication_classes = [SesionTokenAuthentication]
     permission_classes = [IsAuthenticatedWithSesionToken]
@@ -847,7 +746,7 @@ class ReportMediaDeleteView(APIView):
     def delete(self, request, report_id, archivo_id):
         """Elimina un archivo específico de un reporte"""
         try:
-            usuario_id = self._get_usuario_id(request)
+            usuario_id = get_usuario_id(request)
             
             if not usuario_id:
                 return Response({
@@ -891,28 +790,8 @@ class ReportMediaDeleteView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_usuario_id(self, request):
-        """Método helper para obtener usuario_id de forma consistente"""
-        usuario_id = None
-        
-        if hasattr(request, 'usua_id') and request.usua_id:
-            usuario_id = request.usua_id
-        elif hasattr(request, 'user_id') and request.user_id:
-            usuario_id = request.user_id
-        elif hasattr(request, 'auth_user') and request.auth_user:
-            if hasattr(request.auth_user, 'usua_id'):
-                usuario_id = request.auth_user.usua_id
-            elif hasattr(request.auth_user, 'id'):
-                usuario_id = request.auth_user.id
-        elif hasattr(request, 'user') and request.user and str(request.user) != 'AnonymousUser':
-            if hasattr(request.user, 'usua_id'):
-                usuario_id = request.user.usua_id
-            elif hasattr(request.user, 'id'):
-                usuario_id = request.user.id
-        
-        return usuario_id
-
 # Vista heredada para compatibilidad con decoradores
+@use_replica
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_reports(request):
@@ -1,6 +1,7 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
 from reports.models.seguimiento_reporte import SeguimientoReporte
 from reports.models.report import ReportModel
 import logging
@@ -61,14 +62,16 @@ def follow_report_view(request, report_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Crear seguimiento
-        seguimiento = SeguimientoReporte.objects.create(
-            usuario=usuario,
-            reporte=reporte
-        )
+        # Crear seguimiento (el contador se ajusta en la misma transacción)
+        with transaction.atomic():
+            seguimiento = SeguimientoReporte.objects.create(
+                usuario=usuario,
+                reporte=reporte
+            )
 
-        # Contar seguidores actuales
-        seguidores_count = SeguimientoReporte.objects.filter(reporte=reporte).count()
+        # Seguidores actuales desde el contador del reporte
+        reporte.refresh_from_db(fields=['total_seguidores'])
+        seguidores_count = reporte.total_seguidores
 
         logger.info(f"Usuario {usuario.usua_nickname} comenzó a seguir reporte #{report_id}")
 
@@ -130,10 +133,12 @@ def unfollow_report_view(request, report_id):
         # Verificar si está siguiendo el reporte
         try:
             seguimiento = SeguimientoReporte.objects.get(usuario=usuario, reporte=reporte)
-            seguimiento.delete()
+            with transaction.atomic():
+                seguimiento.delete()
 
-            # Contar seguidores actuales
-            seguidores_count = SeguimientoReporte.objects.filter(reporte=reporte).count()
+            # Seguidores actuales desde el contador del reporte
+            reporte.refresh_from_db(fields=['total_seguidores'])
+            seguidores_count = reporte.total_seguidores
 
             logger.info(f"Usuario {usuario.usua_nickname} dejó de seguir reporte #{report_id}")
 
@@ -200,7 +205,7 @@ def is_following_report_view(request, report_id):
 
         # Verificar seguimiento
         is_following = SeguimientoReporte.esta_siguiendo_reporte(usuario, reporte)
-        seguidores_count = SeguimientoReporte.objects.filter(reporte=reporte).count()
+        seguidores_count = reporte.total_seguidores
 
         return Response(
             {
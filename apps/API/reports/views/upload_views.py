@@ -0,0 +1,183 @@
+import logging
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.parsers import JSONParser
+
+from ..models import ReportModel
+from ..exceptions import ReportUploadException
+from ..services.upload_service import upload_service
+from interfaces.authentication.permissions import IsAuthenticatedWithSesionToken
+from interfaces.authentication.session_token_auth import SesionTokenAuthentication
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Tipos aceptados en el cuerpo de un PATCH (bytes crudos del fragmento)
+CONTENT_TYPES_FRAGMENTO = ('application/offset+octet-stream', 'application/octet-stream')
+
+
+def _serializar_subida(subida):
+    """Estado de una subida reanudable para las respuestas"""
+    data = {
+        'id': str(subida.id),
+        'reporte_id': subida.reporte_id,
+        'nombre': subida.nombre_original,
+        'tipo': subida.tipo_archivo,
+        'tamaño': subida.tamaño_bytes,
+        'offset': subida.offset,
+        'estado': subida.estado,
+        'expira_en': subida.expira_en.isoformat(),
+        'upload_url': f'/api/reports/uploads/{subida.id}/',
+        'max_chunk_size': upload_service.config['MAX_CHUNK_SIZE'],
+    }
+    if subida.archivo:
+        data['archivo'] = {
+            'id': subida.archivo.id,
+            'nombre': subida.archivo.nombre_original,
+            'tipo': subida.archivo.tipo_archivo,
+            'tamaño': subida.archivo.tamaño_bytes,
+            'url': subida.archivo.url,
+            'sha256': subida.sha256,
+        }
+    return data
+
+
+def _respuesta(subida, status_code=status.HTTP_200_OK):
+    response = Response({'success': True, 'data': _serializar_subida(subida)}, status=status_code)
+    response['Upload-Offset'] = str(subida.offset)
+    response['Upload-Length'] = str(subida.tamaño_bytes)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def _error(exc: ReportUploadException):
+    response = Response({'success': False, 'error': exc.message}, status=exc.status_code)
+    if exc.offset is not None:
+        response['Upload-Offset'] = str(exc.offset)
+    return response
+
+
+class ReportUploadCreateView(APIView):
+    """
+    Abre una subida reanudable para un archivo del reporte.
+    Body JSON: nombre, tamaño (bytes) y opcionalmente checksum (SHA-256 hex).
+    """
+    authentication_classes = [SesionTokenAuthentication]
+    permission_classes = [IsAuthenticatedWithSesionToken]
+    parser_classes = [JSONParser]
+
+    def post(self, request, report_id):
+        usuario_id = request.auth_user.usua_id
+
+        try:
+            report = ReportModel.objects.get(id=report_id, usuario_id=usuario_id)
+        except ReportModel.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Reporte no encontrado'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            tamaño = int(request.data.get('tamaño', request.data.get('size')))
+        except (TypeError, ValueError):
+            return Response({
+                'success': False,
+                'error': 'tamaño es obligatorio y debe ser un entero (bytes)'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            subida = upload_service.create(
+                report,
+                usuario_id,
+                request.data.get('nombre') or '',
+                tamaño,
+                request.data.get('checksum') or ''
+            )
+        except ReportUploadException as e:
+            return _error(e)
+
+        logger.info(f"Subida reanudable {subida.id} creada para el reporte {report_id} ({tamaño} bytes)")
+        response = _respuesta(subida, status.HTTP_201_CREATED)
+        response['Location'] = f'/api/reports/uploads/{subida.id}/'
+        return response
+
+
+class ReportUploadDetailView(APIView):
+    """
+    GET/HEAD: bytes recibidos (Upload-Offset) para reanudar.
+    PATCH: agrega un fragmento; requiere Upload-Offset y Content-Length.
+    DELETE: cancela la subida.
+    """
+    authentication_classes = [SesionTokenAuthentication]
+    permission_classes = [IsAuthenticatedWithSesionToken]
+    # El PATCH lee el cuerpo como stream; ningún parser debe cargarlo en memoria
+    parser_classes = []
+
+    def get(self, request, upload_id):
+        try:
+            subida = upload_service.get(upload_id, request.auth_user.usua_id)
+        except ReportUploadException as e:
+            return _error(e)
+        return _respuesta(subida)
+
+    def patch(self, request, upload_id):
+        content_type = request.META.get('CONTENT_TYPE', '').split(';')[0].strip().lower()
+        if content_type not in CONTENT_TYPES_FRAGMENTO:
+            return Response({
+                'success': False,
+                'error': f"Content-Type debe ser {CONTENT_TYPES_FRAGMENTO[0]}"
+            }, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+        try:
+            offset = int(request.META['HTTP_UPLOAD_OFFSET'])
+            if offset < 0:
+                raise ValueError(offset)
+        except (KeyError, ValueError):
+            return Response({
+                'success': False,
+                'error': 'Upload-Offset es obligatorio y debe ser un entero no negativo'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            longitud = int(request.META.get('CONTENT_LENGTH') or '')
+        except ValueError:
+            longitud = None
+
+        try:
+            subida = upload_service.get(upload_id, request.auth_user.usua_id)
+            upload_service.append(
+                subida,
+                offset,
+                request._request,
+                longitud,
+                request.META.get('HTTP_UPLOAD_CHECKSUM')
+            )
+        except ReportUploadException as e:
+            return _error(e)
+        return _respuesta(subida)
+
+    def delete(self, request, upload_id):
+        try:
+            subida = upload_service.get(upload_id, request.auth_user.usua_id)
+            upload_service.cancel(subida)
+        except ReportUploadException as e:
+            return _error(e)
+        return Response({
+            'success': True,
+            'message': 'Subida cancelada'
+        }, status=status.HTTP_200_OK)
+
+
+class ReportUploadCompleteView(APIView):
+    """Finaliza la subida y adjunta el archivo ensamblado al reporte"""
+    authentication_classes = [SesionTokenAuthentication]
+    permission_classes = [IsAuthenticatedWithSesionToken]
+
+    def post(self, request, upload_id):
+        try:
+            subida = upload_service.get(upload_id, request.auth_user.usua_id)
+            upload_service.complete(subida)
+        except ReportUploadException as e:
+            return _error(e)
+        return _respuesta(subida, status.HTTP_201_CREATED)
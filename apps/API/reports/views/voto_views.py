@@ -4,7 +4,6 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db import IntegrityError
 
 from reports.models import ReportModel, VotoReporte
 
@@ -21,6 +20,10 @@ def votar_reporte(request, report_id):
     Comportamiento:
     - Si el usuario NO ha votado: Se registra el voto (201 Created)
     - Si el usuario YA votó: Se elimina el voto (200 OK)
+    - Si el reporte no existe: 404
+    
+    El toggle y el nuevo total se resuelven en una sola sentencia
+    (ver VotoReporte.alternar_voto), sin errores ante toques simultáneos.
     """
     try:
         # Obtener usuario autenticado
@@ -31,71 +34,47 @@ def votar_reporte(request, report_id):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Obtener el reporte
-        reporte = get_object_or_404(ReportModel, id=report_id)
+        # Toggle en un solo viaje a la base de datos (incluye el nuevo total)
+        resultado = VotoReporte.alternar_voto(usuario.usua_id, report_id)
+        if resultado is None:
+            return Response(
+                {'errors': ['Reporte no encontrado.']},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
-        # Verificar si el usuario ya votó por este reporte
-        voto_existente = VotoReporte.objects.filter(
-            usuario=usuario,
-            reporte=reporte
-        ).first()
-
-        if voto_existente:
-            # TOGGLE: Si ya votó, eliminar el voto
-            voto_existente.delete()
-            
-            # Obtener el nuevo conteo de votos
-            nuevo_conteo = VotoReporte.contar_votos_reporte(reporte)
-            
+        if resultado['accion'] == 'removed':
             logger.info(f"Voto eliminado - Usuario: {usuario.usua_id}, Reporte: {report_id}")
-            
+
             return Response(
                 {
                     'message': 'Voto eliminado exitosamente.',
                     'action': 'removed',
                     'votos': {
-                        'count': nuevo_conteo,
+                        'count': resultado['total'],
                         'usuario_ha_votado': False
                     }
                 },
                 status=status.HTTP_200_OK
             )
-        else:
-            # Si no ha votado, crear el voto
-            try:
-                voto = VotoReporte.objects.create(
-                    usuario=usuario,
-                    reporte=reporte
-                )
-                
-                # Obtener el nuevo conteo de votos
-                nuevo_conteo = VotoReporte.contar_votos_reporte(reporte)
-                
-                logger.info(f"Voto registrado - Usuario: {usuario.usua_id}, Reporte: {report_id}")
-
-                return Response(
-                    {
-                        'message': 'Voto registrado exitosamente.',
-                        'action': 'added',
-                        'voto': {
-                            'id': voto.id,
-                            'fecha_voto': voto.fecha_voto.isoformat(),
-                            'reporte_id': reporte.id
-                        },
-                        'votos': {
-                            'count': nuevo_conteo,
-                            'usuario_ha_votado': True
-                        }
-                    },
-                    status=status.HTTP_201_CREATED
-                )
-
-            except IntegrityError:
-                # Por si acaso hay una condición de carrera
-                return Response(
-                    {'errors': ['Ya has votado por este reporte.']},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+
+        logger.info(f"Voto registrado - Usuario: {usuario.usua_id}, Reporte: {report_id}")
+
+        return Response(
+            {
+                'message': 'Voto registrado exitosamente.',
+                'action': 'added',
+                'voto': {
+                    'id': resultado['voto_id'],
+                    'fecha_voto': resultado['fecha_voto'].isoformat() if resultado['fecha_voto'] else None,
+                    'reporte_id': report_id
+                },
+                'votos': {
+                    'count': resultado['total'],
+                    'usuario_ha_votado': True
+                }
+            },
+            status=status.HTTP_201_CREATED
+        )
 
     except Exception as e:
         logger.error(f"Error al procesar voto: {str(e)}")
@@ -148,8 +127,8 @@ def listar_votos_reporte(request, report_id):
                 }
             })
 
-        # Contar total de votos
-        total_count = VotoReporte.objects.filter(reporte=reporte).count()
+        # Total de votos desde el contador del reporte
+        total_count = reporte.total_votos
 
         # Verificar si el usuario autenticado ha votado
         usuario_ha_votado = VotoReporte.ha_votado_reporte(usuario, reporte)
@@ -0,0 +1,97 @@
+"""
+Prueba de carga de los endpoints de lectura (mapa, listado y notificaciones)
+
+No es un test de pytest: se ejecuta a mano contra un servidor levantado, por
+ejemplo comparando WSGI (runserver/gunicorn) con ASGI (uvicorn) sobre la misma
+base de datos:
+
+    python manage.py runserver 8000
+    uvicorn config.asgi:application --port 8001 --workers 4
+
+    python tests/e2e/load_read_endpoints.py --token <token> \\
+        --base http://localhost:8000 --base http://localhost:8001 \\
+        --concurrency 50 --requests 1000
+
+Solo usa la biblioteca estándar. Para medir las consultas del GeoJSON y no la
+caché, levantar ambos servidores con REPORTS_GEOJSON_CACHE_ENABLED=False.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ENDPOINTS = {
+    'geojson': '/api/reports/geojson/?limit=200',
+    'reportes': '/api/reports/?limit=20',
+    'notificaciones': '/api/notifications/?limit=20',
+}
+
+
+def _peticion(url, token, timeout):
+    """Retorna (código HTTP, segundos) de una petición GET"""
+    solicitud = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(solicitud, timeout=timeout) as respuesta:
+            respuesta.read()
+            codigo = respuesta.status
+    except urllib.error.HTTPError as e:
+        codigo = e.code
+    except (urllib.error.URLError, TimeoutError):
+        codigo = 0
+    return codigo, time.perf_counter() - inicio
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+def medir(base, ruta, token, concurrencia, total, timeout):
+    """Ejecuta `total` peticiones con `concurrencia` hilos y retorna las métricas"""
+    urls = [base.rstrip('/') + ruta] * total
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        resultados = list(pool.map(lambda url: _peticion(url, token, timeout), urls))
+    duracion = time.perf_counter() - inicio
+
+    latencias = sorted(segundos for codigo, segundos in resultados if codigo == 200)
+    return {
+        'ok': len(latencias),
+        'errores': total - len(latencias),
+        'rps': len(latencias) / duracion if duracion else 0.0,
+        'p50': _percentil(latencias, 50) * 1000,
+        'p95': _percentil(latencias, 95) * 1000,
+        'media': (statistics.mean(latencias) * 1000) if latencias else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base', action='append', required=True, help='URL del servidor (repetible)')
+    parser.add_argument('--token', required=True, help='Token de sesión (Bearer)')
+    parser.add_argument('--endpoint', action='append', choices=sorted(ENDPOINTS), help='Por defecto todos')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    print(f"{'servidor':<28} {'endpoint':<15} {'ok':>6} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'media ms':>9}")
+    for nombre in args.endpoint or sorted(ENDPOINTS):
+        for base in args.base:
+            m = medir(base, ENDPOINTS[nombre], args.token, args.concurrency, args.requests, args.timeout)
+            print(
+                f"{base:<28} {nombre:<15} {m['ok']:>6} {m['errores']:>5} {m['rps']:>8.1f} "
+                f"{m['p50']:>8.1f} {m['p95']:>8.1f} {m['media']:>9.1f}"
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Tests de integración para el listado y la exportación de usuarios del panel admin
+"""
+import csv
+import io
+import json
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+class AdminUserListTestCase(TestCase):
+    """Tests para admin_list_users: keyset, total y exportación en streaming"""
+
+    def setUp(self):
+        rol_admin = RolUsuario.objects.create(rous_id=1, rous_nombre='Administrador')
+        rol = RolUsuario.objects.create(rous_id=3, rous_nombre='Ciudadano')
+        self.admin = self._crear_usuario(0, rol_admin)
+        self.token = SesionToken.objects.create(
+            usua_id=self.admin,
+            token_valor='admin-listado-token',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        for i in range(1, 6):
+            self._crear_usuario(i, rol, estado=0 if i == 5 else 1)
+
+        # Misma fecha de creación para varios usuarios: el desempate es usua_id
+        Usuario.objects.update(usua_creado=timezone.now() - timedelta(days=1))
+
+    def _crear_usuario(self, i, rol, estado=1):
+        return Usuario.objects.create(
+            usua_rut=f'1000000{i}-{i}',
+            usua_email=f'usuario{i}@example.com',
+            usua_nombre='Usuario',
+            usua_apellido=str(i),
+            usua_nickname=f'usuario_{i}',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=estado
+        )
+
+    def _listar(self, **params):
+        return self.client.get(
+            reverse('admin-list-users'), params,
+            HTTP_AUTHORIZATION=f'Bearer {self.token.token_valor}'
+        )
+
+    def test_keyset_pages_cover_all_users_once(self):
+        """Las páginas por (usua_creado, usua_id) no repiten ni omiten usuarios"""
+        vistos = []
+        params = {'limit': 2}
+        while True:
+            cuerpo = self._listar(**params).json()
+            self.assertLessEqual(len(cuerpo['data']), 2)
+            self.assertEqual(cuerpo['pagination']['total'], 6)
+            self.assertFalse(cuerpo['pagination']['totalIsEstimate'])
+            vistos.extend(u['usua_id'] for u in cuerpo['data'])
+            if not cuerpo['pagination']['hasMore']:
+                break
+            params['cursor'] = cuerpo['pagination']['nextCursor']
+
+        self.assertEqual(sorted(vistos), sorted(Usuario.objects.values_list('usua_id', flat=True)))
+        self.assertEqual(vistos, sorted(vistos, reverse=True))
+
+    def test_estado_filter_and_invalid_params(self):
+        """estado filtra el listado y el total; parámetros inválidos -> 400"""
+        cuerpo = self._listar(estado=0).json()
+        self.assertEqual([u['usua_nickname'] for u in cuerpo['data']], ['usuario_5'])
+        self.assertEqual(cuerpo['pagination']['total'], 1)
+
+        self.assertEqual(self._listar(cursor='xx').status_code, 400)
+        self.assertEqual(self._listar(estado='uno').status_code, 400)
+        self.assertEqual(self._listar(format='xml').status_code, 400)
+
+    def test_ndjson_export_streams_every_user(self):
+        """format=ndjson entrega una línea JSON por usuario en streaming"""
+        response = self._listar(format='ndjson', estado=1)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lineas = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        filas = [json.loads(linea) for linea in lineas]
+        self.assertEqual(len(filas), 5)
+        self.assertEqual(
+            set(filas[0]),
+            {'usua_id', 'usua_rut', 'usua_nickname', 'usua_email',
+             'usua_telefono', 'rous_id', 'usua_estado', 'usua_creado'}
+        )
+
+    def test_csv_export_has_header_and_rows(self):
+        """format=csv entrega encabezado y una fila por usuario"""
+        response = self._listar(format='csv')
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+
+        contenido = b''.join(response.streaming_content).decode('utf-8')
+        filas = list(csv.reader(io.StringIO(contenido)))
+        self.assertEqual(filas[0][:3], ['usua_id', 'usua_rut', 'usua_nickname'])
+        self.assertEqual(len(filas), 7)
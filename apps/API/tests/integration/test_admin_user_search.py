@@ -0,0 +1,113 @@
+"""
+Tests de integración para la búsqueda de usuarios del panel admin
+"""
+import unittest
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+class AdminUserSearchTestCase(TestCase):
+    """Tests para admin_search_users (límite, cursor y modo prefijo)"""
+
+    def setUp(self):
+        rol_admin = RolUsuario.objects.create(rous_id=1, rous_nombre='Administrador')
+        rol = RolUsuario.objects.create(rous_id=3, rous_nombre='Ciudadano')
+        self.admin = self._crear_usuario('9.999.999-9', 'admin', 'Admin', 'Sistema', rol_admin)
+        self.token = SesionToken.objects.create(
+            usua_id=self.admin,
+            token_valor='admin-busqueda-token',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        datos = [
+            ('11.111.111-1', 'maria_gonzalez', 'María', 'González'),
+            ('12.222.222-2', 'mario_rojas', 'Mario', 'Rojas'),
+            ('13.333.333-3', 'marta_soto', 'Marta', 'Soto'),
+            ('14.444.444-4', 'juan_perez', 'Juan', 'Pérez'),
+        ]
+        self.usuarios = {
+            nick: self._crear_usuario(rut, nick, nombre, apellido, rol)
+            for rut, nick, nombre, apellido in datos
+        }
+
+    def _crear_usuario(self, rut, nickname, nombre, apellido, rol):
+        return Usuario.objects.create(
+            usua_rut=rut,
+            usua_email=f'{nickname}@example.com',
+            usua_nombre=nombre,
+            usua_apellido=apellido,
+            usua_nickname=nickname,
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+
+    def _buscar(self, **params):
+        return self.client.get(
+            reverse('admin-search-users'), params,
+            HTTP_AUTHORIZATION=f'Bearer {self.token.token_valor}'
+        )
+
+    def test_prefix_search_pages_with_cursor(self):
+        """El modo prefijo respeta el límite y el cursor recorre el resto en orden"""
+        response = self._buscar(q='mar', prefix='true', limit=2)
+        self.assertEqual(response.status_code, 200)
+        cuerpo = response.json()
+        self.assertEqual(cuerpo['pagination']['mode'], 'prefijo')
+        self.assertTrue(cuerpo['pagination']['hasMore'])
+        self.assertEqual([u['usua_nickname'] for u in cuerpo['data']], ['maria_gonzalez', 'mario_rojas'])
+
+        response = self._buscar(q='mar', prefix='true', limit=2, cursor=cuerpo['pagination']['nextCursor'])
+        cuerpo = response.json()
+        self.assertEqual([u['usua_nickname'] for u in cuerpo['data']], ['marta_soto'])
+        self.assertFalse(cuerpo['pagination']['hasMore'])
+        self.assertIsNone(cuerpo['pagination']['nextCursor'])
+
+    def test_prefix_matches_rut_in_any_format(self):
+        """El RUT se compara normalizado (con o sin puntos)"""
+        response = self._buscar(q='14.444', prefix='true')
+        self.assertEqual([u['usua_nickname'] for u in response.json()['data']], ['juan_perez'])
+
+    def test_short_query_uses_prefix_mode(self):
+        """Con menos de tres caracteres no hay trigramas: se usa el prefijo"""
+        response = self._buscar(q='ju')
+        self.assertEqual(response.json()['pagination']['mode'], 'prefijo')
+        self.assertEqual([u['usua_nickname'] for u in response.json()['data']], ['juan_perez'])
+
+    def test_invalid_cursor_and_permissions(self):
+        """Cursor inválido -> 400; sin rol de administrador -> 403"""
+        self.assertEqual(self._buscar(q='mar', cursor='no-es-un-cursor').status_code, 400)
+
+        otro_token = SesionToken.objects.create(
+            usua_id=self.usuarios['juan_perez'],
+            token_valor='ciudadano-busqueda-token',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        response = self.client.get(
+            reverse('admin-search-users'), {'q': 'mar'},
+            HTTP_AUTHORIZATION=f'Bearer {otro_token.token_valor}'
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'Requiere PostgreSQL con pg_trgm')
+    def test_fuzzy_search_tolerates_typos_and_ranks(self):
+        """'gonzales' encuentra a 'González' primero; el cursor de score continúa sin repetir"""
+        response = self._buscar(q='gonzales', limit=1)
+        cuerpo = response.json()
+        self.assertEqual(cuerpo['pagination']['mode'], 'difuso')
+        self.assertEqual(cuerpo['data'][0]['usua_nickname'], 'maria_gonzalez')
+
+        vistos = [cuerpo['data'][0]['usua_id']]
+        while cuerpo['pagination']['hasMore']:
+            cuerpo = self._buscar(q='gonzales', limit=1, cursor=cuerpo['pagination']['nextCursor']).json()
+            vistos.extend(u['usua_id'] for u in cuerpo['data'])
+        self.assertEqual(len(vistos), len(set(vistos)))
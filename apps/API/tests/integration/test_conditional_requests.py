@@ -0,0 +1,122 @@
+"""
+Tests de integración para ETag / 304 en los endpoints de reportes y proyectos
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si las apps
+'reports' y 'proyectos' no están instaladas, se omiten.
+"""
+import unittest
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(
+    apps.is_installed('reports') and apps.is_installed('proyectos'),
+    'Requiere PostGIS/GDAL y las apps reports y proyectos'
+)
+class ConditionalRequestsTestCase(TestCase):
+    """Tests para el ETag en detalle, listado y GeoJSON"""
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        rol = RolUsuario.objects.create(rous_id=2, rous_nombre='Usuario')
+        self.usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        self.token = SesionToken.objects.create(
+            usua_id=self.usuario,
+            token_valor='etag-token-123',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        self.reporte = ReportModel.objects.create(
+            titulo='Bache',
+            descripcion='Descripción de prueba',
+            direccion='Calle Falsa 123',
+            ubicacion=Point(-72.59, -38.73),
+            urgencia=1,
+            usuario=self.usuario,
+            denuncia_estado=DenunciaEstado.objects.create(nombre='Nuevo'),
+            tipo_denuncia=TipoDenuncia.objects.create(nombre='Infraestructura'),
+            ciudad=Ciudad.objects.create(nombre='Temuco')
+        )
+
+    def _get(self, url, **headers):
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {self.token.token_valor}', **headers)
+
+    def _assert_revalidates(self, url):
+        """Segunda petición con el ETag -> 304 sin cuerpo; retorna el ETag"""
+        primera = self._get(url)
+        self.assertEqual(primera.status_code, 200)
+        self.assertIn('ETag', primera)
+        # Last-Modified no cubriría los contadores: solo se revalida por ETag
+        self.assertNotIn('Last-Modified', primera)
+
+        segunda = self._get(url, HTTP_IF_NONE_MATCH=primera['ETag'])
+        self.assertEqual(segunda.status_code, 304)
+        self.assertEqual(segunda.content, b'')
+        return primera['ETag']
+
+    def test_report_detail_304_skips_serialization(self):
+        """El 304 del detalle se resuelve sin cargar archivos ni relaciones"""
+        url = f'/api/reports/{self.reporte.id}/'
+        etag = self._assert_revalidates(url)
+
+        with CaptureQueriesContext(connection) as consultas:
+            self._get(url, HTTP_IF_NONE_MATCH=etag)
+        # Sin la precarga de archivos de _with_serialization_data
+        self.assertFalse(any(q['sql'].startswith('SELECT "report_archivos"')
+                             for q in consultas.captured_queries))
+
+    def test_counter_changes_invalidate_list_and_detail(self):
+        """Un voto (contador con F(), sin fecha_actualizacion) cambia el ETag"""
+        from reports.models import VotoReporte
+
+        etag_lista = self._assert_revalidates('/api/reports/')
+        etag_detalle = self._assert_revalidates(f'/api/reports/{self.reporte.id}/')
+
+        VotoReporte.alternar_voto(self.usuario.usua_id, self.reporte.id)
+
+        self.assertEqual(self._get('/api/reports/', HTTP_IF_NONE_MATCH=etag_lista).status_code, 200)
+        self.assertEqual(
+            self._get(f'/api/reports/{self.reporte.id}/', HTTP_IF_NONE_MATCH=etag_detalle).status_code, 200
+        )
+        # Un cliente que solo envía If-Modified-Since no recibe 304 con contadores viejos
+        futuro = http_date((timezone.now() + timedelta(days=1)).timestamp())
+        self.assertEqual(
+            self._get(f'/api/reports/{self.reporte.id}/', HTTP_IF_MODIFIED_SINCE=futuro).status_code, 200
+        )
+
+    def test_geojson_and_projects(self):
+        """GeoJSON, listado y detalle de proyectos responden 304 con el ETag vigente"""
+        from proyectos.models import ProyectoModel
+
+        proyecto = ProyectoModel.objects.create(
+            proy_titulo='Reparación', proy_descripcion='Bache', denu_id=self.reporte
+        )
+        self._assert_revalidates('/api/reports/geojson/')
+        etag = self._assert_revalidates('/api/proyectos/')
+        self._assert_revalidates(f'/api/proyectos/{proyecto.proy_id}/')
+
+        proyecto.proy_estado = 2
+        proyecto.save()
+        self.assertEqual(self._get('/api/proyectos/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
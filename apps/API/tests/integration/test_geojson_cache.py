@@ -0,0 +1,125 @@
+"""
+Tests de integración para la caché del GeoJSON del mapa
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import unittest
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+@override_settings(REPORTS_GEOJSON_CACHE={'ENABLED': True, 'ALIAS': 'default', 'TTL': 60})
+class GeoJSONCacheTestCase(TestCase):
+    """Tests para reports.services.geojson_cache y su uso en ReportGeoJSONView"""
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        cache.clear()
+        rol = RolUsuario.objects.create(rous_id=1, rous_nombre='Administrador')
+        self.usuarios = []
+        self.tokens = []
+        for i in range(2):
+            usuario = Usuario.objects.create(
+                usua_rut=f'1234567{i}-9',
+                usua_email=f'vecino{i}@example.com',
+                usua_nombre='Vecino',
+                usua_apellido=str(i),
+                usua_nickname=f'vecino{i}',
+                usua_pass=make_password('SecurePass123'),
+                usua_telefono=56912345678,
+                rous_id=rol,
+                usua_estado=1
+            )
+            self.usuarios.append(usuario)
+            self.tokens.append(SesionToken.objects.create(
+                usua_id=usuario,
+                token_valor=f'geojson-cache-token-{i}',
+                token_expira_en=timezone.now() + timedelta(days=1)
+            ))
+        self.datos = {
+            'ubicacion': Point(-72.59, -38.73),
+            'urgencia': 2,
+            'usuario': self.usuarios[0],
+            'denuncia_estado': DenunciaEstado.objects.create(nombre='Nuevo'),
+            'tipo_denuncia': TipoDenuncia.objects.create(nombre='Infraestructura'),
+            'ciudad': Ciudad.objects.create(nombre='Temuco'),
+        }
+        ReportModel.objects.create(titulo='Bache', descripcion='Hoyo', **self.datos)
+
+    def _get(self, i, params=None):
+        return self.client.get(
+            '/api/reports/geojson/', params or {},
+            HTTP_AUTHORIZATION=f'Bearer {self.tokens[i].token_valor}'
+        )
+
+    def test_hit_is_shared_and_overlays_user_fields(self):
+        """El segundo usuario recibe la respuesta cacheada con su propio es_mi_reporte"""
+        primera = self._get(0, {'urgencia': '2'})
+        self.assertEqual(primera['X-Cache'], 'MISS')
+        self.assertTrue(primera.json()['features'][0]['properties']['es_mi_reporte'])
+
+        # "02" es el mismo filtro que "2"
+        segunda = self._get(1, {'urgencia': '02'})
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertFalse(segunda.json()['features'][0]['properties']['es_mi_reporte'])
+        self.assertEqual(
+            primera.json()['features'][0]['properties']['id'],
+            segunda.json()['features'][0]['properties']['id']
+        )
+
+    def test_writes_bump_version(self):
+        """Crear o editar un reporte invalida las respuestas cacheadas"""
+        from reports.models import ReportModel
+
+        self._get(0)
+        self.assertEqual(self._get(1)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReportModel.objects.create(titulo='Poste', descripcion='Caído', **self.datos)
+        respuesta = self._get(1)
+        self.assertEqual(respuesta['X-Cache'], 'MISS')
+        self.assertEqual(len(respuesta.json()['features']), 2)
+
+        reporte = ReportModel.objects.get(titulo='Poste')
+        reporte.visible = False
+        with self.captureOnCommitCallbacks(execute=True):
+            reporte.save()
+        self.assertEqual(len(self._get(1).json()['features']), 1)
+
+    def test_my_reports_bypasses_cache_and_stats(self):
+        """my_reports no se cachea; las métricas informan la tasa de aciertos"""
+        self.assertEqual(self._get(0, {'my_reports': 'true'})['X-Cache'], 'BYPASS')
+        self._get(0)
+        self._get(1)
+
+        respuesta = self.client.get(
+            '/api/reports/geojson/cache/stats/',
+            HTTP_AUTHORIZATION=f'Bearer {self.tokens[0].token_valor}'
+        )
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()['data']
+        self.assertEqual((datos['hits'], datos['misses']), (1, 1))
+        self.assertEqual(datos['hit_ratio'], 0.5)
+
+    def test_replica_routed_request_fills_cache(self):
+        """Con réplicas la vista sigue llenando la caché (las features salen de la primaria)"""
+        from unittest import mock
+        from infrastructure.database import replicas
+
+        # La "réplica" es la propia primaria: misma versión, petición enrutada a réplica
+        with mock.patch.object(replicas.replica_monitor, 'available', return_value=['default']):
+            self.assertEqual(self._get(0)['X-Cache'], 'MISS')
+        self.assertEqual(self._get(1)['X-Cache'], 'HIT')
@@ -0,0 +1,82 @@
+"""
+Tests de integración para la paginación por clave (infrastructure.database.pagination)
+"""
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+from infrastructure.database.pagination import akeyset_paginate, decode_cursor, encode_cursor, keyset_paginate
+
+
+class KeysetPaginationTestCase(TestCase):
+    """Tests para keyset_paginate con empates en el campo de orden"""
+
+    def setUp(self):
+        rol = RolUsuario.objects.create(rous_id=1, rous_nombre='Usuario')
+        usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        base = timezone.now()
+        # Pares de tokens con la misma fecha para forzar empates
+        for i in range(7):
+            SesionToken.objects.create(
+                usua_id=usuario,
+                token_valor=f'token-{i}',
+                token_expira_en=base + timedelta(hours=i // 2)
+            )
+
+    def _recorrer(self, descending):
+        vistos = []
+        posicion = None
+        while True:
+            items, hay_mas = keyset_paginate(
+                SesionToken.objects.all(), 'token_expira_en', 3,
+                after=posicion, descending=descending, pk_field='token_id'
+            )
+            vistos.extend(t.token_id for t in items)
+            if not hay_mas:
+                return vistos
+            # El cursor pasa por el cliente como texto
+            posicion = decode_cursor(encode_cursor(items[-1].token_expira_en, items[-1].token_id))
+
+    def test_walks_every_row_once_in_order(self):
+        """Recorre todas las filas sin repetir ni saltar, en ambos sentidos"""
+        esperado = list(
+            SesionToken.objects.order_by('-token_expira_en', '-token_id').values_list('token_id', flat=True)
+        )
+        self.assertEqual(self._recorrer(descending=True), esperado)
+        self.assertEqual(self._recorrer(descending=False), esperado[::-1])
+
+    async def test_async_variant_returns_same_page(self):
+        """akeyset_paginate (ORM async) devuelve la misma página que la versión síncrona"""
+        queryset = SesionToken.objects.all()
+        posicion = await SesionToken.objects.order_by('-token_expira_en', '-token_id').afirst()
+        after = (posicion.token_expira_en, posicion.token_id)
+
+        sincrona = await sync_to_async(keyset_paginate)(
+            queryset, 'token_expira_en', 3, after=after, pk_field='token_id'
+        )
+        asincrona = await akeyset_paginate(queryset, 'token_expira_en', 3, after=after, pk_field='token_id')
+        self.assertEqual(
+            [t.token_id for t in asincrona[0]], [t.token_id for t in sincrona[0]]
+        )
+        self.assertEqual(asincrona[1], sincrona[1])
+
+    def test_invalid_cursor_is_none(self):
+        """Un cursor mal formado se trata como ausente"""
+        self.assertIsNone(decode_cursor('no-es-un-cursor'))
+        self.assertIsNone(decode_cursor(None))
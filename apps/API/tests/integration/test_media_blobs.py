@@ -0,0 +1,140 @@
+"""
+Tests de integración para el almacenamiento deduplicado de archivos (MediaBlob)
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+CONTENIDO = b'\xff\xd8\xff\xe0' + b'foto-repetida' * 512
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL)
+class MediaBlobTestCase(TestCase):
+    """Tests para reports.services.blob_store y el conteo de referencias"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        rol = RolUsuario.objects.create(rous_id=3, rous_nombre='Usuario')
+        usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Prueba',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        token = SesionToken.objects.create(
+            usua_id=usuario,
+            token_valor='blob-token',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token.token_valor}'}
+
+        estado = DenunciaEstado.objects.create(nombre='Nuevo')
+        tipo = TipoDenuncia.objects.create(nombre='Infraestructura')
+        ciudad = Ciudad.objects.create(nombre='Temuco')
+        self.reportes = [
+            ReportModel.objects.create(
+                titulo=f'Bache {i}',
+                descripcion='Hoyo',
+                urgencia=2,
+                ubicacion=Point(-72.59, -38.73),
+                usuario=usuario,
+                denuncia_estado=estado,
+                tipo_denuncia=tipo,
+                ciudad=ciudad
+            )
+            for i in range(2)
+        ]
+
+    def _subir(self, reporte, nombre):
+        return self.client.post(
+            f'/api/reports/{reporte.id}/media/upload/',
+            {'imagenes': SimpleUploadedFile(nombre, CONTENIDO, content_type='image/jpeg')},
+            **self.auth
+        )
+
+    def test_duplicate_uploads_share_one_blob(self):
+        """La misma foto en dos reportes se guarda una vez y cuenta dos referencias"""
+        from reports.models import MediaBlob, ReportArchivo
+
+        self.assertEqual(self._subir(self.reportes[0], 'a.jpg').status_code, 201)
+        self.assertEqual(self._subir(self.reportes[1], 'b.jpg').status_code, 201)
+
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.sha256, hashlib.sha256(CONTENIDO).hexdigest())
+        self.assertEqual(blob.referencias, 2)
+        self.assertEqual(blob.mime_type, 'image/jpeg')
+        self.assertTrue(blob.ruta.startswith(f'blobs/{blob.sha256[:2]}/{blob.sha256[2:4]}/'))
+
+        archivos = ReportArchivo.objects.order_by('id')
+        self.assertEqual({archivo.archivo.name for archivo in archivos}, {blob.ruta})
+        self.assertEqual([archivo.nombre_original for archivo in archivos], ['a.jpg', 'b.jpg'])
+        carpeta = os.path.join(MEDIA_TEMPORAL, os.path.dirname(blob.ruta))
+        self.assertEqual(os.listdir(carpeta), [os.path.basename(blob.ruta)])
+
+    def test_release_marks_blob_without_deleting(self):
+        """Al eliminar la última referencia el blob queda marcado para el recolector"""
+        from reports.models import MediaBlob, ReportArchivo
+
+        self._subir(self.reportes[0], 'a.jpg')
+        self._subir(self.reportes[1], 'b.jpg')
+        primero, segundo = ReportArchivo.objects.order_by('id')
+
+        primero.delete()
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.referencias, 1)
+        self.assertIsNone(blob.sin_referencias_desde)
+
+        # El reporte se elimina en cascada con sus archivos
+        segundo.reporte.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.referencias, 0)
+        self.assertIsNotNone(blob.sin_referencias_desde)
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_TEMPORAL, blob.ruta)))
+
+        # Subirla de nuevo la reactiva sin escribir
+        self._subir(self.reportes[0], 'c.jpg')
+        blob.refresh_from_db()
+        self.assertEqual(blob.referencias, 1)
+        self.assertIsNone(blob.sin_referencias_desde)
+
+    def test_por_ruta_resolves_urls(self):
+        """Una URL del blob store se resuelve a su blob; otras rutas no"""
+        from reports.models import MediaBlob
+        from reports.services.blob_store import blob_store
+
+        self._subir(self.reportes[0], 'a.jpg')
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob_store.por_ruta(f'/media/{blob.ruta}'), blob)
+        self.assertEqual(blob_store.por_ruta(blob.ruta), blob)
+        self.assertIsNone(blob_store.por_ruta('https://example.com/plano.pdf'))
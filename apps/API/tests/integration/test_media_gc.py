@@ -0,0 +1,156 @@
+"""
+Tests de integración para el recolector de archivos huérfanos (collect_orphan_media)
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import uuid
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+HACE_DOS_DIAS = time.time() - 2 * 24 * 60 * 60
+
+
+def _escribir(ruta, antiguo=True):
+    """Crea un archivo en MEDIA_ROOT; por defecto con fecha anterior al período de gracia"""
+    absoluta = os.path.join(MEDIA_TEMPORAL, ruta)
+    os.makedirs(os.path.dirname(absoluta), exist_ok=True)
+    with open(absoluta, 'wb') as f:
+        f.write(b'x' * 100)
+    if antiguo:
+        os.utime(absoluta, (HACE_DOS_DIAS, HACE_DOS_DIAS))
+    return absoluta
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL, MEDIA_GC={'GRACE_PERIOD': 24 * 60 * 60})
+class MediaGarbageCollectorTestCase(TestCase):
+    """Tests para reports.services.media_gc_service y su comando"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+        rol = RolUsuario.objects.create(rous_id=3, rous_nombre='Usuario')
+        usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Prueba',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        self.reporte = ReportModel.objects.create(
+            titulo='Bache',
+            descripcion='Hoyo',
+            urgencia=2,
+            ubicacion=Point(-72.59, -38.73),
+            usuario=usuario,
+            denuncia_estado=DenunciaEstado.objects.create(nombre='Nuevo'),
+            tipo_denuncia=TipoDenuncia.objects.create(nombre='Infraestructura'),
+            ciudad=Ciudad.objects.create(nombre='Temuco')
+        )
+
+    def _archivo(self, nombre='foto.jpg'):
+        from reports.models import ReportArchivo
+
+        archivo = ReportArchivo.objects.create(
+            reporte=self.reporte,
+            archivo=SimpleUploadedFile(nombre, b'\xff\xd8' + b'foto' * 64, content_type='image/jpeg')
+        )
+        absoluta = archivo.archivo.path
+        os.utime(absoluta, (HACE_DOS_DIAS, HACE_DOS_DIAS))
+        return archivo
+
+    def _ejecutar(self, *args):
+        salida = io.StringIO()
+        call_command('collect_orphan_media', *args, stdout=salida)
+        return salida.getvalue()
+
+    def test_orphans_are_removed_after_grace_period(self):
+        """Solo se eliminan los archivos sin referencias y más antiguos que la gracia"""
+        from reports.models import ReportArchivo
+
+        archivo = self._archivo()
+        base = archivo.archivo.name.rsplit('.', 1)[0]
+        derivado = f'{base}_miniatura.jpg'
+        _escribir(derivado)
+        ReportArchivo.objects.filter(id=archivo.id).update(derivados={'miniatura': derivado})
+
+        huerfano = _escribir('reports/01-01-2025/99/huerfano.jpg')
+        reciente = _escribir('reports/01-01-2025/99/reciente.jpg', antiguo=False)
+        parcial = _escribir(f'uploads_tmp/{uuid.uuid4().hex}.part')
+        carpeta_vacia = os.path.join(MEDIA_TEMPORAL, 'reports', '01-01-2025', '98')
+        os.makedirs(carpeta_vacia)
+        os.utime(carpeta_vacia, (HACE_DOS_DIAS, HACE_DOS_DIAS))
+
+        salida = self._ejecutar('--dry-run', '-v', '2')
+        self.assertIn('huerfano.jpg', salida)
+        self.assertTrue(os.path.exists(huerfano))
+        self.assertTrue(os.path.exists(parcial))
+
+        self._ejecutar()
+        self.assertFalse(os.path.exists(huerfano))
+        self.assertFalse(os.path.exists(parcial))
+        self.assertFalse(os.path.exists(carpeta_vacia))
+        self.assertTrue(os.path.exists(reciente))
+        self.assertTrue(os.path.exists(archivo.archivo.path))
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_TEMPORAL, derivado)))
+
+    def test_inactive_files_are_quarantined(self):
+        """Un archivo desactivado hace más que la gracia se elimina y su archivo va a cuarentena"""
+        from reports.models import ReportArchivo
+
+        archivo = self._archivo()
+        ruta = archivo.archivo.name
+        ReportArchivo.objects.filter(id=archivo.id).update(
+            activo=False, fecha_actualizada=timezone.now() - timedelta(days=2)
+        )
+
+        self._ejecutar('--quarantine')
+        self.assertFalse(ReportArchivo.objects.filter(id=archivo.id).exists())
+        self.assertFalse(os.path.exists(os.path.join(MEDIA_TEMPORAL, ruta)))
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_TEMPORAL, '.quarantine', ruta)))
+
+    def test_unreferenced_blobs_expire(self):
+        """Un blob sin referencias pasado el período de gracia se elimina con su archivo"""
+        from django.core.files.base import ContentFile
+        from reports.models import MediaBlob
+        from reports.services.blob_store import blob_store
+
+        usado = blob_store.store(ContentFile(b'usado', name='a.jpg'), 'jpg')
+        usado.referencias = 1
+        usado.save()
+        libre = blob_store.store(ContentFile(b'libre', name='b.jpg'), 'jpg')
+        MediaBlob.objects.filter(id=libre.id).update(sin_referencias_desde=timezone.now() - timedelta(days=2))
+
+        self._ejecutar()
+        self.assertFalse(MediaBlob.objects.filter(id=libre.id).exists())
+        self.assertFalse(os.path.exists(os.path.join(MEDIA_TEMPORAL, libre.ruta)))
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_TEMPORAL, usado.ruta)))
@@ -0,0 +1,89 @@
+"""
+Tests de integración para los contadores de notificaciones por usuario
+
+NOTA: Requieren que la app 'notifications' esté en INSTALLED_APPS (depende de
+reports y por lo tanto de PostGIS/GDAL). Si no está instalada, se omiten.
+"""
+import unittest
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('notifications'), 'Requiere la app notifications (PostGIS/GDAL)')
+class NotificationCounterTestCase(TestCase):
+    """Tests para NotificationCounter y los endpoints que lo usan"""
+
+    def setUp(self):
+        rol = RolUsuario.objects.create(rous_id=2, rous_nombre='Usuario')
+        self.usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        self.token = SesionToken.objects.create(
+            usua_id=self.usuario,
+            token_valor='contador-token-123',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+
+    def _auth(self):
+        return {'HTTP_AUTHORIZATION': f'Bearer {self.token.token_valor}'}
+
+    def test_lazy_backfill_and_transactional_updates(self):
+        """El contador se calcula al consultarlo y luego se mantiene con cada cambio"""
+        from notifications.models import Notification, NotificationCounter
+        from notifications.services.notification_service import notification_service
+
+        # Notificaciones previas al contador (sin fila)
+        Notification.objects.create(usuario=self.usuario, titulo='A', mensaje='a')
+        Notification.objects.create(usuario=self.usuario, titulo='B', mensaje='b', leida=True)
+
+        contador = NotificationCounter.obtener(self.usuario.usua_id)
+        self.assertEqual((contador.total, contador.no_leidas), (2, 1))
+
+        nueva = notification_service.create_notification(self.usuario, 'C', 'c')
+        nueva.marcar_como_leida()
+        nueva.marcar_como_leida()
+
+        contador.refresh_from_db()
+        self.assertEqual((contador.total, contador.no_leidas), (3, 1))
+        self.assertEqual(
+            NotificationCounter.recalcular(self.usuario.usua_id).no_leidas, contador.no_leidas
+        )
+
+    def test_list_and_mark_all_read_use_counter(self):
+        """El listado informa los conteos del contador y mark-all-read lo deja en cero"""
+        from notifications.services.notification_service import notification_service
+
+        for i in range(3):
+            notification_service.create_notification(self.usuario, f'Aviso {i}', 'mensaje')
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/notifications/', **self._auth())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['unread_count'], 3)
+        self.assertEqual(response.json()['total'], 3)
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in consultas.captured_queries))
+
+        response = self.client.post('/api/notifications/mark-all-read/', **self._auth())
+        self.assertEqual(response.json()['count'], 3)
+
+        response = self.client.get('/api/notifications/', **self._auth())
+        self.assertEqual(response.json()['unread_count'], 0)
+        self.assertEqual(response.json()['total'], 3)
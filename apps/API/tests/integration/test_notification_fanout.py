@@ -0,0 +1,92 @@
+"""
+Tests de integración para el envío masivo de notificaciones (NotificationJob)
+
+NOTA: Requieren que la app 'notifications' esté en INSTALLED_APPS (depende de
+reports y por lo tanto de PostGIS/GDAL). Si no está instalada, se omiten.
+"""
+import unittest
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('notifications'), 'Requiere la app notifications (PostGIS/GDAL)')
+class NotificationFanoutTestCase(TestCase):
+    """Tests para FanoutService y el worker process_notification_jobs"""
+
+    def setUp(self):
+        rol = RolUsuario.objects.create(rous_id=1, rous_nombre='Administrador')
+        self.usuarios = [
+            Usuario.objects.create(
+                usua_rut=f'1000000{i}-{i}',
+                usua_email=f'usuario{i}@example.com',
+                usua_nombre='Usuario',
+                usua_apellido=str(i),
+                usua_nickname=f'usuario{i}',
+                usua_pass=make_password('SecurePass123'),
+                usua_telefono=56912345678,
+                rous_id=rol,
+                usua_estado=0 if i == 0 else 1
+            )
+            for i in range(7)
+        ]
+
+    def test_broadcast_is_processed_in_chunks(self):
+        """Un broadcast crea una notificación por usuario habilitado"""
+        from notifications.models import Notification, NotificationJob
+        from notifications.services.fanout_service import fanout_service
+
+        job = fanout_service.enqueue_broadcast('Aviso', 'Mensaje masivo', creado_por=self.usuarios[1])
+        self.assertEqual(job.estado, NotificationJob.ESTADO_PENDIENTE)
+        self.assertEqual(job.total, 6)
+        self.assertEqual(Notification.objects.count(), 0)
+
+        self.assertEqual(fanout_service.run_pending(chunk_size=4), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.estado, NotificationJob.ESTADO_COMPLETADO)
+        self.assertEqual(job.procesados, 6)
+        self.assertEqual(job.progreso, 100.0)
+        self.assertFalse(Notification.objects.filter(usuario=self.usuarios[0]).exists())
+
+    def test_resumes_from_last_committed_chunk(self):
+        """Un job interrumpido retoma desde el último usuario confirmado"""
+        from notifications.models import Notification, NotificationJob
+        from notifications.services.fanout_service import fanout_service
+
+        job = fanout_service.enqueue_broadcast('Aviso', 'Mensaje masivo')
+        habilitados = sorted(u.usua_id for u in self.usuarios if u.usua_estado == 1)
+        NotificationJob.objects.filter(pk=job.pk).update(
+            ultimo_usuario_id=habilitados[2], procesados=3
+        )
+
+        fanout_service.run_pending(chunk_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.procesados, 6)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_job_endpoint_reports_progress(self):
+        """El creador puede consultar el avance del job"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from domain.entities.sesion_token import SesionToken
+        from notifications.services.fanout_service import fanout_service
+
+        token = SesionToken.objects.create(
+            usua_id=self.usuarios[1],
+            token_valor='fanout-token-123',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        job = fanout_service.enqueue_broadcast('Aviso', 'Mensaje', creado_por=self.usuarios[1])
+
+        response = self.client.get(
+            f'/api/notifications/jobs/{job.id}/',
+            HTTP_AUTHORIZATION=f'Bearer {token.token_valor}'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['job']['estado'], 'pendiente')
@@ -0,0 +1,88 @@
+"""
+Tests de integración para la paginación del listado de notificaciones
+
+NOTA: Requieren que la app 'notifications' esté en INSTALLED_APPS (depende de
+reports y por lo tanto de PostGIS/GDAL). Si no está instalada, se omiten.
+"""
+import unittest
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('notifications'), 'Requiere la app notifications (PostGIS/GDAL)')
+class NotificationPaginationTestCase(TestCase):
+    """Tests para cursor y since en GET /api/notifications/"""
+
+    def setUp(self):
+        from notifications.models import Notification
+
+        rol = RolUsuario.objects.create(rous_id=2, rous_nombre='Usuario')
+        self.usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        self.token = SesionToken.objects.create(
+            usua_id=self.usuario,
+            token_valor='paginacion-token-123',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        self.notificaciones = [
+            Notification.objects.create(usuario=self.usuario, titulo=f'Aviso {i}', mensaje='mensaje')
+            for i in range(5)
+        ]
+
+    def _get(self, **params):
+        return self.client.get(
+            '/api/notifications/', params,
+            HTTP_AUTHORIZATION=f'Bearer {self.token.token_valor}'
+        ).json()
+
+    def test_cursor_walks_pages_newest_first(self):
+        """Las páginas avanzan hacia notificaciones más antiguas sin repetir"""
+        primera = self._get(limit=2)
+        self.assertTrue(primera['pagination']['hasMore'])
+        self.assertEqual(primera['total'], 5)
+
+        ids = [n['id'] for n in primera['data']]
+        cursor = primera['pagination']['nextCursor']
+        while cursor:
+            pagina = self._get(limit=2, cursor=cursor)
+            ids.extend(n['id'] for n in pagina['data'])
+            cursor = pagina['pagination']['nextCursor']
+
+        self.assertEqual(ids, [n.id for n in reversed(self.notificaciones)])
+
+    def test_since_returns_only_new_notifications(self):
+        """Con syncCursor solo llegan las notificaciones creadas después"""
+        from notifications.models import Notification
+
+        sync_cursor = self._get(limit=2)['pagination']['syncCursor']
+        self.assertEqual(self._get(since=sync_cursor)['data'], [])
+
+        nueva = Notification.objects.create(usuario=self.usuario, titulo='Nueva', mensaje='mensaje')
+        respuesta = self._get(since=sync_cursor)
+        self.assertEqual([n['id'] for n in respuesta['data']], [nueva.id])
+        self.assertNotEqual(respuesta['pagination']['syncCursor'], sync_cursor)
+
+    def test_invalid_cursor_is_rejected(self):
+        """Un cursor inválido responde 400"""
+        respuesta = self.client.get(
+            '/api/notifications/', {'cursor': '???'},
+            HTTP_AUTHORIZATION=f'Bearer {self.token.token_valor}'
+        )
+        self.assertEqual(respuesta.status_code, 400)
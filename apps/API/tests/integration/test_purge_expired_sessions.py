@@ -0,0 +1,82 @@
+"""
+Tests de integración para el comando purge_expired_sessions
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from domain.entities.recuperar_usuario import RecuperarUsuario
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+class PurgeExpiredSessionsTestCase(TestCase):
+    """Tests para la limpieza de tokens y códigos expirados"""
+
+    def setUp(self):
+        rol = RolUsuario.objects.create(rous_id=1, rous_nombre='Usuario')
+        self.usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        ahora = timezone.now()
+
+        for i in range(7):
+            SesionToken.objects.create(
+                usua_id=self.usuario,
+                token_valor=f'expirado-{i}',
+                token_expira_en=ahora - timedelta(hours=1)
+            )
+        SesionToken.objects.create(
+            usua_id=self.usuario,
+            token_valor='inactivo',
+            token_expira_en=ahora + timedelta(hours=1),
+            token_activo=False
+        )
+        self.vigente = SesionToken.objects.create(
+            usua_id=self.usuario,
+            token_valor='vigente',
+            token_expira_en=ahora + timedelta(hours=1)
+        )
+
+        RecuperarUsuario.objects.create(
+            usua_id=self.usuario, reus_token='111111', reus_expira_en=ahora - timedelta(minutes=5)
+        )
+        RecuperarUsuario.objects.create(
+            usua_id=self.usuario, reus_token='222222', reus_expira_en=ahora + timedelta(minutes=5)
+        )
+
+    def test_deletes_expired_rows_in_batches(self):
+        """Elimina tokens expirados/inactivos y códigos vencidos en lotes"""
+        salida = StringIO()
+        call_command('purge_expired_sessions', batch_size=3, sleep=0, stdout=salida)
+
+        self.assertEqual(list(SesionToken.objects.values_list('token_valor', flat=True)), ['vigente'])
+        self.assertEqual(list(RecuperarUsuario.objects.values_list('reus_token', flat=True)), ['222222'])
+        self.assertIn('sesion_token: 8 filas eliminadas en 3 lotes', salida.getvalue())
+        self.assertIn('recuperar_usuario: 1 filas eliminadas en 1 lotes', salida.getvalue())
+
+    def test_max_batches_limits_work(self):
+        """--max-batches acota la cantidad de lotes por ejecución"""
+        call_command('purge_expired_sessions', batch_size=3, sleep=0, max_batches=1, stdout=StringIO())
+        self.assertEqual(SesionToken.objects.count(), 9 - 3)
+
+    def test_dry_run_does_not_delete(self):
+        """--dry-run solo informa las filas a eliminar"""
+        salida = StringIO()
+        call_command('purge_expired_sessions', dry_run=True, stdout=salida)
+
+        self.assertEqual(SesionToken.objects.count(), 9)
+        self.assertIn('sesion_token: 8 filas a eliminar', salida.getvalue())
@@ -0,0 +1,165 @@
+"""
+Tests de integración para la entrega de notificaciones push
+
+Usan un servidor HTTP local que imita la API de push de Expo.
+
+NOTA: Requieren que la app 'notifications' esté en INSTALLED_APPS (depende de
+reports y por lo tanto de PostGIS/GDAL). Si no está instalada, se omiten.
+"""
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+
+class StubPushHandler(BaseHTTPRequestHandler):
+    """Responde como Expo; los tokens con 'invalido' reciben DeviceNotRegistered"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        mensajes = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.solicitudes.append(mensajes)
+            fallar = server.fallas_pendientes > 0
+            if fallar:
+                server.fallas_pendientes -= 1
+
+        if fallar:
+            self._responder(503, {'errors': [{'code': 'UNAVAILABLE'}]})
+            return
+
+        tickets = []
+        for mensaje in mensajes:
+            if 'invalido' in mensaje['to']:
+                tickets.append({
+                    'status': 'error',
+                    'message': 'El dispositivo no está registrado',
+                    'details': {'error': 'DeviceNotRegistered'}
+                })
+            else:
+                tickets.append({'status': 'ok', 'id': f"ticket-{mensaje['to']}"})
+        self._responder(200, {'data': tickets})
+
+    def _responder(self, status, cuerpo):
+        datos = json.dumps(cuerpo).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipUnless(apps.is_installed('notifications'), 'Requiere la app notifications (PostGIS/GDAL)')
+class PushDeliveryTestCase(TestCase):
+    """Tests para PushService contra un servidor push local"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubPushHandler)
+        self.server.lock = threading.Lock()
+        self.server.solicitudes = []
+        self.server.fallas_pendientes = 0
+        hilo = threading.Thread(target=self.server.serve_forever, daemon=True)
+        hilo.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        settings_push = override_settings(PUSH_NOTIFICATIONS={
+            'URL': f'http://127.0.0.1:{self.server.server_port}/--/api/v2/push/send',
+            'MAX_WORKERS': 2,
+            'BATCH_SIZE': 2,
+            'MAX_RETRIES': 2,
+            'BACKOFF': 0,
+        })
+        settings_push.enable()
+        self.addCleanup(settings_push.disable)
+
+        rol = RolUsuario.objects.create(rous_id=2, rous_nombre='Usuario')
+        self.usuarios = [
+            Usuario.objects.create(
+                usua_rut=f'2000000{i}-{i}',
+                usua_email=f'push{i}@example.com',
+                usua_nombre='Usuario',
+                usua_apellido=str(i),
+                usua_nickname=f'push{i}',
+                usua_pass=make_password('SecurePass123'),
+                usua_telefono=56912345678,
+                rous_id=rol,
+                usua_estado=1
+            )
+            for i in range(3)
+        ]
+
+    def _crear_tokens(self):
+        from notifications.models import PushToken
+
+        PushToken.objects.create(usuario=self.usuarios[0], push_token='ExponentPushToken[a1]', platform='android')
+        PushToken.objects.create(usuario=self.usuarios[0], push_token='ExponentPushToken[a2]', platform='ios')
+        PushToken.objects.create(usuario=self.usuarios[1], push_token='ExponentPushToken[b1]', platform='android')
+        PushToken.objects.create(usuario=self.usuarios[1], push_token='ExponentPushToken[invalido]', platform='android')
+
+    def _crear_notificaciones(self):
+        from notifications.models import Notification
+
+        return [
+            Notification.objects.create(usuario=usuario, titulo='Aviso', mensaje=f'Mensaje {i}')
+            for i, usuario in enumerate(self.usuarios)
+        ]
+
+    def test_delivers_batched_by_platform(self):
+        """Arma lotes por plataforma, marca estados y desactiva tokens rechazados"""
+        from notifications.models import Notification, PushToken
+        from notifications.services.push_service import push_service
+
+        self._crear_tokens()
+        a, b, c = self._crear_notificaciones()
+
+        stats = push_service.run_pending()
+
+        self.assertEqual(stats['mensajes'], 4)
+        self.assertEqual(stats['lotes'], 3)
+        self.assertEqual(stats['tokens_desactivados'], 1)
+        for lote in self.server.solicitudes:
+            self.assertLessEqual(len(lote), 2)
+            plataformas = {'channelId' in mensaje for mensaje in lote}
+            self.assertEqual(len(plataformas), 1)
+
+        estados = dict(Notification.objects.values_list('id', 'push_estado'))
+        self.assertEqual(estados[a.id], Notification.PUSH_ENVIADA)
+        self.assertEqual(estados[b.id], Notification.PUSH_ENVIADA)
+        self.assertEqual(estados[c.id], Notification.PUSH_SIN_DESTINO)
+        self.assertFalse(PushToken.objects.get(push_token='ExponentPushToken[invalido]').is_active)
+
+        # Un segundo ciclo no vuelve a enviar nada
+        self.assertEqual(push_service.run_pending()['notificaciones'], 0)
+
+    def test_retries_transient_errors(self):
+        """Los 5xx se reintentan con backoff antes de dar el lote por fallido"""
+        from notifications.models import Notification, PushToken
+        from notifications.services.push_service import push_service
+
+        PushToken.objects.create(usuario=self.usuarios[2], push_token='ExponentPushToken[c1]', platform='ios')
+        notificacion = Notification.objects.create(usuario=self.usuarios[2], titulo='Aviso', mensaje='Hola')
+        self.server.fallas_pendientes = 1
+
+        push_service.run_pending()
+        notificacion.refresh_from_db()
+        self.assertEqual(notificacion.push_estado, Notification.PUSH_ENVIADA)
+        self.assertEqual(len(self.server.solicitudes), 2)
+
+        otra = Notification.objects.create(usuario=self.usuarios[2], titulo='Aviso', mensaje='Otra')
+        self.server.fallas_pendientes = 10
+        push_service.run_pending()
+        otra.refresh_from_db()
+        self.assertEqual(otra.push_estado, Notification.PUSH_FALLIDA)
@@ -0,0 +1,115 @@
+"""
+Tests de integración para el router de réplicas de lectura
+
+Usan dos bases SQLite locales: `default` (primaria) y `replica`. Cada test
+escribe datos distintos en cada una para saber de cuál leyó la vista.
+"""
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+from infrastructure.database import replicas
+
+CON_REPLICA = {'ALIASES': ['replica'], 'MAX_LAG': 5, 'LAG_CHECK_INTERVAL': 10}
+
+
+def _crear_usuario(i, nickname, rol, using='default'):
+    return Usuario.objects.using(using).create(
+        usua_rut=f'1000000{i}-{i}',
+        usua_email=f'{nickname}@example.com',
+        usua_nombre='Usuario',
+        usua_apellido=nickname,
+        usua_nickname=nickname,
+        usua_pass=make_password('SecurePass123'),
+        usua_telefono=56912345678,
+        rous_id_id=rol.pk,
+        usua_estado=1
+    )
+
+
+class ReadReplicaRoutingTestCase(TestCase):
+    """Tests para infrastructure.database.replicas y ReplicaRoutingMiddleware"""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        replicas.replica_monitor.reset()
+
+        rol_admin = RolUsuario.objects.create(rous_id=1, rous_nombre='Administrador')
+        self.admin = _crear_usuario(1, 'admin', rol_admin)
+        self.vecino = _crear_usuario(2, 'vecino', rol_admin)
+        token = SesionToken.objects.create(
+            usua_id=self.admin,
+            token_valor='replica-admin-token',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token.token_valor}'}
+
+        # Solo existe en la réplica
+        rol_replica = RolUsuario.objects.using('replica').create(rous_id=1, rous_nombre='Administrador')
+        _crear_usuario(3, 'solo_replica', rol_replica, using='replica')
+
+    def _nicknames(self):
+        response = self.client.get(reverse('admin-list-users'), **self.auth)
+        self.assertEqual(response.status_code, 200)
+        return sorted(u['usua_nickname'] for u in response.json()['data'])
+
+    def test_reads_go_to_primary_without_replicas(self):
+        """Sin réplicas configuradas todo se lee de la primaria"""
+        self.assertEqual(self._nicknames(), ['admin', 'vecino'])
+
+    @override_settings(DATABASE_REPLICAS=CON_REPLICA)
+    def test_marked_get_reads_from_replica(self):
+        """Una vista @use_replica lee de la réplica; la autenticación, de la primaria"""
+        self.assertEqual(self._nicknames(), ['solo_replica'])
+
+    @override_settings(DATABASE_REPLICAS=CON_REPLICA)
+    def test_write_pins_user_to_primary(self):
+        """Después de escribir, el usuario lee de la primaria hasta que vence la marca"""
+        response = self.client.put(
+            reverse('admin-update-user-status', args=[self.vecino.usua_id]),
+            data=json.dumps({'usua_estado': 0}),
+            content_type='application/json',
+            **self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replicas.is_pinned(self.admin.usua_id))
+        self.assertEqual(self._nicknames(), ['admin', 'vecino'])
+
+        cache.clear()
+        self.assertEqual(self._nicknames(), ['solo_replica'])
+
+    @override_settings(DATABASE_REPLICAS=CON_REPLICA)
+    def test_lagging_replica_is_skipped(self):
+        """Una réplica con más retraso que MAX_LAG no se usa"""
+        with mock.patch.object(replicas.replica_monitor, 'measure', return_value=30.0):
+            self.assertEqual(self._nicknames(), ['admin', 'vecino'])
+
+    @override_settings(DATABASE_REPLICAS=CON_REPLICA)
+    def test_router_sticks_to_primary_after_write_in_request(self):
+        """Dentro de una petición, tras la primera escritura las lecturas van a la primaria"""
+        router = replicas.ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Usuario))
+
+        replicas.begin_request(replica_allowed=True)
+        try:
+            self.assertEqual(router.db_for_read(Usuario), 'replica')
+            # Las relaciones de un objeto leído de la primaria siguen en ella
+            self.assertEqual(router.db_for_read(Usuario, instance=self.admin), 'default')
+            self.assertEqual(router.db_for_write(Usuario), 'default')
+            self.assertIsNone(router.db_for_read(Usuario))
+        finally:
+            replicas.end_request()
+
+        self.assertFalse(router.allow_migrate('replica', 'entities'))
+        self.assertIsNone(router.allow_migrate('default', 'entities'))
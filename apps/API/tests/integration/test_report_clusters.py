@@ -0,0 +1,97 @@
+"""
+Tests de integración para el clustering de reportes en el mapa
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import unittest
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+class ReportClusterTestCase(TestCase):
+    """Tests del motor de clustering por grilla"""
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        rol = RolUsuario.objects.create(rous_id=1, rous_nombre='Usuario')
+        self.usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        datos = {
+            'descripcion': 'Descripción de prueba',
+            'direccion': 'Calle Falsa 123',
+            'usuario': self.usuario,
+            'denuncia_estado': DenunciaEstado.objects.create(nombre='Nuevo'),
+            'tipo_denuncia': TipoDenuncia.objects.create(nombre='Infraestructura'),
+            'ciudad': Ciudad.objects.create(nombre='Temuco'),
+        }
+        self.datos = datos
+
+        # Tres reportes muy cercanos en Temuco y uno en Santiago
+        ReportModel.objects.create(titulo='A', ubicacion=Point(-72.5901, -38.7301), urgencia=1, **datos)
+        ReportModel.objects.create(titulo='B', ubicacion=Point(-72.5902, -38.7302), urgencia=3, **datos)
+        ReportModel.objects.create(titulo='C', ubicacion=Point(-72.5903, -38.7303), urgencia=2, **datos)
+        ReportModel.objects.create(titulo='D', ubicacion=Point(-70.6500, -33.4500), urgencia=1, **datos)
+
+    def test_groups_nearby_reports_at_low_zoom(self):
+        """A bajo zoom los reportes cercanos forman un cluster"""
+        from reports.models import ReportModel
+        from reports.services.cluster_service import ClusterService
+
+        clusters = ClusterService.cluster(
+            ReportModel.objects.all(), ClusterService.cell_size_for_zoom(8)
+        )
+        tamanos = sorted(cluster['count'] for cluster in clusters)
+        self.assertEqual(tamanos, [1, 3])
+
+        cluster_temuco = next(c for c in clusters if c['count'] == 3)
+        self.assertEqual(cluster_temuco['urgencia_max'], 3)
+
+    def test_higher_zoom_uses_smaller_cells(self):
+        """Al aumentar el zoom la celda se achica y los clusters no crecen"""
+        from reports.models import ReportModel
+        from reports.services.cluster_service import ClusterService
+
+        self.assertLess(ClusterService.cell_size_for_zoom(15), ClusterService.cell_size_for_zoom(8))
+
+        clusters = ClusterService.cluster(
+            ReportModel.objects.all(), ClusterService.cell_size_for_zoom(22)
+        )
+        self.assertEqual(sum(cluster['count'] for cluster in clusters), 4)
+        self.assertGreaterEqual(len(clusters), 2)
+
+    def test_cell_edges_use_floor(self):
+        """Dos puntos de la misma celda quedan juntos aunque uno pase la mitad de la celda"""
+        from django.contrib.gis.geos import Point
+        from reports.models import ReportModel
+        from reports.services.cluster_service import ClusterService
+
+        ReportModel.objects.all().delete()
+        # Celda de 1 grado: x en [10, 11) e y en [20, 21). Con redondeo al punto
+        # más cercano de la grilla quedarían en celdas distintas
+        ReportModel.objects.create(titulo='E', ubicacion=Point(10.4, 20.4), urgencia=1, **self.datos)
+        ReportModel.objects.create(titulo='F', ubicacion=Point(10.6, 20.6), urgencia=1, **self.datos)
+        ReportModel.objects.create(titulo='G', ubicacion=Point(11.0, 20.5), urgencia=1, **self.datos)
+
+        clusters = ClusterService.cluster(ReportModel.objects.all(), 1.0)
+        self.assertEqual(sorted(c['count'] for c in clusters), [1, 2])
+        par = next(c for c in clusters if c['count'] == 2)
+        self.assertAlmostEqual(par['longitud'], 10.5)
+        self.assertAlmostEqual(par['latitud'], 20.5)
@@ -0,0 +1,102 @@
+"""
+Tests de integración para los contadores desnormalizados de reportes
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import unittest
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+class ReportCountersTestCase(TestCase):
+    """Tests para total_votos, total_seguidores y total_comentarios"""
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        rol = RolUsuario.objects.create(rous_id=2, rous_nombre='Usuario')
+        self.usuarios = [
+            Usuario.objects.create(
+                usua_rut=f'1234567{i}-9',
+                usua_email=f'vecino{i}@example.com',
+                usua_nombre='Vecino',
+                usua_apellido=str(i),
+                usua_nickname=f'vecino{i}',
+                usua_pass=make_password('SecurePass123'),
+                usua_telefono=56912345678,
+                rous_id=rol,
+                usua_estado=1
+            )
+            for i in range(3)
+        ]
+        self.reporte = ReportModel.objects.create(
+            titulo='Bache',
+            descripcion='Descripción de prueba',
+            direccion='Calle Falsa 123',
+            ubicacion=Point(-72.59, -38.73),
+            urgencia=1,
+            usuario=self.usuarios[0],
+            denuncia_estado=DenunciaEstado.objects.create(nombre='Nuevo'),
+            tipo_denuncia=TipoDenuncia.objects.create(nombre='Infraestructura'),
+            ciudad=Ciudad.objects.create(nombre='Temuco')
+        )
+
+    def test_counters_follow_writes_and_cascades(self):
+        """Altas, bajas y eliminaciones en cascada ajustan los contadores"""
+        from reports.models import VotoReporte
+        from reports.models.comentario_reporte import ComentarioReporte
+        from reports.models.seguimiento_reporte import SeguimientoReporte
+
+        for usuario in self.usuarios:
+            VotoReporte.objects.create(usuario=usuario, reporte=self.reporte)
+            SeguimientoReporte.objects.create(usuario=usuario, reporte=self.reporte)
+        ComentarioReporte.objects.create(usuario=self.usuarios[1], reporte=self.reporte, comentario='Hola')
+
+        VotoReporte.objects.filter(usuario=self.usuarios[0]).delete()
+        self.usuarios[2].delete()
+
+        self.reporte.refresh_from_db()
+        self.assertEqual(self.reporte.total_votos, 1)
+        self.assertEqual(self.reporte.total_seguidores, 2)
+        self.assertEqual(self.reporte.total_comentarios, 1)
+
+    def test_reconcile_command_repairs_drift(self):
+        """reconcile_report_counters corrige los contadores desfasados"""
+        from reports.models import ReportModel, VotoReporte
+
+        VotoReporte.objects.create(usuario=self.usuarios[1], reporte=self.reporte)
+        ReportModel.objects.filter(pk=self.reporte.pk).update(total_votos=7, total_comentarios=2)
+
+        salida = StringIO()
+        call_command('reconcile_report_counters', dry_run=True, stdout=salida)
+        self.assertIn('1 reportes revisados, 1 con diferencias', salida.getvalue())
+        self.reporte.refresh_from_db()
+        self.assertEqual(self.reporte.total_votos, 7)
+
+        call_command('reconcile_report_counters', stdout=StringIO())
+        self.reporte.refresh_from_db()
+        self.assertEqual((self.reporte.total_votos, self.reporte.total_comentarios), (1, 0))
+
+    def test_full_save_keeps_concurrent_counter_updates(self):
+        """Un save() de una instancia leída antes no pisa los incrementos con F()"""
+        from reports.models import ReportModel, VotoReporte
+
+        reporte = ReportModel.objects.get(pk=self.reporte.pk)
+        VotoReporte.objects.create(usuario=self.usuarios[1], reporte=self.reporte)
+
+        reporte.titulo = 'Bache editado'
+        reporte.save()
+
+        self.reporte.refresh_from_db()
+        self.assertEqual(self.reporte.titulo, 'Bache editado')
+        self.assertEqual(self.reporte.total_votos, 1)
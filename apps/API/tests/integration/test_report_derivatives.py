@@ -0,0 +1,150 @@
+"""
+Tests de integración para las miniaturas y variantes WebP de imágenes de reportes
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField) y Pillow. Si la app
+'reports' no está instalada en la configuración de tests, se omiten.
+"""
+import importlib.util
+import io
+import shutil
+import tempfile
+import unittest
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+@unittest.skipUnless(importlib.util.find_spec('PIL'), 'Requiere Pillow')
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL, REPORT_IMAGE_DERIVATIVES={'ENABLED': True})
+class ReportDerivativesTestCase(TestCase):
+    """Tests para reports.services.derivative_service y sus comandos"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        rol = RolUsuario.objects.create(rous_id=3, rous_nombre='Usuario')
+        usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Prueba',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        self.reporte = ReportModel.objects.create(
+            titulo='Bache',
+            descripcion='Hoyo',
+            urgencia=2,
+            ubicacion=Point(-72.59, -38.73),
+            usuario=usuario,
+            denuncia_estado=DenunciaEstado.objects.create(nombre='Nuevo'),
+            tipo_denuncia=TipoDenuncia.objects.create(nombre='Infraestructura'),
+            ciudad=Ciudad.objects.create(nombre='Temuco')
+        )
+
+    def _imagen(self, nombre='foto.png', ancho=2000, alto=1000):
+        from PIL import Image
+        from reports.models.report_archivos import ReportArchivo
+
+        contenido = io.BytesIO()
+        Image.new('RGB', (ancho, alto), (200, 80, 40)).save(contenido, 'PNG')
+        return ReportArchivo.objects.create(
+            reporte=self.reporte,
+            archivo=SimpleUploadedFile(nombre, contenido.getvalue(), content_type='image/png')
+        )
+
+    def test_worker_generates_variants_next_to_original(self):
+        """El worker genera las variantes con nombres junto al original y expone sus URLs"""
+        from PIL import Image
+        from reports.services.derivative_service import derivative_service
+
+        archivo = self._imagen()
+        self.assertEqual(archivo.derivados_estado, 'pendiente')
+        self.assertEqual(archivo.derivados_urls, {})
+
+        stats = derivative_service.run_pending()
+        self.assertEqual((stats['generados'], stats['fallidos']), (1, 0))
+
+        archivo.refresh_from_db()
+        self.assertEqual(archivo.derivados_estado, 'listo')
+        self.assertEqual(set(archivo.derivados), {'miniatura', 'miniatura_webp', 'webp'})
+        base = archivo.archivo.name.rsplit('.', 1)[0]
+        self.assertEqual(archivo.derivados['miniatura_webp'], f'{base}_miniatura_webp.webp')
+
+        storage = archivo.archivo.storage
+        with storage.open(archivo.derivados['miniatura']) as miniatura:
+            self.assertEqual(Image.open(miniatura).size, (256, 256))
+        with storage.open(archivo.derivados['webp']) as webp:
+            imagen = Image.open(webp)
+            self.assertEqual((imagen.format, imagen.size), ('WEBP', (1280, 640)))
+        self.assertIn('miniatura_webp', archivo.derivados_urls)
+
+    def test_reprocessing_is_idempotent(self):
+        """Reprocesar reemplaza los mismos derivados en vez de crear copias"""
+        from reports.services.derivative_service import derivative_service
+        from reports.models.report_archivos import ReportArchivo
+
+        archivo = self._imagen()
+        derivative_service.run_pending()
+        archivo.refresh_from_db()
+        primeras = dict(archivo.derivados)
+
+        derivative_service.requeue(ReportArchivo.objects.filter(id=archivo.id))
+        derivative_service.run_pending()
+        archivo.refresh_from_db()
+        self.assertEqual(archivo.derivados, primeras)
+
+    def test_invalid_image_and_video(self):
+        """Una imagen ilegible queda en error y los videos no se procesan"""
+        from reports.services.derivative_service import derivative_service
+        from reports.models.report_archivos import ReportArchivo
+
+        rota = ReportArchivo.objects.create(
+            reporte=self.reporte,
+            archivo=SimpleUploadedFile('rota.jpg', b'no es una imagen', content_type='image/jpeg')
+        )
+        video = ReportArchivo.objects.create(
+            reporte=self.reporte,
+            tipo_archivo='video',
+            archivo=SimpleUploadedFile('clip.mp4', b'\x00' * 64, content_type='video/mp4')
+        )
+        self.assertEqual(video.derivados_estado, 'no_aplica')
+
+        stats = derivative_service.run_pending()
+        self.assertEqual((stats['archivos'], stats['fallidos']), (1, 1))
+        rota.refresh_from_db()
+        self.assertEqual(rota.derivados_estado, 'error')
+
+    def test_backfill_command_processes_existing_images(self):
+        """El backfill genera los derivados de imágenes existentes y regenera con --force"""
+        from reports.models.report_archivos import ReportArchivo
+
+        archivo = self._imagen()
+        call_command('backfill_report_derivatives', stdout=io.StringIO())
+        archivo.refresh_from_db()
+        self.assertEqual(archivo.derivados_estado, 'listo')
+
+        salida = io.StringIO()
+        call_command('backfill_report_derivatives', '--force', stdout=salida)
+        self.assertIn('1 imágenes marcadas como pendientes', salida.getvalue())
+        self.assertEqual(
+            ReportArchivo.objects.get(id=archivo.id).derivados_estado, 'listo'
+        )
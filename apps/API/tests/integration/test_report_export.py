@@ -0,0 +1,138 @@
+"""
+Tests de integración para la exportación masiva de reportes (GeoJSON / NDJSON)
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import io
+import json
+import unittest
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+class ReportExportTestCase(TestCase):
+    """Tests para ReportExportView y el comando export_reports"""
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        self.admin = self._crear_usuario(1, 'Administrador', '12345678-9', 'admin')
+        self.vecino = self._crear_usuario(3, 'Usuario', '11111111-1', 'vecino')
+        self.token_admin = self._token(self.admin, 'export-token-admin')
+        self.token_vecino = self._token(self.vecino, 'export-token-vecino')
+
+        datos = {
+            'ubicacion': Point(-72.59, -38.73),
+            'usuario': self.vecino,
+            'denuncia_estado': DenunciaEstado.objects.create(nombre='Nuevo'),
+            'tipo_denuncia': TipoDenuncia.objects.create(nombre='Infraestructura'),
+            'ciudad': Ciudad.objects.create(nombre='Temuco'),
+        }
+        self.antiguo = ReportModel.objects.create(titulo='Bache', descripcion='Hoyo', urgencia=3, **datos)
+        self.reciente = ReportModel.objects.create(titulo='Luminaria', descripcion='Apagada', urgencia=1, **datos)
+        ReportModel.objects.create(titulo='Oculto', descripcion='No visible', urgencia=2, visible=False, **datos)
+        # Fija una fecha de actualización anterior sin pasar por auto_now
+        ReportModel.objects.filter(pk=self.antiguo.pk).update(
+            fecha_actualizacion=timezone.now() - timedelta(days=10)
+        )
+
+    def _crear_usuario(self, rol_id, rol_nombre, rut, nickname):
+        rol = RolUsuario.objects.create(rous_id=rol_id, rous_nombre=rol_nombre)
+        return Usuario.objects.create(
+            usua_rut=rut,
+            usua_email=f'{nickname}@example.com',
+            usua_nombre=nickname.title(),
+            usua_apellido='Prueba',
+            usua_nickname=nickname,
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+
+    def _token(self, usuario, valor):
+        return SesionToken.objects.create(
+            usua_id=usuario,
+            token_valor=valor,
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+
+    def _exportar(self, token, **params):
+        return self.client.get(
+            '/api/reports/export/', params,
+            HTTP_AUTHORIZATION=f'Bearer {token.token_valor}'
+        )
+
+    def test_geojson_streams_visible_reports(self):
+        """La exportación GeoJSON es un FeatureCollection con los reportes visibles"""
+        response = self._exportar(self.token_admin)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/geo+json')
+        self.assertIn('X-Export-Generated-At', response)
+
+        geojson = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(geojson['type'], 'FeatureCollection')
+        # Ordenados por fecha de actualización: el antiguo primero
+        self.assertEqual(
+            [f['properties']['id'] for f in geojson['features']],
+            [self.antiguo.id, self.reciente.id]
+        )
+        feature = geojson['features'][0]
+        self.assertEqual(feature['geometry']['type'], 'Point')
+        self.assertAlmostEqual(feature['geometry']['coordinates'][0], -72.59, places=5)
+        self.assertEqual(feature['properties']['ciudad_nombre'], 'Temuco')
+        self.assertIn('generated_at', geojson['metadata'])
+
+    def test_ndjson_with_since_and_filters(self):
+        """NDJSON entrega un Feature por línea y respeta since y los filtros del mapa"""
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self._exportar(self.token_admin, format='ndjson', since=since)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lineas = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(l)['properties']['id'] for l in lineas], [self.reciente.id])
+
+        response = self._exportar(self.token_admin, format='ndjson', urgencia='3')
+        lineas = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(l)['properties']['id'] for l in lineas], [self.antiguo.id])
+
+    def test_invalid_params_and_non_admin(self):
+        """Formato o since inválidos responden 400; un usuario común recibe 403"""
+        self.assertEqual(self._exportar(self.token_admin, format='xml').status_code, 400)
+        self.assertEqual(self._exportar(self.token_admin, since='ayer').status_code, 400)
+        self.assertEqual(self._exportar(self.token_vecino).status_code, 403)
+
+    def test_since_accepts_z_suffix(self):
+        """since acepta el sufijo Z (UTC) del ejemplo de la documentación"""
+        from reports.services.export_service import report_export_service
+
+        since = report_export_service.parse_since('2025-01-01T00:00:00Z')
+        self.assertEqual(since, datetime(2025, 1, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(self._exportar(self.token_admin, since='2025-01-01T00:00:00Z').status_code, 200)
+
+    def test_command_writes_ndjson(self):
+        """El comando export_reports escribe la exportación y acepta los filtros del mapa"""
+        salida = io.StringIO()
+        call_command('export_reports', '--format', 'ndjson', stdout=salida, stderr=io.StringIO())
+        ids = [json.loads(linea)['properties']['id'] for linea in salida.getvalue().splitlines()]
+        self.assertEqual(ids, [self.antiguo.id, self.reciente.id])
+
+        salida = io.StringIO()
+        call_command('export_reports', '--urgencia', '1', stdout=salida, stderr=io.StringIO())
+        geojson = json.loads(salida.getvalue())
+        self.assertEqual([f['properties']['id'] for f in geojson['features']], [self.reciente.id])
@@ -0,0 +1,99 @@
+"""
+Tests de integración para la búsqueda de texto completo de reportes
+
+NOTA: Requieren PostgreSQL con PostGIS (columna search_vector y trigger de
+la migración reports 0006). Si no están disponibles, se omiten.
+"""
+import unittest
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(
+    apps.is_installed('reports') and connection.vendor == 'postgresql',
+    'Requiere PostgreSQL con PostGIS y la app reports'
+)
+class ReportFullTextSearchTestCase(TestCase):
+    """Tests para el parámetro search del listado de reportes"""
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        rol = RolUsuario.objects.create(rous_id=2, rous_nombre='Usuario')
+        usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        comunes = {
+            'ubicacion': Point(-72.59, -38.73),
+            'urgencia': 1,
+            'usuario': usuario,
+            'denuncia_estado': DenunciaEstado.objects.create(nombre='Nuevo'),
+            'tipo_denuncia': TipoDenuncia.objects.create(nombre='Infraestructura'),
+            'ciudad': Ciudad.objects.create(nombre='Temuco'),
+        }
+        self.en_titulo = ReportModel.objects.create(
+            titulo='Alumbrado público apagado', descripcion='Sin luz', direccion='Av. Alemania 100', **comunes
+        )
+        self.en_descripcion = ReportModel.objects.create(
+            titulo='Poste dañado', descripcion='El alumbrado no funciona', direccion='Calle Montt 5', **comunes
+        )
+        ReportModel.objects.create(
+            titulo='Bache', descripcion='Hoyo en la calzada', direccion='Calle Prat 10', **comunes
+        )
+
+    def test_prefix_and_unaccent_match_ranked_by_field_weight(self):
+        """'alumb publico' encuentra 'Alumbrado público'; el título pesa más que la descripción"""
+        from reports.services.report_service import ReportService
+
+        resultado = ReportService.get_reports_with_cursor_pagination(
+            limit=10, filters={'search': 'alumb'}
+        )
+        self.assertEqual(
+            [r['id'] for r in resultado['data']],
+            [self.en_titulo.id, self.en_descripcion.id]
+        )
+
+        resultado = ReportService.get_reports_with_cursor_pagination(
+            limit=10, filters={'search': 'alumb publico'}
+        )
+        self.assertEqual([r['id'] for r in resultado['data']], [self.en_titulo.id])
+
+    def test_search_vector_follows_updates(self):
+        """El trigger recalcula el vector al editar el texto"""
+        from reports.models import ReportModel
+        from reports.services.report_service import ReportService
+
+        ReportModel.objects.filter(pk=self.en_titulo.pk).update(titulo='Semáforo en rojo')
+        resultado = ReportService.get_reports_with_cursor_pagination(
+            limit=10, filters={'search': 'semaforo'}
+        )
+        self.assertEqual([r['id'] for r in resultado['data']], [self.en_titulo.id])
+
+    def test_ranked_cursor_pagination(self):
+        """La paginación por (rank, id) recorre todos los resultados sin repetir"""
+        from reports.services.report_service import ReportService
+
+        primera = ReportService.get_reports_with_cursor_pagination(limit=1, filters={'search': 'alumbrado'})
+        segunda = ReportService.get_reports_with_cursor_pagination(
+            cursor=primera['pagination']['nextCursor'], limit=1, filters={'search': 'alumbrado'}
+        )
+        self.assertEqual(
+            [primera['data'][0]['id'], segunda['data'][0]['id']],
+            [self.en_titulo.id, self.en_descripcion.id]
+        )
+        self.assertFalse(segunda['pagination']['hasMore'])
@@ -0,0 +1,107 @@
+"""
+Tests de integración para la serialización en lote de reportes
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import unittest
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+class ReportListQueryCountTestCase(TestCase):
+    """Verifica que el listado paginado no ejecute consultas por cada reporte"""
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import (
+            Ciudad, DenunciaEstado, ReportModel, TipoDenuncia, VotoReporte
+        )
+        from reports.models.comentario_reporte import ComentarioReporte
+        from reports.models.seguimiento_reporte import SeguimientoReporte
+
+        rol = RolUsuario.objects.create(rous_id=1, rous_nombre='Usuario')
+        self.usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        estado = DenunciaEstado.objects.create(nombre='Nuevo')
+        tipo = TipoDenuncia.objects.create(nombre='Infraestructura')
+        ciudad = Ciudad.objects.create(nombre='Temuco')
+
+        for i in range(25):
+            reporte = ReportModel.objects.create(
+                titulo=f'Reporte {i}',
+                descripcion='Descripción de prueba',
+                direccion='Calle Falsa 123',
+                ubicacion=Point(-72.59, -38.73),
+                urgencia=1,
+                usuario=self.usuario,
+                denuncia_estado=estado,
+                tipo_denuncia=tipo,
+                ciudad=ciudad
+            )
+            if i % 2 == 0:
+                VotoReporte.objects.create(usuario=self.usuario, reporte=reporte)
+                SeguimientoReporte.objects.create(usuario=self.usuario, reporte=reporte)
+                ComentarioReporte.objects.create(
+                    usuario=self.usuario, reporte=reporte, comentario='Comentario'
+                )
+
+    def _contar_consultas(self, limit):
+        from reports.services.report_service import ReportService
+
+        with CaptureQueriesContext(connection) as contexto:
+            resultado = ReportService.get_reports_with_cursor_pagination(
+                limit=limit, usuario_id=self.usuario.usua_id
+            )
+        self.assertEqual(resultado['pagination']['count'], limit)
+        return len(contexto.captured_queries), resultado
+
+    def test_query_count_is_flat(self):
+        """La cantidad de consultas no crece con el tamaño de página"""
+        consultas_pequena, _ = self._contar_consultas(5)
+        consultas_grande, _ = self._contar_consultas(20)
+        self.assertEqual(consultas_pequena, consultas_grande)
+
+    def test_batch_matches_individual_serialization(self):
+        """La serialización en lote produce el mismo JSON que la individual"""
+        from reports.models import ReportModel
+        from reports.services.report_service import ReportService
+
+        _, resultado = self._contar_consultas(10)
+        for item in resultado['data']:
+            reporte = ReportModel.objects.get(id=item['id'])
+            esperado = ReportService._serialize_report(reporte, self.usuario.usua_id)
+            self.assertEqual(item, esperado)
+
+    def test_geojson_build_uses_prefetched_files(self):
+        """El GeoJSON del mapa no consulta los archivos de cada reporte"""
+        from reports.models import ReportModel
+        from reports.services.report_service import ReportService
+        from reports.views.geojson_views import ReportGeoJSONView
+
+        reportes = list(
+            ReportModel.objects.select_related(
+                'usuario', 'denuncia_estado', 'tipo_denuncia', 'ciudad'
+            ).prefetch_related(ReportService.prefetch_archivos_activos())[:20]
+        )
+        with self.assertNumQueries(0):
+            geojson = ReportGeoJSONView()._build_geojson(reportes, self.usuario.usua_id)
+        self.assertEqual(len(geojson['features']), 20)
+        self.assertEqual(geojson['features'][0]['properties']['total_archivos'], 0)
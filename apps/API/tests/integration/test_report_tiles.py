@@ -0,0 +1,181 @@
+"""
+Tests de integración para las teselas vectoriales del mapa
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import math
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+class ReportTileTestCase(TestCase):
+    """Tests para reports.services.tile_service y ReportTileView"""
+
+    def setUp(self):
+        rol = RolUsuario.objects.create(rous_id=1, rous_nombre='Usuario')
+        usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        token = SesionToken.objects.create(
+            usua_id=usuario,
+            token_valor='tiles-token',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token.token_valor}'}
+        self.usuario = usuario
+
+    def _crear_reportes(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        datos = {
+            'descripcion': 'Descripción de prueba',
+            'urgencia': 1,
+            'usuario': self.usuario,
+            'denuncia_estado': DenunciaEstado.objects.create(nombre='Nuevo'),
+            'tipo_denuncia': TipoDenuncia.objects.create(nombre='Infraestructura'),
+            'ciudad': Ciudad.objects.create(nombre='Temuco'),
+        }
+        ReportModel.objects.create(titulo='Temuco', ubicacion=Point(-72.59, -38.73), **datos)
+        ReportModel.objects.create(titulo='Santiago', ubicacion=Point(-70.65, -33.45), **datos)
+        ReportModel.objects.create(titulo='Madrid', ubicacion=Point(-3.70, 40.42), **datos)
+
+    def _titulos(self, z, x, y):
+        """Decodifica la tesela y retorna los títulos de sus features"""
+        import mapbox_vector_tile
+        from reports.services.tile_service import TileService
+
+        response = self.client.get(reverse('reports-tiles', args=[z, x, y]), **self.auth)
+        self.assertEqual(response.status_code, 200)
+        if not response.content:
+            return set()
+        capa = mapbox_vector_tile.decode(response.content)[TileService.LAYER_NAME]
+        return {feature['properties']['titulo'] for feature in capa['features']}
+
+    @staticmethod
+    def _tesela(lng, lat, z):
+        """Coordenadas x/y (esquema XYZ) de la tesela que contiene el punto"""
+        n = 2 ** z
+        x = int((lng + 180) / 360 * n)
+        y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+        return x, y
+
+    def test_is_valid_tile_bounds(self):
+        """Zoom entre 0 y MAX_ZOOM; x e y entre 0 y 2**z - 1"""
+        from reports.services.tile_service import TileService
+
+        maximo = TileService.MAX_ZOOM
+        self.assertTrue(TileService.is_valid_tile(0, 0, 0))
+        self.assertFalse(TileService.is_valid_tile(0, 1, 0))
+        self.assertFalse(TileService.is_valid_tile(0, 0, 1))
+        self.assertFalse(TileService.is_valid_tile(-1, 0, 0))
+        self.assertTrue(TileService.is_valid_tile(maximo, 2 ** maximo - 1, 2 ** maximo - 1))
+        self.assertFalse(TileService.is_valid_tile(maximo + 1, 0, 0))
+        self.assertTrue(TileService.is_valid_tile(3, 7, 7))
+        self.assertFalse(TileService.is_valid_tile(3, 8, 0))
+        self.assertFalse(TileService.is_valid_tile(3, 0, 8))
+        self.assertFalse(TileService.is_valid_tile(3, -1, 0))
+        self.assertFalse(TileService.is_valid_tile(3, 0, -1))
+
+    def test_invalid_tile_returns_400(self):
+        """Coordenadas fuera de rango responden 400 antes de consultar la base"""
+        from reports.services.tile_service import TileService
+
+        for z, x, y in [(TileService.MAX_ZOOM + 1, 0, 0), (3, 8, 0), (3, 0, 8)]:
+            response = self.client.get(reverse('reports-tiles', args=[z, x, y]), **self.auth)
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(response.json()['success'])
+
+    def test_without_postgis_returns_501(self):
+        """Sin PostGIS la vista responde 501 en lugar de fallar en el SQL"""
+        from reports.services.tile_service import TileService
+
+        with mock.patch.object(TileService, 'is_supported', return_value=False):
+            response = self.client.get(reverse('reports-tiles', args=[3, 1, 1]), **self.auth)
+        self.assertEqual(response.status_code, 501)
+        self.assertFalse(response.json()['success'])
+
+    def test_requires_authentication(self):
+        """Sin token no se entrega la tesela"""
+        response = self.client.get(reverse('reports-tiles', args=[0, 0, 0]))
+        self.assertIn(response.status_code, [401, 403])
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'Requiere PostgreSQL')
+    def test_case_sql_matches_marker_helpers(self):
+        """Los CASE del SQL de teselas dan el mismo estilo que get_marker_*"""
+        from reports.services.tile_service import TileService
+        from reports.utils.constants import (
+            DEFAULT_MARKER_COLOR, DEFAULT_MARKER_SIZE, MARKER_COLORS, MARKER_SIZES, MARKER_SYMBOLS
+        )
+        from reports.utils.helpers import get_marker_color, get_marker_size, get_marker_symbol
+
+        color_sql, color_params = TileService._case_urgencia(MARKER_COLORS, DEFAULT_MARKER_COLOR)
+        size_sql, size_params = TileService._case_urgencia(MARKER_SIZES, DEFAULT_MARKER_SIZE)
+        symbol_sql, symbol_params = TileService._case_simbolo()
+
+        urgencias = sorted({*MARKER_COLORS, *MARKER_SIZES, 0, 99})
+        nombres = [None, '', 'Otro', 'Sin clasificar']
+        for palabras, _ in MARKER_SYMBOLS:
+            for palabra in palabras:
+                nombres.extend([palabra, f'Problema de {palabra.upper()} en la calle'])
+
+        with connection.cursor() as cursor:
+            for urgencia in urgencias:
+                cursor.execute(
+                    f"SELECT {color_sql}, {size_sql} FROM (SELECT CAST(%s AS integer) AS urgencia) r",
+                    [*color_params, *size_params, urgencia]
+                )
+                self.assertEqual(
+                    cursor.fetchone(),
+                    (get_marker_color(urgencia), get_marker_size(urgencia)),
+                    f'urgencia={urgencia}'
+                )
+
+            for nombre in nombres:
+                cursor.execute(
+                    f"SELECT {symbol_sql} FROM (SELECT CAST(%s AS text) AS nombre) t",
+                    [*symbol_params, nombre]
+                )
+                self.assertEqual(cursor.fetchone()[0], get_marker_symbol(nombre), f'nombre={nombre!r}')
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'Requiere PostgreSQL')
+    def test_low_zoom_tiles_include_reports_near_antimeridian_edges(self):
+        """Las teselas z=0 y z=1 (envolventes de ±180°) incluyen los reportes de Chile"""
+        self._crear_reportes()
+
+        self.assertEqual(self._titulos(0, 0, 0), {'Temuco', 'Santiago', 'Madrid'})
+        self.assertEqual(self._titulos(1, 0, 1), {'Temuco', 'Santiago'})
+        self.assertEqual(self._titulos(1, 0, 0), set())
+        self.assertEqual(self._titulos(1, 1, 0), {'Madrid'})
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'Requiere PostgreSQL')
+    def test_high_zoom_tile_includes_only_its_reports(self):
+        """A zoom alto la tesela contiene solo los reportes de su área"""
+        self._crear_reportes()
+
+        self.assertEqual(self._titulos(14, *self._tesela(-72.59, -38.73, 14)), {'Temuco'})
+        self.assertEqual(self._titulos(14, *self._tesela(-70.65, -33.45, 14)), {'Santiago'})
+        x, y = self._tesela(-72.59, -38.73, 14)
+        self.assertEqual(self._titulos(14, x + 3, y), set())
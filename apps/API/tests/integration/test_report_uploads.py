@@ -0,0 +1,210 @@
+"""
+Tests de integración para las subidas reanudables por fragmentos
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). Si la app 'reports'
+no está instalada en la configuración de tests, se omiten.
+"""
+import base64
+import hashlib
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+CONTENIDO = bytes(range(256)) * 1024  # 256KB
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL, REPORT_UPLOADS={'MAX_CHUNK_SIZE': 100 * 1024})
+class ReportUploadTestCase(TestCase):
+    """Tests para reports.services.upload_service y sus vistas"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        from django.contrib.gis.geos import Point
+        from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+        rol = RolUsuario.objects.create(rous_id=3, rous_nombre='Usuario')
+        usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Prueba',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=rol,
+            usua_estado=1
+        )
+        self.token = SesionToken.objects.create(
+            usua_id=usuario,
+            token_valor='upload-token',
+            token_expira_en=timezone.now() + timedelta(days=1)
+        )
+        self.reporte = ReportModel.objects.create(
+            titulo='Bache',
+            descripcion='Hoyo',
+            urgencia=2,
+            ubicacion=Point(-72.59, -38.73),
+            usuario=usuario,
+            denuncia_estado=DenunciaEstado.objects.create(nombre='Nuevo'),
+            tipo_denuncia=TipoDenuncia.objects.create(nombre='Infraestructura'),
+            ciudad=Ciudad.objects.create(nombre='Temuco')
+        )
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {self.token.token_valor}'}
+
+    def _crear(self, nombre='video.mp4', tamaño=len(CONTENIDO), **extra):
+        return self.client.post(
+            f'/api/reports/{self.reporte.id}/uploads/',
+            {'nombre': nombre, 'tamaño': tamaño, **extra},
+            content_type='application/json',
+            **self.auth
+        )
+
+    def _patch(self, upload_id, offset, datos, **headers):
+        return self.client.patch(
+            f'/api/reports/uploads/{upload_id}/', datos,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset),
+            **headers,
+            **self.auth
+        )
+
+    def _subir_todo(self, upload_id, tamaño_fragmento=100 * 1024):
+        for offset in range(0, len(CONTENIDO), tamaño_fragmento):
+            response = self._patch(upload_id, offset, CONTENIDO[offset:offset + tamaño_fragmento])
+            self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_chunked_upload_is_resumable_and_attached(self):
+        """Los fragmentos se acumulan, el offset se puede consultar y al finalizar se crea el archivo"""
+        from reports.models import ReportArchivo
+        from reports.services.upload_service import upload_service
+
+        creada = self._crear(checksum=hashlib.sha256(CONTENIDO).hexdigest())
+        self.assertEqual(creada.status_code, 201)
+        upload_id = creada.json()['data']['id']
+
+        self.assertEqual(self._patch(upload_id, 0, CONTENIDO[:100 * 1024])['Upload-Offset'], str(100 * 1024))
+        # Otro proceso recibe el siguiente fragmento: el hash se reconstruye desde el disco
+        upload_service._hashes.clear()
+        estado = self.client.get(f'/api/reports/uploads/{upload_id}/', **self.auth)
+        self.assertEqual(estado['Upload-Offset'], str(100 * 1024))
+        self._patch(upload_id, 100 * 1024, CONTENIDO[100 * 1024:])
+
+        completada = self.client.post(f'/api/reports/uploads/{upload_id}/complete/', **self.auth)
+        self.assertEqual(completada.status_code, 201)
+        datos = completada.json()['data']['archivo']
+        self.assertEqual(datos['sha256'], hashlib.sha256(CONTENIDO).hexdigest())
+
+        archivo = ReportArchivo.objects.get(id=datos['id'])
+        self.assertEqual(archivo.tipo_archivo, 'video')
+        with archivo.archivo.open('rb') as f:
+            self.assertEqual(f.read(), CONTENIDO)
+
+        # Repetir la finalización retorna el mismo archivo
+        repetida = self.client.post(f'/api/reports/uploads/{upload_id}/complete/', **self.auth)
+        self.assertEqual(repetida.json()['data']['archivo']['id'], archivo.id)
+
+    def test_offset_mismatch_and_chunk_checksum(self):
+        """Un offset distinto responde 409 y un fragmento con checksum erróneo se descarta"""
+        upload_id = self._crear().json()['data']['id']
+        fragmento = CONTENIDO[:1024]
+
+        conflicto = self._patch(upload_id, 512, fragmento)
+        self.assertEqual(conflicto.status_code, 409)
+        self.assertEqual(conflicto['Upload-Offset'], '0')
+
+        malo = base64.b64encode(hashlib.sha256(b'otro').digest()).decode()
+        rechazado = self._patch(upload_id, 0, fragmento, HTTP_UPLOAD_CHECKSUM=f'sha256 {malo}')
+        self.assertEqual(rechazado.status_code, 460)
+
+        bueno = base64.b64encode(hashlib.sha256(fragmento).digest()).decode()
+        aceptado = self._patch(upload_id, 0, fragmento, HTTP_UPLOAD_CHECKSUM=f'sha256 {bueno}')
+        self.assertEqual(aceptado['Upload-Offset'], '1024')
+
+        # Fragmento mayor que MAX_CHUNK_SIZE
+        self.assertEqual(self._patch(upload_id, 1024, CONTENIDO[:101 * 1024]).status_code, 413)
+        # Sin completar no se puede finalizar
+        incompleta = self.client.post(f'/api/reports/uploads/{upload_id}/complete/', **self.auth)
+        self.assertEqual(incompleta.status_code, 409)
+
+    def test_limits_are_enforced_on_complete(self):
+        """Solo un video por reporte: la segunda subida finalizada se rechaza"""
+        primera = self._crear().json()['data']['id']
+        segunda = self._crear(nombre='otro.mp4').json()['data']['id']
+        self._subir_todo(primera)
+        self._subir_todo(segunda)
+
+        self.assertEqual(
+            self.client.post(f'/api/reports/uploads/{primera}/complete/', **self.auth).status_code, 201
+        )
+        rechazada = self.client.post(f'/api/reports/uploads/{segunda}/complete/', **self.auth)
+        self.assertEqual(rechazada.status_code, 400)
+        self.assertFalse(rechazada.json()['success'])
+
+        # Tampoco se puede abrir una nueva subida de video
+        self.assertEqual(self._crear(nombre='tercero.mp4').status_code, 400)
+
+    def test_declared_checksum_mismatch_cancels(self):
+        """Si el SHA-256 declarado no coincide, la subida se cancela"""
+        upload_id = self._crear(checksum='0' * 64).json()['data']['id']
+        self._subir_todo(upload_id)
+
+        response = self.client.post(f'/api/reports/uploads/{upload_id}/complete/', **self.auth)
+        self.assertEqual(response.status_code, 460)
+        self.assertEqual(self.client.get(f'/api/reports/uploads/{upload_id}/', **self.auth).status_code, 410)
+
+    def test_stale_complete_returns_existing_file(self):
+        """Una finalización con la sesión leída antes de otra no adjunta un segundo archivo"""
+        from reports.models import ReportArchivo, ReportUpload
+        from reports.services.upload_service import upload_service
+
+        upload_id = self._crear().json()['data']['id']
+        self._subir_todo(upload_id)
+        obsoleta = ReportUpload.objects.get(id=upload_id)
+
+        primero = upload_service.complete(ReportUpload.objects.get(id=upload_id))
+        segundo = upload_service.complete(obsoleta)
+        self.assertEqual(segundo.id, primero.id)
+        self.assertEqual(ReportArchivo.objects.filter(reporte=self.reporte).count(), 1)
+
+    def test_interrupted_chunk_does_not_corrupt_hash(self):
+        """Si la lectura de un fragmento falla a medias, el SHA-256 final sigue siendo correcto"""
+        import io
+        from reports.models import ReportUpload
+        from reports.services.upload_service import upload_service
+
+        class Cortado(io.BytesIO):
+            def read(self, n=-1):
+                datos = super().read(n)
+                if self.tell() > 64 * 1024:
+                    raise IOError('conexión cortada')
+                return datos
+
+        upload_id = self._crear().json()['data']['id']
+        self._patch(upload_id, 0, CONTENIDO[:1024])
+        subida = ReportUpload.objects.get(id=upload_id)
+        with self.assertRaises(IOError):
+            upload_service.append(subida, 1024, Cortado(CONTENIDO[1024:100 * 1024]), 99 * 1024)
+
+        self._patch(upload_id, 1024, CONTENIDO[1024:100 * 1024])
+        self._patch(upload_id, 100 * 1024, CONTENIDO[100 * 1024:200 * 1024])
+        self._patch(upload_id, 200 * 1024, CONTENIDO[200 * 1024:])
+        completada = self.client.post(f'/api/reports/uploads/{upload_id}/complete/', **self.auth)
+        self.assertEqual(completada.json()['data']['archivo']['sha256'], hashlib.sha256(CONTENIDO).hexdigest())
@@ -0,0 +1,120 @@
+"""
+Tests de integración para la búsqueda de usuarios por RUT normalizado
+"""
+import unittest
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario, normalizar_rut
+
+
+class RutLookupTestCase(TestCase):
+    """Tests para Usuario.usua_rut_normalizado y los flujos que buscan por RUT"""
+
+    def setUp(self):
+        self.rol = RolUsuario.objects.create(rous_id=3, rous_nombre='Ciudadano')
+        self.usuario = Usuario.objects.create(
+            usua_rut='12.345.678-K',
+            usua_email='rut@example.com',
+            usua_nombre='Rut',
+            usua_apellido='Test',
+            usua_nickname='rut_user',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=self.rol,
+            usua_estado=1
+        )
+
+    def test_normalizar_rut(self):
+        """Quita puntos, guion, espacios y ceros a la izquierda; k en minúscula"""
+        self.assertEqual(normalizar_rut('12.345.678-K'), '12345678k')
+        self.assertEqual(normalizar_rut(' 012345678k '), '12345678k')
+        self.assertEqual(normalizar_rut(None), '')
+
+    def test_save_keeps_normalized_rut(self):
+        """save() calcula la columna normalizada, también con update_fields"""
+        self.assertEqual(self.usuario.usua_rut_normalizado, '12345678k')
+
+        self.usuario.usua_rut = '9.876.543-2'
+        self.usuario.save(update_fields=['usua_rut'])
+        self.usuario.refresh_from_db()
+        self.assertEqual(self.usuario.usua_rut_normalizado, '98765432')
+
+    @unittest.skipUnless(apps.is_installed('reports'), 'Requiere la app reports (PostGIS/GDAL)')
+    def test_lookup_in_any_format_is_single_query(self):
+        """La búsqueda por RUT es una sola consulta por la columna indexada"""
+        from reports.services.notification_service import NotificationService
+
+        servicio = NotificationService()
+        for formato in ('12.345.678-K', '12345678-k', '12345678K'):
+            with CaptureQueriesContext(connection) as consultas:
+                self.assertEqual(servicio.get_usuario_by_rut_or_id(formato), self.usuario)
+            self.assertEqual(len(consultas.captured_queries), 1)
+            self.assertIn('usua_rut_normalizado', consultas.captured_queries[0]['sql'])
+
+        self.assertIsNone(servicio.get_usuario_by_rut_or_id('11.111.111-1'))
+
+    def test_login_and_register_use_normalized_rut(self):
+        """El login acepta el RUT con otro formato y el registro rechaza duplicados"""
+        response = self.client.post('/api/v1/login/', {
+            'rut': '12345678-k',
+            'password': 'SecurePass123'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post('/api/v1/register/', {
+            'rut': '12345678-K',
+            'email': 'otro@example.com',
+            'username': 'otro_user',
+            'phone': '56912345678',
+            'password': 'SecurePass123',
+            'confirmPassword': 'SecurePass123'
+        }, content_type='application/json')
+        self.assertFalse(response.json()['success'])
+        self.assertIn('rut', response.json()['errors'])
+        self.assertEqual(Usuario.objects.count(), 1)
+
+    def _crear_sin_normalizar(self, rut, nickname):
+        """Usuario como los que la migración 0004 dejó con el RUT normalizado en NULL"""
+        usuario = Usuario.objects.create(
+            usua_rut='1-9',
+            usua_email=f'{nickname}@example.com',
+            usua_nombre='Otro',
+            usua_apellido='Test',
+            usua_nickname=nickname,
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=self.rol,
+            usua_estado=1
+        )
+        Usuario.objects.filter(pk=usuario.pk).update(usua_rut=rut, usua_rut_normalizado=None)
+        usuario.refresh_from_db()
+        return usuario
+
+    def test_non_rut_identifier_matches_nobody(self):
+        """Un identificador sin dígitos no coincide con los RUT sin normalizar"""
+        self._crear_sin_normalizar('', 'rut_vacio')
+
+        self.assertFalse(Usuario.por_rut('juan').exists())
+        response = self.client.post('/api/v1/login/', {
+            'rut': 'juan',
+            'password': 'SecurePass123'
+        }, content_type='application/json')
+        self.assertNotEqual(response.status_code, 200)
+        self.assertLess(response.status_code, 500)
+
+    def test_save_keeps_conflicting_rut_unnormalized(self):
+        """Guardar un usuario con RUT duplicado sin normalizar no rompe el índice único"""
+        duplicado = self._crear_sin_normalizar('12345678-k', 'rut_duplicado')
+
+        duplicado.usua_estado = 0
+        duplicado.save()
+        duplicado.refresh_from_db()
+        self.assertEqual(duplicado.usua_estado, 0)
+        self.assertIsNone(duplicado.usua_rut_normalizado)
+        self.assertEqual(list(Usuario.por_rut('12.345.678-K')), [self.usuario])
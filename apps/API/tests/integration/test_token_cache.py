@@ -0,0 +1,118 @@
+"""
+Tests de integración para la caché de resolución de tokens de sesión
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.sesion_token import SesionToken
+from domain.entities.usuario import Usuario
+from interfaces.authentication.token_cache import token_cache
+
+
+@override_settings(SESION_TOKEN_CACHE={'ENABLED': True, 'TTL': 300})
+class TokenCacheTestCase(TestCase):
+    """Tests para TokenCache"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.rol = RolUsuario.objects.create(rous_id=1, rous_nombre='Usuario')
+        self.usuario = Usuario.objects.create(
+            usua_rut='12345678-9',
+            usua_email='vecino@example.com',
+            usua_nombre='Vecino',
+            usua_apellido='Test',
+            usua_nickname='vecino',
+            usua_pass=make_password('SecurePass123'),
+            usua_telefono=56912345678,
+            rous_id=self.rol,
+            usua_estado=1
+        )
+        self.token = SesionToken.objects.create(
+            usua_id=self.usuario,
+            token_valor='cache-token-123',
+            token_expira_en=timezone.now() + timedelta(days=1),
+            token_activo=True
+        )
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def test_second_resolution_hits_no_database(self):
+        """Tras la primera resolución, el token, usuario y rol salen de la caché"""
+        with self.assertNumQueries(1):
+            token_cache.resolve('cache-token-123')
+
+        with self.assertNumQueries(0):
+            sesion_token = token_cache.resolve('cache-token-123')
+            self.assertEqual(sesion_token.usua_id.usua_id, self.usuario.usua_id)
+            self.assertEqual(sesion_token.usua_id.rous_id.rous_nombre, 'Usuario')
+
+    def test_unknown_token_returns_none(self):
+        """Un token inexistente no se resuelve"""
+        self.assertIsNone(token_cache.resolve('token-inexistente'))
+
+    def test_logout_invalidates_cache(self):
+        """Eliminar el token (logout) lo invalida"""
+        token_cache.resolve('cache-token-123')
+        self.token.delete()
+        self.assertIsNone(token_cache.resolve('cache-token-123'))
+
+    def test_deactivation_invalidates_cache(self):
+        """Desactivar el token (refresh) lo invalida"""
+        token_cache.resolve('cache-token-123')
+        self.token.deactivate()
+        self.assertIsNone(token_cache.resolve('cache-token-123'))
+
+    def test_estado_change_invalidates_cache(self):
+        """Deshabilitar al usuario se refleja en la siguiente resolución"""
+        token_cache.resolve('cache-token-123')
+        self.usuario.usua_estado = 0
+        self.usuario.save()
+
+        sesion_token = token_cache.resolve('cache-token-123')
+        self.assertEqual(sesion_token.usua_id.usua_estado, 0)
+
+    def test_password_change_invalidates_cache(self):
+        """Cambiar la contraseña y borrar los tokens del usuario los invalida"""
+        token_cache.resolve('cache-token-123')
+        self.usuario.usua_pass = 'NuevaPass456'
+        self.usuario.save()
+        SesionToken.objects.filter(usua_id=self.usuario).delete()
+
+        self.assertIsNone(token_cache.resolve('cache-token-123'))
+
+    def test_expired_token_is_not_cached(self):
+        """Un token expirado se retorna sin cachear"""
+        self.token.token_expira_en = timezone.now() - timedelta(minutes=1)
+        self.token.save()
+
+        sesion_token = token_cache.resolve('cache-token-123')
+        self.assertFalse(sesion_token.is_valid())
+        with self.assertNumQueries(1):
+            token_cache.resolve('cache-token-123')
+
+    def test_cached_instances_are_not_shared(self):
+        """Cada resolución entrega una copia independiente"""
+        primero = token_cache.resolve('cache-token-123')
+        primero.usua_id.usua_nickname = 'modificado'
+
+        segundo = token_cache.resolve('cache-token-123')
+        self.assertEqual(segundo.usua_id.usua_nickname, 'vecino')
+
+    def test_local_entries_expire_without_shared_cache(self):
+        """Sin caché compartida el LRU local guarda el token solo LOCAL_TTL segundos"""
+        with mock.patch('interfaces.authentication.token_cache.time.monotonic', return_value=1000.0):
+            token_cache.resolve('cache-token-123')
+
+        # Revocado en otro worker: este proceso no recibe la señal
+        SesionToken.objects.filter(pk=self.token.pk).update(token_activo=False)
+
+        with mock.patch('interfaces.authentication.token_cache.time.monotonic', return_value=1004.0):
+            self.assertIsNotNone(token_cache.resolve('cache-token-123'))
+        with mock.patch('interfaces.authentication.token_cache.time.monotonic', return_value=1006.0):
+            self.assertIsNone(token_cache.resolve('cache-token-123'))
@@ -0,0 +1,115 @@
+"""
+Tests de integración para el toggle atómico de votos (VotoReporte.alternar_voto)
+
+NOTA: Requieren PostGIS/GDAL (ReportModel usa PointField). El test de
+concurrencia además requiere PostgreSQL. Si no están disponibles, se omiten.
+"""
+import threading
+import unittest
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from domain.entities.rol_usuario import RolUsuario
+from domain.entities.usuario import Usuario
+
+
+def crear_reporte():
+    from django.contrib.gis.geos import Point
+    from reports.models import Ciudad, DenunciaEstado, ReportModel, TipoDenuncia
+
+    rol = RolUsuario.objects.create(rous_id=2, rous_nombre='Usuario')
+    usuario = Usuario.objects.create(
+        usua_rut='12345678-9',
+        usua_email='vecino@example.com',
+        usua_nombre='Vecino',
+        usua_apellido='Test',
+        usua_nickname='vecino',
+        usua_pass=make_password('SecurePass123'),
+        usua_telefono=56912345678,
+        rous_id=rol,
+        usua_estado=1
+    )
+    reporte = ReportModel.objects.create(
+        titulo='Bache',
+        descripcion='Descripción de prueba',
+        direccion='Calle Falsa 123',
+        ubicacion=Point(-72.59, -38.73),
+        urgencia=1,
+        usuario=usuario,
+        denuncia_estado=DenunciaEstado.objects.create(nombre='Nuevo'),
+        tipo_denuncia=TipoDenuncia.objects.create(nombre='Infraestructura'),
+        ciudad=Ciudad.objects.create(nombre='Temuco')
+    )
+    return usuario, reporte
+
+
+@unittest.skipUnless(apps.is_installed('reports'), 'Requiere PostGIS/GDAL y la app reports')
+class VoteToggleTestCase(TestCase):
+    """Tests para el toggle de votos"""
+
+    def setUp(self):
+        self.usuario, self.reporte = crear_reporte()
+
+    def test_toggle_adds_and_removes(self):
+        """Votar dos veces registra y luego quita el voto, con el total actualizado"""
+        from reports.models import VotoReporte
+
+        agregado = VotoReporte.alternar_voto(self.usuario.usua_id, self.reporte.id)
+        self.assertEqual(agregado['accion'], 'added')
+        self.assertEqual(agregado['total'], 1)
+        self.assertIsNotNone(agregado['voto_id'])
+
+        quitado = VotoReporte.alternar_voto(self.usuario.usua_id, self.reporte.id)
+        self.assertEqual(quitado['accion'], 'removed')
+        self.assertEqual(quitado['total'], 0)
+        self.assertFalse(VotoReporte.objects.exists())
+
+    def test_missing_report_returns_none(self):
+        """Un reporte inexistente no crea votos"""
+        from reports.models import VotoReporte
+
+        self.assertIsNone(VotoReporte.alternar_voto(self.usuario.usua_id, self.reporte.id + 1000))
+
+
+@unittest.skipUnless(
+    apps.is_installed('reports') and connection.vendor == 'postgresql',
+    'Requiere PostgreSQL con PostGIS y la app reports'
+)
+class VoteToggleConcurrencyTestCase(TransactionTestCase):
+    """Muchos hilos alternando el mismo par (usuario, reporte)"""
+
+    HILOS = 16
+    TOGGLES_POR_HILO = 10
+
+    def test_concurrent_toggles_keep_counter_consistent(self):
+        """Sin errores, y el contador coincide con los votos reales"""
+        from reports.models import ReportModel, VotoReporte
+
+        usuario, reporte = crear_reporte()
+        errores = []
+        barrera = threading.Barrier(self.HILOS)
+
+        def alternar():
+            try:
+                barrera.wait()
+                for _ in range(self.TOGGLES_POR_HILO):
+                    if VotoReporte.alternar_voto(usuario.usua_id, reporte.id) is None:
+                        errores.append('reporte no encontrado')
+            except Exception as e:
+                errores.append(repr(e))
+            finally:
+                connection.close()
+
+        hilos = [threading.Thread(target=alternar) for _ in range(self.HILOS)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        votos = VotoReporte.objects.filter(usuario=usuario, reporte=reporte).count()
+        self.assertIn(votos, (0, 1))
+        self.assertEqual(ReportModel.objects.get(pk=reporte.pk).total_votos, votos)
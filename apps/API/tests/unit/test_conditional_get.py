@@ -0,0 +1,106 @@
+"""
+Pruebas unitarias para el GET condicional (interfaces.responses.conditional).
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.http import http_date
+
+from interfaces.responses.conditional import aconditional_get, build_etag, conditional_get
+
+MODIFICADO = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def fabrica():
+    return RequestFactory()
+
+
+def construir_contando(llamadas):
+    def construir():
+        llamadas.append(1)
+        return HttpResponse('cuerpo')
+    return construir
+
+
+class TestBuildEtag:
+
+    def test_weak_and_stable(self):
+        assert build_etag('reporte', (1, MODIFICADO)) == build_etag('reporte', (1, MODIFICADO))
+        assert build_etag('reporte', (1, MODIFICADO)).startswith('W/"')
+
+    def test_changes_with_content(self):
+        assert build_etag('reporte', (1, 5)) != build_etag('reporte', (1, 6))
+
+
+class TestConditionalGet:
+
+    def test_first_request_builds_body_with_validators(self, fabrica):
+        llamadas = []
+        etag = build_etag('x')
+        respuesta = conditional_get(fabrica.get('/'), etag, MODIFICADO, construir_contando(llamadas))
+
+        assert respuesta.status_code == 200
+        assert llamadas == [1]
+        assert respuesta['ETag'] == etag
+        assert respuesta['Last-Modified'] == http_date(MODIFICADO.timestamp())
+        assert 'no-cache' in respuesta['Cache-Control']
+        assert 'private' in respuesta['Cache-Control']
+        assert respuesta['Vary'] == 'Authorization'
+
+    def test_matching_if_none_match_returns_304_without_building(self, fabrica):
+        llamadas = []
+        etag = build_etag('x')
+        request = fabrica.get('/', HTTP_IF_NONE_MATCH=etag)
+        respuesta = conditional_get(request, etag, MODIFICADO, construir_contando(llamadas))
+
+        assert respuesta.status_code == 304
+        assert llamadas == []
+        assert respuesta['ETag'] == etag
+
+    def test_stale_etag_builds_body(self, fabrica):
+        llamadas = []
+        request = fabrica.get('/', HTTP_IF_NONE_MATCH=build_etag('viejo'))
+        respuesta = conditional_get(request, build_etag('nuevo'), MODIFICADO, construir_contando(llamadas))
+
+        assert respuesta.status_code == 200
+        assert llamadas == [1]
+
+    def test_if_modified_since(self, fabrica):
+        llamadas = []
+        request = fabrica.get('/', HTTP_IF_MODIFIED_SINCE=http_date(MODIFICADO.timestamp()))
+        respuesta = conditional_get(request, build_etag('x'), MODIFICADO, construir_contando(llamadas))
+        assert respuesta.status_code == 304
+        assert llamadas == []
+
+    def test_error_responses_get_no_validators(self, fabrica):
+        respuesta = conditional_get(
+            fabrica.get('/'), build_etag('x'), None, lambda: HttpResponse(status=404)
+        )
+        assert respuesta.status_code == 404
+        assert not respuesta.has_header('ETag')
+
+
+class TestAsyncConditionalGet:
+
+    def test_awaits_builder_only_when_stale(self, fabrica):
+        llamadas = []
+
+        async def construir():
+            llamadas.append(1)
+            return HttpResponse('cuerpo')
+
+        etag = build_etag('x')
+        primera = asyncio.run(aconditional_get(fabrica.get('/'), etag, MODIFICADO, construir))
+        assert primera.status_code == 200
+        assert primera['ETag'] == etag
+        assert primera['Vary'] == 'Authorization'
+
+        request = fabrica.get('/', HTTP_IF_NONE_MATCH=etag)
+        segunda = asyncio.run(aconditional_get(request, etag, MODIFICADO, construir))
+        assert segunda.status_code == 304
+        assert llamadas == [1]
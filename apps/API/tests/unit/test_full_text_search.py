@@ -0,0 +1,45 @@
+"""
+Pruebas unitarias para la construcción de consultas de texto completo
+(infrastructure.database.search).
+"""
+
+from infrastructure.database.search import MAX_TERMINOS, build_search_query, search_filter
+
+
+def texto(consulta):
+    """Texto crudo del tsquery construido"""
+    return consulta.source_expressions[-1].value
+
+
+class TestBuildSearchQuery:
+    """Conversión del texto del usuario a tsquery con prefijos"""
+
+    def test_each_word_becomes_a_prefix_term(self):
+        consulta = build_search_query('bache  calle')
+        assert texto(consulta) == 'bache:* & calle:*'
+
+    def test_accents_and_enie_are_kept_as_words(self):
+        consulta = build_search_query('Alumbrado público dañado')
+        assert texto(consulta) == 'Alumbrado:* & público:* & dañado:*'
+
+    def test_tsquery_operators_are_discarded(self):
+        consulta = build_search_query("bache' | !calle & (x:*")
+        assert texto(consulta) == 'bache:* & calle:* & x:*'
+
+    def test_empty_text_returns_none(self):
+        assert build_search_query('') is None
+        assert build_search_query('  ¿?!  ') is None
+
+    def test_terms_are_capped(self):
+        consulta = build_search_query(' '.join(f'p{i}' for i in range(20)))
+        assert texto(consulta).count(':*') == MAX_TERMINOS
+
+
+class TestSearchFilterFallback:
+    """Fuera de PostgreSQL se usa icontains sobre los campos indicados"""
+
+    def test_fallback_uses_icontains(self):
+        filtro = search_filter('bache', ('titulo', 'descripcion'))
+        assert ('titulo__icontains', 'bache') in filtro.children
+        assert ('descripcion__icontains', 'bache') in filtro.children
+        assert filtro.connector == 'OR'